@@ -98,6 +98,7 @@ class CdkInvoker:
         cloudformation_execution_policies: str = None,
         public_access_block_configuration: bool = True,
         rollback: bool = True,
+        skip_unchanged: bool = False,
     ):
         self.cluster_name = cluster_name
         self.aws_region = aws_region
@@ -110,6 +111,13 @@ class CdkInvoker:
 
         self.rollback = rollback
 
+        # skip deployment if the synthesized template and packages match the last deployment of the module
+        self.skip_unchanged = skip_unchanged
+        # checksums of the bootstrap and release packages referenced by the stack
+        self.package_checksums: List[str] = []
+        # when skip_unchanged is enabled, packages are uploaded only if the module is deployed
+        self.pending_uploads: List[Dict] = []
+
         if Utils.is_empty(module_set):
             module_set = constants.DEFAULT_MODULE_SET
         self.module_set = module_set
@@ -401,8 +409,11 @@ class CdkInvoker:
             force_build=force_build,
         )
         bootstrap_package_archive_file = builder.build()
-        session = Utils.create_boto_session(self.aws_region, self.aws_profile)
-        s3_client = session.client('s3')
+        self.package_checksums.append(
+            Utils.compute_checksum_for_dir(
+                os.path.join(self.deployment_dir, bootstrap_package_basename)
+            )
+        )
 
         cluster_s3_bucket = bootstrap_context.config.get_string(
             'cluster.cluster_s3_bucket', required=True
@@ -410,11 +421,11 @@ class CdkInvoker:
         bootstrap_package_uri = f's3://{cluster_s3_bucket}/idea/bootstrap/{os.path.basename(bootstrap_package_archive_file)}'
 
         if upload:
-            print(f'uploading bootstrap package {bootstrap_package_uri} ...')
-            s3_client.upload_file(
-                Bucket=cluster_s3_bucket,
-                Filename=bootstrap_package_archive_file,
-                Key=f'idea/bootstrap/{os.path.basename(bootstrap_package_archive_file)}',
+            self.upload_package(
+                message=f'uploading bootstrap package {bootstrap_package_uri} ...',
+                bucket=cluster_s3_bucket,
+                file=bootstrap_package_archive_file,
+                key=f'idea/bootstrap/{os.path.basename(bootstrap_package_archive_file)}',
             )
             return bootstrap_package_uri
 
@@ -434,21 +445,114 @@ class CdkInvoker:
             'cluster.cluster_s3_bucket', required=True
         )
         app_package_uri = f's3://{cluster_s3_bucket}/idea/releases/{package_name}'
+        self.package_checksums.append(Utils.compute_checksum_for_file(app_package))
 
         if upload:
-            aws_client = AwsClientProvider(
-                options=AWSClientProviderOptions(
-                    profile=self.aws_profile, region=self.aws_region
-                )
+            self.upload_package(
+                message=f'uploading release package: {app_package_uri} ...',
+                bucket=cluster_s3_bucket,
+                file=app_package,
+                key=f'idea/releases/{os.path.basename(app_package)}',
+            )
+
+        return app_package_uri
+
+    def upload_package(self, message: str, bucket: str, file: str, key: str):
+        """
+        upload the package to the cluster's s3 bucket.
+        if skip_unchanged is enabled, the upload is deferred until the module is deployed. see cdk_deploy()
+        """
+        upload = {'message': message, 'bucket': bucket, 'file': file, 'key': key}
+        if self.skip_unchanged:
+            self.pending_uploads.append(upload)
+        else:
+            self.upload_packages([upload])
+
+    def upload_packages(self, uploads: List[Dict]):
+        if len(uploads) == 0:
+            return
+        aws_client = AwsClientProvider(
+            options=AWSClientProviderOptions(
+                profile=self.aws_profile, region=self.aws_region
             )
-            print(f'uploading release package: {app_package_uri} ...')
+        )
+        for upload in uploads:
+            print(upload['message'])
             aws_client.s3().upload_file(
-                Bucket=cluster_s3_bucket,
-                Filename=app_package,
-                Key=f'idea/releases/{os.path.basename(app_package)}',
+                Bucket=upload['bucket'], Filename=upload['file'], Key=upload['key']
             )
 
-        return app_package_uri
+    def get_deployment_fingerprint(self, cloud_assembly_dir: str) -> str:
+        """
+        fingerprint of the synthesized stack templates and the packages referenced by the stack.
+
+        the deployment id is part of the bootstrap package uris and cluster settings in the template and is excluded,
+        so that the fingerprint of a module only changes when the stack, bootstrap package or release package changes.
+        """
+        checksums = []
+        for file in sorted(os.listdir(cloud_assembly_dir)):
+            if not file.endswith('.template.json'):
+                continue
+            with open(os.path.join(cloud_assembly_dir, file), 'r') as f:
+                template = f.read()
+            template = template.replace(self.deployment_id, '{deployment_id}')
+            checksums.append(Utils.sha256(template))
+        checksums += self.package_checksums
+        return Utils.sha256(''.join(checksums))
+
+    def cdk_deploy(self, outputs_file: str, context_params: Dict[str, str] = None):
+        """
+        synthesize the stack to a cloud assembly in the deployment directory and deploy the cloud assembly.
+
+        if skip_unchanged is enabled and the module is already deployed with the same deployment fingerprint,
+        the deployment and package uploads are skipped.
+        """
+        cdk_app_cmd = self.get_cdk_app_cmd()
+        cloud_assembly_dir = os.path.join(
+            self.deployment_dir, f'cdk.out.{self.module_id}'
+        )
+        cdk_cmd = self.get_cdk_command(
+            'synth',
+            params=[
+                f"--app '{cdk_app_cmd}'",
+                f'--output {cloud_assembly_dir}',
+                '--quiet',
+            ],
+            context_params=context_params,
+        )
+        self.exec_shell(cdk_cmd)
+
+        fingerprint = self.get_deployment_fingerprint(cloud_assembly_dir)
+        self.log(f'DeploymentFingerprint: {fingerprint}')
+        if self.skip_unchanged:
+            module_info = self.cluster_config_db.get_module_info(self.module_id)
+            if (
+                module_info is not None
+                and module_info.get('status') == 'deployed'
+                and module_info.get('deployment_fingerprint') == fingerprint
+            ):
+                print(
+                    f'module: {self.module_id} is up to date. no changes to the stack template and packages '
+                    f'since the last deployment. skipping deployment.'
+                )
+                self.pending_uploads = []
+                return
+
+        self.upload_packages(self.pending_uploads)
+        self.pending_uploads = []
+
+        cdk_cmd = self.get_cdk_command(
+            'deploy',
+            params=[
+                f"--app '{cloud_assembly_dir}'",
+                f'--outputs-file {outputs_file}',
+                '--require-approval never',
+            ],
+        )
+        self.exec_shell(cdk_cmd)
+        self.cluster_config_db.set_module_deployment_fingerprint(
+            self.module_id, fingerprint
+        )
 
     def bootstrap_cluster(self, cluster_bucket: str):
         try:
@@ -556,70 +660,35 @@ class CdkInvoker:
 
     def invoke_cluster(self, **_):
         outputs_file = os.path.join(self.deployment_dir, 'cluster-outputs.json')
-        cdk_app_cmd = self.get_cdk_app_cmd()
-        cdk_cmd = self.get_cdk_command(
-            'deploy',
-            [
-                f"--app '{cdk_app_cmd}' ",
-                f'--outputs-file {outputs_file}',
-                '--require-approval never',
-            ],
+        self.cdk_deploy(
+            outputs_file=outputs_file,
         )
-        self.exec_shell(cdk_cmd)
 
     def invoke_shared_storage(self, **_):
         outputs_file = os.path.join(self.deployment_dir, 'shared-storage-outputs.json')
-        cdk_app_cmd = self.get_cdk_app_cmd()
-        cdk_cmd = self.get_cdk_command(
-            'deploy',
-            [
-                f"--app '{cdk_app_cmd}' ",
-                f'--outputs-file {outputs_file}',
-                '--require-approval never',
-            ],
+        self.cdk_deploy(
+            outputs_file=outputs_file,
         )
-        self.exec_shell(cdk_cmd)
 
     def invoke_analytics(self, **_):
         outputs_file = os.path.join(self.deployment_dir, 'analytics-outputs.json')
-        cdk_app_cmd = self.get_cdk_app_cmd()
-        cdk_cmd = self.get_cdk_command(
-            'deploy',
-            [
-                f"--app '{cdk_app_cmd}' ",
-                f'--outputs-file {outputs_file} ',
-                '--require-approval never',
-            ],
+        self.cdk_deploy(
+            outputs_file=outputs_file,
         )
-        self.exec_shell(cdk_cmd)
 
     def invoke_metrics(self, **_):
         outputs_file = os.path.join(self.deployment_dir, 'metrics-outputs.json')
-        cdk_app_cmd = self.get_cdk_app_cmd()
-        cdk_cmd = self.get_cdk_command(
-            'deploy',
-            [
-                f"--app '{cdk_app_cmd}' ",
-                f'--outputs-file {outputs_file}',
-                '--require-approval never',
-            ],
+        self.cdk_deploy(
+            outputs_file=outputs_file,
         )
-        self.exec_shell(cdk_cmd)
 
     def invoke_identity_provider(self, **_):
         outputs_file = os.path.join(
             self.deployment_dir, 'identity-provider-outputs.json'
         )
-        cdk_app_cmd = self.get_cdk_app_cmd()
-        cdk_cmd = self.get_cdk_command(
-            'deploy',
-            [
-                f"--app '{cdk_app_cmd}' ",
-                f'--outputs-file {outputs_file}',
-                '--require-approval never',
-            ],
+        self.cdk_deploy(
+            outputs_file=outputs_file,
         )
-        self.exec_shell(cdk_cmd)
 
     def invoke_directoryservice(self, **kwargs):
         modules = self.cluster_config_db.get_cluster_modules()
@@ -708,33 +777,19 @@ class CdkInvoker:
                 outputs_file = os.path.join(
                     self.deployment_dir, 'directoryservice-outputs.json'
                 )
-                cdk_app_cmd = self.get_cdk_app_cmd()
-                cdk_cmd = self.get_cdk_command(
-                    'deploy',
-                    params=[
-                        f"--app '{cdk_app_cmd}' ",
-                        f'--outputs-file {outputs_file} ',
-                        '--require-approval never',
-                    ],
+                self.cdk_deploy(
+                    outputs_file=outputs_file,
                     context_params={'bootstrap_package_uri': bootstrap_package_uri},
                 )
-                self.exec_shell(cdk_cmd)
 
         else:
             if deploy_stack:
                 outputs_file = os.path.join(
                     self.deployment_dir, 'directoryservice-outputs.json'
                 )
-                cdk_app_cmd = self.get_cdk_app_cmd()
-                cdk_cmd = self.get_cdk_command(
-                    'deploy',
-                    params=[
-                        f"--app '{cdk_app_cmd}' ",
-                        f'--outputs-file {outputs_file} ',
-                        '--require-approval never',
-                    ],
+                self.cdk_deploy(
+                    outputs_file=outputs_file,
                 )
-                self.exec_shell(cdk_cmd)
 
     def invoke_cluster_manager(self, **kwargs):
         upload_release_package = Utils.get_value_as_bool(
@@ -821,17 +876,10 @@ class CdkInvoker:
             outputs_file = os.path.join(
                 self.deployment_dir, 'cluster-manager-outputs.json'
             )
-            cdk_app_cmd = self.get_cdk_app_cmd()
-            cdk_cmd = self.get_cdk_command(
-                'deploy',
-                params=[
-                    f"--app '{cdk_app_cmd}' ",
-                    f'--outputs-file {outputs_file} ',
-                    '--require-approval never',
-                ],
+            self.cdk_deploy(
+                outputs_file=outputs_file,
                 context_params={'bootstrap_package_uri': bootstrap_package_uri},
             )
-            self.exec_shell(cdk_cmd)
 
     def invoke_scheduler(self, **kwargs):
         upload_release_package = Utils.get_value_as_bool(
@@ -936,17 +984,10 @@ class CdkInvoker:
 
         if upload_release_package and upload_bootstrap_package and deploy_stack:
             outputs_file = os.path.join(self.deployment_dir, 'scheduler-outputs.json')
-            cdk_app_cmd = self.get_cdk_app_cmd()
-            cdk_cmd = self.get_cdk_command(
-                'deploy',
-                params=[
-                    f"--app '{cdk_app_cmd}' ",
-                    f'--outputs-file {outputs_file} ',
-                    '--require-approval never',
-                ],
+            self.cdk_deploy(
+                outputs_file=outputs_file,
                 context_params={'bootstrap_package_uri': bootstrap_package_uri},
             )
-            self.exec_shell(cdk_cmd)
 
     def invoke_virtual_desktop_controller(self, **kwargs):
         upload_release_package = Utils.get_value_as_bool(
@@ -1137,21 +1178,14 @@ class CdkInvoker:
             outputs_file = os.path.join(
                 self.deployment_dir, 'virtual-desktop-controller-outputs.json'
             )
-            cdk_app_cmd = self.get_cdk_app_cmd()
-            cdk_cmd = self.get_cdk_command(
-                'deploy',
-                params=[
-                    f"--app '{cdk_app_cmd}' ",
-                    f'--outputs-file {outputs_file} ',
-                    '--require-approval never',
-                ],
+            self.cdk_deploy(
+                outputs_file=outputs_file,
                 context_params={
                     'controller_bootstrap_package_uri': controller_bootstrap_package_uri,
                     'dcv_broker_bootstrap_package_uri': dcv_broker_package_uri,
                     'dcv_connection_gateway_package_uri': dcv_connection_gateway_package_uri,
                 },
             )
-            self.exec_shell(cdk_cmd)
 
     def invoke_bastion_host(self, **kwargs):
         modules = self.cluster_config_db.get_cluster_modules()
@@ -1240,17 +1274,10 @@ class CdkInvoker:
             outputs_file = os.path.join(
                 self.deployment_dir, 'bastion-host-outputs.json'
             )
-            cdk_app_cmd = self.get_cdk_app_cmd()
-            cdk_cmd = self.get_cdk_command(
-                'deploy',
-                params=[
-                    f"--app '{cdk_app_cmd}' ",
-                    f'--outputs-file {outputs_file} ',
-                    '--require-approval never',
-                ],
+            self.cdk_deploy(
+                outputs_file=outputs_file,
                 context_params={'bootstrap_package_uri': bootstrap_package_uri},
             )
-            self.exec_shell(cdk_cmd)
 
     def invoke(self, **kwargs):
         try:
@@ -11,7 +11,8 @@
 
 from ideasdk.context import SocaCliContext, SocaContextOptions
 from ideasdk.config.cluster_config_db import ClusterConfigDB
-from ideasdk.utils import Utils
+from ideasdk.aws import AwsRateGovernor, TokenBucket
+from ideasdk.utils import Utils, ModuleMetadataHelper
 from ideadatamodel import (
     constants,
     exceptions,
@@ -20,14 +21,69 @@ from ideadatamodel import (
     SocaMemory,
     SocaMemoryUnit,
 )
+from ideaadministrator.app.delete_cluster_plan import (
+    DeleteClusterPlan,
+    DeleteClusterTask,
+    STACK_DELETION_ESTIMATE_SECONDS,
+)
 
-from typing import Optional, List
+from typing import Optional, List, Dict, Callable, Any
+from concurrent.futures import ThreadPoolExecutor
 from prettytable import PrettyTable
+import math
 import time
 import botocore.exceptions
 
+# client side rate (requests/second), burst and max concurrent requests for each AWS API used during cluster deletion.
+# rates are reduced when API calls are throttled and gradually restored (see AwsRateGovernor)
+DELETE_CLUSTER_API_LIMITS = {
+    'ec2': (20, 50, 10),
+    'cloudformation': (10, 20, 10),
+    'dynamodb': (10, 10, 10),
+    'logs': (8, 10, 5),
+    'backup': (10, 10, 5),
+    'cognito-idp': (5, 5, 2),
+}
+
+# max instance ids per ec2.terminate_instances() call
+TERMINATE_INSTANCES_BATCH_SIZE = 1000
+
+# status polls start with the min interval and back off up to the max interval while the status does not change
+STACK_STATUS_POLL_MIN_SECONDS = 2
+STACK_STATUS_POLL_MAX_SECONDS = 15
+SSM_COMMAND_POLL_MIN_SECONDS = 2
+SSM_COMMAND_POLL_MAX_SECONDS = 10
+POLL_BACKOFF_FACTOR = 1.5
+
+DELETE_BUCKET_MAX_ATTEMPTS = 5
+
+# tasks of the previous sequential cluster deletion, used for the dry run timing report
+PHASE_APP_MODULE_CLEAN_UP = 0
+PHASE_EC2_TERMINATION_PROTECTION = 1
+PHASE_EC2_INSTANCES = 2
+PHASE_CLOUD_FORMATION_STACKS = 3
+PHASE_USER_POOL_PROTECTION = 4
+PHASE_IDENTITY_PROVIDER_STACKS = 5
+PHASE_BACKUP_RECOVERY_POINTS = 6
+PHASE_CLUSTER_STACKS = 7
+PHASE_BOOTSTRAP = 8
+PHASE_DYNAMODB_TABLES = 9
+PHASE_CLOUDWATCH_ALARMS = 10
+PHASE_CLOUDWATCH_LOGS = 11
+
 
 class DeleteCluster:
+    """
+    Delete all resources of a cluster.
+
+    All confirmations are prompted before any resource is deleted. The deletion is then executed as a
+    DeleteClusterPlan, where each CloudFormation stack is deleted as soon as all stacks of the modules depending on
+    it are deleted, and other resources are deleted in parallel with the stacks they do not depend on.
+
+    AWS API calls are paced using an AwsRateGovernor with limited concurrency for each AWS service, instead of fixed
+    delays between API calls. Use dry_run to print the deletion plan and estimated timing without deleting anything.
+    """
+
     def __init__(
         self,
         cluster_name: str,
@@ -39,6 +95,7 @@ class DeleteCluster:
         delete_cloudwatch_logs: bool,
         delete_all: bool,
         force: bool,
+        dry_run: bool = False,
     ):
         self.cluster_name = cluster_name
         self.aws_region = aws_region
@@ -49,7 +106,7 @@ class DeleteCluster:
         self.delete_cloudwatch_logs = delete_cloudwatch_logs
         self.delete_all = delete_all
         self.force = force
-        self.delete_failed_attempt = 0
+        self.dry_run = dry_run
         self.delete_failed_max_attempts = 3
 
         self.context = SocaCliContext(
@@ -61,6 +118,10 @@ class DeleteCluster:
             )
         )
 
+        self.rate_governor: Optional[AwsRateGovernor] = None
+        self.api_concurrency: Dict[str, int] = {}
+        self.initialize_rate_governor()
+
         try:
             self.cluster_config_db = ClusterConfigDB(
                 cluster_name=cluster_name,
@@ -78,6 +139,9 @@ class DeleteCluster:
         else:
             self.cluster_modules = []
 
+        self.initialize_resources()
+
+    def initialize_resources(self):
         self.app_modules = []
         for cluster_module in self.cluster_modules:
             module_type = Utils.get_value_as_string('type', cluster_module, None)
@@ -93,18 +157,76 @@ class DeleteCluster:
         self.cluster_stacks = []
         # Identity Provider stacks - requires disable of the UserPool protection
         self.identity_provider_stacks = []
+        self.bootstrap_stack: Optional[Dict] = None
+        # found before the cluster settings table is deleted
+        self.cluster_s3_bucket_name: Optional[str] = None
 
         self.dynamodb_tables = []
 
         self.cloudwatch_logs = []
 
+        self.backup_recovery_points = []
+
+        self.confirm_delete_backups = False
+        self.confirm_delete_bootstrap = False
+        self.confirm_delete_databases = False
+        self.confirm_delete_cloudwatch_logs = False
+
+    def initialize_rate_governor(self):
+        self.rate_governor = AwsRateGovernor(
+            logger=self.context.logger('aws-rate-governor')
+        )
+        clients = {
+            'ec2': self.context.aws().ec2(),
+            'cloudformation': self.context.aws().cloudformation(),
+            'dynamodb': self.context.aws().dynamodb(),
+            'logs': self.context.aws().logs(),
+            'backup': self.context.aws().backup(),
+            'cognito-idp': self.context.aws().cognito_idp(),
+        }
+        for service_name, (
+            rate,
+            burst,
+            concurrency,
+        ) in DELETE_CLUSTER_API_LIMITS.items():
+            self.rate_governor.add_bucket(
+                service_name, TokenBucket(rate=rate, burst=burst)
+            )
+            self.rate_governor.attach(clients[service_name], service_name)
+            self.api_concurrency[service_name] = concurrency
+
+    def get_api_concurrency(self, service_name: str) -> int:
+        return self.api_concurrency.get(service_name, 1)
+
+    def for_each(
+        self, service_name: str, items: List, fn: Callable[[Any], Any]
+    ) -> List:
+        """
+        call fn for each item, with at most the configured number of concurrent calls for the AWS service.
+        results are returned in the order of items. the first error is raised after all calls are completed.
+        """
+        if len(items) == 0:
+            return []
+        max_workers = min(len(items), self.get_api_concurrency(service_name))
+        if max_workers == 1:
+            return [fn(item) for item in items]
+        with ThreadPoolExecutor(
+            max_workers=max_workers, thread_name_prefix=f'delete-{service_name}'
+        ) as executor:
+            futures = [executor.submit(fn, item) for item in items]
+        return [future.result() for future in futures]
+
+    def confirm(self, message: str) -> bool:
+        if self.force or self.dry_run:
+            return True
+        return self.context.prompt(message)
+
     def get_bootstrap_stack_name(self) -> str:
         return f'{self.cluster_name}-bootstrap'
 
     def find_ec2_instances(self):
         self.context.info('Searching for EC2 instances to be terminated ...')
         ec2_instances_to_delete = []
-        termination_protected_instances = []
         ec2_instances = self.context.aws_util().ec2_describe_instances(
             filters=[
                 {
@@ -113,11 +235,14 @@ class DeleteCluster:
                 }
             ]
         )
-        for ec2_instance in ec2_instances:
-            if ec2_instance.state == 'terminated':
-                continue
-
-            # check termination protection instances
+        ec2_instances = [
+            ec2_instance
+            for ec2_instance in ec2_instances
+            if ec2_instance.state != 'terminated'
+        ]
+
+        # check termination protection instances
+        def is_termination_protected(ec2_instance: EC2Instance) -> bool:
             describe_instance_attribute_result = (
                 self.context.aws()
                 .ec2()
@@ -129,15 +254,18 @@ class DeleteCluster:
             disable_api_termination = Utils.get_value_as_dict(
                 'DisableApiTermination', describe_instance_attribute_result
             )
-            disable_api_termination_enabled = Utils.get_value_as_bool(
-                'Value', disable_api_termination, False
-            )
-            if disable_api_termination_enabled:
-                termination_protected_instances.append(ec2_instance)
-            time.sleep(
-                0.1
-            )  # 10 tps - might need to be adjusted in-future. allowed 100 TPS - https://docs.aws.amazon.com/AWSEC2/latest/APIReference/throttling.html
+            return Utils.get_value_as_bool('Value', disable_api_termination, False)
+
+        termination_protected = self.for_each(
+            'ec2', ec2_instances, is_termination_protected
+        )
+        termination_protected_instances = [
+            ec2_instance
+            for ec2_instance, protected in zip(ec2_instances, termination_protected)
+            if protected
+        ]
 
+        for ec2_instance in ec2_instances:
             # app and infra node type instances will be terminated by their respective cloudformation stacks
             # we are primarily interested in the instances launched without CloudFormation stack
             node_type = ec2_instance.soca_node_type
@@ -166,41 +294,49 @@ class DeleteCluster:
             )
         print(instance_table)
 
+    def disable_ec2_termination_protection(self):
+        def disable_termination_protection(ec2_instance: EC2Instance):
+            self.context.info(
+                f'disabling termination protection for EC2 instance: {ec2_instance.instance_id} ...'
+            )
+            self.context.aws().ec2().modify_instance_attribute(
+                InstanceId=ec2_instance.instance_id,
+                DisableApiTermination={'Value': False},
+            )
+            self.context.success(
+                f'termination protection disabled for EC2 instance: {ec2_instance.instance_id}'
+            )
+
+        self.for_each(
+            'ec2',
+            self.termination_protected_ec2_instances,
+            disable_termination_protection,
+        )
+
+    def get_terminate_instance_batches(self) -> List[List[str]]:
+        instance_ids = [ec2_instance.instance_id for ec2_instance in self.ec2_instances]
+        return [
+            instance_ids[i : i + TERMINATE_INSTANCES_BATCH_SIZE]
+            for i in range(0, len(instance_ids), TERMINATE_INSTANCES_BATCH_SIZE)
+        ]
+
     def delete_ec2_instances(self):
-        if len(self.termination_protected_ec2_instances) > 0:
-            for ec2_instance in self.termination_protected_ec2_instances:
-                self.context.info(
-                    f'disabling termination protection for EC2 instance: {ec2_instance.instance_id} ...'
-                )
-                self.context.aws().ec2().modify_instance_attribute(
-                    InstanceId=ec2_instance.instance_id,
-                    DisableApiTermination={'Value': False},
+        def terminate_instances(instance_ids: List[str]):
+            self.context.info(f'terminating EC2 instances: {instance_ids}')
+            kwargs = {'InstanceIds': instance_ids}
+            if self.force:
+                kwargs['Force'] = True
+                kwargs['SkipOsShutdown'] = (
+                    True  # Use skip OS shutdown when force is enabled
                 )
-                self.context.success(
-                    f'termination protection disabled for EC2 instance: {ec2_instance.instance_id}'
-                )
-                time.sleep(1)
-
-        if len(self.ec2_instances) > 0:
-            for ec2_instance in self.ec2_instances:
                 self.context.info(
-                    f'terminating EC2 instance: {ec2_instance.instance_id}'
+                    'using force termination with skip OS shutdown for instances'
                 )
-                kwargs = {'InstanceIds': [ec2_instance.instance_id]}
-                if self.force:
-                    kwargs['Force'] = True
-                    kwargs['SkipOsShutdown'] = (
-                        True  # Use skip OS shutdown when force is enabled
-                    )
-                    self.context.info(
-                        f'using force termination with skip OS shutdown for instance: {ec2_instance.instance_id}'
-                    )
 
-                self.context.aws().ec2().terminate_instances(**kwargs)
-                self.context.success(
-                    f'terminated EC2 instance: {ec2_instance.instance_id}'
-                )
-                time.sleep(1)
+            self.context.aws().ec2().terminate_instances(**kwargs)
+            self.context.success(f'terminated {len(instance_ids)} EC2 instances')
+
+        self.for_each('ec2', self.get_terminate_instance_batches(), terminate_instances)
 
     def _get_app_instance(self, module_id: str) -> Optional[EC2Instance]:
         describe_instances_result = (
@@ -250,6 +386,9 @@ class DeleteCluster:
             print(f'executing app-module-clean-up commands for app: {module_id}')
             instance_ids.append(app_instance.instance_id)
 
+        if len(instance_ids) == 0:
+            return
+
         command_to_execute = 'sudo ideactl app-module-clean-up'
         if self.delete_databases:
             command_to_execute = f'{command_to_execute} --delete-databases'
@@ -265,6 +404,7 @@ class DeleteCluster:
         )
 
         command_id = send_command_result['Command']['CommandId']
+        poll_interval = SSM_COMMAND_POLL_MIN_SECONDS
         while True:
             list_command_invocations_result = (
                 self.context.aws()
@@ -288,15 +428,16 @@ class DeleteCluster:
             if completed_count == len(command_invocations):
                 break
 
-            time.sleep(10)
+            time.sleep(poll_interval)
+            poll_interval = min(
+                SSM_COMMAND_POLL_MAX_SECONDS, poll_interval * POLL_BACKOFF_FACTOR
+            )
 
     def find_cloud_formation_stacks(self):
         self.context.info(
             f'Searching for CloudFormation stacks to be terminated (matching {constants.IDEA_TAG_CLUSTER_NAME} of {self.cluster_name})...'
         )
-        stacks_to_delete = []
-        cluster_stacks = []
-        identity_provider_stacks = []
+        stack_ids = []
         pagination_token = None
         while True:
             request = {
@@ -329,42 +470,59 @@ class DeleteCluster:
                 'ResourceTagMappingList', get_resources_result, []
             )
             for resource in resources:
-                try:
-                    stack_id = Utils.get_value_as_string('ResourceARN', resource)
-
-                    stack = self.describe_cloud_formation_stack(stack_id)
-                    stack_name = Utils.get_value_as_string('StackName', stack)
+                stack_id = Utils.get_value_as_string('ResourceARN', resource)
+                if Utils.is_not_empty(stack_id):
+                    stack_ids.append(stack_id)
 
-                    if Utils.is_empty(stack_name):
-                        continue
+            if Utils.is_empty(pagination_token):
+                break
 
-                    if self.is_bootstrap_stack(stack_name):
-                        continue
+        def describe_stack(stack_id: str) -> Optional[Dict]:
+            try:
+                return self.describe_cloud_formation_stack(stack_id)
+            except botocore.exceptions.ClientError as e:
+                # race condition, where resources tagging API returns a cfn stack, but the stack could be deleted.
+                # * this scenario occurs when scheduler launches a job stack and deletes it by the time delete cluster calls describe cfn stack
+                # * to address this scenario, skip all validation error cases
+                if e.response['Error']['Code'] != 'ValidationError':
+                    raise e
+                return None
 
-                    if self.is_cluster_stack(stack_name):
-                        cluster_stacks.append(stack)
-                    elif self.is_identity_provider_stack(stack_name):
-                        identity_provider_stacks.append(stack)
-                    else:
-                        stacks_to_delete.append(stack)
+        stacks_to_delete = []
+        cluster_stacks = []
+        identity_provider_stacks = []
+        for stack in self.for_each('cloudformation', stack_ids, describe_stack):
+            if stack is None:
+                continue
 
-                    # sleep for a while to ensure we don't flood describe_stack() API
-                    time.sleep(0.5)
+            stack_name = Utils.get_value_as_string('StackName', stack)
+            if Utils.is_empty(stack_name):
+                continue
 
-                except botocore.exceptions.ClientError as e:
-                    # race condition, where resources tagging API returns a cfn stack, but the stack could be deleted.
-                    # * this scenario occurs when scheduler launches a job stack and deletes it by the time delete cluster calls describe cfn stack
-                    # * to address this scenario, skip all validation error cases
-                    if e.response['Error']['Code'] != 'ValidationError':
-                        raise e
+            if self.is_bootstrap_stack(stack_name):
+                continue
 
-            if Utils.is_empty(pagination_token):
-                break
+            if self.is_cluster_stack(stack_name):
+                cluster_stacks.append(stack)
+            elif self.is_identity_provider_stack(stack_name):
+                identity_provider_stacks.append(stack)
+            else:
+                stacks_to_delete.append(stack)
 
         self.cloud_formation_stacks = stacks_to_delete
         self.cluster_stacks = cluster_stacks
         self.identity_provider_stacks = identity_provider_stacks
 
+    def find_bootstrap_stack(self):
+        try:
+            self.bootstrap_stack = self.describe_cloud_formation_stack(
+                self.get_bootstrap_stack_name()
+            )
+        except botocore.exceptions.ClientError as e:
+            if e.response['Error']['Code'] != 'ValidationError':
+                raise e
+            self.bootstrap_stack = None
+
     def print_cloud_formation_stacks(self):
         stacks_table = PrettyTable(['Stack Name', 'Status', 'Termination Protection'])
         stacks_table.align = 'l'
@@ -391,7 +549,26 @@ class DeleteCluster:
         stacks = Utils.get_value_as_list('Stacks', describe_stack_result)
         return stacks[0]
 
+    def confirm_stack_termination_protection(self, stacks: List[Dict]) -> bool:
+        for stack in stacks:
+            stack_name = Utils.get_value_as_string('StackName', stack)
+            enable_termination_protection = Utils.get_value_as_bool(
+                'EnableTerminationProtection', stack, False
+            )
+            if not enable_termination_protection:
+                continue
+            confirm = self.confirm(
+                f'Termination protection is enabled for stack: {stack_name}. Disable and terminate?'
+            )
+            if not confirm:
+                return False
+        return True
+
     def delete_cloud_formation_stack(self, stack_name: str):
+        """
+        delete the stack. termination protection, if enabled, is disabled without a prompt. termination protection
+        for all stacks is confirmed in confirm_stack_termination_protection() before the cluster deletion starts.
+        """
         try:
             stack = self.describe_cloud_formation_stack(stack_name)
         except botocore.exceptions.ClientError as e:
@@ -403,14 +580,6 @@ class DeleteCluster:
         enable_termination_protection = Utils.get_value_as_bool(
             'EnableTerminationProtection', stack, False
         )
-        if not self.force and enable_termination_protection:
-            confirm = self.context.prompt(
-                f'Termination protection is enabled for stack: {stack_name}. Disable and terminate?'
-            )
-            if not confirm:
-                self.context.error('Abort cluster deletion')
-                raise SystemExit
-
         if enable_termination_protection:
             print(f'disabling termination protection for stack: {stack_name}')
             self.context.aws().cloudformation().update_termination_protection(
@@ -464,6 +633,18 @@ class DeleteCluster:
             return True
         return False
 
+    def get_stack_module_name(self, stack_name: str) -> Optional[str]:
+        """
+        returns the name of the module deployed by the stack. None for stacks not deployed as a module, for eg. job stacks.
+        """
+        for module in self.cluster_modules:
+            if Utils.get_value_as_string('stack_name', module) == stack_name:
+                return Utils.get_value_as_string('name', module)
+        for module_name in ModuleMetadataHelper().module_meta:
+            if stack_name == f'{self.cluster_name}-{module_name}':
+                return module_name
+        return None
+
     def try_delete_vpc_lambda_enis(self):
         # fix to address scenario where deleting lambda function in VPC takes a very long time
         # and in-turn causes cluster deletion to either fail
@@ -497,74 +678,72 @@ class DeleteCluster:
                     NetworkInterfaceId=network_interface_id
                 )
 
-    def check_stack_deletion_status(self, stack_names: List[str]) -> bool:
-        delete_failed = 0
-        stacks_pending = list(stack_names)
-
-        while len(stacks_pending) > 0:
-            stacks_deleted = []
-            for stack_name in stacks_pending:
-                try:
-                    describe_stack_result = (
-                        self.context.aws()
-                        .cloudformation()
-                        .describe_stacks(StackName=stack_name)
-                    )
-                    stacks = Utils.get_value_as_list('Stacks', describe_stack_result)
-                    stack = stacks[0]
-                    stack_status = Utils.get_value_as_string('StackStatus', stack)
-
-                    if stack_status == 'DELETE_COMPLETE':
-                        self.context.success(
-                            f'stack: {stack_name}, status: {stack_status}'
-                        )
-                        stacks_deleted.append(stack_name)
-                    elif stack_status == 'DELETE_FAILED':
-                        if self.delete_failed_attempt < self.delete_failed_max_attempts:
-                            if self.is_analytics_stack(stack_name):
-                                self.try_delete_vpc_lambda_enis()
-                            self.context.warning(
-                                f'stack: {stack_name}, status: {stack_status}, submitting a new delete_cloud_formation_stack request. [Loop {self.delete_failed_attempt}/{self.delete_failed_max_attempts}]'
-                            )
-                            self.delete_cloud_formation_stack(stack_name)
-                            self.delete_failed_attempt += 1
-                        else:
-                            self.context.error(
-                                f'stack: {stack_name}, status: {stack_status}'
-                            )
-                            stacks_deleted.append(stack_name)
-                            delete_failed += 1
-                    else:
-                        print(f'stack: {stack_name}, status: {stack_status}')
-                        if self.is_analytics_stack(stack_name):
-                            self.try_delete_vpc_lambda_enis()
-
-                except botocore.exceptions.ClientError as e:
-                    if e.response['Error']['Code'] == 'ValidationError':
-                        self.context.success(
-                            f'stack: {stack_name}, status: DELETE_COMPLETE'
-                        )
-                        stacks_deleted.append(stack_name)
-                    else:
-                        raise e
+    def check_stack_deletion_status(self, stack_name: str) -> bool:
+        """
+        wait for the stack to be deleted. the stack status is polled more frequently right after a status change and
+        less frequently while the status remains unchanged.
 
-            for stack_name in stacks_deleted:
-                stacks_pending.remove(stack_name)
+        failed deletions are retried up to delete_failed_max_attempts times for each stack.
+        """
+        delete_failed_attempt = 0
+        poll_interval = STACK_STATUS_POLL_MIN_SECONDS
+        last_stack_status = None
 
-            if len(stacks_pending) > 0:
-                num_stacks_pending = len(stacks_pending)
-                if num_stacks_pending == 1:
-                    print(f'waiting for 1 stack to be deleted: {stacks_pending} ...')
+        while True:
+            try:
+                stack = self.describe_cloud_formation_stack(stack_name)
+            except botocore.exceptions.ClientError as e:
+                if e.response['Error']['Code'] == 'ValidationError':
+                    self.context.success(
+                        f'stack: {stack_name}, status: DELETE_COMPLETE'
+                    )
+                    return True
                 else:
-                    print(
-                        f'waiting for {num_stacks_pending} stacks to be deleted: {stacks_pending} ...'
+                    raise e
+
+            stack_status = Utils.get_value_as_string('StackStatus', stack)
+            if stack_status == 'DELETE_COMPLETE':
+                self.context.success(f'stack: {stack_name}, status: {stack_status}')
+                return True
+            elif stack_status == 'DELETE_FAILED':
+                if delete_failed_attempt < self.delete_failed_max_attempts:
+                    if self.is_analytics_stack(stack_name):
+                        self.try_delete_vpc_lambda_enis()
+                    self.context.warning(
+                        f'stack: {stack_name}, status: {stack_status}, submitting a new delete_cloud_formation_stack request. [Loop {delete_failed_attempt}/{self.delete_failed_max_attempts}]'
                     )
-                time.sleep(15)
+                    self.delete_cloud_formation_stack(stack_name)
+                    delete_failed_attempt += 1
+                    # the status of the stack changes to DELETE_IN_PROGRESS
+                    stack_status = None
+                else:
+                    self.context.error(f'stack: {stack_name}, status: {stack_status}')
+                    return False
+            else:
+                if stack_status != last_stack_status:
+                    print(f'stack: {stack_name}, status: {stack_status}')
+                if self.is_analytics_stack(stack_name):
+                    self.try_delete_vpc_lambda_enis()
+
+            if stack_status == last_stack_status:
+                poll_interval = min(
+                    STACK_STATUS_POLL_MAX_SECONDS, poll_interval * POLL_BACKOFF_FACTOR
+                )
+            else:
+                poll_interval = STACK_STATUS_POLL_MIN_SECONDS
+            last_stack_status = stack_status
+            time.sleep(poll_interval)
 
-        return delete_failed == 0
+    def delete_cloud_formation_stack_and_wait(self, stack_name: str):
+        self.delete_cloud_formation_stack(stack_name)
+        deletion_status = self.check_stack_deletion_status(stack_name)
+        if not deletion_status:
+            self.context.error(
+                f'failed to delete CloudFormation stack: {stack_name}. abort!'
+            )
+            raise SystemExit
 
-    def delete_identity_provider_stacks(self):
-        stack_names = []
+    def disable_user_pool_deletion_protection(self):
         user_pool_ids_to_unprotect = []
 
         describe_user_pool_paginator = (
@@ -577,102 +756,64 @@ class DeleteCluster:
         # idea:ClusterName tag for us to consider it as valid.
         for page in user_pool_iter:
             user_pools = Utils.get_value_as_list('UserPools', page, default=[])
+            for pool in user_pools:
+                pool_name = Utils.get_value_as_string('Name', pool, default='')
+                pool_id = Utils.get_value_as_string('Id', pool, default=None)
+                if (
+                    pool_name == f'{self.cluster_name}-user-pool'
+                    and pool_id is not None
+                ):
+                    user_pool_ids_to_unprotect.append(pool_id)
+
+        # Unprotect the discovered user pools if they have matching cluster Tags
+        def disable_deletion_protection(pool_id: str):
+            _remove_pool_protection = False
+            describe_user_pool_result = (
+                self.context.aws().cognito_idp().describe_user_pool(UserPoolId=pool_id)
+            )
+            delete_protection = Utils.get_value_as_string(
+                'DeletionProtection', describe_user_pool_result, default='ACTIVE'
+            )
 
-            confirm_delete_pools = self.force
-            if not self.force:
-                confirm_delete_pools = self.context.prompt(
-                    f'Are you sure you want to delete the User Pools associated with the cluster: '
-                    f'{self.cluster_name}? This action is not reversible.'
-                )
-
-            if not confirm_delete_pools:
-                self.context.error(
-                    'Aborting Delete Operation - User Pools remain intact!'
+            if delete_protection.upper() == 'ACTIVE':
+                pool_tags = Utils.get_value_as_dict(
+                    'UserPoolTags',
+                    Utils.get_value_as_dict(
+                        'UserPool', describe_user_pool_result, default={}
+                    ),
+                    default={},
                 )
-                raise SystemExit
-
-            if user_pools:
-                for pool in user_pools:
-                    pool_name = Utils.get_value_as_string('Name', pool, default='')
-                    pool_id = Utils.get_value_as_string('Id', pool, default=None)
+                # Support previous deployments that didn't have UserPoolTags
+                # It is OK to do this since we validated that the user pool Name still matched the expected name.
+                # Note that the Name and the Name Tag can be different in this case.
+                if not pool_tags:
+                    self.context.info(
+                        f'Cognito User Pool {pool_id} - Deletion Protection is {delete_protection} - No tags found - proceeding to remove'
+                    )
+                    _remove_pool_protection = True
+                for tag_name, tag_value in pool_tags.items():
                     if (
-                        pool_name == f'{self.cluster_name}-user-pool'
-                        and pool_id is not None
+                        tag_name == constants.IDEA_TAG_CLUSTER_NAME
+                        and tag_value == self.cluster_name
                     ):
-                        user_pool_ids_to_unprotect.append(pool_id)
-
-            # Unprotect the discovered user pools if they have matching cluster Tags
-            for pool_id in user_pool_ids_to_unprotect:
-                _remove_pool_protection = False
-                describe_user_pool_result = (
-                    self.context.aws()
-                    .cognito_idp()
-                    .describe_user_pool(UserPoolId=pool_id)
-                )
-                delete_protection = Utils.get_value_as_string(
-                    'DeletionProtection', describe_user_pool_result, default='ACTIVE'
-                )
-
-                if delete_protection.upper() == 'ACTIVE':
-                    pool_tags = Utils.get_value_as_dict(
-                        'UserPoolTags',
-                        Utils.get_value_as_dict(
-                            'UserPool', describe_user_pool_result, default={}
-                        ),
-                        default={},
-                    )
-                    # Support previous deployments that didn't have UserPoolTags
-                    # It is OK to do this since we validated that the user pool Name still matched the expected name.
-                    # Note that the Name and the Name Tag can be different in this case.
-                    if not pool_tags:
                         self.context.info(
-                            f'Cognito User Pool {pool_id} - Deletion Protection is {delete_protection} - No tags found - proceeding to remove'
+                            f'Cognito User Pool {pool_id} - Deletion Protection is {delete_protection} - Removing'
                         )
                         _remove_pool_protection = True
-                    for tag_name, tag_value in pool_tags.items():
-                        if (
-                            tag_name == constants.IDEA_TAG_CLUSTER_NAME
-                            and tag_value == self.cluster_name
-                        ):
-                            self.context.info(
-                                f'Cognito User Pool {pool_id} - Deletion Protection is {delete_protection} - Removing'
-                            )
-                            _remove_pool_protection = True
 
-                    if _remove_pool_protection:
-                        self.context.aws().cognito_idp().update_user_pool(
-                            UserPoolId=pool_id, DeletionProtection='INACTIVE'
-                        )
-                        time.sleep(0.5)
-
-                elif delete_protection.upper() == 'INACTIVE':
-                    self.context.info(
-                        f'Cognito User Pool {pool_id} - Deletion Protection is INACTIVE - No need to remove protection.'
+                if _remove_pool_protection:
+                    self.context.aws().cognito_idp().update_user_pool(
+                        UserPoolId=pool_id, DeletionProtection='INACTIVE'
                     )
 
-        # For non-Cognito deployments - we should just land here to cleanup the stacks
-        # If there are any other cleanups needed - add them here
-        for stack in self.identity_provider_stacks:
-            stack_name = Utils.get_value_as_string('StackName', stack)
-            stack_names.append(stack_name)
-            self.delete_cloud_formation_stack(stack_name)
-
-        deletion_status = self.check_stack_deletion_status(stack_names)
-        if not deletion_status:
-            self.context.error('failed to delete CloudFormation stacks. abort!')
-            raise SystemExit
-
-    def delete_cloud_formation_stacks(self):
-        stack_names = []
-        for stack in self.cloud_formation_stacks:
-            stack_name = Utils.get_value_as_string('StackName', stack)
-            stack_names.append(stack_name)
-            self.delete_cloud_formation_stack(stack_name)
+            elif delete_protection.upper() == 'INACTIVE':
+                self.context.info(
+                    f'Cognito User Pool {pool_id} - Deletion Protection is INACTIVE - No need to remove protection.'
+                )
 
-        deletion_status = self.check_stack_deletion_status(stack_names)
-        if not deletion_status:
-            self.context.error('failed to delete CloudFormation stacks. abort!')
-            raise SystemExit
+        self.for_each(
+            'cognito-idp', user_pool_ids_to_unprotect, disable_deletion_protection
+        )
 
     def find_dynamodb_tables(self):
         last_evaluated_table_name = None
@@ -708,11 +849,7 @@ class DeleteCluster:
         print(f'{len(tables)} tables will be deleted.')
 
     def delete_dynamodb_tables(self):
-        for table in self.dynamodb_tables:
-            self.delete_dynamo_table(table)
-
-        # Cleanup Cloudwatch Alarms for all tables
-        self.delete_cloudwatch_alarms()
+        self.for_each('dynamodb', self.dynamodb_tables, self.delete_dynamo_table)
 
     def delete_cloudwatch_alarms(self):
         alarms_to_delete = []
@@ -841,54 +978,58 @@ class DeleteCluster:
         )
 
     def delete_cloudwatch_log_groups(self):
-        for log_group in self.cloudwatch_logs:
+        # log groups are searched again, as log groups can be created by lambda functions until their stacks are deleted
+        self.cloudwatch_logs = []
+        self.find_cloudwatch_logs()
+
+        def delete_log_group(log_group: Dict):
+            log_group_name = log_group.get('name')
             try:
-                log_group_name = log_group.get('name')
                 print(f'deleting cloudwatch log group: {log_group_name} ...')
                 self.context.aws().logs().delete_log_group(logGroupName=log_group_name)
                 self.context.success(f'deleted log group: {log_group_name}')
-                time.sleep(0.1)
-            except botocore.exceptions.BotoCoreError as e:
-                raise e
+            except botocore.exceptions.ClientError as e:
+                if e.response['Error']['Code'] != 'ResourceNotFoundException':
+                    raise e
+
+        self.for_each('logs', self.cloudwatch_logs, delete_log_group)
 
     def delete_bootstrap_and_s3_bucket(self):
         stack_name = self.get_bootstrap_stack_name()
         self.delete_cloud_formation_stack(stack_name)
         self.delete_s3_bucket()
 
-    def delete_cluster_stack(self):
-        stack_names = []
-        for cluster_stack in self.cluster_stacks:
-            stack_name = Utils.get_value_as_string('StackName', cluster_stack)
-            stack_names.append(stack_name)
-            self.delete_cloud_formation_stack(stack_name)
+    def find_cluster_s3_bucket_name(self):
+        """
+        the bucket name is read from the cluster settings table, which is deleted in parallel with the bootstrap stack
+        and S3 bucket. the bucket name must be found before the tables are deleted.
+        """
+        bucket_name = None
+        if self.cluster_config_db is not None:
+            config_entry = self.cluster_config_db.get_config_entry(
+                'cluster.cluster_s3_bucket'
+            )
 
-        deletion_status = self.check_stack_deletion_status(stack_names)
-        if not deletion_status:
-            self.context.error('failed to delete cluster stack. abort!')
-            raise SystemExit
+            if Utils.is_not_empty(config_entry):
+                bucket_name = config_entry['value']
+
+        if Utils.is_empty(bucket_name):
+            account_id = self.context.aws().aws_account_id()
+            bucket_name = (
+                str(self.cluster_name)
+                + '-cluster-'
+                + self.aws_region
+                + '-'
+                + account_id
+            )
+
+        self.cluster_s3_bucket_name = bucket_name
 
     def delete_s3_bucket(self):
         try:
-            # get s3 bucket name
-            bucket_name = None
-            if self.cluster_config_db is not None:
-                config_entry = self.cluster_config_db.get_config_entry(
-                    'cluster.cluster_s3_bucket'
-                )
-
-                if Utils.is_not_empty(config_entry):
-                    bucket_name = config_entry['value']
-
-            if Utils.is_empty(bucket_name):
-                account_id = self.context.aws().aws_account_id()
-                bucket_name = (
-                    str(self.cluster_name)
-                    + '-cluster-'
-                    + self.aws_region
-                    + '-'
-                    + account_id
-                )
+            if Utils.is_empty(self.cluster_s3_bucket_name):
+                self.find_cluster_s3_bucket_name()
+            bucket_name = self.cluster_s3_bucket_name
 
             s3_bucket = self.context.aws().s3_bucket()
             bucket = s3_bucket.Bucket(bucket_name)
@@ -900,94 +1041,317 @@ class DeleteCluster:
 
             print(f'deleting S3 bucket: {bucket_name} for cluster ...')
 
-            # create s3 bucket resource and delete all versions in the bucket
-            # This includes current versions - no explicit object list needed
-            bucket.object_versions.all().delete()
-            time.sleep(5)
-
-            # delete the bucket itself
-            self.context.aws().s3().delete_bucket(Bucket=bucket_name)
+            # delete all versions in the bucket (in batches of 1000 objects), including current versions.
+            # objects written after the listing (for eg. by log delivery) cause BucketNotEmpty errors. retry with backoff.
+            delay = 1
+            for attempt in range(1, DELETE_BUCKET_MAX_ATTEMPTS + 1):
+                bucket.object_versions.all().delete()
+                try:
+                    self.context.aws().s3().delete_bucket(Bucket=bucket_name)
+                    break
+                except botocore.exceptions.ClientError as e:
+                    if e.response['Error']['Code'] != 'BucketNotEmpty':
+                        raise e
+                    if attempt == DELETE_BUCKET_MAX_ATTEMPTS:
+                        raise e
+                    self.context.warning(
+                        f'bucket {bucket_name} is not empty. retrying in {delay} seconds ...'
+                    )
+                    time.sleep(delay)
+                    delay *= 2
 
             self.context.success(f'bucket {bucket_name} deleted successfully')
 
         except botocore.exceptions.BotoCoreError as e:
             raise e
 
-    def delete_backup_vault_recovery_points(self):
-        """
-        delete all recovery points for the backup vault configured for the cluster.
-        the implementation assumes the backup vault will be named as: CLUSTER_NAME-cluster-backup-vault.
-        """
+    def get_backup_vault_name(self) -> str:
         # backup vault must be of below name format
-        backup_vault_name = f'{self.cluster_name}-cluster-backup-vault'
+        return f'{self.cluster_name}-cluster-backup-vault'
+
+    def find_backup_recovery_points(self) -> List[Dict]:
+        backup_vault_name = self.get_backup_vault_name()
         try:
             # basic check to find if backup vault exists
             self.context.aws().backup().describe_backup_vault(
                 BackupVaultName=backup_vault_name
             )
+        except botocore.exceptions.ClientError as e:
+            if e.response['Error']['Code'] in (
+                'ResourceNotFoundException',
+                'AccessDeniedException',
+            ):
+                # possibly backups are not enabled for the cluster. skip
+                return []
+            raise e
+
+        all_recovery_points_list = []
+        bu_paginator = (
+            self.context.aws()
+            .backup()
+            .get_paginator('list_recovery_points_by_backup_vault')
+        )
+        bu_iterator = bu_paginator.paginate(BackupVaultName=backup_vault_name)
 
-            total_deleted = 0
-            all_recovery_points_list = []
+        for _page in bu_iterator:
+            recovery_points = Utils.get_value_as_list('RecoveryPoints', _page, [])
+            if recovery_points:
+                all_recovery_points_list += recovery_points
+        return all_recovery_points_list
 
-            bu_paginator = (
-                self.context.aws()
-                .backup()
-                .get_paginator('list_recovery_points_by_backup_vault')
+    def delete_backup_vault_recovery_points(
+        self, recovery_points: Optional[List[Dict]] = None
+    ):
+        """
+        delete all recovery points for the backup vault configured for the cluster.
+        the implementation assumes the backup vault will be named as: CLUSTER_NAME-cluster-backup-vault.
+        """
+        backup_vault_name = self.get_backup_vault_name()
+        if recovery_points is None:
+            recovery_points = self.find_backup_recovery_points()
+
+        if len(recovery_points) <= 0:
+            self.context.info(
+                f'No recovery points found for backup vault: {backup_vault_name}'
             )
-            bu_iterator = bu_paginator.paginate(BackupVaultName=backup_vault_name)
+            return
 
-            for _page in bu_iterator:
-                recovery_points = Utils.get_value_as_list('RecoveryPoints', _page, [])
-                if recovery_points:
-                    all_recovery_points_list += recovery_points
+        # Now that we have assembled the entire list - process them
+        _rp_delete_start = Utils.current_time_ms()
+        self.context.info(
+            f'Deleting {len(recovery_points)} recovery points from AWS Backup...'
+        )
 
-            if len(all_recovery_points_list) <= 0:
-                self.context.info(
-                    f'No recovery points found for backup vault: {backup_vault_name}'
-                )
-                return
+        def delete_recovery_point(recovery_point: Dict) -> bool:
+            recovery_point_arn = Utils.get_value_as_string(
+                'RecoveryPointArn', recovery_point
+            )
 
-            # Now that we have assembled the entire list - process them
-            _rp_delete_start = Utils.current_time_ms()
-            self.context.info(
-                f'Deleting {len(all_recovery_points_list)} recovery points from AWS Backup...'
+            # can be one of: 'COMPLETED'|'PARTIAL'|'DELETING'|'EXPIRED'
+            # if status is not COMPLETED/EXPIRED, do not attempt to delete, but wait for deletion or backup completion.
+            recovery_point_status = Utils.get_value_as_string(
+                'Status', recovery_point, default='UNKNOWN'
             )
-            for recovery_point in all_recovery_points_list:
-                recovery_point_arn = Utils.get_value_as_string(
-                    'RecoveryPointArn', recovery_point
+            if recovery_point_status.upper() not in ('COMPLETED', 'EXPIRED'):
+                self.context.warning(
+                    f'Unable to delete recovery point {recovery_point_arn} . Status: {recovery_point_status}. This may cause failures to delete the stack.'
                 )
+                return False
+
+            self.context.info(f'deleting recovery point: {recovery_point_arn} ...')
+            self.context.aws().backup().delete_recovery_point(
+                BackupVaultName=backup_vault_name,
+                RecoveryPointArn=recovery_point_arn,
+            )
+            return True
+
+        total_deleted = sum(
+            self.for_each('backup', recovery_points, delete_recovery_point)
+        )
+
+        _rp_delete_end = Utils.current_time_ms()
+        _run_time_sec = int((_rp_delete_end - _rp_delete_start) / 1_000)
+        self.context.info(
+            f'deleted {total_deleted} recovery points in {_run_time_sec} seconds.'
+        )
 
-                # can be one of: 'COMPLETED'|'PARTIAL'|'DELETING'|'EXPIRED'
-                # if status is not COMPLETED/EXPIRED, do not attempt to delete, but wait for deletion or backup completion.
-                recovery_point_status = Utils.get_value_as_string(
-                    'Status', recovery_point, default='UNKNOWN'
+    def build_plan(self) -> DeleteClusterPlan:
+        """
+        build the cluster deletion plan from the resources found and the confirmations.
+
+        identity provider stacks are deleted after the stacks of modules depending on the identity provider module (see
+        ModuleMetadata). the cluster stack is deleted after all other stacks. the bootstrap stack, S3 bucket, tables and
+        log groups are deleted after the cluster stack. the S3 bucket name is found before the plan is executed.
+        """
+        plan = DeleteClusterPlan()
+        ec2_concurrency = self.get_api_concurrency('ec2')
+
+        clean_up = plan.add(
+            DeleteClusterTask(
+                name='app-module-clean-up',
+                run=self.invoke_app_app_module_clean_up,
+                resources=len(self.app_modules),
+                api_calls=len(self.app_modules) + 2,
+                phase=PHASE_APP_MODULE_CLEAN_UP,
+            )
+        )
+        termination_protection = plan.add(
+            DeleteClusterTask(
+                name='ec2-termination-protection',
+                run=self.disable_ec2_termination_protection,
+                resources=len(self.termination_protected_ec2_instances),
+                api_calls=len(self.termination_protected_ec2_instances),
+                concurrency=ec2_concurrency,
+                phase=PHASE_EC2_TERMINATION_PROTECTION,
+                serial_sleep_seconds=len(self.termination_protected_ec2_instances),
+            )
+        )
+        ec2_instances = plan.add(
+            DeleteClusterTask(
+                name='ec2-instances',
+                run=self.delete_ec2_instances,
+                prerequisites=[termination_protection.name],
+                resources=len(self.ec2_instances),
+                api_calls=len(self.get_terminate_instance_batches()),
+                concurrency=ec2_concurrency,
+                phase=PHASE_EC2_INSTANCES,
+                serial_api_calls=len(self.ec2_instances),
+                serial_sleep_seconds=len(self.ec2_instances),
+            )
+        )
+        user_pool_protection = plan.add(
+            DeleteClusterTask(
+                name='user-pool-protection',
+                run=self.disable_user_pool_deletion_protection,
+                api_calls=1,
+                phase=PHASE_USER_POOL_PROTECTION,
+            )
+        )
+
+        # module stacks and job stacks are deleted in parallel. identity provider stacks are deleted after the stacks
+        # of all modules using the user pool.
+        module_metadata_helper = ModuleMetadataHelper()
+        stack_tasks = []
+        stacks_using_identity_provider = []
+        for stack in self.cloud_formation_stacks:
+            stack_name = Utils.get_value_as_string('StackName', stack)
+            task = plan.add(
+                self.build_stack_task(
+                    stack_name,
+                    [clean_up.name, ec2_instances.name],
+                    PHASE_CLOUD_FORMATION_STACKS,
                 )
-                if recovery_point_status.upper() not in ('COMPLETED', 'EXPIRED'):
-                    self.context.warning(
-                        f'Unable to delete recovery point {recovery_point_arn} . Status: {recovery_point_status}. This may cause failures to delete the stack.'
+            )
+            stack_tasks.append(task)
+            module_name = self.get_stack_module_name(stack_name)
+            if module_name is None:
+                continue
+            if (
+                constants.MODULE_IDENTITY_PROVIDER
+                in module_metadata_helper.get_module_prerequisites(module_name)
+            ):
+                stacks_using_identity_provider.append(task.name)
+
+        for stack in self.identity_provider_stacks:
+            stack_name = Utils.get_value_as_string('StackName', stack)
+            prerequisites = [
+                clean_up.name,
+                ec2_instances.name,
+                user_pool_protection.name,
+            ] + stacks_using_identity_provider
+            stack_tasks.append(
+                plan.add(
+                    self.build_stack_task(
+                        stack_name, prerequisites, PHASE_IDENTITY_PROVIDER_STACKS
                     )
-                    continue
+                )
+            )
 
-                self.context.info(f'deleting recovery point: {recovery_point_arn} ...')
-                self.context.aws().backup().delete_recovery_point(
-                    BackupVaultName=backup_vault_name,
-                    RecoveryPointArn=recovery_point_arn,
+        cluster_stack_prerequisites = [clean_up.name, ec2_instances.name] + [
+            task.name for task in stack_tasks
+        ]
+        if self.confirm_delete_backups:
+            recovery_points = self.backup_recovery_points
+            backups = plan.add(
+                DeleteClusterTask(
+                    name='backup-recovery-points',
+                    run=lambda: self.delete_backup_vault_recovery_points(
+                        recovery_points
+                    ),
+                    resources=len(recovery_points),
+                    api_calls=len(recovery_points),
+                    concurrency=self.get_api_concurrency('backup'),
+                    phase=PHASE_BACKUP_RECOVERY_POINTS,
+                    serial_sleep_seconds=len(recovery_points) * 0.1,
                 )
-                total_deleted += 1
-                time.sleep(0.1)
+            )
+            cluster_stack_prerequisites.append(backups.name)
 
-            _rp_delete_end = Utils.current_time_ms()
-            _run_time_sec = int((_rp_delete_end - _rp_delete_start) / 1_000)
-            self.context.info(
-                f'deleted {total_deleted} recovery points in {_run_time_sec} seconds.'
+        cluster_stack_tasks = []
+        for stack in self.cluster_stacks:
+            stack_name = Utils.get_value_as_string('StackName', stack)
+            cluster_stack_tasks.append(
+                plan.add(
+                    self.build_stack_task(
+                        stack_name, cluster_stack_prerequisites, PHASE_CLUSTER_STACKS
+                    )
+                )
+            )
+        cluster_deleted = [task.name for task in cluster_stack_tasks]
+        if len(cluster_deleted) == 0:
+            cluster_deleted = cluster_stack_prerequisites
+
+        log_group_prerequisites = list(cluster_deleted)
+        if self.confirm_delete_bootstrap:
+            bootstrap = plan.add(
+                DeleteClusterTask(
+                    name='bootstrap-stack-and-s3-bucket',
+                    run=self.delete_bootstrap_and_s3_bucket,
+                    prerequisites=cluster_deleted,
+                    resources=2,
+                    api_calls=5,
+                    phase=PHASE_BOOTSTRAP,
+                    serial_sleep_seconds=5,
+                )
+            )
+            log_group_prerequisites.append(bootstrap.name)
+
+        if self.confirm_delete_databases:
+            tables = plan.add(
+                DeleteClusterTask(
+                    name='dynamodb-tables',
+                    run=self.delete_dynamodb_tables,
+                    prerequisites=cluster_deleted,
+                    resources=len(self.dynamodb_tables),
+                    api_calls=len(self.dynamodb_tables),
+                    concurrency=self.get_api_concurrency('dynamodb'),
+                    phase=PHASE_DYNAMODB_TABLES,
+                )
+            )
+            plan.add(
+                DeleteClusterTask(
+                    name='cloudwatch-alarms',
+                    run=self.delete_cloudwatch_alarms,
+                    prerequisites=[tables.name],
+                    api_calls=2,
+                    phase=PHASE_CLOUDWATCH_ALARMS,
+                )
             )
 
-        except botocore.exceptions.ClientError as e:
-            if e.response['Error']['Code'] != 'ResourceNotFoundException':
-                # possibly backups are not enabled for the cluster. skip
-                pass
-            else:
-                raise e
+        if self.confirm_delete_cloudwatch_logs:
+            plan.add(
+                DeleteClusterTask(
+                    name='cloudwatch-log-groups',
+                    run=self.delete_cloudwatch_log_groups,
+                    prerequisites=log_group_prerequisites,
+                    resources=len(self.cloudwatch_logs),
+                    api_calls=len(self.cloudwatch_logs) + 3,
+                    concurrency=self.get_api_concurrency('logs'),
+                    phase=PHASE_CLOUDWATCH_LOGS,
+                    serial_sleep_seconds=len(self.cloudwatch_logs) * 0.1,
+                )
+            )
+
+        return plan
+
+    def build_stack_task(
+        self, stack_name: str, prerequisites: List[str], phase: int
+    ) -> DeleteClusterTask:
+        return DeleteClusterTask(
+            name=f'stack/{stack_name}',
+            run=lambda: self.delete_cloud_formation_stack_and_wait(stack_name),
+            prerequisites=prerequisites,
+            resources=1,
+            api_calls=3
+            + math.ceil(
+                STACK_DELETION_ESTIMATE_SECONDS / STACK_STATUS_POLL_MAX_SECONDS
+            ),
+            concurrency=self.get_api_concurrency('cloudformation'),
+            wait_seconds=STACK_DELETION_ESTIMATE_SECONDS,
+            phase=phase,
+            # describe_stacks() during discovery was followed by a 0.5 second sleep
+            serial_sleep_seconds=0.5,
+        )
 
     def invoke(self):
         # Finding ec2 instances
@@ -1001,84 +1365,82 @@ class DeleteCluster:
         self.find_cloud_formation_stacks()
         self.print_cloud_formation_stacks()
 
-        if not self.force:
-            confirm = self.context.prompt(
-                f'Are you sure you want to delete cluster: {self.cluster_name}, region: {self.aws_region} ?'
-            )
-            if not confirm:
-                return
-
-        self.invoke_app_app_module_clean_up()
+        if not self.confirm(
+            f'Are you sure you want to delete cluster: {self.cluster_name}, region: {self.aws_region} ?'
+        ):
+            return
 
         if Utils.is_not_empty(self.termination_protected_ec2_instances):
             self.print_ec2_instances(self.termination_protected_ec2_instances)
             print(
                 f'found {len(self.termination_protected_ec2_instances)} EC2 instances with termination protection enabled.'
             )
-            if not self.force:
-                confirm = self.context.prompt(
-                    'Are you sure you want to disable termination protection for above instances ?'
-                )
-                if not confirm:
-                    return
-
-        self.delete_ec2_instances()
-        self.delete_cloud_formation_stacks()
+            if not self.confirm(
+                'Are you sure you want to disable termination protection for above instances ?'
+            ):
+                return
 
-        # Delete identity-provider stack - removing UserPool protection
-        self.delete_identity_provider_stacks()
+        if not self.confirm(
+            f'Are you sure you want to delete the User Pools associated with the cluster: '
+            f'{self.cluster_name}? This action is not reversible.'
+        ):
+            self.context.error('Aborting Delete Operation - User Pools remain intact!')
+            raise SystemExit
 
         # delete backups if applicable
         if self.delete_backups or self.delete_all:
-            confirm_delete_backups = self.force
-            if not self.force:
-                confirm_delete_backups = self.context.prompt(
-                    f'Are you sure you want to delete all the backup recovery points associated with the cluster: '
-                    f'{self.cluster_name}?'
-                )
-
-            if confirm_delete_backups:
-                self.delete_backup_vault_recovery_points()
-
-        self.delete_cluster_stack()
+            self.confirm_delete_backups = self.confirm(
+                f'Are you sure you want to delete all the backup recovery points associated with the cluster: '
+                f'{self.cluster_name}?'
+            )
+            if self.confirm_delete_backups:
+                self.backup_recovery_points = self.find_backup_recovery_points()
 
+        stacks = (
+            self.cloud_formation_stacks
+            + self.identity_provider_stacks
+            + self.cluster_stacks
+        )
         if self.delete_bootstrap or self.delete_all:
-            confirm_delete_bootstrap = self.force
-            if not self.force:
-                confirm_delete_bootstrap = self.context.prompt(
-                    f'Are you sure you want to delete the bootstrap stack and S3 Bucket associated with the cluster: '
-                    f'{self.cluster_name}? This action is not reversible.'
-                )
-
-            if confirm_delete_bootstrap:
-                self.delete_bootstrap_and_s3_bucket()
+            self.confirm_delete_bootstrap = self.confirm(
+                f'Are you sure you want to delete the bootstrap stack and S3 Bucket associated with the cluster: '
+                f'{self.cluster_name}? This action is not reversible.'
+            )
+            if self.confirm_delete_bootstrap:
+                self.find_bootstrap_stack()
+                self.find_cluster_s3_bucket_name()
+                if self.bootstrap_stack is not None:
+                    stacks = stacks + [self.bootstrap_stack]
+
+        if not self.confirm_stack_termination_protection(stacks):
+            self.context.error('Abort cluster deletion')
+            raise SystemExit
 
         if self.delete_databases or self.delete_all:
             self.find_dynamodb_tables()
             if Utils.is_not_empty(self.dynamodb_tables):
                 self.print_dynamodb_tables()
-
-                confirm_delete_databases = self.force
-                if not self.force:
-                    confirm_delete_databases = self.context.prompt(
-                        f'Are you sure you want to delete all dynamodb tables associated with the cluster: '
-                        f'{self.cluster_name}?'
-                    )
-
-                if confirm_delete_databases:
-                    self.delete_dynamodb_tables()
+                self.confirm_delete_databases = self.confirm(
+                    f'Are you sure you want to delete all dynamodb tables associated with the cluster: '
+                    f'{self.cluster_name}?'
+                )
 
         if self.delete_cloudwatch_logs or self.delete_all:
             self.find_cloudwatch_logs()
             if Utils.is_not_empty(self.cloudwatch_logs):
                 self.print_cloudwatch_logs()
+                self.confirm_delete_cloudwatch_logs = self.confirm(
+                    f'Are you sure you want to delete all cloudwatch logs associated with the cluster: '
+                    f'{self.cluster_name}?'
+                )
 
-                confirm_delete_cloudwatch_logs = self.force
-                if not self.force:
-                    confirm_delete_cloudwatch_logs = self.context.prompt(
-                        f'Are you sure you want to delete all cloudwatch logs associated with the cluster: '
-                        f'{self.cluster_name}?'
-                    )
+        plan = self.build_plan()
+        if self.dry_run:
+            self.context.info(
+                f'Dry run - cluster deletion plan for cluster: {self.cluster_name}, region: {self.aws_region}'
+            )
+            plan.print_report()
+            return
 
-                if confirm_delete_cloudwatch_logs:
-                    self.delete_cloudwatch_log_groups()
+        plan.execute()
+        self.context.success(f'cluster deleted: {self.cluster_name}')
@@ -0,0 +1,187 @@
+#  Copyright Amazon.com, Inc. or its affiliates. All Rights Reserved.
+#
+#  Licensed under the Apache License, Version 2.0 (the "License"). You may not use this file except in compliance
+#  with the License. A copy of the License is located at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+#  or in the 'license' file accompanying this file. This file is distributed on an 'AS IS' BASIS, WITHOUT WARRANTIES
+#  OR CONDITIONS OF ANY KIND, express or implied. See the License for the specific language governing permissions
+#  and limitations under the License.
+
+from ideadatamodel import exceptions
+from ideaadministrator.app.task_graph_executor import TaskGraphExecutor
+
+from typing import Any, Callable, Dict, List, Optional, Tuple
+from collections import OrderedDict
+from prettytable import PrettyTable
+import math
+import time
+
+# estimates used for the dry run timing report
+API_CALL_LATENCY_ESTIMATE_SECONDS = 0.2
+STACK_DELETION_ESTIMATE_SECONDS = 300
+
+
+class DeleteClusterTask:
+    """
+    a step of the cluster teardown, for eg. delete a CloudFormation stack or delete all log groups of the cluster.
+
+    resources, api_calls and phase are used for the dry run timing report:
+    * estimate_seconds - the estimated duration of the task, with API calls executed concurrently.
+    * serial_seconds - the estimated duration of the task with API calls executed one after another and without
+        batching (serial_api_calls), including the fixed delays previously used between API calls.
+    * phase - the step of the previous sequential teardown the task belongs to. tasks in the same phase were
+        executed in parallel.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        run: Callable[[], Any],
+        prerequisites: Optional[List[str]] = None,
+        resources: int = 0,
+        api_calls: int = 0,
+        concurrency: int = 1,
+        wait_seconds: float = 0,
+        phase: int = 0,
+        serial_api_calls: Optional[int] = None,
+        serial_sleep_seconds: float = 0,
+    ):
+        self.name = name
+        self.run = run
+        self.prerequisites = prerequisites or []
+        self.resources = resources
+        self.api_calls = api_calls
+        self.concurrency = max(1, concurrency)
+        self.wait_seconds = wait_seconds
+        self.phase = phase
+        if serial_api_calls is None:
+            serial_api_calls = api_calls
+        self.serial_api_calls = serial_api_calls
+        self.serial_sleep_seconds = serial_sleep_seconds
+
+        self.started_at: Optional[float] = None
+        self.completed_at: Optional[float] = None
+
+    @property
+    def estimate_seconds(self) -> float:
+        api_seconds = (
+            math.ceil(self.api_calls / self.concurrency)
+            * API_CALL_LATENCY_ESTIMATE_SECONDS
+        )
+        return self.wait_seconds + api_seconds
+
+    @property
+    def serial_seconds(self) -> float:
+        api_seconds = self.serial_api_calls * API_CALL_LATENCY_ESTIMATE_SECONDS
+        return self.wait_seconds + api_seconds + self.serial_sleep_seconds
+
+
+class DeleteClusterPlan:
+    """
+    cluster teardown planned as a dependency graph of tasks.
+
+    each task is started as soon as all of its prerequisites are completed. if a task fails, no new tasks are
+    started, in-progress tasks are allowed to complete, and the error of the first failed task is raised.
+    """
+
+    def __init__(self, max_workers: int = 16):
+        self.max_workers = max_workers
+        self.tasks: Dict[str, DeleteClusterTask] = OrderedDict()
+
+    def add(self, task: DeleteClusterTask) -> DeleteClusterTask:
+        if task.name in self.tasks:
+            raise exceptions.invalid_params(f'duplicate task: {task.name}')
+        for prerequisite in task.prerequisites:
+            if prerequisite not in self.tasks:
+                raise exceptions.invalid_params(
+                    f'task: {task.name} - prerequisite task not found: {prerequisite}'
+                )
+        self.tasks[task.name] = task
+        return task
+
+    def get_schedule(self) -> Dict[str, Tuple[float, float]]:
+        """
+        estimated start and finish time of each task. tasks are added after their prerequisites, so the tasks are
+        already in topological order.
+        """
+        schedule = OrderedDict()
+        for name, task in self.tasks.items():
+            start = 0.0
+            for prerequisite in task.prerequisites:
+                start = max(start, schedule[prerequisite][1])
+            schedule[name] = (start, start + task.estimate_seconds)
+        return schedule
+
+    def get_serial_estimate(self) -> float:
+        """
+        estimated duration of the previous teardown, where each phase was started after the previous phase completed.
+        """
+        phases = {}
+        for task in self.tasks.values():
+            phases[task.phase] = max(phases.get(task.phase, 0), task.serial_seconds)
+        return sum(phases.values())
+
+    def print_report(self):
+        """
+        print the dry run timing report
+        """
+        report = PrettyTable(
+            [
+                'Task',
+                'Prerequisites',
+                'Resources',
+                'API Calls',
+                'Est. Start (s)',
+                'Est. Duration (s)',
+            ]
+        )
+        report.align = 'l'
+        schedule = self.get_schedule()
+        for name, task in self.tasks.items():
+            start, finish = schedule[name]
+            report.add_row(
+                [
+                    name,
+                    '\n'.join(task.prerequisites),
+                    task.resources,
+                    task.api_calls,
+                    f'{start:.0f}',
+                    f'{finish - start:.0f}',
+                ]
+            )
+        print(report)
+
+        planned = max([finish for _, finish in schedule.values()], default=0)
+        serial = self.get_serial_estimate()
+        removed_sleeps = sum(task.serial_sleep_seconds for task in self.tasks.values())
+        print(
+            f'estimated teardown duration: {planned:.0f}s. sequential teardown: {serial:.0f}s, '
+            f'including {removed_sleeps:.0f}s of fixed delays. '
+            f'(estimates assume {API_CALL_LATENCY_ESTIMATE_SECONDS}s per API call and '
+            f'{STACK_DELETION_ESTIMATE_SECONDS}s per CloudFormation stack deletion)'
+        )
+
+    def execute(self):
+        def run(name: str):
+            task = self.tasks[name]
+            task.started_at = time.perf_counter()
+            try:
+                return task.run()
+            finally:
+                task.completed_at = time.perf_counter()
+
+        result = TaskGraphExecutor(
+            max_workers=self.max_workers, thread_name_prefix='delete-cluster'
+        ).execute(
+            graph=OrderedDict(
+                (name, task.prerequisites) for name, task in self.tasks.items()
+            ),
+            run=run,
+        )
+
+        if not result.success:
+            if len(result.skipped) > 0:
+                print(f'skipped tasks: {result.skipped}')
+            raise next(iter(result.failed.values()))
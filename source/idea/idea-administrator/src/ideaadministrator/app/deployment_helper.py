@@ -12,13 +12,12 @@
 from ideadatamodel import constants, exceptions
 from ideasdk.config.cluster_config_db import ClusterConfigDB
 from ideaadministrator.app.cdk.cdk_invoker import CdkInvoker
+from ideaadministrator.app.task_graph_executor import TaskGraphExecutor
 from ideasdk.utils import Utils, ModuleMetadataHelper
 
-from typing import List
+from typing import Dict, List
 from collections import OrderedDict
-import threading
 import botocore.exceptions
-import time
 
 
 class DeploymentHelper:
@@ -36,6 +35,7 @@ class DeploymentHelper:
         module_ids: List[str] = None,
         aws_profile: str = None,
         rollback: bool = True,
+        force_deploy: bool = False,
     ):
         self.cluster_name = cluster_name
         self.aws_region = aws_region
@@ -52,6 +52,8 @@ class DeploymentHelper:
         self.force_build_bootstrap = force_build_bootstrap
         self.optimize_deployment = optimize_deployment
         self.aws_profile = aws_profile
+        # deploy modules even if the stack template and packages are unchanged since the last deployment
+        self.force_deploy = force_deploy
 
         self.module_metadata_helper = ModuleMetadataHelper()
 
@@ -88,6 +90,7 @@ class DeploymentHelper:
             termination_protection=self.termination_protection,
             deployment_id=self.deployment_id,
             module_set=self.module_set,
+            skip_unchanged=not self.force_deploy,
         ).invoke(force_build_bootstrap=self.force_build_bootstrap)
 
     def get_deployment_order(self) -> List[str]:
@@ -116,33 +119,84 @@ class DeploymentHelper:
 
         return [m['module_id'] for m in module_deployment_order]
 
-    def get_optimized_deployment_order(self) -> List[List[str]]:
-        deployment_order = self.get_deployment_order()
-        module_deployments = OrderedDict()
+    def get_deployment_graph(self) -> Dict[str, List[str]]:
+        """
+        returns the modules to be deployed, mapped to the module ids of their prerequisite modules.
 
+        prerequisites are derived from the module dependencies in ModuleMetadata, including transitive dependencies via
+        modules that are not part of this deployment. prerequisites not part of this deployment are not included.
+        """
+        deployment_order = self.get_deployment_order()
+        module_ids_by_name = {}
         for module_id in deployment_order:
-            module_info = self.cluster_modules[module_id]
-            if module_info is None:
-                continue
-            if module_info['type'] == constants.MODULE_TYPE_CONFIG:
-                continue
-            if module_info['status'] == 'deployed':
-                if not self.upgrade:
-                    continue
+            module_ids_by_name[self.cluster_modules[module_id]['name']] = module_id
 
-            priority = self.module_metadata_helper.get_module_deployment_priority(
-                module_name=module_info['name']
+        all_prerequisites = {}
+        for module_id in deployment_order:
+            prerequisites = self.module_metadata_helper.get_module_prerequisites(
+                module_name=self.cluster_modules[module_id]['name']
             )
-
-            if priority in module_deployments:
-                module_deployments[priority].append(module_id)
+            all_prerequisites[module_id] = [
+                module_ids_by_name[module_name]
+                for module_name in module_ids_by_name
+                if module_name in prerequisites
+            ]
+
+        # retain direct prerequisites only. prerequisites of a prerequisite are deployed before the prerequisite.
+        deployment_graph = OrderedDict()
+        for module_id, prerequisites in all_prerequisites.items():
+            indirect = set()
+            for prerequisite in prerequisites:
+                indirect.update(all_prerequisites[prerequisite])
+            deployment_graph[module_id] = [
+                prerequisite
+                for prerequisite in prerequisites
+                if prerequisite not in indirect
+            ]
+        return deployment_graph
+
+    def refresh_cluster_modules(self):
+        try:
+            self.initialize_cluster_modules()
+        except botocore.exceptions.ClientError as e:
+            if e.response['Error']['Code'] == 'ExpiredTokenException':
+                # deployment can take sometimes more than an hour and
+                # credentials can expire for those generated hourly using STS. re-init ClusterConfigDB and boto session
+                self.cluster_config_db = ClusterConfigDB(
+                    cluster_name=self.cluster_name,
+                    aws_region=self.aws_region,
+                    aws_profile=self.aws_profile,
+                )
+                self.initialize_cluster_modules()
             else:
-                module_deployments[priority] = [module_id]
+                raise e
+
+    def deploy_modules(self, deployment_graph: Dict[str, List[str]]):
+        """
+        deploy modules in parallel. each module is deployed as soon as all of its prerequisite modules are deployed.
+        if deployment of a module fails, no new module deployments are started, and in-progress deployments are
+        allowed to complete.
+        """
+
+        def is_deployed(module_id: str) -> bool:
+            return self.cluster_modules[module_id]['status'] == 'deployed'
+
+        result = TaskGraphExecutor(
+            max_workers=len(deployment_graph), thread_name_prefix='deploy'
+        ).execute(
+            graph=deployment_graph,
+            run=self.deploy_module,
+            # check for deployment status of completed modules
+            refresh=self.refresh_cluster_modules,
+            is_completed=is_deployed,
+        )
 
-        result = []
-        for module_set in module_deployments.values():
-            result.append(module_set)
-        return result
+        if not result.success:
+            if len(result.skipped) > 0:
+                print(f'skipped deployment of modules: {result.skipped}')
+            raise exceptions.general_exception(
+                f'deployment failed. could not deploy module: {", ".join(result.failed.keys())}'
+            )
 
     def print_no_op_message(self):
         if self.upgrade:
@@ -161,51 +215,13 @@ class DeploymentHelper:
 
     def invoke(self):
         if self.optimize_deployment and len(self.module_ids) > 1:
-            optimized_deployment_order = self.get_optimized_deployment_order()
-            if len(optimized_deployment_order) == 0:
+            deployment_graph = self.get_deployment_graph()
+            if len(deployment_graph) == 0:
                 self.print_no_op_message()
                 return
 
-            print(f'optimized deployment order: {optimized_deployment_order}')
-            for modules in optimized_deployment_order:
-                threads = []
-                for module_id in modules:
-                    thread = threading.Thread(
-                        name=f'Thread: {module_id}',
-                        target=self.deploy_module,
-                        kwargs={'module_id': module_id},
-                    )
-                    threads.append(thread)
-                    thread.start()
-                    # process the next entry after 10 seconds.
-                    time.sleep(10)
-
-                for thread in threads:
-                    thread.join()
-
-                # check for deployment status of previous modules
-                # if any of them are not deployed, skip deployment of the next module set
-                try:
-                    self.initialize_cluster_modules()
-                except botocore.exceptions.ClientError as e:
-                    if e.response['Error']['Code'] == 'ExpiredTokenException':
-                        # deployment can take sometimes more than an hour and
-                        # credentials can expire for those generated hourly using STS. re-init ClusterConfigDB and boto session
-                        self.cluster_config_db = ClusterConfigDB(
-                            cluster_name=self.cluster_name,
-                            aws_region=self.aws_region,
-                            aws_profile=self.aws_profile,
-                        )
-                        self.initialize_cluster_modules()
-                    else:
-                        raise e
-
-                for module_id in modules:
-                    module_info = self.cluster_modules[module_id]
-                    if module_info['status'] != 'deployed':
-                        raise exceptions.general_exception(
-                            f'deployment failed. could not deploy module: {module_id}'
-                        )
+            print(f'deployment graph (module: prerequisites): {dict(deployment_graph)}')
+            self.deploy_modules(deployment_graph)
 
         else:
             deployment_order = self.get_deployment_order()
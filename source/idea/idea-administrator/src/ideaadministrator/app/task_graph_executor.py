@@ -0,0 +1,102 @@
+#  Copyright Amazon.com, Inc. or its affiliates. All Rights Reserved.
+#
+#  Licensed under the Apache License, Version 2.0 (the "License"). You may not use this file except in compliance
+#  with the License. A copy of the License is located at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+#  or in the 'license' file accompanying this file. This file is distributed on an 'AS IS' BASIS, WITHOUT WARRANTIES
+#  OR CONDITIONS OF ANY KIND, express or implied. See the License for the specific language governing permissions
+#  and limitations under the License.
+
+from ideadatamodel import exceptions
+
+from typing import Any, Callable, Dict, List, Optional, Set
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor, FIRST_COMPLETED, wait
+
+
+class TaskGraphResult:
+    def __init__(self):
+        self.completed: Set[str] = set()
+        # task name -> error. error is None if the task returned, but was not completed as per is_completed
+        self.failed: Dict[str, Optional[BaseException]] = OrderedDict()
+        self.skipped: List[str] = []
+
+    @property
+    def success(self) -> bool:
+        return len(self.failed) == 0
+
+
+class TaskGraphExecutor:
+    """
+    executes a dependency graph of tasks in parallel.
+
+    each task is started as soon as all of its prerequisites are completed. if a task fails, no new tasks are
+    started, in-progress tasks are allowed to complete, and the remaining tasks are returned as skipped.
+    """
+
+    def __init__(self, max_workers: int, thread_name_prefix: str = ''):
+        self.max_workers = max(1, max_workers)
+        self.thread_name_prefix = thread_name_prefix
+
+    def execute(
+        self,
+        graph: Dict[str, List[str]],
+        run: Callable[[str], Any],
+        refresh: Optional[Callable[[], None]] = None,
+        is_completed: Optional[Callable[[str], bool]] = None,
+    ) -> TaskGraphResult:
+        """
+        :param graph: task name -> names of the prerequisite tasks
+        :param run: executes the task with the given name
+        :param refresh: called after one or more tasks return, before is_completed is checked for the tasks
+        :param is_completed: checks if a task that returned without an error is completed
+        """
+        for name, prerequisites in graph.items():
+            for prerequisite in prerequisites:
+                if prerequisite not in graph:
+                    raise exceptions.invalid_params(
+                        f'task: {name} - prerequisite task not found: {prerequisite}'
+                    )
+
+        result = TaskGraphResult()
+        pending = OrderedDict(graph)
+        in_progress = {}
+
+        with ThreadPoolExecutor(
+            max_workers=self.max_workers, thread_name_prefix=self.thread_name_prefix
+        ) as executor:
+            while True:
+                if result.success:
+                    for name, prerequisites in list(pending.items()):
+                        if not all(
+                            prerequisite in result.completed
+                            for prerequisite in prerequisites
+                        ):
+                            continue
+                        del pending[name]
+                        in_progress[executor.submit(run, name)] = name
+
+                if len(in_progress) == 0:
+                    break
+
+                done, _ = wait(in_progress.keys(), return_when=FIRST_COMPLETED)
+
+                if refresh is not None:
+                    refresh()
+                for future in done:
+                    name = in_progress.pop(future)
+                    error = future.exception()
+                    if error is None and (is_completed is None or is_completed(name)):
+                        result.completed.add(name)
+                    else:
+                        result.failed[name] = error
+
+        if result.success and len(pending) > 0:
+            raise exceptions.invalid_params(
+                f'circular dependency between tasks: {list(pending.keys())}'
+            )
+
+        result.skipped = list(pending.keys())
+        return result
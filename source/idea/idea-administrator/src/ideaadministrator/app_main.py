@@ -981,6 +981,11 @@ def bootstrap_cluster(
     is_flag=True,
     help='If flag is provided, deployment will be optimized and applicable stacks will be deployed in parallel.',
 )
+@click.option(
+    '--force-deploy',
+    is_flag=True,
+    help='Deploy the module even if the stack template and bootstrap packages are unchanged since the last deployment.',
+)
 @click.option('--module-set', help='Name of the ModuleSet. Default: default')
 @click.argument('MODULES', required=True, nargs=-1)
 def deploy(
@@ -993,6 +998,7 @@ def deploy(
     force_build_bootstrap: bool,
     rollback: bool,
     optimize_deployment: bool,
+    force_deploy: bool,
     module_set: str,
     modules,
 ):
@@ -1005,9 +1011,12 @@ def deploy(
     Use `all` as the module id to deploy all modules
     The default behavior of deploy is to skip deployment of a module if it's already deployed.
     Use --upgrade to re-run the cdk stack for the module.
+    Deployment of a module is skipped if the synthesized stack template and bootstrap packages are unchanged since the
+    last deployment of the module. Use --force-deploy to deploy the module regardless.
 
     Experimental:
     The --optimize-deployment flag can be provided to optimize deployment time and deploy applicable modules in parallel.
+    Each module is deployed as soon as the modules it depends on are deployed.
     """
 
     # dedupe and convert to list
@@ -1040,6 +1049,7 @@ def deploy(
         module_ids=module_ids_to_deploy,
         aws_profile=aws_profile,
         rollback=rollback,
+        force_deploy=force_deploy,
     ).invoke()
 
 
@@ -1658,7 +1668,7 @@ def quick_setup(
     module_ids = deployment_helper.get_deployment_order()
     if len(module_ids) > 0:
         if optimize_deployment:
-            deployment_order = deployment_helper.get_optimized_deployment_order()
+            deployment_order = dict(deployment_helper.get_deployment_graph())
         else:
             deployment_order = module_ids
         with cli.spinner(f'deploying modules: {deployment_order}'):
@@ -1715,6 +1725,11 @@ def quick_setup(
 @click.option('--delete-cloudwatch-logs', is_flag=True, help='Delete CloudWatch Logs')
 @click.option('--delete-all', is_flag=True, help='Delete all')
 @click.option('--force', is_flag=True, help='Skip confirmation prompts')
+@click.option(
+    '--dry-run',
+    is_flag=True,
+    help='Print the deletion plan and estimated duration without deleting any resources',
+)
 def delete_cluster(
     cluster_name: str,
     aws_region: str,
@@ -1725,6 +1740,7 @@ def delete_cluster(
     delete_cloudwatch_logs: bool,
     delete_all: bool,
     force: bool,
+    dry_run: bool,
 ):
     """
     delete cluster
@@ -1740,6 +1756,7 @@ def delete_cluster(
         delete_cloudwatch_logs=delete_cloudwatch_logs,
         delete_all=delete_all,
         force=force,
+        dry_run=dry_run,
     ).invoke()
 
 
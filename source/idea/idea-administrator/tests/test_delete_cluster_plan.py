@@ -0,0 +1,329 @@
+#  Copyright Amazon.com, Inc. or its affiliates. All Rights Reserved.
+#
+#  Licensed under the Apache License, Version 2.0 (the "License"). You may not use this file except in compliance
+#  with the License. A copy of the License is located at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+#  or in the 'license' file accompanying this file. This file is distributed on an 'AS IS' BASIS, WITHOUT WARRANTIES
+#  OR CONDITIONS OF ANY KIND, express or implied. See the License for the specific language governing permissions
+#  and limitations under the License.
+
+"""
+Test Cases for DeleteClusterPlan and the DeleteCluster teardown plan
+"""
+
+from ideadatamodel import constants, EC2Instance
+from ideaadministrator.app.delete_cluster import (
+    DeleteCluster,
+    DELETE_CLUSTER_API_LIMITS,
+)
+from ideaadministrator.app.delete_cluster_plan import (
+    DeleteClusterPlan,
+    DeleteClusterTask,
+)
+
+from threading import Lock
+from typing import Dict, List
+import time
+import pytest
+
+CLUSTER_NAME = 'idea-test'
+MODULE_STACKS = {
+    constants.MODULE_ANALYTICS: 'idea-test-analytics',
+    constants.MODULE_METRICS: 'idea-test-metrics',
+    constants.MODULE_IDENTITY_PROVIDER: 'idea-test-identity-provider',
+    constants.MODULE_DIRECTORYSERVICE: 'idea-test-directoryservice',
+    constants.MODULE_SHARED_STORAGE: 'idea-test-shared-storage',
+    constants.MODULE_CLUSTER_MANAGER: 'idea-test-cluster-manager',
+    constants.MODULE_SCHEDULER: 'idea-test-scheduler',
+    constants.MODULE_VIRTUAL_DESKTOP_CONTROLLER: 'idea-test-vdc',
+    constants.MODULE_BASTION_HOST: 'idea-test-bastion-host',
+}
+
+
+class FakeEC2:
+    def __init__(self):
+        self.lock = Lock()
+        self.terminate_instances_calls: List[List[str]] = []
+
+    def terminate_instances(self, InstanceIds: List[str], **_):
+        with self.lock:
+            self.terminate_instances_calls.append(InstanceIds)
+
+
+class FakeBucket:
+    def __init__(self, name: str):
+        self.name = name
+        self.creation_date = time.time()
+        self.object_versions = self
+
+    def all(self):
+        return self
+
+    def delete(self):
+        pass
+
+
+class FakeS3:
+    def __init__(self):
+        self.deleted_buckets: List[str] = []
+
+    def Bucket(self, name: str) -> FakeBucket:
+        return FakeBucket(name)
+
+    def delete_bucket(self, Bucket: str):
+        self.deleted_buckets.append(Bucket)
+
+
+class FakeClusterConfigDB:
+    """
+    cluster settings table. get_config_entry fails after the table is deleted.
+    """
+
+    def __init__(self, bucket_name: str):
+        self.bucket_name = bucket_name
+        self.deleted = False
+
+    def get_config_entry(self, key: str) -> Dict:
+        assert not self.deleted, 'cluster settings table is deleted'
+        assert key == 'cluster.cluster_s3_bucket'
+        return {'key': key, 'value': self.bucket_name}
+
+
+class FakeAws:
+    def __init__(self):
+        self._ec2 = FakeEC2()
+        self._s3 = FakeS3()
+
+    def ec2(self):
+        return self._ec2
+
+    def s3(self):
+        return self._s3
+
+    def s3_bucket(self):
+        return self._s3
+
+
+class FakeContext:
+    def __init__(self):
+        self._aws = FakeAws()
+        self.prompts: List[str] = []
+
+    def aws(self) -> FakeAws:
+        return self._aws
+
+    def prompt(self, message: str) -> bool:
+        self.prompts.append(message)
+        return True
+
+    def info(self, message: str):
+        pass
+
+    def success(self, message: str):
+        pass
+
+    def warning(self, message: str):
+        pass
+
+    def error(self, message: str):
+        pass
+
+
+def build_delete_cluster(dry_run: bool = True) -> DeleteCluster:
+    delete_cluster = DeleteCluster.__new__(DeleteCluster)
+    delete_cluster.cluster_name = CLUSTER_NAME
+    delete_cluster.aws_region = 'us-east-1'
+    delete_cluster.force = False
+    delete_cluster.dry_run = dry_run
+    delete_cluster.delete_databases = True
+    delete_cluster.delete_failed_max_attempts = 3
+    delete_cluster.context = FakeContext()
+    delete_cluster.api_concurrency = {
+        service_name: concurrency
+        for service_name, (_, _, concurrency) in DELETE_CLUSTER_API_LIMITS.items()
+    }
+    delete_cluster.cluster_modules = [
+        {'name': constants.MODULE_CLUSTER, 'stack_name': 'idea-test-cluster'}
+    ] + [
+        {'name': module_name, 'stack_name': stack_name}
+        for module_name, stack_name in MODULE_STACKS.items()
+    ]
+    delete_cluster.initialize_resources()
+
+    delete_cluster.cloud_formation_stacks = [
+        {'StackName': stack_name}
+        for module_name, stack_name in MODULE_STACKS.items()
+        if module_name != constants.MODULE_IDENTITY_PROVIDER
+    ] + [{'StackName': 'idea-test-job-1234'}]
+    delete_cluster.identity_provider_stacks = [
+        {'StackName': 'idea-test-identity-provider'}
+    ]
+    delete_cluster.cluster_stacks = [{'StackName': 'idea-test-cluster'}]
+    delete_cluster.ec2_instances = [
+        EC2Instance({'InstanceId': f'i-{i:08d}'}) for i in range(2500)
+    ]
+    delete_cluster.dynamodb_tables = [f'{CLUSTER_NAME}.table-{i}' for i in range(40)]
+    delete_cluster.cloudwatch_logs = [
+        {'name': f'/{CLUSTER_NAME}/log-group-{i}', 'size': 0} for i in range(200)
+    ]
+    delete_cluster.confirm_delete_bootstrap = True
+    delete_cluster.confirm_delete_databases = True
+    delete_cluster.confirm_delete_cloudwatch_logs = True
+    return delete_cluster
+
+
+def test_delete_cluster_plan_ordering():
+    lock = Lock()
+    started: Dict[str, float] = {}
+    completed: Dict[str, float] = {}
+
+    def task(name: str, seconds: float):
+        def run():
+            with lock:
+                started[name] = time.perf_counter()
+            time.sleep(seconds)
+            with lock:
+                completed[name] = time.perf_counter()
+
+        return run
+
+    plan = DeleteClusterPlan()
+    plan.add(DeleteClusterTask(name='a', run=task('a', 0.05)))
+    plan.add(DeleteClusterTask(name='b', run=task('b', 0.02)))
+    plan.add(DeleteClusterTask(name='c', run=task('c', 0.02), prerequisites=['b']))
+    plan.add(DeleteClusterTask(name='d', run=task('d', 0.01), prerequisites=['a', 'c']))
+    plan.execute()
+
+    assert completed['b'] <= started['c']
+    assert completed['a'] <= started['d']
+    assert completed['c'] <= started['d']
+    # c does not wait for a
+    assert started['c'] < completed['a']
+
+    with pytest.raises(Exception):
+        plan.add(DeleteClusterTask(name='e', run=task('e', 0), prerequisites=['x']))
+
+
+def test_delete_cluster_plan_failure():
+    completed = []
+
+    def fail():
+        raise SystemExit(1)
+
+    def run(name: str, seconds: float = 0.0):
+        def _run():
+            time.sleep(seconds)
+            completed.append(name)
+
+        return _run
+
+    plan = DeleteClusterPlan()
+    plan.add(DeleteClusterTask(name='stack/a', run=fail))
+    plan.add(DeleteClusterTask(name='stack/b', run=run('stack/b', 0.02)))
+    plan.add(
+        DeleteClusterTask(
+            name='stack/cluster', run=run('stack/cluster'), prerequisites=['stack/a']
+        )
+    )
+    plan.add(
+        DeleteClusterTask(
+            name='dynamodb-tables',
+            run=run('dynamodb-tables'),
+            prerequisites=['stack/cluster'],
+        )
+    )
+
+    with pytest.raises(SystemExit):
+        plan.execute()
+
+    # in progress tasks complete. tasks depending on the failed task are not started.
+    assert completed == ['stack/b']
+
+
+def test_delete_cluster_stack_dependencies():
+    plan = build_delete_cluster().build_plan()
+
+    def prerequisites(stack_name: str) -> List[str]:
+        return plan.tasks[f'stack/{stack_name}'].prerequisites
+
+    # module stacks and job stacks are deleted in parallel
+    for stack_name in [
+        'idea-test-bastion-host',
+        'idea-test-scheduler',
+        'idea-test-cluster-manager',
+        'idea-test-analytics',
+        'idea-test-job-1234',
+    ]:
+        assert prerequisites(stack_name) == ['app-module-clean-up', 'ec2-instances']
+
+    # the identity provider stack is deleted after the stacks of modules using the user pool
+    identity_provider_prerequisites = prerequisites('idea-test-identity-provider')
+    assert 'user-pool-protection' in identity_provider_prerequisites
+    for stack_name in [
+        'idea-test-cluster-manager',
+        'idea-test-scheduler',
+        'idea-test-vdc',
+        'idea-test-bastion-host',
+    ]:
+        assert f'stack/{stack_name}' in identity_provider_prerequisites
+    for stack_name in ['idea-test-analytics', 'idea-test-shared-storage']:
+        assert f'stack/{stack_name}' not in identity_provider_prerequisites
+
+    # the cluster stack is deleted after all other stacks
+    cluster_prerequisites = prerequisites('idea-test-cluster')
+    for stack_name in list(MODULE_STACKS.values()) + ['idea-test-job-1234']:
+        assert f'stack/{stack_name}' in cluster_prerequisites
+
+    # the tables are deleted in parallel with the bootstrap stack and S3 bucket (see
+    # test_delete_cluster_s3_bucket_name)
+    assert plan.tasks['dynamodb-tables'].prerequisites == ['stack/idea-test-cluster']
+    assert plan.tasks['bootstrap-stack-and-s3-bucket'].prerequisites == [
+        'stack/idea-test-cluster'
+    ]
+    assert plan.tasks['cloudwatch-log-groups'].prerequisites == [
+        'stack/idea-test-cluster',
+        'bootstrap-stack-and-s3-bucket',
+    ]
+
+    # terminate_instances is called with up to 1000 instance ids
+    assert plan.tasks['ec2-instances'].api_calls == 3
+
+
+def test_delete_cluster_s3_bucket_name():
+    """
+    the S3 bucket name is found before the cluster settings table is deleted
+    """
+    delete_cluster = build_delete_cluster(dry_run=False)
+    cluster_config_db = FakeClusterConfigDB('idea-test-cluster-bucket')
+    delete_cluster.cluster_config_db = cluster_config_db
+    delete_cluster.find_cluster_s3_bucket_name()
+
+    cluster_config_db.deleted = True
+    delete_cluster.delete_s3_bucket()
+
+    assert delete_cluster.context.aws().s3().deleted_buckets == [
+        'idea-test-cluster-bucket'
+    ]
+
+
+def test_delete_cluster_terminate_instances_batches():
+    delete_cluster = build_delete_cluster(dry_run=False)
+    delete_cluster.delete_ec2_instances()
+    calls = delete_cluster.context.aws().ec2().terminate_instances_calls
+    assert sorted(len(instance_ids) for instance_ids in calls) == [500, 1000, 1000]
+    terminated = {instance_id for instance_ids in calls for instance_id in instance_ids}
+    assert len(terminated) == 2500
+
+
+def test_delete_cluster_dry_run_report(capsys):
+    plan = build_delete_cluster().build_plan()
+    plan.print_report()
+    output = capsys.readouterr().out
+    assert 'stack/idea-test-cluster' in output
+    assert 'estimated teardown duration' in output
+
+    schedule = plan.get_schedule()
+    planned = max(finish for _, finish in schedule.values())
+    assert planned < plan.get_serial_estimate()
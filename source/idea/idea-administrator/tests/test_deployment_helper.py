@@ -0,0 +1,246 @@
+#  Copyright Amazon.com, Inc. or its affiliates. All Rights Reserved.
+#
+#  Licensed under the Apache License, Version 2.0 (the "License"). You may not use this file except in compliance
+#  with the License. A copy of the License is located at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+#  or in the 'license' file accompanying this file. This file is distributed on an 'AS IS' BASIS, WITHOUT WARRANTIES
+#  OR CONDITIONS OF ANY KIND, express or implied. See the License for the specific language governing permissions
+#  and limitations under the License.
+
+"""
+Test Cases for DeploymentHelper and CdkInvoker change detection
+"""
+
+from ideadatamodel import constants, exceptions
+from ideasdk.utils import ModuleMetadataHelper
+from ideaadministrator.app import deployment_helper
+from ideaadministrator.app.deployment_helper import DeploymentHelper
+from ideaadministrator.app.cdk.cdk_invoker import CdkInvoker
+
+from threading import Lock
+from typing import Dict, List, Optional
+import os
+import time
+import pytest
+
+# simulated deployment duration of each module. 10ms for each minute of a typical deployment.
+DEPLOYMENT_SECONDS = {
+    constants.MODULE_CLUSTER: 0.1,
+    constants.MODULE_ANALYTICS: 0.25,
+    constants.MODULE_METRICS: 0.02,
+    constants.MODULE_IDENTITY_PROVIDER: 0.05,
+    constants.MODULE_DIRECTORYSERVICE: 0.03,
+    constants.MODULE_SHARED_STORAGE: 0.15,
+    constants.MODULE_CLUSTER_MANAGER: 0.1,
+    constants.MODULE_SCHEDULER: 0.08,
+    constants.MODULE_VIRTUAL_DESKTOP_CONTROLLER: 0.15,
+    constants.MODULE_BASTION_HOST: 0.03,
+}
+
+
+class FakeClusterModules:
+    """
+    modules table for a cluster. deploy() simulates the module deployment and records start and end times.
+    """
+
+    def __init__(self, failed: Optional[List[str]] = None):
+        self.lock = Lock()
+        self.modules: Dict[str, Dict] = {
+            constants.MODULE_GLOBAL_SETTINGS: {
+                'module_id': constants.MODULE_GLOBAL_SETTINGS,
+                'name': constants.MODULE_GLOBAL_SETTINGS,
+                'type': constants.MODULE_TYPE_CONFIG,
+                'status': 'deployed',
+            }
+        }
+        for module_name in DEPLOYMENT_SECONDS:
+            self.modules[module_name] = {
+                'module_id': module_name,
+                'name': module_name,
+                'type': constants.MODULE_TYPE_STACK,
+                'status': 'not-deployed',
+            }
+        self.failed = failed or []
+        self.started: Dict[str, float] = {}
+        self.completed: Dict[str, float] = {}
+
+    def get_cluster_modules(self) -> List[Dict]:
+        with self.lock:
+            return [dict(module) for module in self.modules.values()]
+
+    def deploy(self, module_id: str):
+        self.started[module_id] = time.perf_counter()
+        time.sleep(DEPLOYMENT_SECONDS[module_id])
+        self.completed[module_id] = time.perf_counter()
+        if module_id in self.failed:
+            raise SystemExit(1)
+        with self.lock:
+            self.modules[module_id]['status'] = 'deployed'
+
+
+@pytest.fixture()
+def cluster_modules(monkeypatch) -> FakeClusterModules:
+    fake_cluster_modules = FakeClusterModules()
+    monkeypatch.setattr(
+        deployment_helper, 'ClusterConfigDB', lambda **_: fake_cluster_modules
+    )
+    monkeypatch.setattr(
+        DeploymentHelper,
+        'deploy_module',
+        lambda helper, module_id: fake_cluster_modules.deploy(module_id),
+    )
+    return fake_cluster_modules
+
+
+def build_deployment_helper() -> DeploymentHelper:
+    return DeploymentHelper(
+        cluster_name='idea-test',
+        aws_region='us-east-1',
+        all_modules=True,
+        optimize_deployment=True,
+    )
+
+
+def test_deployment_helper_dependency_graph(cluster_modules):
+    helper = build_deployment_helper()
+    deployment_graph = helper.get_deployment_graph()
+    assert deployment_graph[constants.MODULE_CLUSTER] == []
+    assert deployment_graph[constants.MODULE_SHARED_STORAGE] == [
+        constants.MODULE_CLUSTER
+    ]
+    assert deployment_graph[constants.MODULE_BASTION_HOST] == [
+        constants.MODULE_SCHEDULER
+    ]
+
+    helper.invoke()
+
+    # each module starts after its direct and indirect prerequisites are deployed
+    metadata_helper = ModuleMetadataHelper()
+    for module_id in deployment_graph:
+        for prerequisite in metadata_helper.get_module_prerequisites(module_id):
+            if prerequisite not in deployment_graph:
+                continue
+            assert (
+                cluster_modules.completed[prerequisite]
+                <= cluster_modules.started[module_id]
+            )
+
+    # modules without a dependency on analytics do not wait for it
+    assert (
+        cluster_modules.started[constants.MODULE_SHARED_STORAGE]
+        < cluster_modules.completed[constants.MODULE_ANALYTICS]
+    )
+    assert (
+        cluster_modules.started[constants.MODULE_BASTION_HOST]
+        < cluster_modules.completed[constants.MODULE_VIRTUAL_DESKTOP_CONTROLLER]
+    )
+
+    # all modules are deployed
+    helper = build_deployment_helper()
+    assert len(helper.get_deployment_graph()) == 0
+
+
+def test_deployment_helper_failed_prerequisite(cluster_modules):
+    cluster_modules.failed = [constants.MODULE_IDENTITY_PROVIDER]
+    helper = build_deployment_helper()
+
+    with pytest.raises(exceptions.SocaException) as exc_info:
+        helper.invoke()
+    assert constants.MODULE_IDENTITY_PROVIDER in exc_info.value.message
+
+    # in progress deployments complete. dependent modules are not deployed.
+    assert (
+        cluster_modules.modules[constants.MODULE_DIRECTORYSERVICE]['status']
+        == 'deployed'
+    )
+    assert constants.MODULE_CLUSTER_MANAGER not in cluster_modules.started
+    assert constants.MODULE_BASTION_HOST not in cluster_modules.started
+
+
+class FakeModuleInfo:
+    def __init__(self):
+        self.module_info = {'module_id': 'scheduler', 'status': 'not-deployed'}
+
+    def get_module_info(self, module_id: str) -> Dict:
+        return dict(self.module_info)
+
+    def set_module_deployment_fingerprint(self, module_id: str, fingerprint: str):
+        self.module_info['status'] = 'deployed'
+        self.module_info['deployment_fingerprint'] = fingerprint
+
+
+def build_cdk_invoker(tmp_path, deployment_id: str, commands: List[str]) -> CdkInvoker:
+    invoker = CdkInvoker.__new__(CdkInvoker)
+    invoker.module_id = 'scheduler'
+    invoker.deployment_id = deployment_id
+    invoker.deployment_dir = str(tmp_path / deployment_id)
+    invoker.skip_unchanged = True
+    invoker.package_checksums = []
+    invoker.pending_uploads = []
+    invoker.log = lambda message: None
+    invoker.get_cdk_app_cmd = lambda: 'idea-admin cdk cdk-app'
+    invoker.get_cdk_command = lambda name, params=None, context_params=None: ' '.join(
+        [name] + (params or [])
+    )
+    invoker.exec_shell = lambda cmd, **_: commands.append(cmd)
+    invoker.upload_packages = lambda uploads: commands.extend(
+        [f'upload {upload["key"]}' for upload in uploads]
+    )
+    return invoker
+
+
+def synthesize(invoker: CdkInvoker, template: str):
+    cloud_assembly_dir = os.path.join(
+        invoker.deployment_dir, f'cdk.out.{invoker.module_id}'
+    )
+    os.makedirs(cloud_assembly_dir, exist_ok=True)
+    with open(
+        os.path.join(cloud_assembly_dir, 'idea-test-scheduler.template.json'), 'w'
+    ) as f:
+        f.write(template.replace('{deployment_id}', invoker.deployment_id))
+
+
+def test_cdk_invoker_skip_unchanged(tmp_path):
+    cluster_config_db = FakeModuleInfo()
+    template = '{"UserData": "s3://bucket/idea/bootstrap/bootstrap-scheduler-{deployment_id}.tar.gz"}'
+
+    def deploy(deployment_id: str, package_checksum: str, template: str) -> List[str]:
+        commands = []
+        invoker = build_cdk_invoker(tmp_path, deployment_id, commands)
+        invoker.cluster_config_db = cluster_config_db
+        synthesize(invoker, template)
+        invoker.package_checksums.append(package_checksum)
+        invoker.upload_package(
+            message='uploading bootstrap package',
+            bucket='bucket',
+            file='bootstrap.tar.gz',
+            key=f'idea/bootstrap/bootstrap-scheduler-{deployment_id}.tar.gz',
+        )
+        invoker.cdk_deploy(outputs_file='scheduler-outputs.json')
+        return [command.split(' ')[0] for command in commands]
+
+    assert deploy('deployment-1', 'package-1', template) == [
+        'synth',
+        'upload',
+        'deploy',
+    ]
+
+    # new deployment id, same template and bootstrap package
+    assert deploy('deployment-2', 'package-1', template) == ['synth']
+
+    # bootstrap package changed
+    assert deploy('deployment-3', 'package-2', template) == [
+        'synth',
+        'upload',
+        'deploy',
+    ]
+
+    # stack template changed
+    template = template.replace('UserData', 'LaunchTemplateData')
+    assert deploy('deployment-4', 'package-2', template) == [
+        'synth',
+        'upload',
+        'deploy',
+    ]
@@ -0,0 +1,69 @@
+#  Copyright Amazon.com, Inc. or its affiliates. All Rights Reserved.
+#
+#  Licensed under the Apache License, Version 2.0 (the "License"). You may not use this file except in compliance
+#  with the License. A copy of the License is located at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+#  or in the 'license' file accompanying this file. This file is distributed on an 'AS IS' BASIS, WITHOUT WARRANTIES
+#  OR CONDITIONS OF ANY KIND, express or implied. See the License for the specific language governing permissions
+#  and limitations under the License.
+
+"""
+Test Cases for TaskGraphExecutor
+"""
+
+from ideadatamodel import exceptions, errorcodes
+from ideaadministrator.app.task_graph_executor import TaskGraphExecutor
+
+from threading import Lock
+from typing import List
+import pytest
+
+
+def test_task_graph_executor_prerequisites():
+    graph = {'a': [], 'b': [], 'c': ['a', 'b'], 'd': ['c']}
+    lock = Lock()
+    order: List[str] = []
+
+    def run(name: str):
+        with lock:
+            order.append(name)
+
+    result = TaskGraphExecutor(max_workers=4).execute(graph=graph, run=run)
+
+    assert result.success
+    assert result.completed == {'a', 'b', 'c', 'd'}
+    assert result.skipped == []
+    assert set(order[:2]) == {'a', 'b'}
+    assert order[2:] == ['c', 'd']
+
+
+def test_task_graph_executor_failure():
+    graph = {'a': [], 'b': [], 'c': ['a'], 'd': ['b']}
+    error = RuntimeError('failed')
+
+    def run(name: str):
+        if name == 'a':
+            raise error
+
+    # b returns without an error, but is not completed
+    result = TaskGraphExecutor(max_workers=2).execute(
+        graph=graph, run=run, is_completed=lambda name: name != 'b'
+    )
+
+    assert not result.success
+    assert result.failed == {'a': error, 'b': None}
+    assert result.skipped == ['c', 'd']
+
+
+def test_task_graph_executor_invalid_graph():
+    with pytest.raises(exceptions.SocaException) as exc_info:
+        TaskGraphExecutor(max_workers=1).execute(graph={'a': ['x']}, run=print)
+    assert exc_info.value.error_code == errorcodes.INVALID_PARAMS
+
+    with pytest.raises(exceptions.SocaException) as exc_info:
+        TaskGraphExecutor(max_workers=1).execute(
+            graph={'a': ['b'], 'b': ['a']}, run=print
+        )
+    assert exc_info.value.error_code == errorcodes.INVALID_PARAMS
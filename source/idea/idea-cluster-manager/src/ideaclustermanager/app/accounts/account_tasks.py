@@ -11,10 +11,13 @@
 
 __all__ = (
     'SyncUserInDirectoryServiceTask',
+    'SyncUsersInDirectoryServiceTask',
     'CreateUserHomeDirectoryTask',
+    'CreateUserHomeDirectoriesTask',
     'SyncGroupInDirectoryServiceTask',
     'SyncPasswordInDirectoryServiceTask',
     'GroupMembershipUpdatedTask',
+    'GroupMembershipSyncTask',
 )
 
 from ideasdk.utils import Utils
@@ -23,8 +26,11 @@ from ideadatamodel import exceptions, errorcodes
 import ideaclustermanager
 from ideaclustermanager.app.tasks.base_task import BaseTask
 from ideaclustermanager.app.accounts.user_home_directory import UserHomeDirectory
+from ideaclustermanager.app.accounts.group_membership_sync import (
+    GROUP_MEMBERSHIP_OPERATION_ADD,
+)
 
-from typing import Dict
+from typing import Dict, List
 import os
 import pathlib
 import shutil
@@ -125,6 +131,114 @@ class GroupMembershipUpdatedTask(BaseTask):
                 )
 
 
+class GroupMembershipSyncTask(BaseTask):
+    """
+    apply coalesced membership changes of a group (refer to GroupMembershipSync).
+
+    changes are applied to the directory service using a single multi-value modify. changes that fail for
+    individual users do not replay the whole batch:
+    * adds are requeued once in the message group of the user (GroupMembershipSync.requeue_add), so that users that
+        are not yet created in the directory service (eg. the member value of an Active Directory group is the DN of
+        the user) are added after the pending accounts.sync-user task of the user.
+    * removes, and adds that fail again after they were requeued, are reported and are not retried.
+    """
+
+    def __init__(self, context: ideaclustermanager.AppContext):
+        self.context = context
+        self.logger = context.logger(self.get_name())
+
+    def get_name(self) -> str:
+        return 'accounts.sync-group-membership'
+
+    def invoke(self, payload: Dict) -> Dict[str, str]:
+        """
+        :return: username -> error, for the users that could not be synced
+        """
+        group_name = payload['group_name']
+        add_usernames: List[str] = Utils.get_value_as_list('add', payload, [])
+        remove_usernames: List[str] = Utils.get_value_as_list('remove', payload, [])
+        requeued = Utils.get_value_as_bool('requeued', payload, False)
+        group = self.context.accounts.group_dao.get_group(group_name)
+
+        if group is None:
+            raise exceptions.soca_exception(
+                error_code=errorcodes.AUTH_GROUP_NOT_FOUND,
+                message=f'group not found: {group_name}',
+            )
+        if not group['enabled']:
+            self.logger.info(
+                f'group: {group_name} is disabled. skip membership sync for {len(add_usernames) + len(remove_usernames)} users'
+            )
+            return {}
+
+        if requeued:
+            # changes sent in the message group of the group are not ordered with requeued adds.
+            # skip users that were removed from the group since the add was requeued.
+            group_members_dao = self.context.accounts.group_members_dao
+            add_usernames = [
+                username
+                for username in add_usernames
+                if group_members_dao.is_member(group_name, username)
+            ]
+
+        failed = {}
+        if self.context.ldap_client.is_readonly():
+            self.logger.info(
+                f'add: {len(add_usernames)}, remove: {len(remove_usernames)} members of group: {group_name} in READ-ONLY directory service ...'
+            )
+        else:
+            self.logger.info(
+                f'add: {len(add_usernames)}, remove: {len(remove_usernames)} members of group: {group_name} in directory service ...'
+            )
+            failed = self.context.ldap_client.update_group_members(
+                group_name=group_name,
+                add_usernames=add_usernames,
+                remove_usernames=remove_usernames,
+            )
+
+        # update membership in user projects (DynamoDB)
+        user_projects_dao = self.context.projects.user_projects_dao
+        for username in add_usernames:
+            if username in failed:
+                continue
+            try:
+                user_projects_dao.group_member_added(
+                    group_name=group_name, username=username
+                )
+            except Exception as e:
+                failed[username] = str(e)
+        for username in remove_usernames:
+            if username in failed:
+                continue
+            try:
+                user_projects_dao.group_member_removed(
+                    group_name=group_name, username=username
+                )
+            except Exception as e:
+                failed[username] = str(e)
+
+        if not requeued:
+            for username in add_usernames:
+                if username not in failed:
+                    continue
+                self.logger.warning(
+                    f'failed to add user: {username} to group: {group_name} - {failed[username]}. '
+                    f'retrying after the user is synced ...'
+                )
+                self.context.accounts.membership_sync.requeue_add(group_name, username)
+                del failed[username]
+
+        for username, error in failed.items():
+            self.logger.error(
+                f'failed to sync membership of user: {username} in group: {group_name} - {error}'
+            )
+        self.logger.info(
+            f'synced membership of group: {group_name} - '
+            f'users: {len(add_usernames) + len(remove_usernames)}, failed: {len(failed)}'
+        )
+        return failed
+
+
 class SyncUserInDirectoryServiceTask(BaseTask):
     def __init__(self, context: ideaclustermanager.AppContext):
         self.context = context
@@ -136,6 +250,10 @@ class SyncUserInDirectoryServiceTask(BaseTask):
     def invoke(self, payload: Dict):
         username = payload['username']
         user = self.context.accounts.user_dao.get_user(username)
+        self.sync_user(user)
+
+    def sync_user(self, user: Dict):
+        username = user['username']
         group_name = user['group_name']
         enabled = user['enabled']
         sudo = Utils.get_value_as_bool('sudo', user, False)
@@ -178,6 +296,85 @@ class SyncUserInDirectoryServiceTask(BaseTask):
                 self.context.ldap_client.remove_sudo_user(username)
 
 
+class SyncUsersInDirectoryServiceTask(BaseTask):
+    """
+    sync a batch of users created by a bulk import (refer to BulkUserImport).
+
+    users are read from the DAO in batches. passwords are synced from the password files of the users, if provided.
+    users that fail to sync are reported and are not retried, so that a single failure does not replay the whole
+    batch.
+
+    group memberships of the synced users are sent to GroupMembershipSync after the users are created in the
+    directory service, so that the members can be resolved (eg. the member value of an Active Directory group is
+    the DN of the user). memberships are sent before the passwords are synced: if a membership change cannot be
+    sent, the task fails and is retried while the password files still exist.
+    """
+
+    def __init__(self, context: ideaclustermanager.AppContext):
+        self.context = context
+        self.logger = context.logger(self.get_name())
+        self.sync_user_task = SyncUserInDirectoryServiceTask(context)
+        self.sync_password_task = SyncPasswordInDirectoryServiceTask(context)
+
+    def get_name(self) -> str:
+        return 'accounts.sync-users'
+
+    def invoke(self, payload: Dict) -> Dict[str, str]:
+        """
+        :return: username -> error, for the users that could not be synced
+        """
+        usernames: List[str] = Utils.get_value_as_list('usernames', payload, [])
+        password_files: Dict[str, str] = Utils.get_value_as_dict(
+            'password_files', payload, {}
+        )
+        users = self.context.accounts.user_dao.batch_get_users(usernames)
+
+        failed = {}
+        synced = []
+        for username in usernames:
+            user = users.get(username)
+            if user is None:
+                failed[username] = 'user not found'
+                continue
+            try:
+                self.sync_user_task.sync_user(user)
+                synced.append(username)
+            except Exception as e:
+                failed[username] = str(e)
+
+        group_usernames: Dict[str, List[str]] = {}
+        for username in synced:
+            user = users[username]
+            if not user['enabled']:
+                continue
+            for group_name in Utils.get_value_as_list('additional_groups', user, []):
+                group_usernames.setdefault(group_name, []).append(username)
+        for group_name, group_members in group_usernames.items():
+            self.context.accounts.membership_sync.add_changes(
+                group_name=group_name,
+                usernames=group_members,
+                operation=GROUP_MEMBERSHIP_OPERATION_ADD,
+            )
+
+        for username in synced:
+            password_file = password_files.get(username)
+            if Utils.is_empty(password_file) or not users[username]['enabled']:
+                continue
+            try:
+                self.sync_password_task.sync_password(username, password_file)
+            except Exception as e:
+                failed[username] = str(e)
+
+        for username, error in failed.items():
+            self.logger.error(
+                f'failed to sync user: {username} in directory service - {error}'
+            )
+        self.logger.info(
+            f'synced users in directory service - users: {len(usernames)}, failed: {len(failed)}'
+        )
+        return failed
+
+
 class SyncPasswordInDirectoryServiceTask(BaseTask):
     def __init__(self, context: ideaclustermanager.AppContext):
         self.context = context
@@ -189,7 +386,9 @@ class SyncPasswordInDirectoryServiceTask(BaseTask):
     def invoke(self, payload: Dict):
         username = payload['username']
         password_file = payload['password_file']
+        self.sync_password(username, password_file)
 
+    def sync_password(self, username: str, password_file: str):
         self.logger.info(f'sync password for user: {username} in directory service')
 
         with open(password_file, 'r') as f:
@@ -220,3 +419,46 @@ class CreateUserHomeDirectoryTask(BaseTask):
         username = payload['username']
         user = self.context.accounts.get_user(username)
         UserHomeDirectory(context=self.context, user=user).initialize()
+
+
+class CreateUserHomeDirectoriesTask(BaseTask):
+    """
+    create home directories for a batch of users created by a bulk import (refer to BulkUserImport).
+    """
+
+    def __init__(self, context: ideaclustermanager.AppContext):
+        self.context = context
+        self.logger = context.logger(self.get_name())
+
+    def get_name(self) -> str:
+        return 'accounts.create-home-directories'
+
+    def invoke(self, payload: Dict) -> Dict[str, str]:
+        """
+        :return: username -> error, for the users whose home directory could not be created
+        """
+        usernames: List[str] = Utils.get_value_as_list('usernames', payload, [])
+        user_dao = self.context.accounts.user_dao
+        users = user_dao.batch_get_users(usernames)
+
+        failed = {}
+        for username in usernames:
+            user = users.get(username)
+            if user is None:
+                failed[username] = 'user not found'
+                continue
+            try:
+                UserHomeDirectory(
+                    context=self.context, user=user_dao.convert_from_db(user)
+                ).initialize()
+            except Exception as e:
+                failed[username] = str(e)
+
+        for username, error in failed.items():
+            self.logger.error(
+                f'failed to create home directory for user: {username} - {error}'
+            )
+        self.logger.info(
+            f'created home directories - users: {len(usernames)}, failed: {len(failed)}'
+        )
+        return failed
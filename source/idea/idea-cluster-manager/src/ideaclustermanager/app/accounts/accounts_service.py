@@ -31,7 +31,10 @@ from ideasdk.auth import TokenService
 from ideaclustermanager.app.accounts.ldapclient.abstract_ldap_client import (
     AbstractLDAPClient,
 )
-from ideaclustermanager.app.accounts.cognito_user_pool import CognitoUserPool
+from ideaclustermanager.app.accounts.cognito_user_pool import (
+    CognitoUserPool,
+    CognitoUserPoolPasswordPolicy,
+)
 from ideaclustermanager.app.accounts import auth_constants
 from ideaclustermanager.app.accounts.auth_utils import AuthUtils
 from ideaclustermanager.app.accounts.db.group_dao import GroupDAO
@@ -41,6 +44,11 @@ from ideaclustermanager.app.accounts.db.group_members_dao import GroupMembersDAO
 from ideaclustermanager.app.accounts.db.single_sign_on_state_dao import (
     SingleSignOnStateDAO,
 )
+from ideaclustermanager.app.accounts.group_membership_sync import (
+    GroupMembershipSync,
+    GROUP_MEMBERSHIP_OPERATION_ADD,
+    GROUP_MEMBERSHIP_OPERATION_REMOVE,
+)
 
 from ideaclustermanager.app.tasks.task_manager import TaskManager
 
@@ -91,6 +99,7 @@ class AccountsService:
         self.sequence_config_dao = SequenceConfigDAO(context)
         self.group_members_dao = GroupMembersDAO(context, self.user_dao)
         self.sso_state_dao = SingleSignOnStateDAO(context)
+        self.membership_sync = GroupMembershipSync(context, task_manager)
 
         self.user_dao.initialize()
         self.group_dao.initialize()
@@ -364,15 +373,11 @@ class AccountsService:
                     username=username, group_name=group_name
                 )
 
-            self.task_manager.send(
-                task_name='accounts.group-membership-updated',
-                payload={
-                    'group_name': group_name,
-                    'username': username,
-                    'operation': 'add',
-                },
-                message_group_id=username,
-            )
+        self.membership_sync.add_changes(
+            group_name=group_name,
+            usernames=[user['username'] for user in users],
+            operation=GROUP_MEMBERSHIP_OPERATION_ADD,
+        )
 
     def remove_user_from_groups(self, username: str, group_names: List[str]):
         """
@@ -436,14 +441,10 @@ class AccountsService:
                     username=username, group_name=group_name
                 )
 
-            self.task_manager.send(
-                task_name='accounts.group-membership-updated',
-                payload={
-                    'group_name': group_name,
-                    'username': username,
-                    'operation': 'remove',
-                },
-                message_group_id=username,
+            self.membership_sync.add_changes(
+                group_name=group_name,
+                usernames=[username],
+                operation=GROUP_MEMBERSHIP_OPERATION_REMOVE,
             )
 
         self.user_dao.update_user(
@@ -515,15 +516,11 @@ class AccountsService:
                     username=username, group_name=group_name
                 )
 
-            self.task_manager.send(
-                task_name='accounts.group-membership-updated',
-                payload={
-                    'group_name': group_name,
-                    'username': username,
-                    'operation': 'remove',
-                },
-                message_group_id=username,
-            )
+        self.membership_sync.add_changes(
+            group_name=group_name,
+            usernames=[user['username'] for user in users],
+            operation=GROUP_MEMBERSHIP_OPERATION_REMOVE,
+        )
 
     # sudo user management methods
 
@@ -598,6 +595,37 @@ class AccountsService:
 
         return self.user_dao.convert_from_db(user)
 
+    @staticmethod
+    def check_password_policy(
+        password: str, password_policy: CognitoUserPoolPasswordPolicy
+    ):
+        # Validate password compliance versus Cognito user pool password policy
+        # Cognito: https://docs.aws.amazon.com/cognito/latest/developerguide/user-pool-settings-policies.html
+        if len(password) < password_policy.minimum_length:
+            raise exceptions.invalid_params(
+                f'Password should be greater than {password_policy.minimum_length} characters'
+            )
+        elif len(password) > 256:
+            raise exceptions.invalid_params('Password can be up to 256 characters')
+        elif password_policy.require_numbers and re.search('[0-9]', password) is None:
+            raise exceptions.invalid_params('Password should include at least 1 number')
+        elif password_policy.require_uppercase and re.search('[A-Z]', password) is None:
+            raise exceptions.invalid_params(
+                'Password should include at least 1 uppercase letter'
+            )
+        elif password_policy.require_lowercase and re.search('[a-z]', password) is None:
+            raise exceptions.invalid_params(
+                'Password should include at least 1 lowercase letter'
+            )
+        elif (
+            password_policy.require_symbols
+            and re.search('[\^\$\*\.\[\]{}\(\)\?"!@#%&\/\\,><\':;\|_~`=\+\-]', password)
+            is None
+        ):
+            raise exceptions.invalid_params(
+                'Password should include at least 1 of these special characters: ^ $ * . [ ] { } ( ) ? " ! @ # % & / \ , > < \' : ; | _ ~ ` = + -'
+            )
+
     def create_user(self, user: User, email_verified: bool = False) -> User:
         """
         create a new user
@@ -631,46 +659,9 @@ class AccountsService:
             if Utils.is_empty(password):
                 raise exceptions.invalid_params('Password is required')
 
-            user_pool_password_policy = self.user_pool.describe_password_policy()
-            # Validate password compliance versus Cognito user pool password policy
-            # Cognito: https://docs.aws.amazon.com/cognito/latest/developerguide/user-pool-settings-policies.html
-            if len(password) < user_pool_password_policy.minimum_length:
-                raise exceptions.invalid_params(
-                    f'Password should be greater than {user_pool_password_policy.minimum_length} characters'
-                )
-            elif len(password) > 256:
-                raise exceptions.invalid_params('Password can be up to 256 characters')
-            elif (
-                user_pool_password_policy.require_numbers
-                and re.search('[0-9]', password) is None
-            ):
-                raise exceptions.invalid_params(
-                    'Password should include at least 1 number'
-                )
-            elif (
-                user_pool_password_policy.require_uppercase
-                and re.search('[A-Z]', password) is None
-            ):
-                raise exceptions.invalid_params(
-                    'Password should include at least 1 uppercase letter'
-                )
-            elif (
-                user_pool_password_policy.require_lowercase
-                and re.search('[a-z]', password) is None
-            ):
-                raise exceptions.invalid_params(
-                    'Password should include at least 1 lowercase letter'
-                )
-            elif (
-                user_pool_password_policy.require_symbols
-                and re.search(
-                    '[\^\$\*\.\[\]{}\(\)\?"!@#%&\/\\,><\':;\|_~`=\+\-]', password
-                )
-                is None
-            ):
-                raise exceptions.invalid_params(
-                    'Password should include at least 1 of these special characters: ^ $ * . [ ] { } ( ) ? " ! @ # % & / \ , > < \' : ; | _ ~ ` = + -'
-                )
+            self.check_password_policy(
+                password, self.user_pool.describe_password_policy()
+            )
         else:
             self.logger.debug('create_user() - setting password to random value')
             password = Utils.generate_password(8, 2, 2, 2, 2)
@@ -979,12 +970,10 @@ class AccountsService:
     def list_users(self, request: ListUsersRequest) -> ListUsersResult:
         return self.user_dao.list_users(request)
 
-    def change_ldap_password(self, username: str, password: str):
+    def create_password_file(self, password: str) -> str:
         """
-        Change password for given username in ldap or ad
-        :param username:
-        :param password:
-        :return:
+        write the password to a file in the directory service automation dir, to be synced by the
+        accounts.sync-password or accounts.sync-users task. the password is not sent in the task payload.
         """
         if not Utils.is_dir(self.ds_automation_dir):
             os.makedirs(self.ds_automation_dir)
@@ -995,6 +984,16 @@ class AccountsService:
         password_file = os.path.join(temp_dir, 'password.txt')
         with open(password_file, 'w') as f:
             f.write(password)
+        return password_file
+
+    def change_ldap_password(self, username: str, password: str):
+        """
+        Change password for given username in ldap or ad
+        :param username:
+        :param password:
+        :return:
+        """
+        password_file = self.create_password_file(password)
 
         is_user_synced = self.ldap_client.is_existing_user(username)
         if not is_user_synced:
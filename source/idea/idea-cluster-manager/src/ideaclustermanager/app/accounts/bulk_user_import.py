@@ -0,0 +1,509 @@
+#  Copyright Amazon.com, Inc. or its affiliates. All Rights Reserved.
+#
+#  Licensed under the Apache License, Version 2.0 (the "License"). You may not use this file except in compliance
+#  with the License. A copy of the License is located at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+#  or in the 'license' file accompanying this file. This file is distributed on an 'AS IS' BASIS, WITHOUT WARRANTIES
+#  OR CONDITIONS OF ANY KIND, express or implied. See the License for the specific language governing permissions
+#  and limitations under the License.
+
+from ideasdk.aws import AwsRateGovernor, TokenBucket
+from ideasdk.context import SocaContext
+from ideasdk.utils import Utils
+from ideadatamodel import (
+    exceptions,
+    errorcodes,
+    constants,
+    User,
+    BatchCreateUsersResult,
+)
+
+from ideaclustermanager.app.accounts import auth_constants
+from ideaclustermanager.app.accounts.accounts_service import AccountsService, nonce
+from ideaclustermanager.app.accounts.auth_utils import AuthUtils
+from ideaclustermanager.app.accounts.cognito_user_pool import (
+    CognitoUserPoolPasswordPolicy,
+)
+
+from typing import Any, Callable, Dict, Iterable, List, Optional
+from concurrent.futures import ThreadPoolExecutor
+import botocore.exceptions
+import math
+import os
+import re
+import time
+
+# max. no. of users in a single Accounts.BatchCreateUsers request
+BULK_IMPORT_MAX_USERS = 500
+
+# max. no. of users in a single accounts.sync-users or accounts.create-home-directories task
+BULK_IMPORT_TASK_MAX_USERS = 100
+
+# AdminCreateUser and the other admin APIs used during onboarding share the Cognito "UserCreation" and
+# "UserAccountAdministration" quotas with interactive requests. the default rate leaves headroom for the web portal.
+DEFAULT_BULK_IMPORT_COGNITO_RATE = 10
+DEFAULT_BULK_IMPORT_COGNITO_CONCURRENCY = 4
+BULK_IMPORT_MAX_THROTTLE_RETRIES = 5
+
+# Cognito API calls per user, when SSO is enabled and the user is a sudo user:
+# AdminCreateUser, AdminLinkProviderForUser and AdminAddUserToGroup
+BULK_IMPORT_MAX_COGNITO_CALLS_PER_USER = 3
+
+COGNITO_IDP = 'cognito-idp'
+
+CHECKPOINT_VERSION = 2
+
+
+class BulkUserImport:
+    """
+    Creates users in bulk, for onboarding users from a CSV file or an identity provider.
+
+    Compared to creating users one at a time using AccountsService.create_user():
+    * existing users and groups are read using batch gets. existing users are reported and skipped, so that an
+        interrupted import can be submitted again.
+    * uids and gids for all users of the request are reserved with a single atomic update each.
+    * Cognito API calls are paced using a token bucket shared by all requests, and reduced when throttled.
+    * users, personal groups and group memberships are saved using batch writes.
+    * directory service sync and home directory creation are sent as batch tasks (accounts.sync-users,
+        accounts.create-home-directories). group memberships are synced to the directory service per group by the
+        accounts.sync-users task, after the users are created in the directory service.
+
+    A user that already exists in the Cognito user pool, but not in the DB (eg. the previous import was interrupted
+    after creating the Cognito user) is reconciled instead of failing the user.
+
+    Users are saved using conditional writes. users created by another request (create-user or another import) after
+    the existing users were read are reported as existing and are not modified.
+    """
+
+    def __init__(self, context: SocaContext, accounts_service: AccountsService):
+        self.context = context
+        self.logger = context.logger('bulk-user-import')
+        self.accounts = accounts_service
+
+        cognito_rate = self.context.config().get_float(
+            'cluster-manager.accounts.bulk_import.cognito_rate',
+            default=DEFAULT_BULK_IMPORT_COGNITO_RATE,
+        )
+        self.cognito_concurrency = self.context.config().get_int(
+            'cluster-manager.accounts.bulk_import.cognito_concurrency',
+            default=DEFAULT_BULK_IMPORT_COGNITO_CONCURRENCY,
+        )
+        self.rate_governor = AwsRateGovernor(logger=self.logger)
+        self.rate_governor.add_bucket(
+            COGNITO_IDP, TokenBucket(rate=cognito_rate, burst=cognito_rate)
+        )
+
+    @staticmethod
+    def get_request_timeout_seconds(
+        user_count: int, cognito_rate: float = DEFAULT_BULK_IMPORT_COGNITO_RATE
+    ) -> int:
+        """
+        timeout for an Accounts.BatchCreateUsers request. Cognito API calls of the users are paced at cognito_rate.
+        the estimate is doubled to allow for throttled calls, which are retried at a reduced rate, and includes a
+        minute for the DB writes.
+        """
+        cognito_seconds = (
+            user_count * BULK_IMPORT_MAX_COGNITO_CALLS_PER_USER / max(cognito_rate, 1)
+        )
+        return int(math.ceil(cognito_seconds * 2)) + 60
+
+    def call_user_pool(self, fn: Callable[[], Any], tokens: float = 1) -> Any:
+        """
+        invoke a Cognito user pool operation. throttled operations are retried at a reduced rate.
+        """
+        attempt = 0
+        while True:
+            self.rate_governor.acquire(COGNITO_IDP, tokens)
+            try:
+                result = fn()
+            except botocore.exceptions.ClientError as e:
+                error_code = e.response['Error']['Code']
+                self.rate_governor.on_response(COGNITO_IDP, error_code)
+                if (
+                    AwsRateGovernor.is_throttling_error(error_code)
+                    and attempt < BULK_IMPORT_MAX_THROTTLE_RETRIES
+                ):
+                    attempt += 1
+                    continue
+                raise e
+            self.rate_governor.on_response(COGNITO_IDP)
+            return result
+
+    def build_user(
+        self,
+        user: User,
+        email_verified: bool,
+        password_policy: Optional[CognitoUserPoolPasswordPolicy],
+    ) -> Dict:
+        """
+        validate the user and build the DB entry. uid and gid are assigned later, if not provided.
+        """
+        username = AuthUtils.sanitize_username(user.username)
+        if Utils.is_empty(username):
+            raise exceptions.invalid_params('user.username is required')
+        if not re.match(auth_constants.USERNAME_REGEX, username):
+            raise exceptions.invalid_params(
+                f'user.username must match regex: {auth_constants.USERNAME_REGEX}'
+            )
+        AuthUtils.check_allowed_username(username)
+
+        email = AuthUtils.sanitize_email(user.email)
+
+        password = user.password
+        if email_verified:
+            if Utils.is_empty(password):
+                raise exceptions.invalid_params('Password is required')
+            self.accounts.check_password_policy(password, password_policy)
+        else:
+            password = Utils.generate_password(8, 2, 2, 2, 2)
+
+        login_shell = user.login_shell
+        if Utils.is_empty(login_shell):
+            login_shell = auth_constants.DEFAULT_LOGIN_SHELL
+
+        group_name = self.accounts.group_name_helper.get_user_group(username)
+
+        # the user is added to the personal group and the default project group, after the additional groups
+        additional_groups = []
+        for additional_group in Utils.get_as_list(user.additional_groups, default=[]):
+            if additional_group == group_name or additional_group in additional_groups:
+                continue
+            additional_groups.append(additional_group)
+        additional_groups.append(group_name)
+        default_project_group = (
+            self.accounts.group_name_helper.get_default_project_group()
+        )
+        if default_project_group not in additional_groups:
+            additional_groups.append(default_project_group)
+
+        return {
+            'username': username,
+            'email': email,
+            'password': password,
+            'uid': user.uid,
+            'gid': user.gid,
+            'group_name': group_name,
+            'additional_groups': additional_groups,
+            'login_shell': login_shell,
+            'home_dir': os.path.join(auth_constants.USER_HOME_DIR_BASE, username),
+            'sudo': Utils.get_as_bool(user.sudo, False),
+            'enabled': True,
+        }
+
+    def create_user_pool_user(
+        self, entry: Dict, email_verified: bool, user_pool_groups: List[str]
+    ):
+        user_pool = self.accounts.user_pool
+        username = entry['username']
+        password = entry['password']
+
+        try:
+            # AdminCreateUser + AdminSetUserPassword when the email is verified
+            self.call_user_pool(
+                lambda: user_pool.admin_create_user(
+                    username=username,
+                    email=entry['email'],
+                    password=password,
+                    email_verified=email_verified,
+                ),
+                tokens=2 if email_verified else 1,
+            )
+        except botocore.exceptions.ClientError as e:
+            if e.response['Error']['Code'] != 'UsernameExistsException':
+                raise e
+            # the user may have been created by another request since the existing users were read
+            if self.accounts.user_dao.get_user(username) is not None:
+                raise exceptions.soca_exception(
+                    error_code=errorcodes.AUTH_USER_ALREADY_EXISTS,
+                    message=f'username: {username} already exists.',
+                )
+            self.logger.warning(
+                f'user: {username} already exists in the user pool, but not in the DB. '
+                f'reconciling user pool entry ...'
+            )
+            if email_verified:
+                self.call_user_pool(
+                    lambda: user_pool.admin_set_password(
+                        username, password, permanent=True
+                    )
+                )
+
+        if self.accounts.is_sso_enabled():
+            self.call_user_pool(
+                lambda: user_pool.admin_link_idp_for_user(username, entry['email'])
+            )
+
+        if entry['sudo']:
+            self.call_user_pool(lambda: user_pool.admin_add_sudo_user(username))
+
+        for group_name in user_pool_groups:
+            self.call_user_pool(
+                lambda: user_pool.admin_add_user_to_group(
+                    username=username, group_name=group_name
+                )
+            )
+
+    def create_users(
+        self, users: List[User], email_verified: bool = False
+    ) -> BatchCreateUsersResult:
+        if Utils.is_empty(users):
+            raise exceptions.invalid_params('users is required')
+        if len(users) > BULK_IMPORT_MAX_USERS:
+            raise exceptions.invalid_params(
+                f'a maximum of {BULK_IMPORT_MAX_USERS} users can be created in a single request'
+            )
+
+        start_time = time.time()
+        failed: Dict[str, str] = {}
+        entries: Dict[str, Dict] = {}
+
+        # validate
+        password_policy = None
+        if email_verified:
+            password_policy = self.accounts.user_pool.describe_password_policy()
+        for user in users:
+            username = Utils.get_as_string(user.username, default='')
+            try:
+                entry = self.build_user(user, email_verified, password_policy)
+            except exceptions.SocaException as e:
+                failed[username] = e.message
+                continue
+            username = entry['username']
+            if username in entries:
+                failed[username] = f'duplicate username: {username}'
+                continue
+            entries[username] = entry
+        # rows with a duplicate username are ambiguous. none of them are created.
+        for username in failed:
+            entries.pop(username, None)
+
+        # users that already exist are skipped
+        existing = list(self.accounts.user_dao.batch_get_users(entries.keys()).keys())
+        for username in existing:
+            del entries[username]
+
+        # groups must exist and be enabled, except for the personal groups of the users
+        group_names = set()
+        for entry in entries.values():
+            group_names.update(entry['additional_groups'])
+        groups = self.accounts.group_dao.batch_get_groups(group_names)
+        for username, entry in list(entries.items()):
+            for group_name in entry['additional_groups']:
+                if group_name == entry['group_name']:
+                    continue
+                group = groups.get(group_name)
+                if group is None:
+                    failed[username] = f'group: {group_name} not found.'
+                elif not group['enabled']:
+                    failed[username] = (
+                        f'cannot add users to a disabled user group: {group_name}'
+                    )
+                else:
+                    continue
+                del entries[username]
+                break
+
+        # reserve uid and gid ranges. ids of users that fail later are not reused, same as create_user().
+        entries_without_uid = [
+            entry for entry in entries.values() if entry['uid'] is None
+        ]
+        if len(entries_without_uid) > 0:
+            uids = self.accounts.sequence_config_dao.reserve_uids(
+                len(entries_without_uid)
+            )
+            for entry, uid in zip(entries_without_uid, uids):
+                entry['uid'] = uid
+        entries_without_gid = [
+            entry for entry in entries.values() if entry['gid'] is None
+        ]
+        if len(entries_without_gid) > 0:
+            gids = self.accounts.sequence_config_dao.reserve_gids(
+                len(entries_without_gid)
+            )
+            for entry, gid in zip(entries_without_gid, gids):
+                entry['gid'] = gid
+
+        # create user pool entries
+        with ThreadPoolExecutor(
+            max_workers=max(1, self.cognito_concurrency),
+            thread_name_prefix='bulk-user-import',
+        ) as executor:
+            futures = {}
+            for username, entry in entries.items():
+                user_pool_groups = [
+                    group_name
+                    for group_name in entry['additional_groups']
+                    if group_name in groups
+                    and groups[group_name]['group_type']
+                    not in (constants.GROUP_TYPE_USER, constants.GROUP_TYPE_PROJECT)
+                ]
+                futures[username] = executor.submit(
+                    self.create_user_pool_user, entry, email_verified, user_pool_groups
+                )
+            for username, future in futures.items():
+                error = future.exception()
+                if error is None:
+                    continue
+                if isinstance(error, exceptions.SocaException):
+                    if error.error_code == errorcodes.AUTH_USER_ALREADY_EXISTS:
+                        existing.append(username)
+                    else:
+                        failed[username] = error.message
+                else:
+                    failed[username] = str(error)
+                del entries[username]
+
+        if len(entries) == 0:
+            return BatchCreateUsersResult(created=[], existing=existing, failed=failed)
+
+        # users. users created by another request since the existing users were read are skipped.
+        created_users, created_by_others = self.accounts.user_dao.batch_create_users(
+            [
+                {key: value for key, value in entry.items() if key != 'password'}
+                for entry in entries.values()
+            ]
+        )
+        for username in created_by_others:
+            existing.append(username)
+            del entries[username]
+
+        if len(entries) == 0:
+            return BatchCreateUsersResult(created=[], existing=existing, failed=failed)
+
+        # personal groups and group memberships of the created users
+        personal_groups = {}
+        for username, entry in entries.items():
+            group_name = entry['group_name']
+            if group_name in groups or group_name in personal_groups:
+                continue
+            personal_groups[group_name] = {
+                'title': f"{username}'s Personal User Group",
+                'group_name': group_name,
+                'gid': entry['gid'],
+                'group_type': constants.GROUP_TYPE_USER,
+                'ref': username,
+                'enabled': True,
+            }
+        self.accounts.group_dao.batch_create_groups(list(personal_groups.values()))
+
+        self.accounts.group_members_dao.batch_create_memberships(
+            (group_name, username)
+            for username, entry in entries.items()
+            for group_name in entry['additional_groups']
+        )
+
+        # directory service and home directories
+        usernames = list(entries.keys())
+        for offset in range(0, len(usernames), BULK_IMPORT_TASK_MAX_USERS):
+            batch = usernames[offset : offset + BULK_IMPORT_TASK_MAX_USERS]
+            batch_id = nonce()
+            self.accounts.task_manager.send(
+                task_name='accounts.sync-users',
+                payload={
+                    'usernames': batch,
+                    'password_files': {
+                        username: self.accounts.create_password_file(
+                            entries[username]['password']
+                        )
+                        for username in batch
+                    },
+                },
+                message_group_id=f'bulk-user-import.{batch_id}',
+                message_dedupe_id=f'bulk-user-import.{batch_id}.sync-users',
+            )
+            self.accounts.task_manager.send(
+                task_name='accounts.create-home-directories',
+                payload={'usernames': batch},
+                message_group_id=f'bulk-user-import.{batch_id}',
+                message_dedupe_id=f'bulk-user-import.{batch_id}.create-home-directories',
+            )
+
+        duration = time.time() - start_time
+        self.logger.info(
+            f'bulk user import - created: {len(created_users)}, existing: {len(existing)}, failed: {len(failed)} '
+            f'in {duration:.1f}s ({len(created_users) / max(duration, 0.001):.1f} users/s), '
+            f'cognito throttled: {self.rate_governor.get_bucket(COGNITO_IDP).throttle_count} times'
+        )
+
+        return BatchCreateUsersResult(
+            created=[
+                self.accounts.user_dao.convert_from_db(user) for user in created_users
+            ],
+            existing=existing,
+            failed=failed,
+        )
+
+
+class BulkUserImportCheckpoint:
+    """
+    Progress of a bulk user import, saved to a local file after each batch, so that an interrupted import can be
+    resumed. users that were created or already existed are skipped when the import is resumed. failed users are
+    submitted again.
+
+    the checkpoint is keyed by username, so the import file can be edited between runs (eg. to fix the failed rows).
+    users that are removed from the import file are removed from the failed users.
+    """
+
+    def __init__(self, checkpoint_file: str):
+        self.checkpoint_file = checkpoint_file
+        # username -> created | existing
+        self.completed: Dict[str, str] = {}
+        # username -> error
+        self.failed: Dict[str, str] = {}
+
+    def load(self) -> bool:
+        """
+        :return: True if a checkpoint was loaded
+        """
+        if not os.path.isfile(self.checkpoint_file):
+            return False
+        with open(self.checkpoint_file, 'r') as f:
+            checkpoint = Utils.from_json(f.read())
+        if (
+            Utils.get_value_as_int('version', checkpoint, default=0)
+            != CHECKPOINT_VERSION
+        ):
+            return False
+        self.completed = Utils.get_value_as_dict('completed', checkpoint, default={})
+        self.failed = Utils.get_value_as_dict('failed', checkpoint, default={})
+        return True
+
+    def is_completed(self, username: str) -> bool:
+        return username in self.completed
+
+    def retain_failed(self, usernames: Iterable[str]):
+        """
+        remove the failed users that are not in the import file
+        """
+        usernames = set(usernames)
+        self.failed = {
+            username: error
+            for username, error in self.failed.items()
+            if username in usernames
+        }
+
+    def update(self, result: BatchCreateUsersResult):
+        for user in Utils.get_as_list(result.created, default=[]):
+            self.completed[user.username] = 'created'
+            self.failed.pop(user.username, None)
+        for username in Utils.get_as_list(result.existing, default=[]):
+            self.completed[username] = 'existing'
+            self.failed.pop(username, None)
+        for username, error in Utils.get_as_dict(result.failed, default={}).items():
+            self.failed[username] = error
+
+    def save(self):
+        checkpoint = {
+            'version': CHECKPOINT_VERSION,
+            'completed': self.completed,
+            'failed': self.failed,
+        }
+        checkpoint_dir = os.path.dirname(os.path.abspath(self.checkpoint_file))
+        os.makedirs(checkpoint_dir, exist_ok=True)
+        # write to a temp file and rename, so that a partially written checkpoint is never loaded
+        temp_file = f'{self.checkpoint_file}.{os.getpid()}.tmp'
+        with open(temp_file, 'w') as f:
+            f.write(Utils.to_json(checkpoint))
+        os.replace(temp_file, self.checkpoint_file)
@@ -19,9 +19,11 @@ from ideadatamodel import (
 )
 from ideasdk.context import SocaContext
 
-from typing import Optional, Dict
+from typing import Optional, Dict, Iterable, List
 from boto3.dynamodb.conditions import Attr
 
+BATCH_GET_MAX_KEYS = 100
+
 
 class GroupDAO:
     def __init__(self, context: SocaContext, logger=None):
@@ -103,6 +105,54 @@ class GroupDAO:
         )
         return created_group
 
+    def batch_create_groups(self, groups: List[Dict]) -> List[Dict]:
+        """
+        create groups using batch writes.
+        batch writes do not support condition expressions. callers must check for existing groups (batch_get_groups).
+        """
+        created_groups = []
+        with self.table.batch_writer(overwrite_by_pkeys=['group_name']) as batch:
+            for group in groups:
+                if Utils.is_empty(Utils.get_value_as_string('group_name', group)):
+                    raise exceptions.invalid_params('group_name is required')
+                created_group = {
+                    **group,
+                    'created_on': Utils.current_time_ms(),
+                    'updated_on': Utils.current_time_ms(),
+                }
+                batch.put_item(Item=created_group)
+                created_groups.append(created_group)
+        return created_groups
+
+    def batch_get_groups(self, group_names: Iterable[str]) -> Dict[str, Dict]:
+        """
+        get groups in batches of 100. groups that do not exist are skipped.
+        :return: group name -> group
+        """
+        keys = [
+            {'group_name': group_name}
+            for group_name in dict.fromkeys(group_names)
+            if Utils.is_not_empty(group_name)
+        ]
+        table_name = self.get_table_name()
+        groups = {}
+        for offset in range(0, len(keys), BATCH_GET_MAX_KEYS):
+            request_items = {
+                table_name: {'Keys': keys[offset : offset + BATCH_GET_MAX_KEYS]}
+            }
+            while Utils.is_not_empty(request_items):
+                result = (
+                    self.context.aws()
+                    .dynamodb_table()
+                    .batch_get_item(RequestItems=request_items)
+                )
+                for group in Utils.get_value_as_list(
+                    table_name, Utils.get_value_as_dict('Responses', result, {}), []
+                ):
+                    groups[group['group_name']] = group
+                request_items = Utils.get_value_as_dict('UnprocessedKeys', result)
+        return groups
+
     def get_group(self, group_name: str) -> Optional[Dict]:
         if Utils.is_empty(group_name):
             raise exceptions.invalid_params('group_name is required')
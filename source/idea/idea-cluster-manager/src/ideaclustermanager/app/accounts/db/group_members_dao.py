@@ -21,7 +21,7 @@ from ideasdk.context import SocaContext
 from ideaclustermanager.app.accounts.auth_utils import AuthUtils
 from ideaclustermanager.app.accounts.db.user_dao import UserDAO
 
-from typing import List
+from typing import Iterable, List, Tuple
 from boto3.dynamodb.conditions import Key
 
 
@@ -63,6 +63,23 @@ class GroupMembersDAO:
 
         self.table.put_item(Item={'group_name': group_name, 'username': username})
 
+    def batch_create_memberships(self, memberships: Iterable[Tuple[str, str]]):
+        """
+        :param memberships: (group name, username) tuples
+        """
+        with self.table.batch_writer(
+            overwrite_by_pkeys=['group_name', 'username']
+        ) as batch:
+            for group_name, username in memberships:
+                if Utils.is_empty(group_name):
+                    raise exceptions.invalid_params('group_name is required')
+                batch.put_item(
+                    Item={
+                        'group_name': group_name,
+                        'username': AuthUtils.sanitize_username(username),
+                    }
+                )
+
     def delete_membership(self, group_name: str, username: str):
         username = AuthUtils.sanitize_username(username)
         if Utils.is_empty(group_name):
@@ -70,6 +87,16 @@ class GroupMembersDAO:
 
         self.table.delete_item(Key={'group_name': group_name, 'username': username})
 
+    def is_member(self, group_name: str, username: str) -> bool:
+        username = AuthUtils.sanitize_username(username)
+        if Utils.is_empty(group_name):
+            raise exceptions.invalid_params('group_name is required')
+
+        result = self.table.get_item(
+            Key={'group_name': group_name, 'username': username}
+        )
+        return Utils.get_value_as_dict('Item', result) is not None
+
     def has_users_in_group(self, group_name: str) -> bool:
         query_result = self.table.query(
             Limit=1,
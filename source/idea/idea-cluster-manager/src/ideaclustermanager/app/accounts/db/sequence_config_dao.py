@@ -10,6 +10,7 @@
 #  and limitations under the License.
 
 from ideasdk.utils import Utils
+from ideadatamodel import exceptions
 from ideasdk.context import SocaContext
 from boto3.dynamodb.conditions import Attr
 import botocore.exceptions
@@ -70,19 +71,33 @@ class SequenceConfigDAO:
             else:
                 raise e
 
-    def _next(self, key: str) -> int:
+    def _reserve(self, key: str, count: int) -> int:
+        """
+        atomically reserve a range of count ids
+        :return: the first id of the range
+        """
+        if count < 1:
+            raise exceptions.invalid_params('count must be greater than 0')
         result = self.table.update_item(
             Key={'key': key},
             UpdateExpression='ADD #value :value',
             ExpressionAttributeNames={'#value': 'value'},
-            ExpressionAttributeValues={':value': 1},
+            ExpressionAttributeValues={':value': count},
             ReturnValues='ALL_OLD',
         )
         attributes = result['Attributes']
         return Utils.get_value_as_int('value', attributes)
 
     def next_uid(self) -> int:
-        return self._next(KEY_USERS)
+        return self._reserve(KEY_USERS, 1)
 
     def next_gid(self) -> int:
-        return self._next(KEY_GROUPS)
+        return self._reserve(KEY_GROUPS, 1)
+
+    def reserve_uids(self, count: int) -> range:
+        start = self._reserve(KEY_USERS, count)
+        return range(start, start + count)
+
+    def reserve_gids(self, count: int) -> range:
+        start = self._reserve(KEY_GROUPS, count)
+        return range(start, start + count)
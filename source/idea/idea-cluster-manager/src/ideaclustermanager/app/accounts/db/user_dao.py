@@ -17,8 +17,11 @@ from ideasdk.context import SocaContext
 from ideaclustermanager.app.accounts.auth_utils import AuthUtils
 from ideaclustermanager.app.accounts.cognito_user_pool import CognitoUserPool
 
-from typing import Optional, Dict
+from typing import Optional, Dict, Iterable, List, Tuple
 from boto3.dynamodb.conditions import Attr
+import botocore.exceptions
+
+BATCH_GET_MAX_KEYS = 100
 
 
 class UserDAO:
@@ -120,6 +123,59 @@ class UserDAO:
         )
         return created_user
 
+    def batch_create_users(self, users: List[Dict]) -> Tuple[List[Dict], List[str]]:
+        """
+        create users that do not exist, using conditional writes.
+        batch writes do not support condition expressions, so users are written one at a time. callers are expected
+        to skip users that are known to exist (batch_get_users).
+        :return: (created users, usernames of the users that already exist)
+        """
+        created_users = []
+        existing_usernames = []
+        for user in users:
+            try:
+                created_users.append(self.create_user(user))
+            except botocore.exceptions.ClientError as e:
+                if e.response['Error']['Code'] != 'ConditionalCheckFailedException':
+                    raise e
+                existing_usernames.append(
+                    AuthUtils.sanitize_username(
+                        Utils.get_value_as_string('username', user)
+                    )
+                )
+        return created_users, existing_usernames
+
+    def batch_get_users(self, usernames: Iterable[str]) -> Dict[str, Dict]:
+        """
+        get users in batches of 100. users that do not exist are skipped.
+        :return: username -> user
+        """
+        keys = [
+            {'username': username}
+            for username in dict.fromkeys(
+                AuthUtils.sanitize_username(username) for username in usernames
+            )
+            if Utils.is_not_empty(username)
+        ]
+        table_name = self.get_table_name()
+        users = {}
+        for offset in range(0, len(keys), BATCH_GET_MAX_KEYS):
+            request_items = {
+                table_name: {'Keys': keys[offset : offset + BATCH_GET_MAX_KEYS]}
+            }
+            while Utils.is_not_empty(request_items):
+                result = (
+                    self.context.aws()
+                    .dynamodb_table()
+                    .batch_get_item(RequestItems=request_items)
+                )
+                for user in Utils.get_value_as_list(
+                    table_name, Utils.get_value_as_dict('Responses', result, {}), []
+                ):
+                    users[user['username']] = user
+                request_items = Utils.get_value_as_dict('UnprocessedKeys', result)
+        return users
+
     def get_user(self, username: str) -> Optional[Dict]:
         username = AuthUtils.sanitize_username(username)
         _lu_start = Utils.current_time_ms()
@@ -0,0 +1,85 @@
+#  Copyright Amazon.com, Inc. or its affiliates. All Rights Reserved.
+#
+#  Licensed under the Apache License, Version 2.0 (the "License"). You may not use this file except in compliance
+#  with the License. A copy of the License is located at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+#  or in the 'license' file accompanying this file. This file is distributed on an 'AS IS' BASIS, WITHOUT WARRANTIES
+#  OR CONDITIONS OF ANY KIND, express or implied. See the License for the specific language governing permissions
+#  and limitations under the License.
+
+from ideasdk.context import SocaContext
+from ideasdk.utils import Utils
+
+from ideaclustermanager.app.tasks.task_manager import TaskManager
+
+from typing import List, Optional
+
+# max. no. of users in a single accounts.sync-group-membership task. keeps the task message well below the SQS limit.
+MEMBERSHIP_SYNC_MAX_USERS = 500
+
+GROUP_MEMBERSHIP_OPERATION_ADD = 'add'
+GROUP_MEMBERSHIP_OPERATION_REMOVE = 'remove'
+
+
+class GroupMembershipSync:
+    """
+    Syncs group membership changes to the directory service in batches.
+
+    Callers pass all users whose membership of a group changed in a single call (eg. add users to group, bulk user
+    import). The changes are sent as accounts.sync-group-membership tasks in the message group of the group, with up
+    to 500 users per task, before the call returns.
+
+    Changes are not buffered in memory, so that they are not lost if the server is restarted after the group_members
+    table is updated. If a task cannot be sent, the error is raised to the caller.
+    """
+
+    def __init__(self, context: SocaContext, task_manager: Optional[TaskManager]):
+        self.context = context
+        self.logger = context.logger('group-membership-sync')
+        self.task_manager = task_manager
+
+    def add_changes(self, group_name: str, usernames: List[str], operation: str):
+        if self.task_manager is None:
+            return
+
+        # dedupe
+        usernames = list(dict.fromkeys(usernames))
+        for offset in range(0, len(usernames), MEMBERSHIP_SYNC_MAX_USERS):
+            batch = usernames[offset : offset + MEMBERSHIP_SYNC_MAX_USERS]
+            payload = {
+                'group_name': group_name,
+                'add': batch if operation == GROUP_MEMBERSHIP_OPERATION_ADD else [],
+                'remove': batch
+                if operation == GROUP_MEMBERSHIP_OPERATION_REMOVE
+                else [],
+            }
+            self.task_manager.send(
+                task_name='accounts.sync-group-membership',
+                payload=payload,
+                message_group_id=group_name,
+                # the same change can be sent again within the SQS de-duplication interval
+                # eg. add, remove and add the same user
+                message_dedupe_id=Utils.uuid(),
+            )
+
+    def requeue_add(self, group_name: str, username: str):
+        """
+        retry adding a user to a group, after the pending directory service sync of the user.
+
+        the add is sent in the message group of the user, which is also used for the accounts.sync-user and
+        accounts.create-home-directory tasks of the user, so it is executed after the user is created in the
+        directory service.
+        """
+        self.task_manager.send(
+            task_name='accounts.sync-group-membership',
+            payload={
+                'group_name': group_name,
+                'add': [username],
+                'remove': [],
+                'requeued': True,
+            },
+            message_group_id=username,
+            message_dedupe_id=Utils.uuid(),
+        )
@@ -61,6 +61,9 @@ DEFAULT_LDAP_PAGE_SIZE = 100
 DEFAULT_LDAP_PAGE_START = 0
 DEFAULT_LDAP_COOKIE = ''
 
+# attributes required by convert_ldap_group
+GROUP_ATTRIBUTES = ['cn', 'gidNumber', 'memberUid']
+
 UID_MIN = 5000
 UID_MAX = 65533  # 65534 is for "nobody" and 65535 is reserved
 GID_MIN = 5000
@@ -211,6 +214,13 @@ class AbstractLDAPClient:
         page_size: int = None,
         cookie: str = None,
     ) -> Dict:
+        """
+        Simple Paged Results (RFC 2696) based search. returns a single page of results.
+
+        the paged results cookie is returned base64 encoded, and must be passed as is to fetch the next page.
+        cookie is None after the last page.
+        total is the result set size estimated by the server, or None if the server does not provide an estimate.
+        """
         trace_message = f'ldapsearch -x -b "{base}" -D "{self.ldap_root_bind}" -H {self.ldap_uri} "{filterstr}"'
         if attrlist is not None:
             trace_message = f'{trace_message} {" ".join(attrlist)}'
@@ -218,10 +228,13 @@ class AbstractLDAPClient:
         result = []
         with self.get_ldap_root_connection() as conn:
             page_size = Utils.get_as_int(page_size, DEFAULT_LDAP_PAGE_SIZE)
-            if cookie is None:
+            if Utils.is_empty(cookie):
                 cookie_b = DEFAULT_LDAP_COOKIE
             else:
-                cookie_b = base64.b64decode(cookie)
+                try:
+                    cookie_b = base64.b64decode(cookie, validate=True)
+                except ValueError:
+                    raise exceptions.invalid_params('invalid cursor')
             serverctrls = [
                 SimplePagedResultsControl(True, size=page_size, cookie=cookie_b)
             ]
@@ -238,10 +251,14 @@ class AbstractLDAPClient:
                 if control.controlType == SimplePagedResultsControl.controlType
             ]
             if controls and len(controls) > 0:
+                total = controls[0].size
+                next_cookie = controls[0].cookie
                 return {
                     'result': result,
-                    'total': None,
-                    'cookie': Utils.from_bytes(base64.b64encode(controls[0].cookie)),
+                    'total': total if total is not None and total > 0 else None,
+                    'cookie': Utils.from_bytes(base64.b64encode(next_cookie))
+                    if next_cookie
+                    else None,
                 }
             else:
                 return {'result': result, 'total': None, 'cookie': None}
@@ -654,7 +671,15 @@ class AbstractLDAPClient:
         username_filter: SocaFilter = None,
         page_size: int = None,
         start: int = 0,
+        cursor: str = None,
     ) -> Tuple[List[Dict], SocaPaginator]:
+        """
+        search groups, a page at a time.
+
+        for Active Directory, pages are fetched using the paged results cookie of the previous page, returned as
+        paginator.cursor. start is not used to skip results and paginator.total is the server estimate, if available.
+        for OpenLDAP, pages are fetched using start (VLV offset) and paginator.total is the size of the result set.
+        """
         result = []
 
         group_name_token = None
@@ -686,13 +711,19 @@ class AbstractLDAPClient:
                 group_name=group_name_token, username=username_token
             )
 
+        next_cursor = None
         if self.is_activedirectory():
             search_result = self.simple_paginated_search(
-                base=self.ldap_group_base, filterstr=filterstr
+                base=self.ldap_group_base,
+                filterstr=filterstr,
+                attrlist=GROUP_ATTRIBUTES,
+                page_size=page_size,
+                cookie=cursor,
             )
 
             ldap_result = Utils.get_value_as_list('result', search_result, default=[])
-            total = len(ldap_result)
+            total = Utils.get_value_as_int('total', search_result)
+            next_cursor = Utils.get_value_as_string('cookie', search_result)
 
         else:
             search_result = self.sssvlv_paginated_search(
@@ -716,16 +747,23 @@ class AbstractLDAPClient:
                     continue
                 result.append(user_group)
 
-        return result, SocaPaginator(page_size=page_size, start=start, total=total)
+        return result, SocaPaginator(
+            page_size=page_size, start=start, total=total, cursor=next_cursor
+        )
+
+    def build_group_member_value(self, username: str) -> Tuple[str, bytes]:
+        """
+        :return: group membership attribute and value for the user
+        """
+        return 'memberUid', Utils.to_bytes(username)
 
     def add_user_to_group(self, usernames: List[str], group_name: str):
         try:
             group_dn = self.build_group_dn(group_name)
             group_attrs = []
             for username in usernames:
-                group_attrs.append(
-                    (ldap.MOD_ADD, 'memberUid', [Utils.to_bytes(username)])
-                )
+                attr, value = self.build_group_member_value(username)
+                group_attrs.append((ldap.MOD_ADD, attr, [value]))
             self.modify_s(group_dn, group_attrs)
         except ldap.TYPE_OR_VALUE_EXISTS:
             pass
@@ -734,9 +772,60 @@ class AbstractLDAPClient:
         group_dn = self.build_group_dn(group_name)
         mod_attrs = []
         for username in usernames:
-            mod_attrs.append((ldap.MOD_DELETE, 'memberUid', [Utils.to_bytes(username)]))
+            attr, value = self.build_group_member_value(username)
+            mod_attrs.append((ldap.MOD_DELETE, attr, [value]))
         self.modify_s(group_dn, mod_attrs)
 
+    def update_group_members(
+        self,
+        group_name: str,
+        add_usernames: List[str] = None,
+        remove_usernames: List[str] = None,
+    ) -> Dict[str, str]:
+        """
+        add and remove group members using a single multi-value modify.
+
+        the modify is atomic and fails as a whole if any of the changes cannot be applied (eg. a user is already
+        a member of the group). in that case, the changes are applied per user. users already added or removed
+        are not considered as failures.
+
+        :return: username -> error, for the changes that could not be applied
+        """
+        group_dn = self.build_group_dn(group_name)
+        changes = []
+        for username in add_usernames or []:
+            attr, value = self.build_group_member_value(username)
+            changes.append((username, (ldap.MOD_ADD, attr, [value])))
+        for username in remove_usernames or []:
+            attr, value = self.build_group_member_value(username)
+            changes.append((username, (ldap.MOD_DELETE, attr, [value])))
+
+        failed = {}
+        if len(changes) == 0:
+            return failed
+
+        try:
+            self.modify_s(group_dn, [mod for _, mod in changes])
+            return failed
+        except ldap.LDAPError as e:
+            self.logger.warning(
+                f'failed to update {len(changes)} members of group: {group_name} in a single modify ({e}). '
+                f'applying changes per user ...'
+            )
+
+        for username, mod in changes:
+            try:
+                self.modify_s(group_dn, [mod])
+            except ldap.TYPE_OR_VALUE_EXISTS:
+                # already a member
+                pass
+            except ldap.NO_SUCH_ATTRIBUTE:
+                # not a member
+                pass
+            except ldap.LDAPError as e:
+                failed[username] = str(e)
+        return failed
+
     def delete_group(self, group_name: str):
         if not self.is_existing_group(group_name):
             return
@@ -810,8 +899,15 @@ class AbstractLDAPClient:
         self.delete_s(user_dn)
 
     def search_users(
-        self, username_filter: SocaFilter, page_size: int = None, start: int = 0
+        self,
+        username_filter: SocaFilter,
+        page_size: int = None,
+        start: int = 0,
+        cursor: str = None,
     ) -> Tuple[List[Dict], SocaPaginator]:
+        """
+        search users, a page at a time. refer to search_groups for pagination using cursor and start.
+        """
         result = []
 
         filterstr = self.ldap_user_filterstr
@@ -831,13 +927,18 @@ class AbstractLDAPClient:
                     username=f'*{username_filter.like}*'
                 )
 
+        next_cursor = None
         if self.is_activedirectory():
             search_result = self.simple_paginated_search(
-                base=self.ldap_user_base, filterstr=filterstr
+                base=self.ldap_user_base,
+                filterstr=filterstr,
+                page_size=page_size,
+                cookie=cursor,
             )
 
             ldap_result = Utils.get_value_as_list('result', search_result)
-            total = len(ldap_result)
+            total = Utils.get_value_as_int('total', search_result)
+            next_cursor = Utils.get_value_as_string('cookie', search_result)
 
         else:
             search_result = self.sssvlv_paginated_search(
@@ -861,7 +962,9 @@ class AbstractLDAPClient:
                     continue
                 result.append(user)
 
-        return result, SocaPaginator(page_size=page_size, start=start, total=total)
+        return result, SocaPaginator(
+            page_size=page_size, start=start, total=total, cursor=next_cursor
+        )
 
     def authenticate_user(self, username: str, password: str) -> bool:
         try:
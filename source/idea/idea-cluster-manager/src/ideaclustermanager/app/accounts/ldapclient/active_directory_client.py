@@ -18,10 +18,9 @@ from ideaclustermanager.app.accounts.ldapclient.abstract_ldap_client import (
     LdapClientOptions,
 )
 
-from typing import Dict, Optional
+from typing import Dict, Optional, Tuple
 import ldap  # noqa
 import time
-from typing import List
 
 
 class ActiveDirectoryClient(AbstractLDAPClient):
@@ -381,34 +380,8 @@ class ActiveDirectoryClient(AbstractLDAPClient):
 
         return self.get_group(group_name)
 
-    def add_user_to_group(self, usernames: List[str], group_name: str):
-        try:
-            group_dn = self.build_group_dn(group_name)
-            group_attrs = []
-            for username in usernames:
-                group_attrs.append(
-                    (
-                        ldap.MOD_ADD,
-                        'member',
-                        [Utils.to_bytes(self.build_user_dn(username))],
-                    )
-                )
-            self.modify_s(group_dn, group_attrs)
-        except ldap.TYPE_OR_VALUE_EXISTS:
-            pass
-
-    def remove_user_from_group(self, usernames: List[str], group_name: str):
-        group_dn = self.build_group_dn(group_name)
-        mod_attrs = []
-        for username in usernames:
-            mod_attrs.append(
-                (
-                    ldap.MOD_DELETE,
-                    'member',
-                    [Utils.to_bytes(self.build_user_dn(username))],
-                )
-            )
-        self.modify_s(group_dn, mod_attrs)
+    def build_group_member_value(self, username: str) -> Tuple[str, bytes]:
+        return 'member', Utils.to_bytes(self.build_user_dn(username))
 
     def add_sudo_user(self, username: str):
         user_dn = self.build_user_dn(username)
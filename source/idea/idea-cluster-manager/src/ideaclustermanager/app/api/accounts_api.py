@@ -13,6 +13,7 @@ from ideasdk.api import BaseAPI, ApiInvocationContext
 from ideadatamodel.auth import (
     CreateUserRequest,
     CreateUserResult,
+    BatchCreateUsersRequest,
     GetUserRequest,
     GetUserResult,
     ModifyUserRequest,
@@ -68,6 +69,10 @@ class AccountsAPI(BaseAPI):
                 'scope': self.SCOPE_WRITE,
                 'method': self.create_user,
             },
+            'Accounts.BatchCreateUsers': {
+                'scope': self.SCOPE_WRITE,
+                'method': self.batch_create_users,
+            },
             'Accounts.GetUser': {'scope': self.SCOPE_READ, 'method': self.get_user},
             'Accounts.ModifyUser': {
                 'scope': self.SCOPE_WRITE,
@@ -171,6 +176,18 @@ class AccountsAPI(BaseAPI):
         created_user = self.context.accounts.create_user(request.user, email_verified)
         context.success(CreateUserResult(user=created_user))
 
+    def batch_create_users(self, context: ApiInvocationContext):
+        request = context.get_request_payload_as(BatchCreateUsersRequest)
+        if Utils.is_empty(request.users):
+            raise exceptions.invalid_params('users is required')
+
+        email_verified = Utils.get_as_bool(request.email_verified, False)
+
+        result = self.context.bulk_user_import.create_users(
+            request.users, email_verified
+        )
+        context.success(result)
+
     def get_user(self, context: ApiInvocationContext):
         request = context.get_request_payload_as(GetUserRequest)
         user = self.context.accounts.get_user(request.username)
@@ -293,6 +310,12 @@ class AccountsAPI(BaseAPI):
             is_sudo_authorization_required = payload.user is not None and Utils.is_true(
                 payload.user.sudo
             )
+        elif namespace == 'Accounts.BatchCreateUsers':
+            payload = context.get_request_payload_as(BatchCreateUsersRequest)
+            is_sudo_authorization_required = any(
+                Utils.is_true(user.sudo)
+                for user in Utils.get_as_list(payload.users, default=[])
+            )
         else:
             is_sudo_authorization_required = namespace in (
                 'Accounts.AddSudoUser',
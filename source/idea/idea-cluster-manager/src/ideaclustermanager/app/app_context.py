@@ -15,6 +15,7 @@ from ideasdk.utils import GroupNameHelper
 
 from ideaclustermanager.app.projects.projects_service import ProjectsService
 from ideaclustermanager.app.accounts.accounts_service import AccountsService
+from ideaclustermanager.app.accounts.bulk_user_import import BulkUserImport
 from ideaclustermanager.app.accounts.cognito_user_pool import CognitoUserPool
 from ideaclustermanager.app.accounts.ldapclient import (
     OpenLDAPClient,
@@ -41,6 +42,7 @@ class ClusterManagerAppContext(SocaContext):
         self.user_pool: Optional[CognitoUserPool] = None
         self.ldap_client: Optional[Union[OpenLDAPClient, ActiveDirectoryClient]] = None
         self.accounts: Optional[AccountsService] = None
+        self.bulk_user_import: Optional[BulkUserImport] = None
         self.task_manager: Optional[TaskManager] = None
         self.ad_automation_agent: Optional[ADAutomationAgent] = None
         self.email_templates: Optional[EmailTemplatesService] = None
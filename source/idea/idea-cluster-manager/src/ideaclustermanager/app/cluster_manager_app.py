@@ -41,7 +41,11 @@ from ideaclustermanager.app.accounts.account_tasks import (
     SyncGroupInDirectoryServiceTask,
     SyncPasswordInDirectoryServiceTask,
     GroupMembershipUpdatedTask,
+    GroupMembershipSyncTask,
+    SyncUsersInDirectoryServiceTask,
+    CreateUserHomeDirectoriesTask,
 )
+from ideaclustermanager.app.accounts.bulk_user_import import BulkUserImport
 from ideaclustermanager.app.tasks.task_manager import TaskManager
 from ideaclustermanager.app.web_portal import WebPortal
 from ideaclustermanager.app.email_templates.email_templates_service import (
@@ -160,6 +164,9 @@ class ClusterManagerApp(ideasdk.app.SocaApp):
                 CreateUserHomeDirectoryTask(self.context),
                 SyncPasswordInDirectoryServiceTask(self.context),
                 GroupMembershipUpdatedTask(self.context),
+                GroupMembershipSyncTask(self.context),
+                SyncUsersInDirectoryServiceTask(self.context),
+                CreateUserHomeDirectoriesTask(self.context),
                 ProjectEnabledTask(self.context),
                 ProjectDisabledTask(self.context),
                 ProjectGroupsUpdatedTask(self.context),
@@ -177,6 +184,10 @@ class ClusterManagerApp(ideasdk.app.SocaApp):
             token_service=self.context.token_service,
         )
 
+        self.context.bulk_user_import = BulkUserImport(
+            context=self.context, accounts_service=self.context.accounts
+        )
+
         # projects service
         self.context.projects = ProjectsService(
             context=self.context,
@@ -11,23 +11,42 @@
 
 from ideasdk.context import SocaContext
 from ideasdk.service import SocaService
+from ideasdk.aws import AwsRateGovernor, TokenBucket
 from ideasdk.utils import Utils, Jinja2Utils
-from ideadatamodel import GetEmailTemplateRequest, Notification
+from ideadatamodel import EmailTemplate, GetEmailTemplateRequest, Notification
 
 from ideaclustermanager.app.accounts.accounts_service import AccountsService
 from ideaclustermanager.app.email_templates.email_templates_service import (
     EmailTemplatesService,
 )
 
-from typing import Dict
+from typing import Dict, List, Optional, Tuple
 from concurrent.futures import ThreadPoolExecutor
+from cacheout import LRUCache
+from jinja2 import Template
+import botocore.exceptions
 import threading
-import time
 
-MAX_WORKERS = 1  # must be between 1 and 10
+MAX_WORKERS = 10  # must be between 1 and 10
+
+# max. no. of entries in an SQS DeleteMessageBatch request
+SQS_DELETE_MESSAGE_BATCH_SIZE = 10
+
+DEFAULT_TEMPLATE_CACHE_TTL_SECONDS = 60
 
 
 class NotificationsService(SocaService):
+    """
+    Email notifications from the notifications queue.
+
+    * messages are received in batches of up to 10 and sent by MAX_WORKERS threads.
+    * emails are paced by a single token bucket at cluster.ses.max_sending_rate, shared by all workers.
+      SES throttling errors reduce the rate and the message is retried after the visibility timeout.
+    * compiled email templates are cached by template name and version (updated_on). template versions
+      are read from DynamoDB at most once per template_cache_ttl_seconds.
+    * processed messages are deleted from the queue using DeleteMessageBatch.
+    """
+
     def __init__(
         self,
         context: SocaContext,
@@ -55,6 +74,50 @@ class NotificationsService(SocaService):
         )
         self.jinja2_env = Jinja2Utils.env_using_base_loader()
 
+        max_sending_rate = max(
+            1, self.context.config().get_int('cluster.ses.max_sending_rate', 1)
+        )
+        self.ses_rate_limiter = TokenBucket(
+            rate=max_sending_rate, burst=max_sending_rate
+        )
+
+        template_cache_ttl_seconds = self.context.config().get_int(
+            'cluster-manager.notifications.email.template_cache_ttl_seconds',
+            DEFAULT_TEMPLATE_CACHE_TTL_SECONDS,
+        )
+        # template name -> EmailTemplate
+        self.email_template_cache = LRUCache(
+            maxsize=100, ttl=template_cache_ttl_seconds
+        )
+        # (template name, updated_on) -> compiled subject and body templates
+        self.compiled_template_cache = LRUCache(maxsize=100)
+
+    def get_compiled_email_template(
+        self, template_name: str
+    ) -> Tuple[Template, Template]:
+        """
+        :return: compiled subject and body templates for the current version of the email template
+        """
+        email_template: Optional[EmailTemplate] = self.email_template_cache.get(
+            template_name
+        )
+        if email_template is None:
+            get_template_result = self.email_templates.get_email_template(
+                GetEmailTemplateRequest(name=template_name)
+            )
+            email_template = get_template_result.template
+            self.email_template_cache.set(template_name, email_template)
+
+        version = (template_name, Utils.to_milliseconds(email_template.updated_on))
+        compiled = self.compiled_template_cache.get(version)
+        if compiled is None:
+            compiled = (
+                self.jinja2_env.from_string(email_template.subject),
+                self.jinja2_env.from_string(email_template.body),
+            )
+            self.compiled_template_cache.set(version, compiled)
+        return compiled
+
     def send_email(self, notification: Notification):
         """
         send email
@@ -65,6 +128,7 @@ class NotificationsService(SocaService):
             template_name: str - the name of the email template
             params: dict - containing all parameters required to render the template
 
+        SES throttling errors are raised, so that the notification can be retried.
         """
         try:
             ses_enabled = self.context.config().get_bool('cluster.ses.enabled', False)
@@ -75,10 +139,6 @@ class NotificationsService(SocaService):
             sender_email = self.context.config().get_string(
                 'cluster.ses.sender_email', required=True
             )
-            max_sending_rate = self.context.config().get_int(
-                'cluster.ses.max_sending_rate', 1
-            )
-            max_sending_rate = max(1, max_sending_rate)
 
             email_notifications_enabled = self.context.config().get_bool(
                 'cluster-manager.notifications.email.enabled', False
@@ -108,21 +168,15 @@ class NotificationsService(SocaService):
                 )
                 return
 
-            template_name = notification.template_name
-            get_template_result = self.email_templates.get_email_template(
-                GetEmailTemplateRequest(name=template_name)
+            subject_template, message_template = self.get_compiled_email_template(
+                notification.template_name
             )
-            template = get_template_result.template
-            subject_template = template.subject
-            body_template = template.body
 
             params = Utils.get_as_dict(notification.params, {})
-
-            subject_template = self.jinja2_env.from_string(subject_template)
-            message_template = self.jinja2_env.from_string(body_template)
             subject = subject_template.render(**params)
             body = message_template.render(**params)
 
+            self.ses_rate_limiter.acquire()
             ses.send_email(
                 Source=sender_email,
                 Destination={'ToAddresses': [email]},
@@ -131,27 +185,56 @@ class NotificationsService(SocaService):
                     'Body': {'Html': {'Data': body}},
                 },
             )
+            self.ses_rate_limiter.on_success()
 
-            delay = float(1 / max_sending_rate)
-            time.sleep(delay)
-
+        except botocore.exceptions.ClientError as e:
+            error_code = Utils.get_value_as_string(
+                'Code', Utils.get_value_as_dict('Error', e.response, {})
+            )
+            if AwsRateGovernor.is_throttling_error(error_code):
+                self.ses_rate_limiter.on_throttle()
+                self.logger.warning(
+                    f'email notification throttled. reducing sending rate to: {self.ses_rate_limiter.rate:.2f}/s'
+                )
+                raise e
+            self.logger.exception(f'failed to send email notification: {e}')
         except Exception as e:
             self.logger.exception(f'failed to send email notification: {e}')
 
-    def execute_notifications(self, sqs_message: Dict):
-        notifications_name = None
+    def execute_notifications(self, sqs_message: Dict) -> Optional[str]:
+        """
+        :return: receipt handle of the message if the message was processed and can be deleted from the queue
+        """
         try:
             message_body = Utils.get_value_as_string('Body', sqs_message)
             receipt_handle = Utils.get_value_as_string('ReceiptHandle', sqs_message)
             payload = Utils.from_json(message_body)
             self.send_email(Notification(**payload))
-            self.context.aws().sqs().delete_message(
-                QueueUrl=self.notifications_queue_url, ReceiptHandle=receipt_handle
-            )
+            return receipt_handle
         except Exception as e:
             self.logger.exception(
-                f'failed to execute notifications: {notifications_name} - {e}'
+                f'failed to execute notifications: {Utils.get_value_as_string("MessageId", sqs_message)} - {e}'
             )
+            return None
+
+    def delete_messages(self, receipt_handles: List[str]):
+        for offset in range(0, len(receipt_handles), SQS_DELETE_MESSAGE_BATCH_SIZE):
+            batch = receipt_handles[offset : offset + SQS_DELETE_MESSAGE_BATCH_SIZE]
+            result = (
+                self.context.aws()
+                .sqs()
+                .delete_message_batch(
+                    QueueUrl=self.notifications_queue_url,
+                    Entries=[
+                        {'Id': str(index), 'ReceiptHandle': receipt_handle}
+                        for index, receipt_handle in enumerate(batch)
+                    ],
+                )
+            )
+            for failed in Utils.get_value_as_list('Failed', result, []):
+                self.logger.error(
+                    f'failed to delete notification message: {Utils.get_value_as_string("Message", failed)}'
+                )
 
     def notifications_queue_listener(self):
         while not self.exit.is_set():
@@ -169,10 +252,17 @@ class NotificationsService(SocaService):
                 if len(messages) == 0:
                     continue
                 self.logger.info(f'received {len(messages)} messages')
-                for message in messages:
-                    self.notifications_executors.submit(
-                        lambda message_: self.execute_notifications(message_), message
+
+                # the next batch is received after the current batch is processed, so that messages do not
+                # wait in the executor queue while their visibility timeout expires.
+                receipt_handles = [
+                    receipt_handle
+                    for receipt_handle in self.notifications_executors.map(
+                        self.execute_notifications, messages
                     )
+                    if Utils.is_not_empty(receipt_handle)
+                ]
+                self.delete_messages(receipt_handles)
 
             except Exception as e:
                 self.logger.exception(f'failed to poll queue: {e}')
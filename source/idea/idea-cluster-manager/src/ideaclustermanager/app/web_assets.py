@@ -0,0 +1,319 @@
+#  Copyright Amazon.com, Inc. or its affiliates. All Rights Reserved.
+#
+#  Licensed under the Apache License, Version 2.0 (the "License"). You may not use this file except in compliance
+#  with the License. A copy of the License is located at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+#  or in the 'license' file accompanying this file. This file is distributed on an 'AS IS' BASIS, WITHOUT WARRANTIES
+#  OR CONDITIONS OF ANY KIND, express or implied. See the License for the specific language governing permissions
+#  and limitations under the License.
+
+from ideasdk.utils import Utils
+
+from typing import Dict, List, Optional
+import gzip
+import hashlib
+import logging
+import mimetypes
+import os
+import re
+import sanic
+from sanic.exceptions import NotFound
+
+try:
+    import brotli
+except ImportError:
+    # brotli is optional. precompressed .br files created during the build are served without it.
+    brotli = None
+
+# encodings in the order of preference
+CONTENT_ENCODINGS = ['br', 'gzip']
+ENCODING_FILE_EXTENSIONS = {'br': '.br', 'gzip': '.gz'}
+
+COMPRESSIBLE_CONTENT_TYPES = {
+    'application/javascript',
+    'application/json',
+    'application/manifest+json',
+    'application/xml',
+    'application/wasm',
+    'image/svg+xml',
+    'image/x-icon',
+    'image/vnd.microsoft.icon',
+}
+COMPRESS_MIN_SIZE_BYTES = 1024
+
+# webpack (create-react-app) build outputs include a content hash in the file name. eg. static/js/main.1f2e3d4c.js
+FINGERPRINT_PATTERN = re.compile(r'\.[0-9a-f]{8,}\.')
+
+CACHE_CONTROL_IMMUTABLE = 'public, max-age=31536000, immutable'
+CACHE_CONTROL_REVALIDATE = 'no-cache'
+
+
+class WebAsset:
+    """
+    a web portal resource with its compressed variants.
+
+    the ETag is derived from the sha256 digest of the uncompressed content. compressed variants use a different
+    strong ETag, as the bytes sent over the wire are different for each encoding.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        content_type: str,
+        digest: str,
+        body: Optional[bytes] = None,
+        file: Optional[str] = None,
+        variants: Optional[Dict[str, bytes]] = None,
+        fingerprinted: bool = False,
+    ):
+        self.name = name
+        self.content_type = content_type
+        self.digest = digest
+        self.body = body
+        self.file = file
+        self.variants = variants or {}
+        self.fingerprinted = fingerprinted
+
+    @property
+    def version(self) -> str:
+        return self.digest[:16]
+
+    def get_etag(self, encoding: Optional[str] = None) -> str:
+        if encoding is None:
+            return f'"{self.digest[:32]}"'
+        return f'"{self.digest[:32]}-{encoding}"'
+
+    def get_etags(self) -> List[str]:
+        return [self.get_etag()] + [
+            self.get_etag(encoding) for encoding in self.variants
+        ]
+
+    @staticmethod
+    def is_compressible(content_type: str) -> bool:
+        content_type = content_type.split(';')[0].strip()
+        return (
+            content_type.startswith('text/')
+            or content_type in COMPRESSIBLE_CONTENT_TYPES
+        )
+
+    @staticmethod
+    def compress(body: bytes) -> Dict[str, bytes]:
+        variants = {}
+        if brotli is not None:
+            variants['br'] = brotli.compress(body)
+        variants['gzip'] = gzip.compress(body, compresslevel=9, mtime=0)
+        # skip variants that are not smaller than the content
+        return {
+            encoding: variant
+            for encoding, variant in variants.items()
+            if len(variant) < len(body)
+        }
+
+    @staticmethod
+    def from_bytes(name: str, body: bytes, content_type: str) -> 'WebAsset':
+        variants = {}
+        if (
+            WebAsset.is_compressible(content_type)
+            and len(body) >= COMPRESS_MIN_SIZE_BYTES
+        ):
+            variants = WebAsset.compress(body)
+        return WebAsset(
+            name=name,
+            content_type=content_type,
+            digest=hashlib.sha256(body).hexdigest(),
+            body=body,
+            variants=variants,
+        )
+
+
+class WebAssets:
+    """
+    static resources of the web portal, loaded once during start-up.
+
+    * precompressed variants (<file>.br, <file>.gz) created during the build are used if available. missing variants
+        are compressed during start-up. brotli variants are created only if the brotli module is installed.
+    * fingerprinted resources (with a content hash in the file name) are cached by browsers without revalidation.
+        other resources are revalidated using strong ETags, unless requested with the current version of the
+        resource (?v=<version>, see get_url()).
+    """
+
+    def __init__(self, web_app_dir: str, logger: Optional[logging.Logger] = None):
+        self.web_app_dir = web_app_dir
+        self.logger = logger
+        self.assets: Dict[str, WebAsset] = {}
+
+    @staticmethod
+    def get_content_type(file_name: str) -> str:
+        if file_name.endswith('.map'):
+            return 'application/json'
+        content_type, _ = mimetypes.guess_type(file_name)
+        if content_type is None:
+            return 'application/octet-stream'
+        if content_type.startswith('text/'):
+            return f'{content_type}; charset=utf-8'
+        return content_type
+
+    def load_asset(self, name: str, file: str) -> WebAsset:
+        with open(file, 'rb') as f:
+            body = f.read()
+
+        content_type = self.get_content_type(file)
+        variants = {}
+        if (
+            WebAsset.is_compressible(content_type)
+            and len(body) >= COMPRESS_MIN_SIZE_BYTES
+        ):
+            # use precompressed variants from the build, if they are not older than the file
+            for encoding, extension in ENCODING_FILE_EXTENSIONS.items():
+                variant_file = f'{file}{extension}'
+                if not os.path.isfile(variant_file):
+                    continue
+                if os.path.getmtime(variant_file) < os.path.getmtime(file):
+                    continue
+                with open(variant_file, 'rb') as f:
+                    variants[encoding] = f.read()
+            if 'gzip' not in variants or ('br' not in variants and brotli is not None):
+                variants = {**WebAsset.compress(body), **variants}
+
+        return WebAsset(
+            name=name,
+            content_type=content_type,
+            digest=hashlib.sha256(body).hexdigest(),
+            file=file,
+            variants=variants,
+            fingerprinted=FINGERPRINT_PATTERN.search(os.path.basename(name))
+            is not None,
+        )
+
+    def load(self):
+        assets = {}
+        total_size = 0
+        compressed_size = 0
+        if os.path.isdir(self.web_app_dir):
+            for root, _, files in os.walk(self.web_app_dir):
+                for file_name in files:
+                    file = os.path.join(root, file_name)
+                    if file.endswith(tuple(ENCODING_FILE_EXTENSIONS.values())):
+                        if os.path.isfile(os.path.splitext(file)[0]):
+                            continue
+                    name = os.path.relpath(file, self.web_app_dir).replace(os.sep, '/')
+                    asset = self.load_asset(name, file)
+                    assets[name] = asset
+                    total_size += os.path.getsize(file)
+                    if 'gzip' in asset.variants:
+                        compressed_size += len(asset.variants['gzip'])
+        self.assets = assets
+        if self.logger is not None:
+            self.logger.info(
+                f'loaded {len(assets)} web resources ({total_size:,} bytes, gzip variants: {compressed_size:,} bytes)'
+            )
+
+    def get(self, name: str) -> Optional[WebAsset]:
+        return self.assets.get(name.lstrip('/'))
+
+    def get_url(self, path: str) -> str:
+        """
+        returns the path with the current version of the resource, so that the url changes when the content changes.
+        """
+        asset = self.get(path)
+        if asset is None or asset.fingerprinted:
+            return path
+        return f'{path}?v={asset.version}'
+
+    @staticmethod
+    def get_accepted_encodings(accept_encoding: Optional[str]) -> List[str]:
+        if Utils.is_empty(accept_encoding):
+            return []
+        accepted = set()
+        for item in accept_encoding.split(','):
+            tokens = item.strip().split(';')
+            encoding = tokens[0].strip().lower()
+            quality = 1.0
+            for param in tokens[1:]:
+                name, _, value = param.strip().partition('=')
+                if name.strip().lower() == 'q':
+                    try:
+                        quality = float(value)
+                    except ValueError:
+                        quality = 0.0
+            if quality > 0:
+                accepted.add(encoding)
+        if '*' in accepted:
+            return list(CONTENT_ENCODINGS)
+        return [encoding for encoding in CONTENT_ENCODINGS if encoding in accepted]
+
+    @staticmethod
+    def is_not_modified(asset: WebAsset, if_none_match: Optional[str]) -> bool:
+        if Utils.is_empty(if_none_match):
+            return False
+        etags = asset.get_etags()
+        for etag in if_none_match.split(','):
+            etag = etag.strip()
+            if etag == '*':
+                return True
+            # If-None-Match uses weak comparison
+            if etag.startswith('W/'):
+                etag = etag[2:]
+            if etag in etags:
+                return True
+        return False
+
+    @staticmethod
+    def select_encoding(asset: WebAsset, http_request) -> Optional[str]:
+        accept_encoding = http_request.headers.get('accept-encoding')
+        for encoding in WebAssets.get_accepted_encodings(accept_encoding):
+            if encoding in asset.variants:
+                return encoding
+        return None
+
+    @staticmethod
+    async def create_response(
+        asset: WebAsset,
+        http_request,
+        cache_control: str = CACHE_CONTROL_REVALIDATE,
+        headers: Optional[Dict[str, str]] = None,
+    ):
+        encoding = WebAssets.select_encoding(asset, http_request)
+        response_headers = {
+            'Cache-Control': cache_control,
+            'ETag': asset.get_etag(encoding),
+            **(headers or {}),
+        }
+        if len(asset.variants) > 0:
+            response_headers['Vary'] = 'Accept-Encoding'
+
+        if WebAssets.is_not_modified(asset, http_request.headers.get('if-none-match')):
+            return sanic.response.empty(status=304, headers=response_headers)
+
+        if encoding is not None:
+            response_headers['Content-Encoding'] = encoding
+            return sanic.response.raw(
+                body=asset.variants[encoding],
+                headers=response_headers,
+                content_type=asset.content_type,
+            )
+
+        if asset.body is not None:
+            return sanic.response.raw(
+                body=asset.body,
+                headers=response_headers,
+                content_type=asset.content_type,
+            )
+
+        return await sanic.response.file(
+            asset.file, headers=response_headers, mime_type=asset.content_type
+        )
+
+    async def static_route(self, http_request, path: str):
+        asset = self.get(path)
+        if asset is None:
+            raise NotFound(f'Requested URL {http_request.path} not found')
+
+        if asset.fingerprinted or http_request.args.get('v') == asset.version:
+            cache_control = CACHE_CONTROL_IMMUTABLE
+        else:
+            cache_control = CACHE_CONTROL_REVALIDATE
+
+        return await self.create_response(asset, http_request, cache_control)
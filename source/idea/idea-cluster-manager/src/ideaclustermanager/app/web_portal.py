@@ -11,17 +11,40 @@
 
 import ideaclustermanager
 import ideaclustermanager.app.app_messages as app_messages
+from ideaclustermanager.app.web_assets import WebAsset, WebAssets
 
 from ideasdk.utils import Utils, EnvironmentUtils, Jinja2Utils, ModuleMetadataHelper
 from ideasdk.server import SocaServer
 from ideadatamodel import exceptions, constants
 
 import os
+import time
 from pathlib import Path
 import sanic
 from typing import Dict
 from datetime import datetime
 
+# the logo url is a pre-signed url, valid for 12 hours. cached index pages must expire before the logo url.
+DEFAULT_INDEX_PAGE_CACHE_TTL_SECONDS = 60 * 60
+
+
+class IndexPage:
+    """
+    rendered index page for a module set, along with the app init data used to render the page.
+    """
+
+    def __init__(
+        self,
+        config_version: int,
+        expires_at: float,
+        app_init_data: Dict,
+        asset: WebAsset,
+    ):
+        self.config_version = config_version
+        self.expires_at = expires_at
+        self.app_init_data = app_init_data
+        self.asset = asset
+
 
 class WebPortal:
     def __init__(self, context: ideaclustermanager.AppContext, server: SocaServer):
@@ -36,6 +59,9 @@ class WebPortal:
         self.web_template_env = Jinja2Utils.env_using_file_system_loader(
             search_path=self.web_app_dir, auto_escape=True
         )
+        self.web_assets = WebAssets(web_app_dir=self.web_app_dir, logger=self.logger)
+        # module set id -> rendered index page
+        self.index_pages: Dict[str, IndexPage] = {}
 
     @staticmethod
     def is_dev_mode() -> bool:
@@ -73,7 +99,7 @@ class WebPortal:
             )
 
         return self.make_route_path(
-            '/logo.png'
+            self.web_assets.get_url('/logo.png')
         )  # default IDEA logo in public directory
 
     def get_copyright_text(self) -> str:
@@ -87,16 +113,16 @@ class WebPortal:
         copyright_text = copyright_text.replace('{year}', str(datetime.now().year))
         return copyright_text
 
-    def build_app_init_data(self, http_request) -> Dict:
+    def build_app_init_data(self, module_set_id: str) -> Dict:
+        """
+        build the app init data for the module set. the result is cached in the index page for the module set, and
+        must not include request specific values.
+        """
         sso_enabled = self.context.config().get_bool(
             'identity-provider.cognito.sso_enabled', False
         )
 
         # build module metadata and applicable api context paths
-        module_set_id = Utils.get_as_string(
-            self.server.get_query_param_as_string('module_set', http_request),
-            self.context.module_set(),
-        )
         modules = []
         module_set = self.context.config().get_config(
             f'global-settings.module_sets.{module_set_id}'
@@ -144,31 +170,92 @@ class WebPortal:
             ),
         }
 
-        if sso_enabled:
-            sso_auth_status = self.server.get_query_param_as_string(
-                'sso_auth_status', http_request
-            )
-            if Utils.is_not_empty(sso_auth_status):
-                app_init_data['sso_auth_status'] = sso_auth_status
-
-            sso_auth_code = self.server.get_query_param_as_string(
-                'sso_auth_code', http_request
-            )
-            if Utils.is_not_empty(sso_auth_code):
-                app_init_data['sso_auth_code'] = sso_auth_code
-
         return app_init_data
 
-    async def index_route(self, http_request):
+    def render_index_page(self, app_init_data: Dict) -> str:
         template = self.web_template_env.get_template('index.html')
-        app_init_data = self.build_app_init_data(http_request)
-        result = template.render(
+        return template.render(
             app_init_data=Utils.base64_encode(Utils.to_json(app_init_data))
         )
 
+    def get_index_page(self, module_set_id: str) -> IndexPage:
+        """
+        returns the cached index page for the module set. index pages are rebuilt after the cache ttl expires, or
+        when cluster config is updated (config entries are updated via the cluster config ddb stream subscription).
+        """
+        config_version = self.context.config().version
+        index_page = self.index_pages.get(module_set_id)
+        if (
+            index_page is not None
+            and index_page.config_version == config_version
+            and index_page.expires_at > time.time()
+        ):
+            return index_page
+
+        app_init_data = self.build_app_init_data(module_set_id)
+        body = self.render_index_page(app_init_data).encode('utf-8')
+        ttl_seconds = self.context.config().get_int(
+            'cluster-manager.web_portal.index_page_cache_ttl_seconds',
+            DEFAULT_INDEX_PAGE_CACHE_TTL_SECONDS,
+        )
+        index_page = IndexPage(
+            config_version=config_version,
+            expires_at=time.time() + ttl_seconds,
+            app_init_data=app_init_data,
+            asset=WebAsset.from_bytes(
+                name='index.html',
+                body=body,
+                content_type='text/html; charset=utf-8',
+            ),
+        )
+        # only module sets with a valid configuration reach here, as build_app_init_data() fails for others.
+        self.index_pages[module_set_id] = index_page
+        return index_page
+
+    def get_sso_params(self, http_request) -> Dict[str, str]:
+        sso_params = {}
+        sso_enabled = self.context.config().get_bool(
+            'identity-provider.cognito.sso_enabled', False
+        )
+        if not sso_enabled:
+            return sso_params
+
+        sso_auth_status = self.server.get_query_param_as_string(
+            'sso_auth_status', http_request
+        )
+        if Utils.is_not_empty(sso_auth_status):
+            sso_params['sso_auth_status'] = sso_auth_status
+
+        sso_auth_code = self.server.get_query_param_as_string(
+            'sso_auth_code', http_request
+        )
+        if Utils.is_not_empty(sso_auth_code):
+            sso_params['sso_auth_code'] = sso_auth_code
+
+        return sso_params
+
+    async def index_route(self, http_request):
+        module_set_id = Utils.get_as_string(
+            self.server.get_query_param_as_string('module_set', http_request),
+            self.context.module_set(),
+        )
+        index_page = self.get_index_page(module_set_id)
+
         # add X-Frame-Options header to mitigate ClickJacking (embedding WebPortal within an iframe)
-        return sanic.response.html(
-            body=result, status=200, headers={'X-Frame-Options': 'SAMEORIGIN'}
+        headers = {'X-Frame-Options': 'SAMEORIGIN'}
+
+        # sso redirects include the auth status and code specific to the request. render the page for the request.
+        sso_params = self.get_sso_params(http_request)
+        if len(sso_params) > 0:
+            result = self.render_index_page({**index_page.app_init_data, **sso_params})
+            return sanic.response.html(
+                body=result,
+                status=200,
+                headers={**headers, 'Cache-Control': 'no-store'},
+            )
+
+        return await WebAssets.create_response(
+            asset=index_page.asset, http_request=http_request, headers=headers
         )
 
     async def sso_initiate_route(self, _):
@@ -328,6 +415,8 @@ class WebPortal:
             return f'{self.web_resources_context_path}{path}'
 
     def initialize(self):
+        self.web_assets.load()
+
         # index route
         self.server.http_app.add_route(
             self.index_route, self.web_resources_context_path, name='index'
@@ -343,6 +432,9 @@ class WebPortal:
             name='oauth2_callback',
         )
         # add static resources at the end
-        self.server.http_app.static(
-            self.web_resources_context_path, self.web_app_dir, name='static-content'
+        self.server.http_app.add_route(
+            self.web_assets.static_route,
+            self.make_route_path('/<path:path>'),
+            methods=['GET', 'HEAD'],
+            name='static-content',
         )
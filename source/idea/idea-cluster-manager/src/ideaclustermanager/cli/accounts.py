@@ -19,6 +19,8 @@ from ideadatamodel import (
     ListUsersResult,
     CreateUserRequest,
     CreateUserResult,
+    BatchCreateUsersRequest,
+    BatchCreateUsersResult,
     EnableUserRequest,
     EnableUserResult,
     DisableUserRequest,
@@ -32,11 +34,17 @@ from ideadatamodel import (
 from ideaclustermanager.cli import build_cli_context
 from ideasdk.utils import Utils
 from ideaclustermanager.app.accounts.auth_utils import AuthUtils
+from ideaclustermanager.app.accounts.bulk_user_import import (
+    BulkUserImport,
+    BulkUserImportCheckpoint,
+    BULK_IMPORT_MAX_USERS,
+)
 from ideaclustermanager.cli.cli_utils import ClusterManagerUtils
 
 from rich.table import Table
 import click
 import csv
+import time
 
 
 @click.group()
@@ -410,3 +418,142 @@ def batch_create_users(
 
     create_users_response = ClusterManagerUtils.create_users(new_users, context)
     ClusterManagerUtils.print_create_user_status(create_users_response, context)
+
+
+@accounts.command(context_settings=constants.CLICK_SETTINGS)
+@click.option('--path-to-csv', required=True, help='path to the csv file')
+@click.option(
+    '--batch-size',
+    default=50,
+    type=int,
+    help=f'no. of users created per request. max: {BULK_IMPORT_MAX_USERS}',
+)
+@click.option(
+    '--checkpoint-file',
+    help='file to save the import progress. default: <path-to-csv>.checkpoint.json',
+)
+@click.option('--force', is_flag=True, help='skips confirmation prompts')
+def import_users(path_to_csv: str, batch_size: int, checkpoint_file: str, force: bool):
+    """
+    import users from csv file in batches
+
+    \b
+    invitation emails are sent to the imported users.
+    progress is saved to a checkpoint file after each batch. if the import is interrupted, run the command again
+    to resume. users that were created or already exist are skipped. failed users are retried.
+    the checkpoint is keyed by username: the csv file can be edited to fix the failed rows before running the
+    command again.
+    """
+
+    # the request is not completed until the Cognito API calls of all users of the batch are completed
+    context = ClusterManagerUtils.get_soca_cli_context_cluster_manager(
+        unix_socket_timeout=BulkUserImport.get_request_timeout_seconds(
+            min(max(batch_size, 1), BULK_IMPORT_MAX_USERS)
+        )
+    )
+    ClusterManagerUtils.check_if_csv_file(path_to_csv, context)
+    if batch_size < 1 or batch_size > BULK_IMPORT_MAX_USERS:
+        context.error(f'--batch-size must be between 1 and {BULK_IMPORT_MAX_USERS}')
+        raise SystemExit(1)
+
+    if Utils.is_empty(checkpoint_file):
+        checkpoint_file = f'{path_to_csv}.checkpoint.json'
+    checkpoint = BulkUserImportCheckpoint(checkpoint_file=checkpoint_file)
+    if checkpoint.load():
+        context.info(
+            f'resuming import from checkpoint: {checkpoint_file} - '
+            f'completed: {len(checkpoint.completed)}, failed: {len(checkpoint.failed)}'
+        )
+
+    users = []
+    usernames = []
+    with open(path_to_csv, 'r', encoding='utf-8') as csv_file:
+        csv_reader = csv.DictReader(csv_file)
+        ClusterManagerUtils.check_has_valid_csv_headers(csv_reader.fieldnames, context)
+        for row in csv_reader:
+            username = AuthUtils.sanitize_username(
+                Utils.get_value_as_string('Username', row)
+            )
+            usernames.append(username)
+            if checkpoint.is_completed(username):
+                continue
+            users.append(
+                User(
+                    username=username,
+                    email=Utils.get_value_as_string('Email', row, '').strip().lower(),
+                    sudo=Utils.get_value_as_bool('Is Admin?', row, default=False),
+                )
+            )
+    # rows removed from the csv file since the last run are not reported as failed
+    checkpoint.retain_failed(usernames)
+
+    if len(users) == 0:
+        context.success(
+            f'all users are imported. completed: {len(checkpoint.completed)}'
+        )
+        return
+
+    if not force:
+        continue_import = context.prompt(
+            f'Are you sure you want to import {len(users)} users in batches of {batch_size}?'
+        )
+        if not continue_import:
+            raise SystemExit(1)
+
+    start_time = time.time()
+    processed = 0
+    for offset in range(0, len(users), batch_size):
+        batch = users[offset : offset + batch_size]
+        try:
+            result = context.unix_socket_client.invoke_alt(
+                namespace='Accounts.BatchCreateUsers',
+                payload=BatchCreateUsersRequest(users=batch),
+                result_as=BatchCreateUsersResult,
+            )
+        except exceptions.SocaException as e:
+            if e.error_code == errorcodes.SOCKET_TIMEOUT:
+                # the users of the batch may still be created by the server. the users are not saved to the
+                # checkpoint, and no further batches are submitted, so that imports do not overlap.
+                context.error(
+                    f'request timed out: {e.message}. users of the current batch may still be created. '
+                    f'wait for the request to complete and run the command again to resume the import. '
+                    f'progress is saved to: {checkpoint_file}'
+                )
+                raise SystemExit(1)
+            result = BatchCreateUsersResult(
+                created=[],
+                existing=[],
+                failed={user.username: e.message for user in batch},
+            )
+        checkpoint.update(result)
+        checkpoint.save()
+
+        processed += len(batch)
+        elapsed = time.time() - start_time
+        users_per_second = processed / max(elapsed, 0.001)
+        remaining_seconds = (len(users) - processed) / users_per_second
+        context.info(
+            f'imported {processed}/{len(users)} users '
+            f'(created: {len(Utils.get_as_list(result.created, []))}, '
+            f'existing: {len(Utils.get_as_list(result.existing, []))}, '
+            f'failed: {len(Utils.get_as_dict(result.failed, {}))}) - '
+            f'{users_per_second:.1f} users/s, remaining: {remaining_seconds:.0f}s'
+        )
+
+    if len(checkpoint.failed) > 0:
+        table = Table()
+        table.add_column('Username', justify='left', no_wrap=False)
+        table.add_column('Reason', justify='left', no_wrap=False)
+        for username, error in checkpoint.failed.items():
+            table.add_row(username, error, style='red')
+        context.print(table)
+        context.error(
+            f'failed to import {len(checkpoint.failed)} users. '
+            f'fix the failed rows in {path_to_csv} and run the command again to retry the failed users. '
+            f'progress is saved to: {checkpoint_file}'
+        )
+        raise SystemExit(1)
+
+    context.success(
+        f'imported {len(checkpoint.completed)} users in {time.time() - start_time:.0f}s'
+    )
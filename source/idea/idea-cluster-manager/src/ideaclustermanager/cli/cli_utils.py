@@ -26,7 +26,7 @@ from ideaclustermanager.app.accounts import auth_constants
 from ideaclustermanager.app.accounts.auth_utils import AuthUtils
 from rich.table import Table
 
-from typing import List, Tuple
+from typing import List, Optional, Tuple
 import time
 import re
 
@@ -35,8 +35,13 @@ API_CONTEXT_PATH_CLUSTER_MANAGER = '/cluster-manager/api/v1'
 
 class ClusterManagerUtils:
     @staticmethod
-    def get_soca_cli_context_cluster_manager() -> SocaCliContext:
-        return SocaCliContext(api_context_path=API_CONTEXT_PATH_CLUSTER_MANAGER)
+    def get_soca_cli_context_cluster_manager(
+        unix_socket_timeout: Optional[int] = None,
+    ) -> SocaCliContext:
+        return SocaCliContext(
+            api_context_path=API_CONTEXT_PATH_CLUSTER_MANAGER,
+            unix_socket_timeout=unix_socket_timeout,
+        )
 
     @staticmethod
     def check_duplicate_users_in_csv(usernames: List[str]) -> List[str]:
@@ -54,6 +54,7 @@ def search_users(query: str, page_size: int):
     ldap_client = build_ldap_client(context)
 
     _start = 0
+    _cursor = None
     _cur_page = 0
     user_result = []
 
@@ -64,6 +65,7 @@ def search_users(query: str, page_size: int):
         users, page = ldap_client.search_users(
             username_filter=SocaFilter(like=query),
             start=_start,
+            cursor=_cursor,
             page_size=Utils.get_as_int(page_size, default=DEFAULT_CLI_PAGE_SIZE),
         )
         _page_end_time = Utils.current_time_ms()
@@ -78,7 +80,12 @@ def search_users(query: str, page_size: int):
         user_result += users
         _start += len(users)
 
-        if _start >= page.total:
+        # active directory: pages are fetched using the paged results cookie
+        if ldap_client.is_activedirectory():
+            _cursor = page.cursor
+            if Utils.is_empty(_cursor):
+                break
+        elif _start >= page.total:
             break
 
     _loop_end = Utils.current_time_ms()
@@ -105,6 +112,7 @@ def search_groups(query: str, page_size: int):
     ldap_client = build_ldap_client(context)
 
     _start = 0
+    _cursor = None
     _cur_page = 0
     group_result = []
 
@@ -116,6 +124,7 @@ def search_groups(query: str, page_size: int):
         groups, page = ldap_client.search_groups(
             group_name_filter=SocaFilter(like=query),
             start=_start,
+            cursor=_cursor,
             page_size=Utils.get_as_int(page_size, default=DEFAULT_CLI_PAGE_SIZE),
         )
         _page_end_time = Utils.current_time_ms()
@@ -130,7 +139,12 @@ def search_groups(query: str, page_size: int):
         group_result += groups
         _start += len(groups)
 
-        if _start >= page.total:
+        # active directory: pages are fetched using the paged results cookie
+        if ldap_client.is_activedirectory():
+            _cursor = page.cursor
+            if Utils.is_empty(_cursor):
+                break
+        elif _start >= page.total:
             break
 
     _loop_end = Utils.current_time_ms()
@@ -36,8 +36,6 @@ from ideatestutils.dynamodb.dynamodb_local import DynamoDBLocal
 
 import pytest
 import boto3
-import time
-import requests
 
 from _pytest.monkeypatch import MonkeyPatch
 
@@ -47,32 +45,6 @@ from _pytest.monkeypatch import MonkeyPatch
 monkeypatch = MonkeyPatch()
 
 
-def wait_for_dynamodb_local(endpoint_url: str, timeout: int = 30):
-    """Wait for DynamoDB Local to be ready to accept connections"""
-    start_time = time.time()
-
-    while time.time() - start_time < timeout:
-        try:
-            # Try to make a simple request to check if server is up
-            response = requests.get(endpoint_url, timeout=1)
-            # DynamoDB Local returns a 400 for GET requests, but that means it's running
-            if response.status_code == 400:
-                print(f'DynamoDB Local is ready at {endpoint_url}')
-                return True
-        except requests.exceptions.ConnectionError:
-            # Server not ready yet, continue waiting
-            pass
-        except requests.exceptions.Timeout:
-            # Server not ready yet, continue waiting
-            pass
-
-        print(f'Waiting for DynamoDB Local at {endpoint_url}...')
-        time.sleep(1)
-
-    print(f'DynamoDB Local failed to start within {timeout} seconds')
-    return False
-
-
 @pytest.fixture(scope='session')
 def ddb_local():
     ddb_local = DynamoDBLocal(db_name='cluster-manager', reset=True)
@@ -85,8 +57,7 @@ def ddb_local():
     ddb_local.start()
 
     # Wait for DynamoDB Local to actually be ready
-    endpoint_url = f'http://localhost:{ddb_local.port}/'
-    if not wait_for_dynamodb_local(endpoint_url, timeout=30):
+    if not ddb_local.wait_until_ready(timeout=30):
         ddb_local.stop()
         pytest.skip('DynamoDB Local failed to start')
 
@@ -186,8 +157,11 @@ def context(ddb_local):
         aws_secret_access_key='dummy',
     )
 
-    # Copy the Table method to our mock
+    # Copy the Table and batch methods to our mock
     mock_dynamodb_table_resource.Table = real_dynamodb_table_resource.Table
+    mock_dynamodb_table_resource.batch_get_item = (
+        real_dynamodb_table_resource.batch_get_item
+    )
 
     mock_cognito_idp = SocaAnyPayload()
     mock_cognito_idp.admin_create_user = mock_function
@@ -0,0 +1,428 @@
+#  Copyright Amazon.com, Inc. or its affiliates. All Rights Reserved.
+#
+#  Licensed under the Apache License, Version 2.0 (the "License"). You may not use this file except in compliance
+#  with the License. A copy of the License is located at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+#  or in the 'license' file accompanying this file. This file is distributed on an 'AS IS' BASIS, WITHOUT WARRANTIES
+#  OR CONDITIONS OF ANY KIND, express or implied. See the License for the specific language governing permissions
+#  and limitations under the License.
+
+"""
+Test Cases for BulkUserImport and BulkUserImportCheckpoint
+"""
+
+from ideaclustermanager import AppContext
+from ideadatamodel import (
+    constants,
+    exceptions,
+    User,
+    BatchCreateUsersResult,
+)
+from ideasdk.aws import TokenBucket
+
+from ideaclustermanager.app.accounts.account_tasks import (
+    SyncUsersInDirectoryServiceTask,
+)
+from ideaclustermanager.app.accounts.bulk_user_import import (
+    BulkUserImport,
+    BulkUserImportCheckpoint,
+    COGNITO_IDP,
+)
+
+from concurrent.futures import ThreadPoolExecutor
+from threading import Lock
+from typing import Dict, List, Set
+import botocore.exceptions
+import os
+import pytest
+
+DEFAULT_PROJECT_GROUP = 'bulkimport-project-group'
+DESIGN_PROJECT_GROUP = 'bulkdesign-project-group'
+CLUSTER_GROUP = 'bulkadmins-cluster-group'
+
+
+def client_error(code: str) -> botocore.exceptions.ClientError:
+    return botocore.exceptions.ClientError(
+        error_response={'Error': {'Code': code, 'Message': code}},
+        operation_name='AdminCreateUser',
+    )
+
+
+class FakeUserPool:
+    """
+    Cognito user pool. the first create user request of each user in throttled_users is throttled.
+    """
+
+    def __init__(self):
+        self.users: Set[str] = set()
+        self.sudo_users: Set[str] = set()
+        self.calls: List[str] = []
+        self.throttled_users: Set[str] = set()
+        self.failed_users: Set[str] = set()
+        self.lock = Lock()
+
+    def admin_create_user(self, username: str, **_):
+        with self.lock:
+            self.calls.append('admin_create_user')
+            if username in self.throttled_users:
+                self.throttled_users.remove(username)
+                raise client_error('TooManyRequestsException')
+            if username in self.failed_users:
+                raise client_error('InvalidParameterException')
+            if username in self.users:
+                raise client_error('UsernameExistsException')
+            self.users.add(username)
+
+    def admin_add_sudo_user(self, username: str):
+        with self.lock:
+            self.calls.append('admin_add_sudo_user')
+            self.sudo_users.add(username)
+
+    def admin_add_user_to_group(self, username: str, group_name: str):
+        with self.lock:
+            self.calls.append(f'admin_add_user_to_group:{group_name}')
+
+
+class FakeTaskManager:
+    def __init__(self):
+        self.messages: List[Dict] = []
+
+    def send(self, task_name: str, payload: Dict, **_):
+        self.messages.append({'task_name': task_name, 'payload': payload})
+
+    def get_messages(self, task_name: str) -> List[Dict]:
+        return [
+            message['payload']
+            for message in self.messages
+            if message['task_name'] == task_name
+        ]
+
+
+@pytest.fixture()
+def bulk_user_import(context: AppContext, monkeypatch, tmp_path) -> BulkUserImport:
+    """
+    BulkUserImport backed by the DynamoDB Local tables of the context. Cognito and the task queue are faked.
+    """
+    accounts = context.accounts
+    task_manager = FakeTaskManager()
+    monkeypatch.setattr(accounts, 'user_pool', FakeUserPool())
+    monkeypatch.setattr(accounts, 'task_manager', task_manager)
+    monkeypatch.setattr(accounts.membership_sync, 'task_manager', task_manager)
+    monkeypatch.setattr(accounts, 'ds_automation_dir', str(tmp_path / 'ds-automation'))
+    monkeypatch.setattr(
+        accounts.group_name_helper,
+        'get_default_project_group',
+        lambda: DEFAULT_PROJECT_GROUP,
+    )
+
+    for group_name, group_type in (
+        (DEFAULT_PROJECT_GROUP, constants.GROUP_TYPE_PROJECT),
+        (DESIGN_PROJECT_GROUP, constants.GROUP_TYPE_PROJECT),
+        (CLUSTER_GROUP, constants.GROUP_TYPE_CLUSTER),
+    ):
+        if accounts.group_dao.get_group(group_name) is not None:
+            continue
+        accounts.group_dao.create_group(
+            {
+                'group_name': group_name,
+                'title': group_name,
+                'group_type': group_type,
+                'enabled': True,
+            }
+        )
+
+    bulk_user_import = BulkUserImport(context=context, accounts_service=accounts)
+    # Cognito API calls are not paced in tests
+    bulk_user_import.rate_governor.add_bucket(
+        COGNITO_IDP, TokenBucket(rate=1000, burst=1000)
+    )
+    return bulk_user_import
+
+
+def get_sequence_value(context: AppContext, key: str) -> int:
+    result = context.accounts.sequence_config_dao.table.get_item(Key={'key': key})
+    return int(result['Item']['value'])
+
+
+def test_bulk_user_import_create_users(
+    context: AppContext, bulk_user_import: BulkUserImport, monkeypatch
+):
+    accounts = context.accounts
+    users = [
+        User(username=f'bulkcreate{i:03d}', email=f'bulkcreate{i:03d}@example.org')
+        for i in range(150)
+    ]
+    users[0].sudo = True
+    users[1].additional_groups = [DESIGN_PROJECT_GROUP]
+    users[2].additional_groups = [CLUSTER_GROUP]
+
+    reserve_calls = []
+    reserve = accounts.sequence_config_dao._reserve
+
+    def spy_reserve(key: str, count: int) -> int:
+        reserve_calls.append((key, count))
+        return reserve(key, count)
+
+    monkeypatch.setattr(accounts.sequence_config_dao, '_reserve', spy_reserve)
+
+    result = bulk_user_import.create_users(users)
+
+    assert len(result.created) == 150
+    assert result.failed == {}
+
+    # uids and gids are reserved using a single atomic update for each sequence
+    assert reserve_calls == [('users', 150), ('groups', 150)]
+    uids = sorted(user.uid for user in result.created)
+    assert uids == list(range(uids[0], uids[0] + 150))
+    gids = sorted(user.gid for user in result.created)
+    assert gids == list(range(gids[0], gids[0] + 150))
+
+    # users, personal groups and group memberships are saved
+    saved_users = accounts.user_dao.batch_get_users([user.username for user in users])
+    assert len(saved_users) == 150
+    user = saved_users['bulkcreate001']
+    assert user['additional_groups'] == [
+        DESIGN_PROJECT_GROUP,
+        'bulkcreate001-user-group',
+        DEFAULT_PROJECT_GROUP,
+    ]
+    assert 'password' not in user
+    assert (
+        accounts.group_dao.get_group('bulkcreate001-user-group')['gid'] == user['gid']
+    )
+    assert accounts.group_members_dao.is_member(
+        'bulkcreate001-user-group', 'bulkcreate001'
+    )
+    assert accounts.group_members_dao.is_member(DESIGN_PROJECT_GROUP, 'bulkcreate001')
+    default_project_members = set(
+        accounts.group_members_dao.get_usernames_in_group(DEFAULT_PROJECT_GROUP)
+    )
+    assert {user.username for user in users} <= default_project_members
+
+    # cognito groups are updated for groups other than user and project groups
+    assert accounts.user_pool.sudo_users == {'bulkcreate000'}
+    assert (
+        accounts.user_pool.calls.count(f'admin_add_user_to_group:{CLUSTER_GROUP}') == 1
+    )
+
+    # directory service and home directory tasks are coalesced
+    task_manager = accounts.task_manager
+    sync_users = task_manager.get_messages('accounts.sync-users')
+    assert [len(payload['usernames']) for payload in sync_users] == [100, 50]
+    for payload in sync_users:
+        for username in payload['usernames']:
+            assert os.path.isfile(payload['password_files'][username])
+    home_directories = task_manager.get_messages('accounts.create-home-directories')
+    assert [len(payload['usernames']) for payload in home_directories] == [100, 50]
+    # group memberships are synced by accounts.sync-users
+    assert len(task_manager.get_messages('accounts.sync-group-membership')) == 0
+    assert len(task_manager.get_messages('accounts.sync-user')) == 0
+
+
+def test_bulk_user_import_sync_users_group_membership(
+    context: AppContext, bulk_user_import: BulkUserImport
+):
+    """
+    group memberships are synced after the users are created in the directory service
+    """
+    task_manager = context.accounts.task_manager
+    users = [
+        User(username=f'bulksync{i:03d}', email=f'bulksync{i:03d}@example.org')
+        for i in range(3)
+    ]
+    users[0].additional_groups = [DESIGN_PROJECT_GROUP]
+    bulk_user_import.create_users(users)
+    payload = task_manager.get_messages('accounts.sync-users')[0]
+    task_manager.messages.clear()
+
+    task = SyncUsersInDirectoryServiceTask(context)
+    passwords = []
+
+    def sync_user(user: Dict):
+        if user['username'] == 'bulksync002':
+            raise exceptions.general_exception('failed to sync user')
+        assert len(task_manager.messages) == 0
+
+    def sync_password(username: str, password_file: str):
+        passwords.append(username)
+
+    task.sync_user_task.sync_user = sync_user
+    task.sync_password_task.sync_password = sync_password
+    failed = task.invoke(payload)
+
+    assert list(failed.keys()) == ['bulksync002']
+    assert passwords == ['bulksync000', 'bulksync001']
+    membership = {
+        payload['group_name']: payload['add']
+        for payload in task_manager.get_messages('accounts.sync-group-membership')
+    }
+    assert membership == {
+        DESIGN_PROJECT_GROUP: ['bulksync000'],
+        'bulksync000-user-group': ['bulksync000'],
+        'bulksync001-user-group': ['bulksync001'],
+        DEFAULT_PROJECT_GROUP: ['bulksync000', 'bulksync001'],
+    }
+
+
+def test_bulk_user_import_reconcile(
+    context: AppContext, bulk_user_import: BulkUserImport
+):
+    user_pool = context.accounts.user_pool
+    users = [
+        User(username=f'bulkretry{i:03d}', email=f'bulkretry{i:03d}@example.org')
+        for i in range(10)
+    ]
+    bulk_user_import.create_users(users[:4])
+
+    # user pool entry created by an interrupted import
+    user_pool.users.add('bulkretry005')
+    user_pool.throttled_users = {'bulkretry006', 'bulkretry007'}
+    user_pool.failed_users = {'bulkretry008'}
+
+    uid_before = get_sequence_value(context, 'users')
+    result = bulk_user_import.create_users(
+        users
+        + [
+            User(username='root', email='root@example.org'),
+            User(username='bulkretry009', email='duplicate@example.org'),
+            User(
+                username='bulkretry010',
+                email='bulkretry010@example.org',
+                additional_groups=['unknown-project-group'],
+            ),
+        ]
+    )
+
+    assert sorted(result.existing) == [
+        'bulkretry000',
+        'bulkretry001',
+        'bulkretry002',
+        'bulkretry003',
+    ]
+    assert sorted(user.username for user in result.created) == [
+        'bulkretry004',
+        'bulkretry005',
+        'bulkretry006',
+        'bulkretry007',
+    ]
+    assert sorted(result.failed.keys()) == [
+        'bulkretry008',
+        'bulkretry009',
+        'bulkretry010',
+        'root',
+    ]
+    assert 'not found' in result.failed['bulkretry010']
+
+    # throttled requests are retried at a reduced rate
+    bucket = bulk_user_import.rate_governor.get_bucket(COGNITO_IDP)
+    assert bucket.throttle_count == 2
+    assert bucket.rate < bucket.max_rate
+
+    # ids are reserved only for the users that passed validation: bulkretry004 - bulkretry008
+    assert get_sequence_value(context, 'users') == uid_before + 5
+    saved_users = context.accounts.user_dao.batch_get_users(
+        [user.username for user in users]
+    )
+    assert len(saved_users) == 8
+    assert uid_before <= saved_users['bulkretry004']['uid'] < uid_before + 5
+
+
+def test_bulk_user_import_created_by_other_request(
+    context: AppContext, bulk_user_import: BulkUserImport, monkeypatch
+):
+    """
+    users created by another request after the existing users were read are reported as existing and not modified
+    """
+    accounts = context.accounts
+    user_dao = accounts.user_dao
+    users = [
+        User(username=f'bulkrace{i:03d}', email=f'bulkrace{i:03d}@example.org')
+        for i in range(4)
+    ]
+
+    # bulkrace000: user pool entry and DB user created by create-user
+    # bulkrace001: DB user created by another import, after the user pool entry was created by this import
+    accounts.user_pool.users.add('bulkrace000')
+    user_dao.create_user({'username': 'bulkrace000', 'uid': 7000})
+    batch_get_users = user_dao.batch_get_users
+
+    def stale_batch_get_users(usernames):
+        existing = batch_get_users(usernames)
+        user_dao.create_user({'username': 'bulkrace001', 'uid': 7001})
+        return {
+            username: user
+            for username, user in existing.items()
+            if username not in ('bulkrace000', 'bulkrace001')
+        }
+
+    monkeypatch.setattr(user_dao, 'batch_get_users', stale_batch_get_users)
+
+    result = bulk_user_import.create_users(users)
+
+    assert sorted(result.existing) == ['bulkrace000', 'bulkrace001']
+    assert sorted(user.username for user in result.created) == [
+        'bulkrace002',
+        'bulkrace003',
+    ]
+    assert result.failed == {}
+    assert user_dao.get_user('bulkrace000')['uid'] == 7000
+    assert user_dao.get_user('bulkrace001')['uid'] == 7001
+
+    # no groups, memberships or tasks for the users created by the other requests
+    for username in ('bulkrace000', 'bulkrace001'):
+        assert accounts.group_dao.get_group(f'{username}-user-group') is None
+        assert not accounts.group_members_dao.is_member(DEFAULT_PROJECT_GROUP, username)
+    for payload in accounts.task_manager.get_messages('accounts.sync-users'):
+        assert sorted(payload['usernames']) == ['bulkrace002', 'bulkrace003']
+
+
+def test_bulk_user_import_reserve_ids_concurrently(context: AppContext):
+    """
+    id ranges reserved by concurrent imports do not overlap
+    """
+    sequence_config_dao = context.accounts.sequence_config_dao
+    with ThreadPoolExecutor(max_workers=8) as executor:
+        ranges = list(
+            executor.map(lambda _: sequence_config_dao.reserve_uids(50), range(16))
+        )
+    uids = [uid for uid_range in ranges for uid in uid_range]
+    assert len(set(uids)) == 16 * 50
+
+
+def test_bulk_user_import_checkpoint(tmp_path):
+    checkpoint_file = str(tmp_path / 'users.csv.checkpoint.json')
+
+    checkpoint = BulkUserImportCheckpoint(checkpoint_file)
+    assert not checkpoint.load()
+    checkpoint.update(
+        BatchCreateUsersResult(
+            created=[User(username='user1')],
+            existing=['user2'],
+            failed={'user3': 'invalid email', 'user4': 'invalid email'},
+        )
+    )
+    checkpoint.save()
+
+    checkpoint = BulkUserImportCheckpoint(checkpoint_file)
+    assert checkpoint.load()
+    assert checkpoint.is_completed('user1')
+    assert checkpoint.is_completed('user2')
+    assert not checkpoint.is_completed('user3')
+
+    # the import file was edited: user4 was removed
+    checkpoint.retain_failed(['user1', 'user2', 'user3'])
+    assert list(checkpoint.failed.keys()) == ['user3']
+
+    # failed users are retried
+    checkpoint.update(BatchCreateUsersResult(created=[User(username='user3')]))
+    assert checkpoint.failed == {}
+
+
+def test_bulk_user_import_request_timeout():
+    # 500 users at 10 Cognito calls/s take more than the default unix socket timeout of 10s
+    assert BulkUserImport.get_request_timeout_seconds(500) >= 500 * 3 / 10
+    assert BulkUserImport.get_request_timeout_seconds(
+        50, cognito_rate=5
+    ) > BulkUserImport.get_request_timeout_seconds(50)
@@ -0,0 +1,230 @@
+#  Copyright Amazon.com, Inc. or its affiliates. All Rights Reserved.
+#
+#  Licensed under the Apache License, Version 2.0 (the "License"). You may not use this file except in compliance
+#  with the License. A copy of the License is located at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+#  or in the 'license' file accompanying this file. This file is distributed on an 'AS IS' BASIS, WITHOUT WARRANTIES
+#  OR CONDITIONS OF ANY KIND, express or implied. See the License for the specific language governing permissions
+#  and limitations under the License.
+
+"""
+Test Cases for GroupMembershipSync and GroupMembershipSyncTask
+"""
+
+from ideadatamodel import SocaAnyPayload, exceptions
+from ideasdk.utils import Utils
+
+from ideaclustermanager.app.accounts.account_tasks import (
+    GroupMembershipSyncTask,
+)
+from ideaclustermanager.app.accounts.group_membership_sync import (
+    GroupMembershipSync,
+)
+from ideaclustermanager.app.accounts.ldapclient.openldap_client import OpenLDAPClient
+
+from typing import Dict, List, Set
+import ldap  # noqa
+import logging
+import pytest
+
+CONFIG = {
+    'directoryservice.provider': 'openldap',
+    'directoryservice.name': 'idea.local',
+}
+
+
+class FakeDirectory(OpenLDAPClient):
+    """
+    OpenLDAP client backed by an in-memory group. counts LDAP modify requests.
+    """
+
+    def __init__(self, context):
+        self.context = context
+        self.logger = logging.getLogger('test-group-membership-sync')
+        self.options = SocaAnyPayload(uri='ldap://localhost', domain_name='idea.local')
+        self._root_username = 'admin'
+        self._root_password = 'mock'
+        self.members: Set[str] = set()
+        self.modify_requests = 0
+        self.broken_users: Set[str] = set()
+
+    def modify_s(self, dn, modlist):
+        self.modify_requests += 1
+        members = set(self.members)
+        for operation, attr, values in modlist:
+            username = Utils.from_bytes(values[0])
+            if username in self.broken_users:
+                raise ldap.UNWILLING_TO_PERFORM(
+                    {'desc': 'Server is unwilling to perform'}
+                )
+            if operation == ldap.MOD_ADD:
+                if username in members:
+                    raise ldap.TYPE_OR_VALUE_EXISTS({'desc': 'Type or value exists'})
+                members.add(username)
+            else:
+                if username not in members:
+                    raise ldap.NO_SUCH_ATTRIBUTE({'desc': 'No such attribute'})
+                members.remove(username)
+        self.members = members
+
+
+class FakeTaskManager:
+    def __init__(self):
+        self.messages: List[Dict] = []
+
+    def send(self, task_name: str, payload: Dict, **_):
+        self.messages.append({'name': task_name, 'payload': payload})
+
+
+class FakeUserProjectsDAO:
+    def __init__(self):
+        self.calls = 0
+
+    def group_member_added(self, group_name: str, username: str):
+        self.calls += 1
+
+    def group_member_removed(self, group_name: str, username: str):
+        self.calls += 1
+
+
+class FakeGroupMembersDAO:
+    def __init__(self):
+        self.removed: Set[str] = set()
+
+    def is_member(self, group_name: str, username: str) -> bool:
+        return username not in self.removed
+
+
+def build_context(task_manager: FakeTaskManager):
+    config = SocaAnyPayload(
+        get_string=lambda key, default=None, required=False: CONFIG.get(key, default),
+        get_int=lambda key, default=None, required=False: CONFIG.get(key, default),
+    )
+    context = SocaAnyPayload(
+        config=lambda: config,
+        logger=lambda name=None: logging.getLogger(name),
+    )
+    context.ldap_client = FakeDirectory(context)
+    context.accounts = SocaAnyPayload(
+        group_dao=SocaAnyPayload(
+            get_group=lambda group_name: {'group_name': group_name, 'enabled': True}
+        ),
+        group_members_dao=FakeGroupMembersDAO(),
+    )
+    context.accounts.membership_sync = GroupMembershipSync(context, task_manager)
+    context.projects = SocaAnyPayload(user_projects_dao=FakeUserProjectsDAO())
+    return context
+
+
+def run_tasks(context, task_manager: FakeTaskManager) -> Dict[str, str]:
+    task = GroupMembershipSyncTask(context)
+    # requeued changes are sent while the tasks are executed
+    messages = list(task_manager.messages)
+    task_manager.messages.clear()
+    failed = {}
+    for message in messages:
+        failed.update(task.invoke(message['payload']))
+    return failed
+
+
+def test_group_membership_sync_send_changes():
+    task_manager = FakeTaskManager()
+    context = build_context(task_manager)
+    membership_sync = context.accounts.membership_sync
+
+    # changes are sent before add_changes() returns
+    membership_sync.add_changes('project-a', ['user1', 'user2', 'user1'], 'add')
+    membership_sync.add_changes('project-a', ['user2'], 'remove')
+    assert [message['payload'] for message in task_manager.messages] == [
+        {'group_name': 'project-a', 'add': ['user1', 'user2'], 'remove': []},
+        {'group_name': 'project-a', 'add': [], 'remove': ['user2']},
+    ]
+    failed = run_tasks(context, task_manager)
+    assert failed == {}
+    assert context.ldap_client.members == {'user1'}
+
+    # send failures are raised to the caller
+    def send_failed(**_):
+        raise exceptions.general_exception('failed to send message')
+
+    task_manager.send = send_failed
+    with pytest.raises(exceptions.SocaException):
+        membership_sync.add_changes('project-b', ['user1'], 'add')
+
+
+def test_group_membership_sync_task_per_user_failures():
+    task_manager = FakeTaskManager()
+    context = build_context(task_manager)
+    membership_sync = context.accounts.membership_sync
+    directory = context.ldap_client
+    directory.members = {'user0'}
+    directory.broken_users = {'user3'}
+
+    membership_sync.add_changes('project-a', [f'user{i}' for i in range(5)], 'add')
+    failed = run_tasks(context, task_manager)
+
+    # batch modify fails, changes are applied per user. existing members are not failures.
+    assert failed == {}
+    assert directory.members == {'user0', 'user1', 'user2', 'user4'}
+    assert directory.modify_requests == 1 + 5
+    # user projects are not updated for users that could not be added to the group
+    assert context.projects.user_projects_dao.calls == 4
+
+    # the failed add is requeued in the message group of the user
+    assert task_manager.messages == [
+        {
+            'name': 'accounts.sync-group-membership',
+            'payload': {
+                'group_name': 'project-a',
+                'add': ['user3'],
+                'remove': [],
+                'requeued': True,
+            },
+        }
+    ]
+    failed = run_tasks(context, task_manager)
+    assert list(failed.keys()) == ['user3']
+    assert len(task_manager.messages) == 0
+
+
+def test_group_membership_sync_task_requeued_add():
+    task_manager = FakeTaskManager()
+    context = build_context(task_manager)
+    membership_sync = context.accounts.membership_sync
+    directory = context.ldap_client
+
+    # the user is synced to the directory service before the requeued add is executed
+    membership_sync.requeue_add('project-a', 'user1')
+    failed = run_tasks(context, task_manager)
+    assert failed == {}
+    assert directory.members == {'user1'}
+    assert context.projects.user_projects_dao.calls == 1
+
+    # the user is removed from the group before the requeued add is executed
+    membership_sync.requeue_add('project-a', 'user2')
+    context.accounts.group_members_dao.removed.add('user2')
+    failed = run_tasks(context, task_manager)
+    assert failed == {}
+    assert directory.members == {'user1'}
+    assert directory.modify_requests == 1
+
+
+def test_group_membership_sync_large_group():
+    """
+    adding 2000 users to a project group is coalesced into a few tasks and LDAP modify requests
+    """
+    user_count = 2000
+    usernames = [f'user{index}' for index in range(user_count)]
+
+    task_manager = FakeTaskManager()
+    context = build_context(task_manager)
+    membership_sync = context.accounts.membership_sync
+    membership_sync.add_changes('project-a', usernames, 'add')
+    assert len(task_manager.messages) == 4
+    failed = run_tasks(context, task_manager)
+
+    assert failed == {}
+    assert len(context.ldap_client.members) == user_count
+    assert context.ldap_client.modify_requests == 4
@@ -0,0 +1,182 @@
+#  Copyright Amazon.com, Inc. or its affiliates. All Rights Reserved.
+#
+#  Licensed under the Apache License, Version 2.0 (the "License"). You may not use this file except in compliance
+#  with the License. A copy of the License is located at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+#  or in the 'license' file accompanying this file. This file is distributed on an 'AS IS' BASIS, WITHOUT WARRANTIES
+#  OR CONDITIONS OF ANY KIND, express or implied. See the License for the specific language governing permissions
+#  and limitations under the License.
+
+"""
+Test Cases for paged results (cookie) based group and user search in Active Directory
+"""
+
+from ideadatamodel import SocaAnyPayload, errorcodes, exceptions
+from ideasdk.utils import Utils
+
+from ideaclustermanager.app.accounts.ldapclient.active_directory_client import (
+    ActiveDirectoryClient,
+)
+
+from contextlib import contextmanager
+from typing import Dict, List
+from ldap.controls import SimplePagedResultsControl  # noqa
+import base64
+import logging
+import pytest
+
+GROUP_COUNT = 50000
+
+
+class PagedResultsDirectory:
+    """
+    in-process directory server supporting the simple paged results control (RFC 2696).
+    the cookie is the offset of the next entry in the result set.
+    """
+
+    def __init__(self, group_count: int):
+        self.entries = []
+        for index in range(group_count):
+            name = f'group{index:05d}'
+            self.entries.append(
+                (
+                    f'cn={name},ou=Groups,ou=IDEA,dc=idea,dc=local',
+                    {
+                        'cn': [Utils.to_bytes(name)],
+                        'gidNumber': [Utils.to_bytes(str(5000 + index))],
+                        'memberUid': [
+                            Utils.to_bytes(f'user{index}'),
+                            Utils.to_bytes(f'user{index + 1}'),
+                        ],
+                        'description': [Utils.to_bytes(f'group {name}')],
+                        'objectClass': [b'top', b'group'],
+                    },
+                )
+            )
+        self.requests = 0
+        self.entries_returned = 0
+        self._searches: Dict[int, tuple] = {}
+
+    def search_ext(
+        self,
+        base,
+        scope,
+        filterstr,
+        attrlist,
+        attrsonly,
+        serverctrls,
+        clientctrls,
+        timeout,
+    ) -> int:
+        self.requests += 1
+        message_id = self.requests
+        self._searches[message_id] = (attrlist, serverctrls[0])
+        return message_id
+
+    def result3(self, message_id: int):
+        attrlist, control = self._searches.pop(message_id)
+        offset = int(control.cookie) if control.cookie else 0
+        page = self.entries[offset : offset + control.size]
+        if attrlist is not None:
+            page = [
+                (dn, {key: value for key, value in attrs.items() if key in attrlist})
+                for dn, attrs in page
+            ]
+        self.entries_returned += len(page)
+        next_offset = offset + len(page)
+        cookie = (
+            Utils.to_bytes(str(next_offset)) if next_offset < len(self.entries) else b''
+        )
+        response_control = SimplePagedResultsControl(
+            False, size=len(self.entries), cookie=cookie
+        )
+        return 101, page, message_id, [response_control]
+
+
+class PagedResultsDirectoryClient(ActiveDirectoryClient):
+    def __init__(self, directory: PagedResultsDirectory):
+        config = {
+            'directoryservice.provider': 'activedirectory',
+            'directoryservice.groups.ou': 'ou=Groups,ou=IDEA,dc=idea,dc=local',
+            'directoryservice.users.ou': 'ou=Users,ou=IDEA,dc=idea,dc=local',
+        }
+        self.context = SocaAnyPayload(
+            config=lambda: SocaAnyPayload(
+                get_string=lambda key, default=None, required=False: config.get(
+                    key, default
+                )
+            )
+        )
+        self.logger = logging.getLogger('test-ldap-search')
+        self.options = SocaAnyPayload(
+            uri='ldap://localhost', domain_name='idea.local', ad_netbios='IDEA'
+        )
+        self._root_username = 'Admin'
+        self._root_password = 'mock'
+        self.directory = directory
+
+    @contextmanager
+    def get_ldap_root_connection(self):
+        yield self.directory
+
+
+@pytest.fixture(scope='module')
+def directory() -> PagedResultsDirectory:
+    return PagedResultsDirectory(group_count=GROUP_COUNT)
+
+
+def test_ldap_search_groups_cursor(directory):
+    ldap_client = PagedResultsDirectoryClient(directory)
+
+    groups, page = ldap_client.search_groups(page_size=100)
+    assert len(groups) == 100
+    assert groups[0] == {
+        'name': 'group00000',
+        'gid': 5000,
+        'users': ['user0', 'user1'],
+    }
+    assert page.total == GROUP_COUNT
+    assert Utils.is_not_empty(page.cursor)
+
+    groups, page = ldap_client.search_groups(
+        page_size=100, start=100, cursor=page.cursor
+    )
+    assert groups[0]['name'] == 'group00100'
+
+    # last page
+    last_page_cursor = Utils.from_bytes(
+        base64.b64encode(Utils.to_bytes(str(GROUP_COUNT - 10)))
+    )
+    groups, page = ldap_client.search_groups(page_size=100, cursor=last_page_cursor)
+    assert len(groups) == 10
+    assert page.cursor is None
+
+    with pytest.raises(exceptions.SocaException) as exc_info:
+        ldap_client.search_groups(page_size=100, cursor='not a cursor!')
+    assert exc_info.value.error_code == errorcodes.INVALID_PARAMS
+
+
+def test_ldap_search_groups_single_page(directory):
+    """
+    a group listing page in a directory with 50k groups is read using a single paged search request, instead of
+    fetching all matching groups and slicing the page
+    """
+    ldap_client = PagedResultsDirectoryClient(directory)
+    page_size = 100
+
+    all_groups: List[Dict] = []
+    cursor = None
+    while True:
+        groups, page = ldap_client.search_groups(page_size=1000, cursor=cursor)
+        all_groups += groups
+        cursor = page.cursor
+        if cursor is None:
+            break
+    assert len(all_groups) == GROUP_COUNT
+
+    requests = directory.requests
+    groups, page = ldap_client.search_groups(page_size=page_size)
+    assert directory.requests - requests == 1
+    assert groups == all_groups[:page_size]
@@ -0,0 +1,194 @@
+#  Copyright Amazon.com, Inc. or its affiliates. All Rights Reserved.
+#
+#  Licensed under the Apache License, Version 2.0 (the "License"). You may not use this file except in compliance
+#  with the License. A copy of the License is located at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+#  or in the 'license' file accompanying this file. This file is distributed on an 'AS IS' BASIS, WITHOUT WARRANTIES
+#  OR CONDITIONS OF ANY KIND, express or implied. See the License for the specific language governing permissions
+#  and limitations under the License.
+
+"""
+Test Cases for NotificationsService
+"""
+
+from ideadatamodel import (
+    SocaAnyPayload,
+    EmailTemplate,
+    GetEmailTemplateResult,
+    Notification,
+    User,
+)
+from ideasdk.utils import Utils
+
+from ideaclustermanager.app.notifications.notifications_service import (
+    NotificationsService,
+)
+
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta, timezone
+from threading import RLock
+from typing import Dict, List
+import botocore.exceptions
+import logging
+import time
+
+MAX_SENDING_RATE = 20
+
+CONFIG = {
+    'cluster.ses.enabled': True,
+    'cluster.ses.sender_email': 'admin@example.org',
+    'cluster.ses.region': 'us-east-1',
+    'cluster.ses.max_sending_rate': MAX_SENDING_RATE,
+    'cluster-manager.notifications.email.enabled': True,
+    'cluster-manager.notifications_queue_url': 'https://sqs.us-east-1.amazonaws.com/123456789012/notifications',
+}
+
+
+class FakeNotificationsBackend:
+    """
+    in-memory email templates, accounts, SES and SQS. counts api calls and records the time of each email sent.
+    """
+
+    def __init__(self):
+        self.lock = RLock()
+        self.template_reads = 0
+        self.sent: List[float] = []
+        self.delete_message_calls = 0
+        self.deleted: List[str] = []
+        self.throttle_sends = 0
+        self.template = EmailTemplate(
+            name='job-started',
+            subject='Job Started: {{ job.name }}',
+            body='<p>Hello {{ job.owner }}, your job {{ job.job_id }} has started.</p>',
+            updated_on=datetime.now(timezone.utc),
+        )
+
+    def get_email_template(self, request) -> GetEmailTemplateResult:
+        with self.lock:
+            self.template_reads += 1
+        return GetEmailTemplateResult(template=self.template.model_copy())
+
+    def get_user(self, username: str) -> User:
+        return User(username=username, email=f'{username}@example.org', enabled=True)
+
+    def send_email(self, **_):
+        with self.lock:
+            if self.throttle_sends > 0:
+                self.throttle_sends -= 1
+                raise botocore.exceptions.ClientError(
+                    {
+                        'Error': {
+                            'Code': 'Throttling',
+                            'Message': 'Maximum sending rate exceeded.',
+                        }
+                    },
+                    'SendEmail',
+                )
+            self.sent.append(time.monotonic())
+
+    def delete_message_batch(self, QueueUrl: str, Entries: List[Dict]):
+        with self.lock:
+            self.delete_message_calls += 1
+            self.deleted.extend(entry['ReceiptHandle'] for entry in Entries)
+        return {'Successful': [{'Id': entry['Id']} for entry in Entries]}
+
+
+def build_notifications_service(
+    backend: FakeNotificationsBackend,
+) -> NotificationsService:
+    logger = logging.getLogger('test-notifications')
+    aws = SocaAnyPayload(ses=lambda region_name=None: backend, sqs=lambda: backend)
+    config = SocaAnyPayload(
+        get_string=lambda key, default=None, required=False: CONFIG.get(key, default),
+        get_int=lambda key, default=None, required=False: CONFIG.get(key, default),
+        get_bool=lambda key, default=None, required=False: CONFIG.get(key, default),
+    )
+    context = SocaAnyPayload(
+        aws=lambda: aws,
+        config=lambda: config,
+        logger=lambda name=None: logger,
+        service_registry=lambda: SocaAnyPayload(register=lambda service: None),
+    )
+    return NotificationsService(
+        context=context,
+        accounts=SocaAnyPayload(get_user=backend.get_user),
+        email_templates=SocaAnyPayload(get_email_template=backend.get_email_template),
+    )
+
+
+def build_notification(index: int) -> Notification:
+    return Notification(
+        username=f'user{index}',
+        template_name='job-started',
+        params={
+            'job': {'name': f'job-{index}', 'owner': f'user{index}', 'job_id': index}
+        },
+    )
+
+
+def build_sqs_message(index: int) -> Dict:
+    return {
+        'MessageId': f'message-{index}',
+        'ReceiptHandle': f'receipt-{index}',
+        'Body': Utils.to_json(build_notification(index)),
+    }
+
+
+def test_notifications_compiled_template_cache():
+    backend = FakeNotificationsBackend()
+    service = build_notifications_service(backend)
+
+    for index in range(50):
+        service.send_email(build_notification(index))
+    assert backend.template_reads == 1
+    assert len(backend.sent) == 50
+
+    # template update: the new version is compiled after the cached template expires
+    backend.template.subject = 'Job Running: {{ job.name }}'
+    backend.template.updated_on = backend.template.updated_on + timedelta(seconds=1)
+    service.email_template_cache.clear()
+    subject_template, _ = service.get_compiled_email_template('job-started')
+    assert subject_template.render(job={'name': 'job-1'}) == 'Job Running: job-1'
+    assert backend.template_reads == 2
+
+
+def test_notifications_batched_delete_and_throttling():
+    backend = FakeNotificationsBackend()
+    service = build_notifications_service(backend)
+
+    # a throttled notification is not deleted and is retried after the visibility timeout
+    backend.throttle_sends = 1
+    messages = [build_sqs_message(index) for index in range(10)]
+    receipt_handles = [
+        receipt_handle
+        for receipt_handle in map(service.execute_notifications, messages)
+        if receipt_handle is not None
+    ]
+    service.delete_messages(receipt_handles)
+
+    assert backend.delete_message_calls == 1
+    assert len(backend.deleted) == 9
+    assert 'receipt-0' not in backend.deleted
+    assert service.ses_rate_limiter.throttle_count == 1
+    assert service.ses_rate_limiter.rate < MAX_SENDING_RATE
+
+
+def test_notifications_shared_sending_rate():
+    """
+    workers share a token bucket for cluster.ses.max_sending_rate. the burst is sent immediately, the remaining
+    emails are paced at the configured rate.
+    """
+    workers = 10
+    count = 40
+
+    backend = FakeNotificationsBackend()
+    service = build_notifications_service(backend)
+    start = time.monotonic()
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        list(executor.map(service.send_email, map(build_notification, range(count))))
+    elapsed = time.monotonic() - start
+
+    assert len(backend.sent) == count
+    assert elapsed >= (count - MAX_SENDING_RATE) / MAX_SENDING_RATE * 0.95
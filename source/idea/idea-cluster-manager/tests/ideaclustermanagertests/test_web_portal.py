@@ -0,0 +1,209 @@
+#  Copyright Amazon.com, Inc. or its affiliates. All Rights Reserved.
+#
+#  Licensed under the Apache License, Version 2.0 (the "License"). You may not use this file except in compliance
+#  with the License. A copy of the License is located at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+#  or in the 'license' file accompanying this file. This file is distributed on an 'AS IS' BASIS, WITHOUT WARRANTIES
+#  OR CONDITIONS OF ANY KIND, express or implied. See the License for the specific language governing permissions
+#  and limitations under the License.
+
+"""
+Test Cases for WebPortal index page caching and WebAssets
+"""
+
+from ideasdk.config.soca_config import SocaConfig
+from ideasdk.utils import Jinja2Utils, ModuleMetadataHelper
+
+from ideaclustermanager.app.web_portal import WebPortal
+from ideaclustermanager.app.web_assets import (
+    WebAssets,
+    CACHE_CONTROL_IMMUTABLE,
+    CACHE_CONTROL_REVALIDATE,
+)
+
+from typing import Dict, Optional
+import asyncio
+import gzip
+import os
+import time
+
+INDEX_TEMPLATE = '<html><body><script>window.idea={app_init_data:"{{ app_init_data }}"}</script></body></html>'
+MAIN_JS = 'console.log("web portal");\n' * 200
+
+
+class FakeRequest:
+    def __init__(
+        self, headers: Optional[Dict[str, str]] = None, args: Optional[Dict] = None
+    ):
+        self.headers = {key.lower(): value for key, value in (headers or {}).items()}
+        self.args = args or {}
+        self.path = '/'
+
+
+class FakeServer:
+    @staticmethod
+    def get_query_param_as_string(
+        name: str, http_request: FakeRequest
+    ) -> Optional[str]:
+        return http_request.args.get(name)
+
+
+class FakeAws:
+    @staticmethod
+    def aws_region() -> str:
+        return 'us-east-1'
+
+
+class FakeContext:
+    def __init__(self):
+        self._config = SocaConfig(
+            {
+                'global-settings': {
+                    'module_sets': {
+                        'default': {
+                            'cluster': {'module_id': 'cluster'},
+                            'cluster-manager': {'module_id': 'cluster-manager'},
+                        }
+                    }
+                },
+                'identity-provider': {'cognito': {'sso_enabled': True}},
+            }
+        )
+
+    def config(self) -> SocaConfig:
+        return self._config
+
+    def cluster_name(self) -> str:
+        return 'idea-test'
+
+    def module_set(self) -> str:
+        return 'default'
+
+    def aws(self) -> FakeAws:
+        return FakeAws()
+
+
+def write_file(path: str, content: str):
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, 'w') as f:
+        f.write(content)
+
+
+def build_web_app(tmp_path) -> str:
+    web_app_dir = str(tmp_path / 'webapp')
+    write_file(os.path.join(web_app_dir, 'index.html'), INDEX_TEMPLATE)
+    write_file(os.path.join(web_app_dir, 'static', 'js', 'main.1f2e3d4c.js'), MAIN_JS)
+    write_file(os.path.join(web_app_dir, 'manifest.json'), '{"name": "IDEA"}')
+    return web_app_dir
+
+
+def build_web_portal(tmp_path) -> WebPortal:
+    web_portal = WebPortal.__new__(WebPortal)
+    web_portal.context = FakeContext()
+    web_portal.server = FakeServer()
+    web_portal.logger = None
+    web_portal.module_metadata_helper = ModuleMetadataHelper()
+    web_portal.web_app_dir = build_web_app(tmp_path)
+    web_portal.web_resources_context_path = '/'
+    web_portal.web_template_env = Jinja2Utils.env_using_file_system_loader(
+        search_path=web_portal.web_app_dir, auto_escape=True
+    )
+    web_portal.web_assets = WebAssets(web_app_dir=web_portal.web_app_dir)
+    web_portal.web_assets.load()
+    web_portal.index_pages = {}
+    return web_portal
+
+
+def test_web_assets_precompressed_variants(tmp_path):
+    web_app_dir = build_web_app(tmp_path)
+    main_js = os.path.join(web_app_dir, 'static', 'js', 'main.1f2e3d4c.js')
+    with open(f'{main_js}.br', 'wb') as f:
+        f.write(b'precompressed brotli')
+
+    web_assets = WebAssets(web_app_dir=web_app_dir)
+    web_assets.load()
+
+    # precompressed files are not served as separate resources
+    assert web_assets.get('static/js/main.1f2e3d4c.js.br') is None
+
+    asset = web_assets.get('static/js/main.1f2e3d4c.js')
+    assert asset.fingerprinted
+    assert asset.variants['br'] == b'precompressed brotli'
+    assert gzip.decompress(asset.variants['gzip']).decode('utf-8') == MAIN_JS
+
+    # small resources are not compressed
+    assert len(web_assets.get('manifest.json').variants) == 0
+
+
+def test_web_assets_static_route(tmp_path):
+    web_assets = WebAssets(web_app_dir=build_web_app(tmp_path))
+    web_assets.load()
+    asset = web_assets.get('static/js/main.1f2e3d4c.js')
+
+    request = FakeRequest(headers={'Accept-Encoding': 'gzip, deflate, br;q=0'})
+    response = asyncio.run(
+        web_assets.static_route(request, path='static/js/main.1f2e3d4c.js')
+    )
+    assert response.status == 200
+    assert response.headers['content-encoding'] == 'gzip'
+    assert response.headers['cache-control'] == CACHE_CONTROL_IMMUTABLE
+    assert response.headers['vary'] == 'Accept-Encoding'
+    assert response.headers['etag'] == asset.get_etag('gzip')
+    assert gzip.decompress(response.body).decode('utf-8') == MAIN_JS
+
+    # revalidation
+    request = FakeRequest(
+        headers={'Accept-Encoding': 'gzip', 'If-None-Match': asset.get_etag('gzip')}
+    )
+    response = asyncio.run(
+        web_assets.static_route(request, path='static/js/main.1f2e3d4c.js')
+    )
+    assert response.status == 304
+
+    # resources without content hash in the file name are revalidated, unless requested with the current version
+    response = asyncio.run(web_assets.static_route(FakeRequest(), path='manifest.json'))
+    assert response.headers['cache-control'] == CACHE_CONTROL_REVALIDATE
+    assert web_assets.get_url('/manifest.json').startswith('/manifest.json?v=')
+    version = web_assets.get('manifest.json').version
+    response = asyncio.run(
+        web_assets.static_route(FakeRequest(args={'v': version}), path='manifest.json')
+    )
+    assert response.headers['cache-control'] == CACHE_CONTROL_IMMUTABLE
+
+
+def test_web_portal_index_page_cache(tmp_path, monkeypatch):
+    web_portal = build_web_portal(tmp_path)
+    build_app_init_data = web_portal.build_app_init_data
+    calls = []
+
+    def counting_build_app_init_data(module_set_id: str) -> Dict:
+        calls.append(module_set_id)
+        return build_app_init_data(module_set_id)
+
+    monkeypatch.setattr(web_portal, 'build_app_init_data', counting_build_app_init_data)
+
+    for _ in range(10):
+        response = asyncio.run(
+            web_portal.index_route(FakeRequest(headers={'Accept-Encoding': 'gzip'}))
+        )
+        assert response.status == 200
+    assert calls == ['default']
+
+    # sso redirects are rendered for the request, using the cached app init data
+    response = asyncio.run(
+        web_portal.index_route(FakeRequest(args={'sso_auth_status': 'SUCCESS'}))
+    )
+    assert response.headers['cache-control'] == 'no-store'
+    assert calls == ['default']
+
+    # config updates invalidate the cached index page
+    web_portal.context.config().put('cluster-manager.web_portal.title', 'Updated')
+    asyncio.run(web_portal.index_route(FakeRequest()))
+    assert calls == ['default', 'default']
+
+    # index pages expire after the cache ttl
+    web_portal.index_pages['default'].expires_at = time.time() - 1
+    asyncio.run(web_portal.index_route(FakeRequest()))
+    assert len(calls) == 3
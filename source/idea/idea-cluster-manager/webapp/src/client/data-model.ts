@@ -601,6 +601,7 @@ export interface SocaQueueManagementParams {
   restricted_parameters?: string[];
   allowed_security_groups?: string[];
   allowed_instance_profiles?: string[];
+  provisioning_workers?: number;
 }
 export interface SocaJobParams {
   nodes?: number;
@@ -1203,6 +1204,7 @@ export interface GetSoftwareStackInfoResponse {
 export interface GetUserApplicationsRequest {
   username?: string;
   application_ids?: string[];
+  lite?: boolean;
 }
 export interface GetUserApplicationsResult {
   applications: HpcApplication[];
@@ -214,7 +214,8 @@ class HpcApplications extends Component<HpcApplicationsProps, HpcApplicationsSta
                 onFetchRecords={() => {
                     return this.schedulerAdmin().listHpcApplications({
                         filters: this.getListing().getFilters(),
-                        paginator: this.getListing().getPaginator()
+                        paginator: this.getListing().getPaginator(),
+                        lite: true
                     })
                 }}
                 columnDefinitions={APPLICATIONS_TABLE_COLUMN_DEFINITIONS}
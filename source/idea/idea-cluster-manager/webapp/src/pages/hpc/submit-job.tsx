@@ -264,9 +264,12 @@ class SubmitJob extends Component<SubmitJobProps, SubmitJobState> {
                                <Button variant="primary"
                                        disabled={this.state.selectedApplicationId == null}
                                        onClick={() => {
-                                           this.state.applications.forEach(application => {
-                                               if(application.application_id === this.state.selectedApplicationId) {
-                                                   this.loadApplication(application)
+                                           // the application listing does not include the form template. get the application when selected.
+                                           this.getSchedulerClient().getUserApplications({
+                                               application_ids: [this.state.selectedApplicationId!]
+                                           }).then(result => {
+                                               if (result.applications?.length > 0) {
+                                                   this.loadApplication(result.applications[0])
                                                }
                                            })
                                        }}>Select</Button>
@@ -650,6 +653,7 @@ class SubmitJob extends Component<SubmitJobProps, SubmitJobState> {
                                 }
                                 <Button variant="normal" onClick={() => {
                                     this.getSchedulerClient().getUserApplications({
+                                        lite: true
                                     }).then(result => {
                                         const listing: HpcApplication[] = (result.applications) ? result.applications : []
                                         this.setState({
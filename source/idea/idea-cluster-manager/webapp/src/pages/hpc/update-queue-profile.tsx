@@ -346,6 +346,17 @@ class HpcUpdateQueueProfile extends Component<HpcUpdateQueueProfileProps, HpcUpd
                                                         required: true,
                                                         min: 0
                                                     }
+                                                },
+                                                {
+                                                    name: 'queue_management_params.provisioning_workers',
+                                                    title: 'Provisioning Workers',
+                                                    description: 'The no. of jobs provisioned concurrently for this Queue Profile',
+                                                    help_text: 'Applicable only for ephemeral capacity without queue limits. Leave empty to use the cluster default.',
+                                                    param_type: 'text',
+                                                    data_type: 'int',
+                                                    validate: {
+                                                        min: 1
+                                                    }
                                                 }
                                             ]
                                         },
@@ -11,6 +11,8 @@
 __all__ = (
     'CreateUserRequest',
     'CreateUserResult',
+    'BatchCreateUsersRequest',
+    'BatchCreateUsersResult',
     'GetUserRequest',
     'GetUserResult',
     'ModifyUserRequest',
@@ -90,6 +92,22 @@ class CreateUserResult(SocaPayload):
     user: Optional[User] = Field(default=None)
 
 
+# BatchCreateUsers
+
+
+class BatchCreateUsersRequest(SocaPayload):
+    users: Optional[List[User]] = Field(default=None)
+    email_verified: Optional[bool] = Field(default=None)
+
+
+class BatchCreateUsersResult(SocaPayload):
+    created: Optional[List[User]] = Field(default=None)
+    # usernames of users that already exist
+    existing: Optional[List[str]] = Field(default=None)
+    # username -> error message
+    failed: Optional[Dict[str, str]] = Field(default=None)
+
+
 # GetUser
 
 
@@ -435,6 +453,13 @@ OPEN_API_SPEC_ENTRIES_AUTH = [
         is_listing=False,
         is_public=False,
     ),
+    IdeaOpenAPISpecEntry(
+        namespace='Accounts.BatchCreateUsers',
+        request=BatchCreateUsersRequest,
+        result=BatchCreateUsersResult,
+        is_listing=False,
+        is_public=False,
+    ),
     IdeaOpenAPISpecEntry(
         namespace='Accounts.GetUser',
         request=GetUserRequest,
@@ -135,6 +135,7 @@ IDEA_TAG_BACKUP_PLAN = IDEA_TAG_PREFIX + 'BackupPlan'
 IDEA_TAG_STACK_TYPE = IDEA_TAG_PREFIX + 'StackType'
 IDEA_TAG_IDEA_SESSION_ID = IDEA_TAG_PREFIX + 'IDEASessionUUID'
 IDEA_TAG_DCV_SESSION_ID = IDEA_TAG_PREFIX + 'DCVSessionUUID'
+IDEA_TAG_BACKFILL_PREFIX = IDEA_TAG_PREFIX + 'Backfill:'
 
 NODE_TYPE_COMPUTE = 'compute-node'
 NODE_TYPE_DCV_HOST = 'virtual-desktop-dcv-host'
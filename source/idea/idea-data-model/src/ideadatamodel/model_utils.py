@@ -470,6 +470,23 @@ class ModelUtils:
     def from_json(data: str) -> Union[Dict, List]:
         return orjson.loads(data)
 
+    @staticmethod
+    def to_json_object(payload: Union[BaseModel, Any]) -> Any:
+        """
+        convert the payload to JSON compatible dicts, lists and values, same as from_json(to_json(payload)).
+
+        pydantic models are serialized by pydantic-core and dicts by orjson, both in native code. a structural copy
+        in python (or a json mode model_dump) is not faster and does not return the same values for
+        non-finite floats, so the payload is serialized to JSON and parsed, without decoding the bytes to a string.
+        """
+        if isinstance(payload, BaseModel):
+            return orjson.loads(
+                payload.__pydantic_serializer__.to_json(
+                    payload, exclude_none=True, by_alias=True
+                )
+            )
+        return orjson.loads(orjson.dumps(payload, default=json_serializer))
+
     @staticmethod
     def shake_256(data: str, num_bytes: int = 5) -> str:
         return hashlib.shake_256(data.encode('utf-8')).hexdigest(num_bytes)
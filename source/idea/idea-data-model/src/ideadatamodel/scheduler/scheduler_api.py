@@ -362,6 +362,7 @@ class ProvisionAlwaysOnNodesResult(SocaPayload):
 class GetUserApplicationsRequest(SocaPayload):
     username: Optional[str] = Field(default=None)
     application_ids: Optional[List[str]] = Field(default=None)
+    lite: Optional[bool] = Field(default=None)
 
 
 class GetUserApplicationsResult(SocaPayload):
@@ -497,6 +498,13 @@ OPEN_API_SPEC_ENTRIES_SCHEDULER = [
         is_listing=True,
         is_public=False,
     ),
+    IdeaOpenAPISpecEntry(
+        namespace='SchedulerAdmin.ListArchivedJobs',
+        request=ListJobsRequest,
+        result=ListJobsResult,
+        is_listing=True,
+        is_public=False,
+    ),
     IdeaOpenAPISpecEntry(
         namespace='SchedulerAdmin.ListNodes',
         request=ListNodesRequest,
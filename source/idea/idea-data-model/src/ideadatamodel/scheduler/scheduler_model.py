@@ -1369,6 +1369,7 @@ class SocaQueueManagementParams(SocaBaseModel):
     restricted_parameters: Optional[List[str]] = Field(default=None)
     allowed_security_groups: Optional[List[str]] = Field(default=None)
     allowed_instance_profiles: Optional[List[str]] = Field(default=None)
+    provisioning_workers: Optional[int] = Field(default=None)
 
     def is_allowed_security_group(self, security_group: str) -> bool:
         if (
@@ -81,6 +81,10 @@ class SchedulerAdminAPI(BaseAPI):
                 'scope': self.SCOPE_READ,
                 'method': self.list_completed_jobs,
             },
+            'SchedulerAdmin.ListArchivedJobs': {
+                'scope': self.SCOPE_READ,
+                'method': self.list_archived_jobs,
+            },
             'SchedulerAdmin.ListNodes': {
                 'scope': self.SCOPE_READ,
                 'method': self.list_nodes,
@@ -197,10 +201,17 @@ class SchedulerAdminAPI(BaseAPI):
         else:
             page_size = payload.page_size
             page_start = payload.page_start
+            cursor = None
 
-            entries = self.context.job_cache.list_completed_jobs(
-                _limit=page_size, _offset=page_start
-            )
+            if page_start > 0 and Utils.is_empty(payload.cursor):
+                # legacy offset based paging
+                entries = self.context.job_cache.list_completed_jobs(
+                    _limit=page_size, _offset=page_start
+                )
+            else:
+                entries, cursor = self.context.job_cache.list_completed_jobs_page(
+                    page_size=page_size, cursor=payload.cursor
+                )
             total = self.context.job_cache.get_completed_jobs_count()
 
             context.success(
@@ -209,11 +220,42 @@ class SchedulerAdminAPI(BaseAPI):
                         total=total,
                         page_size=payload.page_size,
                         start=payload.page_start,
+                        cursor=cursor,
                     ),
                     listing=entries,
                 )
             )
 
+    def list_archived_jobs(self, context: ApiInvocationContext):
+        payload = context.get_request_payload_as(ListJobsRequest)
+
+        start = None
+        end = None
+        if payload.date_range is not None:
+            start = payload.date_range.start
+            end = payload.date_range.end
+
+        kwargs = {}
+        if Utils.is_not_empty(payload.queue_type):
+            kwargs['queue_type'] = payload.queue_type
+        if Utils.is_not_empty(payload.queue):
+            kwargs['queue'] = payload.queue
+
+        entries, cursor = self.context.job_cache.list_archived_jobs(
+            page_size=payload.page_size,
+            cursor=payload.cursor,
+            start=start,
+            end=end,
+            **kwargs,
+        )
+
+        context.success(
+            ListJobsResult(
+                paginator=SocaPaginator(page_size=payload.page_size, cursor=cursor),
+                listing=entries,
+            )
+        )
+
     # nodes
     def list_nodes(self, context: ApiInvocationContext):
         payload = context.get_request_payload_as(ListNodesRequest)
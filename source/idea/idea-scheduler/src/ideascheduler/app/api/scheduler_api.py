@@ -117,15 +117,27 @@ class SchedulerAPI(BaseAPI):
             payload = context.get_request_payload_as(ListJobsRequest)
             page_size = payload.page_size
             page_start = payload.page_start
-            entries = self.context.job_cache.list_completed_jobs(
-                owner=context.get_username(), _limit=page_size, _offset=page_start
-            )
+            cursor = None
+            if page_start > 0 and Utils.is_empty(payload.cursor):
+                # legacy offset based paging
+                entries = self.context.job_cache.list_completed_jobs(
+                    owner=context.get_username(), _limit=page_size, _offset=page_start
+                )
+            else:
+                entries, cursor = self.context.job_cache.list_completed_jobs_page(
+                    page_size=page_size,
+                    cursor=payload.cursor,
+                    owner=context.get_username(),
+                )
             total = self.context.job_cache.get_completed_jobs_count(
                 owner=context.get_username()
             )
             result = ListJobsResult(
                 paginator=SocaPaginator(
-                    total=total, page_size=payload.page_size, start=payload.page_start
+                    total=total,
+                    page_size=payload.page_size,
+                    start=payload.page_start,
+                    cursor=cursor,
                 ),
                 listing=entries,
             )
@@ -15,6 +15,8 @@ from ideasdk.auth import TokenService
 from ideasdk.client import AccountsClient, ProjectsClient, NotificationsAsyncClient
 from ideasdk.utils import EnvironmentUtils, Utils
 from ideasdk.shell import ShellInvoker
+from ideasdk.bootstrap import BootstrapPackageCache
+from ideasdk.aws import AwsRateGovernor
 
 
 from ideascheduler.app.app_protocols import (
@@ -29,6 +31,8 @@ from ideascheduler.app.app_protocols import (
     HpcApplicationsProtocol,
     LicenseServiceProtocol,
     JobNotificationsProtocol,
+    CloudFormationTemplateCompilerProtocol,
+    LaunchPreflightCacheProtocol,
 )
 from ideascheduler.app.metrics import JobProvisioningMetrics
 
@@ -62,6 +66,12 @@ class SchedulerAppContext(SocaContext):
         self.metrics: Optional[JobProvisioningMetrics] = None
 
         self.shell: Optional[ShellInvoker] = None
+        self.bootstrap_package_cache: Optional[BootstrapPackageCache] = None
+        self.cloudformation_template_compiler: Optional[
+            CloudFormationTemplateCompilerProtocol
+        ] = None
+        self.launch_preflight_cache: Optional[LaunchPreflightCacheProtocol] = None
+        self.aws_rate_governor: Optional[AwsRateGovernor] = None
 
     def is_ready(self) -> bool:
         job_cache_ready = self.job_cache.is_ready()
@@ -10,7 +10,8 @@
 #  and limitations under the License.
 
 from ideasdk.protocols import SocaBaseProtocol, SocaServiceProtocol
-from ideadatamodel.aws import EC2Instance
+from ideadatamodel import exceptions
+from ideadatamodel.aws import EC2Instance, CheckServiceQuotaResult
 from ideadatamodel.scheduler import (
     SocaJobState,
     SocaJobExecutionHost,
@@ -51,7 +52,8 @@ from ideadatamodel.scheduler import (
 )
 
 from abc import abstractmethod, ABC
-from typing import List, Optional, Dict, Any, TypeVar, Union, Generator
+from typing import List, Optional, Dict, Any, TypeVar, Union, Generator, Tuple
+from datetime import datetime
 import arrow
 import dataset
 
@@ -73,6 +75,24 @@ class JobCacheProtocol(SocaBaseProtocol):
         self, _limit: int = -1, _offset: int = 0, **kwargs
     ) -> List[SocaJob]: ...
 
+    @abstractmethod
+    def list_completed_jobs_page(
+        self, page_size: int, cursor: Optional[str] = None, **kwargs
+    ) -> Tuple[List[SocaJob], Optional[str]]: ...
+
+    @abstractmethod
+    def list_archived_jobs(
+        self,
+        page_size: int,
+        cursor: Optional[str] = None,
+        start: Optional[datetime] = None,
+        end: Optional[datetime] = None,
+        **kwargs,
+    ) -> Tuple[List[SocaJob], Optional[str]]: ...
+
+    @abstractmethod
+    def archive_completed_jobs(self, retention_days: int) -> int: ...
+
     @abstractmethod
     def get_job(self, job_id: str) -> Optional[SocaJob]: ...
 
@@ -107,6 +127,12 @@ class JobCacheProtocol(SocaBaseProtocol):
     @abstractmethod
     def get_desired_capacity(self, job_group: str) -> int: ...
 
+    @abstractmethod
+    def job_submitted(self, job: SocaJob): ...
+
+    @abstractmethod
+    def get_expected_batch_size(self, job_group: str) -> int: ...
+
     @abstractmethod
     def get_active_jobs(self, queue_profile: str) -> int: ...
 
@@ -180,6 +206,13 @@ class JobProvisioningQueueProtocol(SocaBaseProtocol):
     @abstractmethod
     def get_queue_size(self, key: Optional[str] = None) -> int: ...
 
+    @property
+    @abstractmethod
+    def put_count(self) -> int: ...
+
+    @abstractmethod
+    def wait_for_jobs(self, put_count: int, timeout: float) -> bool: ...
+
 
 JobProvisioningQueueType = TypeVar(
     'JobProvisioningQueueType', bound=JobProvisioningQueueProtocol
@@ -233,6 +266,9 @@ class SocaSchedulerProtocol(SocaBaseProtocol):
     @abstractmethod
     def delete_node(self, host: str) -> bool: ...
 
+    @abstractmethod
+    def delete_nodes(self, hosts: List[str]) -> Dict[str, exceptions.SocaException]: ...
+
     @abstractmethod
     def set_node_state(self, host: str, state: SocaComputeNodeState): ...
 
@@ -458,6 +494,10 @@ class LicenseServiceProtocol(SocaBaseProtocol):
 
     def get_available_licenses(self, license_resource_name: str) -> int: ...
 
+    def reserve_licenses(self, jobs: List[SocaJob], logger=None): ...
+
+    def release_licenses(self, jobs: List[SocaJob]): ...
+
     def check_license_resource_availability(
         self, request: CheckHpcLicenseResourceAvailabilityRequest
     ) -> CheckHpcLicenseResourceAvailabilityResult: ...
@@ -467,3 +507,27 @@ class JobNotificationsProtocol(SocaBaseProtocol):
     def job_started(self, job: SocaJob): ...
 
     def job_completed(self, job: SocaJob): ...
+
+
+class CloudFormationTemplateCompilerProtocol(SocaBaseProtocol):
+    def compile(self, builder): ...
+
+    def clear(self): ...
+
+
+class LaunchPreflightCacheProtocol(SocaBaseProtocol):
+    def is_dry_run_verified(self, dry_run_key: str) -> bool: ...
+
+    def set_dry_run_verified(self, dry_run_key: str): ...
+
+    def check_service_quota(
+        self, quota_key: str, desired_capacity: int, sample
+    ) -> CheckServiceQuotaResult: ...
+
+    def invalidate(
+        self,
+        dry_run_keys: Optional[List[str]] = None,
+        quota_keys: Optional[List[str]] = None,
+    ): ...
+
+    def clear(self): ...
@@ -12,8 +12,8 @@
 import ideascheduler
 from ideasdk.utils import Utils
 
-from typing import Dict, Optional
-from boto3.dynamodb.conditions import Attr
+from typing import Dict, Iterable, List, Optional, Set
+from boto3.dynamodb.conditions import Attr, Key
 import arrow
 from ideadatamodel import (
     exceptions,
@@ -21,9 +21,28 @@ from ideadatamodel import (
     ListHpcApplicationsResult,
     SocaPaginator,
     HpcApplication,
+    Project,
     SocaUserInputModuleMetadata,
 )
 
+# attributes required to render an application in a listing (application catalog, admin applications table).
+# form_template and the job script attributes are only read when an application is opened.
+APPLICATION_LISTING_ATTRIBUTES = [
+    'application_id',
+    'title',
+    'description',
+    'thumbnail_data',
+    'project_ids',
+    'created_on',
+    'updated_on',
+]
+
+# max. no. of keys in a single BatchGetItem request
+BATCH_GET_MAX_KEYS = 100
+
+# index of the project ids of applications created before the application-projects table was added
+APPLICATION_PROJECTS_INDEX_BACKFILL = 'application-projects'
+
 
 class HpcApplicationsDAO:
     def __init__(self, context: ideascheduler.AppContext, logger=None):
@@ -33,10 +52,14 @@ class HpcApplicationsDAO:
         else:
             self.logger = context.logger('applications-dao')
         self.table = None
+        self.application_projects_table = None
 
     def get_table_name(self) -> str:
         return f'{self.context.cluster_name()}.{self.context.module_id()}.applications'
 
+    def get_application_projects_table_name(self) -> str:
+        return f'{self.context.cluster_name()}.{self.context.module_id()}.application-projects'
+
     def initialize(self):
         self.context.aws_util().dynamodb_create_table(
             create_table_request={
@@ -49,10 +72,163 @@ class HpcApplicationsDAO:
             },
             wait=True,
         )
+        self.context.aws_util().dynamodb_create_table(
+            create_table_request={
+                'TableName': self.get_application_projects_table_name(),
+                'AttributeDefinitions': [
+                    {'AttributeName': 'project_id', 'AttributeType': 'S'},
+                    {'AttributeName': 'application_id', 'AttributeType': 'S'},
+                ],
+                'KeySchema': [
+                    {'AttributeName': 'project_id', 'KeyType': 'HASH'},
+                    {'AttributeName': 'application_id', 'KeyType': 'RANGE'},
+                ],
+                'BillingMode': 'PAY_PER_REQUEST',
+            },
+            wait=True,
+        )
         self.table = self.context.aws().dynamodb_table().Table(self.get_table_name())
+        self.application_projects_table = (
+            self.context.aws()
+            .dynamodb_table()
+            .Table(self.get_application_projects_table_name())
+        )
+
+        # the index is rebuilt until the build completes. the application catalog reads only the index.
+        if not self.context.aws_util().dynamodb_is_backfill_complete(
+            self.get_application_projects_table_name(),
+            APPLICATION_PROJECTS_INDEX_BACKFILL,
+        ):
+            self.build_application_projects_index()
+            self.context.aws_util().dynamodb_set_backfill_complete(
+                self.get_application_projects_table_name(),
+                APPLICATION_PROJECTS_INDEX_BACKFILL,
+            )
+
+    def build_application_projects_index(self):
+        """
+        index the project ids of all existing applications.
+        called until the build completes, after the application-projects table is created for an existing cluster.
+        """
+        count = 0
+        exclusive_start_key = None
+        with self.application_projects_table.batch_writer() as batch:
+            while True:
+                scan_request = {'AttributesToGet': ['application_id', 'project_ids']}
+                if exclusive_start_key is not None:
+                    scan_request['ExclusiveStartKey'] = exclusive_start_key
+                scan_result = self.table.scan(**scan_request)
+                for db_application in Utils.get_value_as_list('Items', scan_result, []):
+                    application_id = db_application['application_id']
+                    for project_id in Utils.get_value_as_list(
+                        'project_ids', db_application, []
+                    ):
+                        batch.put_item(
+                            Item={
+                                'project_id': project_id,
+                                'application_id': application_id,
+                            }
+                        )
+                    count += 1
+                exclusive_start_key = Utils.get_any_value(
+                    'LastEvaluatedKey', scan_result
+                )
+                if exclusive_start_key is None:
+                    break
+        self.logger.info(f'indexed projects for {count} applications')
+
+    def update_application_projects(
+        self,
+        application_id: str,
+        project_ids: Iterable[str],
+        previous_project_ids: Iterable[str] = (),
+    ):
+        project_ids = set(project_ids)
+        previous_project_ids = set(previous_project_ids)
+        with self.application_projects_table.batch_writer() as batch:
+            for project_id in project_ids - previous_project_ids:
+                batch.put_item(
+                    Item={'project_id': project_id, 'application_id': application_id}
+                )
+            for project_id in previous_project_ids - project_ids:
+                batch.delete_item(
+                    Key={'project_id': project_id, 'application_id': application_id}
+                )
+
+    def get_application_ids_by_project(self, project_id: str) -> List[str]:
+        if Utils.is_empty(project_id):
+            raise exceptions.invalid_params('project_id is required')
+
+        application_ids = []
+        exclusive_start_key = None
+        while True:
+            query_request = {
+                'KeyConditionExpression': Key('project_id').eq(project_id),
+                'ProjectionExpression': 'application_id',
+            }
+            if exclusive_start_key is not None:
+                query_request['ExclusiveStartKey'] = exclusive_start_key
+            query_result = self.application_projects_table.query(**query_request)
+            for entry in Utils.get_value_as_list('Items', query_result, []):
+                application_ids.append(entry['application_id'])
+            exclusive_start_key = Utils.get_any_value('LastEvaluatedKey', query_result)
+            if exclusive_start_key is None:
+                break
+        return application_ids
+
+    def batch_get_applications(
+        self, application_ids: Iterable[str], lite: bool = False
+    ) -> List[Dict]:
+        """
+        get applications in batches of 100. applications that do not exist are skipped.
+        :param application_ids:
+        :param lite: only read the attributes required to list the applications
+        """
+        keys = [
+            {'application_id': application_id}
+            for application_id in dict.fromkeys(application_ids)
+            if Utils.is_not_empty(application_id)
+        ]
+        table_name = self.get_table_name()
+        db_applications = []
+        for offset in range(0, len(keys), BATCH_GET_MAX_KEYS):
+            request_items = {
+                table_name: {'Keys': keys[offset : offset + BATCH_GET_MAX_KEYS]}
+            }
+            if lite:
+                request_items[table_name]['AttributesToGet'] = (
+                    APPLICATION_LISTING_ATTRIBUTES
+                )
+            while Utils.is_not_empty(request_items):
+                result = (
+                    self.context.aws()
+                    .dynamodb_table()
+                    .batch_get_item(RequestItems=request_items)
+                )
+                db_applications += Utils.get_value_as_list(
+                    table_name, Utils.get_value_as_dict('Responses', result, {}), []
+                )
+                request_items = Utils.get_value_as_dict('UnprocessedKeys', result)
+        return db_applications
+
+    def get_projects(self, project_ids: Iterable[str]) -> Dict[str, Project]:
+        """
+        resolve the projects for a batch of applications, once per project.
+        """
+        projects = {}
+        for project_id in set(project_ids):
+            if Utils.is_empty(project_id):
+                continue
+            projects[project_id] = self.context.projects_client.get_project_by_id(
+                project_id
+            )
+        return projects
 
     def convert_from_db(
-        self, db_application: Dict, lite: bool = False
+        self,
+        db_application: Dict,
+        lite: bool = False,
+        projects: Optional[Dict[str, Project]] = None,
     ) -> HpcApplication:
         application = HpcApplication()
         application.application_id = Utils.get_value_as_string(
@@ -69,12 +245,16 @@ class HpcApplicationsDAO:
 
         # get projects
         if project_ids is not None:
-            projects = []
+            if projects is None:
+                projects = self.get_projects(project_ids)
+            application_projects = []
             for project_id in project_ids:
-                project = self.context.projects_client.get_project_by_id(project_id)
-                projects.append(project)
-            projects.sort(key=lambda p: p.name)
-            application.projects = projects
+                project = projects.get(project_id)
+                if project is None:
+                    continue
+                application_projects.append(project)
+            application_projects.sort(key=lambda p: p.name)
+            application.projects = application_projects
         application.created_on = arrow.get(
             Utils.get_value_as_int('created_on', db_application)
         ).datetime
@@ -138,6 +318,10 @@ class HpcApplicationsDAO:
             'updated_on': Utils.current_time_ms(),
         }
         self.table.put_item(Item=created_application)
+        self.update_application_projects(
+            application_id=created_application['application_id'],
+            project_ids=Utils.get_value_as_list('project_ids', created_application, []),
+        )
 
         return created_application
 
@@ -155,6 +339,16 @@ class HpcApplicationsDAO:
 
         application['updated_on'] = Utils.current_time_ms()
 
+        previous_project_ids = None
+        if 'project_ids' in application:
+            existing = self.table.get_item(
+                Key={'application_id': application_id},
+                AttributesToGet=['project_ids'],
+            )
+            previous_project_ids = Utils.get_value_as_list(
+                'project_ids', Utils.get_value_as_dict('Item', existing, {}), []
+            )
+
         update_expression_tokens = []
         expression_attr_names = {}
         expression_attr_values = {}
@@ -178,13 +372,31 @@ class HpcApplicationsDAO:
         updated_application = result['Attributes']
         updated_application['application_id'] = application_id
 
+        if previous_project_ids is not None:
+            self.update_application_projects(
+                application_id=application_id,
+                project_ids=Utils.get_value_as_list(
+                    'project_ids', updated_application, []
+                ),
+                previous_project_ids=previous_project_ids,
+            )
+
         return updated_application
 
     def delete_application(self, application_id: str):
         if Utils.is_empty(application_id):
             raise exceptions.invalid_params('application_id is required')
 
-        self.table.delete_item(Key={'application_id': application_id})
+        result = self.table.delete_item(
+            Key={'application_id': application_id}, ReturnValues='ALL_OLD'
+        )
+        self.update_application_projects(
+            application_id=application_id,
+            project_ids=[],
+            previous_project_ids=Utils.get_value_as_list(
+                'project_ids', Utils.get_value_as_dict('Attributes', result, {}), []
+            ),
+        )
 
     def list_applications(
         self, request: ListHpcApplicationsRequest
@@ -196,7 +408,7 @@ class HpcApplicationsDAO:
         if Utils.is_not_empty(cursor):
             last_evaluated_key = Utils.from_json(Utils.base64_decode(cursor))
         if last_evaluated_key is not None:
-            scan_request['LastEvaluatedKey'] = last_evaluated_key
+            scan_request['ExclusiveStartKey'] = last_evaluated_key
 
         scan_filter = None
         if Utils.is_not_empty(request.filters):
@@ -215,13 +427,25 @@ class HpcApplicationsDAO:
         if scan_filter is not None:
             scan_request['ScanFilter'] = scan_filter
 
+        lite = Utils.get_as_bool(request.lite, False)
+        if lite:
+            scan_request['AttributesToGet'] = APPLICATION_LISTING_ATTRIBUTES
+
         scan_result = self.table.scan(**scan_request)
 
         db_applications = Utils.get_value_as_list('Items', scan_result, [])
+        project_ids: Set[str] = set()
+        for db_application in db_applications:
+            project_ids.update(
+                Utils.get_value_as_list('project_ids', db_application, [])
+            )
+        projects = self.get_projects(project_ids)
+
         applications = []
-        lite = Utils.get_as_bool(request.lite, False)
         for db_application in db_applications:
-            application = self.convert_from_db(db_application, lite=lite)
+            application = self.convert_from_db(
+                db_application, lite=lite, projects=projects
+            )
             applications.append(application)
 
         response_cursor = None
@@ -31,7 +31,7 @@ import ideascheduler
 from ideascheduler.app.applications.hpc_applications_dao import HpcApplicationsDAO
 from ideascheduler.app.app_protocols import HpcApplicationsProtocol
 
-from typing import Dict
+from typing import Dict, List
 
 
 class HpcApplicationsService(HpcApplicationsProtocol):
@@ -137,50 +137,66 @@ class HpcApplicationsService(HpcApplicationsProtocol):
         if Utils.is_empty(username):
             raise exceptions.invalid_params('username is required')
 
+        # a single projects request. the user projects are used to resolve the projects of each application.
         user_projects = self.context.projects_client.get_user_projects(username)
-        user_project_ids = set()
+        projects = {}
         for project in user_projects:
-            user_project_ids.add(project.project_id)
+            projects[project.project_id] = project
 
-        db_user_applications = []
-
-        def check_and_add(db_app: Dict):
-            application_project_ids = set(
-                Utils.get_value_as_list('project_ids', db_app, [])
-            )
-            applicable_project_ids = user_project_ids & application_project_ids
-            if len(applicable_project_ids) > 0:
-                db_app['project_ids'] = list(applicable_project_ids)
-                db_user_applications.append(db_app)
+        lite = Utils.get_as_bool(request.lite, False)
 
+        # application id -> ids of the user projects the application is available in
+        application_project_ids: Dict[str, List[str]] = {}
         if Utils.is_not_empty(request.application_ids):
-            requested_application_ids = set(request.application_ids)
-            for application_id in requested_application_ids:
-                db_application = self.applications_dao.get_application(application_id)
-                check_and_add(db_application)
+            db_applications = self.applications_dao.batch_get_applications(
+                request.application_ids, lite=lite
+            )
+            for db_application in db_applications:
+                application_project_ids[db_application['application_id']] = [
+                    project_id
+                    for project_id in Utils.get_value_as_list(
+                        'project_ids', db_application, []
+                    )
+                    if project_id in projects
+                ]
         else:
-            last_evaluated_key = None
-            while True:
-                if last_evaluated_key is None:
-                    scan_result = self.applications_dao.table.scan()
-                else:
-                    scan_result = self.applications_dao.table.scan(
-                        LastEvaluatedKey=last_evaluated_key
+            for project_id in projects:
+                application_ids = self.applications_dao.get_application_ids_by_project(
+                    project_id
+                )
+                for application_id in application_ids:
+                    application_project_ids.setdefault(application_id, []).append(
+                        project_id
                     )
-                db_applications = Utils.get_value_as_list('Items', scan_result, [])
-                for db_application in db_applications:
-                    check_and_add(db_application)
-
-                last_evaluated_key = Utils.get_any_value(
-                    'LastEvaluatedKey', scan_result
+            db_applications = self.applications_dao.batch_get_applications(
+                application_project_ids.keys(), lite=lite
+            )
+            # ignore index entries of projects removed from the application by an update concurrent with the
+            # index build
+            for db_application in db_applications:
+                application_id = db_application['application_id']
+                db_project_ids = Utils.get_value_as_list(
+                    'project_ids', db_application, []
                 )
-                if last_evaluated_key is None:
-                    break
+                application_project_ids[application_id] = [
+                    project_id
+                    for project_id in application_project_ids[application_id]
+                    if project_id in db_project_ids
+                ]
 
         user_applications = []
-        for db_application in db_user_applications:
+        for db_application in db_applications:
+            applicable_project_ids = application_project_ids.get(
+                db_application['application_id']
+            )
+            if Utils.is_empty(applicable_project_ids):
+                continue
+            db_application['project_ids'] = applicable_project_ids
             user_applications.append(
-                self.applications_dao.convert_from_db(db_application)
+                self.applications_dao.convert_from_db(
+                    db_application, lite=lite, projects=projects
+                )
             )
+        user_applications.sort(key=lambda application: application.title or '')
 
         return GetUserApplicationsResult(applications=user_applications)
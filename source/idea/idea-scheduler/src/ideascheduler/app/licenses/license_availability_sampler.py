@@ -0,0 +1,175 @@
+#  Copyright Amazon.com, Inc. or its affiliates. All Rights Reserved.
+#
+#  Licensed under the Apache License, Version 2.0 (the "License"). You may not use this file except in compliance
+#  with the License. A copy of the License is located at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+#  or in the 'license' file accompanying this file. This file is distributed on an 'AS IS' BASIS, WITHOUT WARRANTIES
+#  OR CONDITIONS OF ANY KIND, express or implied. See the License for the specific language governing permissions
+#  and limitations under the License.
+
+from ideascheduler import AppContext
+from ideadatamodel import exceptions, errorcodes, SocaJob
+
+from typing import Callable, Dict, List, Optional
+from threading import Lock, RLock
+import logging
+import time
+
+DEFAULT_LICENSE_SAMPLE_INTERVAL_SECONDS = 30
+
+
+class LicenseSample:
+    def __init__(self):
+        # held while the availability check cmd is running, so that a single probe is in flight per license resource
+        self.probe_lock = Lock()
+        self.available: int = 0
+        self.sampled_at: Optional[float] = None
+
+
+class LicenseAvailabilitySampler:
+    """
+    Shared license availability snapshot and reservation ledger for job provisioning.
+
+    Each license resource is sampled at most once per scheduler.job_provisioning.license_sample_interval_seconds.
+    Concurrent checks for the same license resource wait for the probe in flight and use its result.
+
+    Licenses granted to jobs that are being provisioned are tracked in the reservation ledger until the jobs
+    are added to the active licenses in job cache (or provisioning fails), so that concurrent provisioners do not
+    grant the same licenses to different jobs.
+    """
+
+    def __init__(self, context: AppContext, probe: Callable[[str], int]):
+        self.context = context
+        self.logger = context.logger('license-availability-sampler')
+        self._probe = probe
+
+        self._samples: Dict[str, LicenseSample] = {}
+        self._samples_lock = Lock()
+
+        # license name -> job id -> reserved count
+        self._reservations: Dict[str, Dict[str, int]] = {}
+        self._reservations_lock = RLock()
+
+    @property
+    def sample_interval_seconds(self) -> int:
+        return self.context.config().get_int(
+            'scheduler.job_provisioning.license_sample_interval_seconds',
+            default=DEFAULT_LICENSE_SAMPLE_INTERVAL_SECONDS,
+        )
+
+    def _get_sample(self, license_name: str) -> LicenseSample:
+        with self._samples_lock:
+            sample = self._samples.get(license_name)
+            if sample is None:
+                sample = LicenseSample()
+                self._samples[license_name] = sample
+            return sample
+
+    def get_available_licenses(self, license_name: str) -> int:
+        """
+        available licenses for the license resource, as of the last sample.
+        the license resource is probed if the sample is older than the sample interval.
+        """
+        sample = self._get_sample(license_name)
+        with sample.probe_lock:
+            now = time.monotonic()
+            if (
+                sample.sampled_at is not None
+                and now - sample.sampled_at < self.sample_interval_seconds
+            ):
+                return sample.available
+            sample.available = self._probe(license_name)
+            sample.sampled_at = time.monotonic()
+            return sample.available
+
+    def invalidate(self, license_name: str):
+        with self._samples_lock:
+            self._samples.pop(license_name, None)
+
+    def get_reserved_count(self, license_name: str) -> int:
+        with self._reservations_lock:
+            return sum(self._reservations.get(license_name, {}).values())
+
+    def reserve(self, jobs: List[SocaJob], logger: Optional[logging.Logger] = None):
+        """
+        reserve the licenses requested by all jobs, or none.
+
+        raises NOT_ENOUGH_LICENSES if the available licenses for any of the license resources are less than
+        active licenses + licenses reserved for other jobs + licenses requested by the jobs
+        """
+        if logger is None:
+            logger = self.logger
+
+        license_asks = []
+        for job in jobs:
+            if job.params.licenses is None or len(job.params.licenses) == 0:
+                continue
+            for license_ask in job.params.licenses:
+                license_asks.append((job, license_ask))
+
+        if len(license_asks) == 0:
+            return
+
+        # probe outside the ledger lock. probes for different license resources must not wait for each other.
+        available_licenses = {}
+        for _, license_ask in license_asks:
+            if license_ask.name in available_licenses:
+                continue
+            available_licenses[license_ask.name] = self.get_available_licenses(
+                license_ask.name
+            )
+
+        with self._reservations_lock:
+            # a job being re-provisioned replaces its own reservation
+            self.release(jobs)
+
+            active_licenses = {}
+            reserved = []
+            try:
+                for job, license_ask in license_asks:
+                    name = license_ask.name
+                    available = available_licenses[name]
+                    if name not in active_licenses:
+                        active_licenses[name] = (
+                            self.context.job_cache.get_active_license_count(
+                                license_name=name
+                            )
+                        )
+                    reserved_count = self.get_reserved_count(name)
+                    total_required = (
+                        active_licenses[name] + reserved_count + license_ask.count
+                    )
+                    if available < total_required:
+                        raise exceptions.SocaException(
+                            error_code=errorcodes.NOT_ENOUGH_LICENSES,
+                            message=f'Not enough licenses available for: {name}. '
+                            f'licenses available: {available}, '
+                            f'total required: {total_required}, '
+                            f'job required: {license_ask.count}',
+                        )
+
+                    job_reservations = self._reservations.setdefault(name, {})
+                    job_reservations[job.job_id] = (
+                        job_reservations.get(job.job_id, 0) + license_ask.count
+                    )
+                    reserved.append(job)
+                    logger.info(
+                        f'{job.log_tag} - {name} - '
+                        f'licenses available: {available}, '
+                        f'total required: {total_required}, '
+                        f'job required: {license_ask.count}'
+                    )
+            except Exception:
+                self.release(reserved)
+                raise
+
+    def release(self, jobs: List[SocaJob]):
+        with self._reservations_lock:
+            for job in jobs:
+                for name in list(self._reservations.keys()):
+                    job_reservations = self._reservations[name]
+                    job_reservations.pop(job.job_id, None)
+                    if len(job_reservations) == 0:
+                        del self._reservations[name]
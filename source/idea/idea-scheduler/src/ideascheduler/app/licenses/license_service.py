@@ -10,7 +10,7 @@
 #  and limitations under the License.
 
 from ideascheduler import AppContext
-from ideadatamodel import exceptions, errorcodes, constants
+from ideadatamodel import exceptions, errorcodes, constants, SocaJob
 from ideadatamodel.scheduler import (
     CreateHpcLicenseResourceRequest,
     CreateHpcLicenseResourceResult,
@@ -30,12 +30,15 @@ from ideasdk.utils import Utils
 from ideasdk.shell.shell_invoker import ShellInvocationResult
 from ideascheduler.app.app_protocols import LicenseServiceProtocol
 from ideascheduler.app.licenses.license_resources_dao import LicenseResourcesDAO
+from ideascheduler.app.licenses.license_availability_sampler import (
+    LicenseAvailabilitySampler,
+)
 from ideascheduler.app.scheduler.openpbs.openpbs_constants import (
     CONFIG_FILE_SCHED_CONFIG,
     CONFIG_FILE_RESOURCE_DEF,
 )
 
-from typing import Tuple, Optional
+from typing import Tuple, Optional, List
 import re
 
 PATTERN_LICENSE_RESOURCE_NAME = re.compile('(^[a-z][a-z0-9]*)_lic_([a-z][a-z0-9]*)')
@@ -59,6 +62,10 @@ class LicenseService(LicenseServiceProtocol):
         self.license_resources_dao = LicenseResourcesDAO(self.context)
         self.license_resources_dao.initialize()
 
+        self.availability_sampler = LicenseAvailabilitySampler(
+            context=self.context, probe=self.get_available_licenses
+        )
+
     def cache_set(self, license_resource: HpcLicenseResource):
         return (
             self.context.cache()
@@ -232,6 +239,7 @@ class LicenseService(LicenseServiceProtocol):
                 db_updated
             )
             self.cache_set(updated_license_resource)
+            self.availability_sampler.invalidate(updated_license_resource.name)
 
         return UpdateHpcLicenseResourceResult(license_resource=updated_license_resource)
 
@@ -251,6 +259,7 @@ class LicenseService(LicenseServiceProtocol):
         self.license_resources_dao.delete_license_resource(name)
 
         self.cache_clear(name)
+        self.availability_sampler.invalidate(name)
 
         return DeleteHpcLicenseResourceResult()
 
@@ -357,3 +366,16 @@ class LicenseService(LicenseServiceProtocol):
                 f'exception while checking available licenses for: {license_resource_name} - {e}'
             )
             return 0
+
+    def reserve_licenses(self, jobs: List[SocaJob], logger=None):
+        """
+        reserve licenses for the jobs being provisioned, using the sampled license availability.
+        see LicenseAvailabilitySampler.reserve()
+        """
+        self.availability_sampler.reserve(jobs, logger=logger)
+
+    def release_licenses(self, jobs: List[SocaJob]):
+        """
+        release the licenses reserved for the jobs, once the jobs are provisioned or provisioning failed.
+        """
+        self.availability_sampler.release(jobs)
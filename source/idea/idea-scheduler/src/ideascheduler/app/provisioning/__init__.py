@@ -21,6 +21,12 @@ from ideascheduler.app.provisioning.job_provisioning_queue.job_provisioning_queu
 from ideascheduler.app.provisioning.job_provisioner.cloudformation_stack_builder import (
     CloudFormationStackBuilder,
 )
+from ideascheduler.app.provisioning.job_provisioner.cloudformation_template_compiler import (
+    CloudFormationTemplateCompiler,
+)
+from ideascheduler.app.provisioning.job_provisioner.launch_preflight_cache import (
+    LaunchPreflightCache,
+)
 from ideascheduler.app.provisioning.job_provisioner.job_provisioning_util import (
     JobProvisioningUtil,
 )
@@ -217,6 +217,7 @@ class FinishedJobProcessor:
         self._finished_job_thread.start()
 
         self._retry_updates: List[JobUpdate] = []
+        self._last_archived_ms = 0
 
     def _setup_job_export_logger(self) -> logging.Logger:
         return self._context.logging().get_custom_file_logger(
@@ -262,6 +263,32 @@ class FinishedJobProcessor:
         except Exception as e:
             self._logger.exception(f'failed to publish jobs to opensearch: {e}')
 
+    def _archive_finished_jobs(self):
+        """
+        roll finished jobs older than the configured retention period out of the job cache db, into compressed,
+        date partitioned archive files. archived jobs can be queried using: ideactl jobs list -H --archive
+        """
+        archive_interval_secs = self._context.config().get_int(
+            'scheduler.job_provisioning.finished_jobs_archive_interval_seconds',
+            default=3600,
+        )
+        if not Utils.is_interval_expired(
+            self._last_archived_ms, Utils.current_time_ms(), archive_interval_secs
+        ):
+            return
+        self._last_archived_ms = Utils.current_time_ms()
+
+        retention_days = self._context.config().get_int(
+            'scheduler.job_provisioning.finished_jobs_retention_days', default=90
+        )
+        archived = self._context.job_cache.archive_completed_jobs(
+            retention_days=retention_days
+        )
+        if archived > 0:
+            self._logger.info(
+                f'archived {archived} finished job(s) older than {retention_days} days'
+            )
+
     def _poll_finished_jobs(self):
         while not self._exit.is_set():
             try:
@@ -339,6 +366,11 @@ class FinishedJobProcessor:
                 if len(finished_jobs) > 0:
                     self._process_finished_jobs(finished_jobs)
 
+                try:
+                    self._archive_finished_jobs()
+                except Exception as e:
+                    self._logger.exception(f'failed to archive finished jobs: {e}')
+
                 self._logger.debug(
                     'FinishedJobProcessor: Processing cycle completed successfully'
                 )
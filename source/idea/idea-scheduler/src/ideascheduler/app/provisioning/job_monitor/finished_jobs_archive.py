@@ -0,0 +1,220 @@
+#  Copyright Amazon.com, Inc. or its affiliates. All Rights Reserved.
+#
+#  Licensed under the Apache License, Version 2.0 (the "License"). You may not use this file except in compliance
+#  with the License. A copy of the License is located at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+#  or in the 'license' file accompanying this file. This file is distributed on an 'AS IS' BASIS, WITHOUT WARRANTIES
+#  OR CONDITIONS OF ANY KIND, express or implied. See the License for the specific language governing permissions
+#  and limitations under the License.
+
+from ideadatamodel import exceptions, SocaJob
+from ideasdk.utils import Utils
+
+from typing import List, Optional, Dict, Tuple
+from datetime import datetime
+from threading import RLock
+import arrow
+import gzip
+import os
+import logging
+
+ARCHIVE_FILE_PREFIX = 'finished-jobs-'
+ARCHIVE_FILE_SUFFIX = '.jsonl.gz'
+ARCHIVE_DATE_FORMAT = 'YYYY-MM-DD'
+
+
+class FinishedJobsArchive:
+    """
+    Date partitioned archive for finished jobs rolled out of the job cache db.
+
+    Each partition is a gzip compressed JSON Lines file: finished-jobs-<YYYY-MM-DD>.jsonl.gz, where the date is
+    the UTC date of the job's end_time. Partitions are append only - gzip supports concatenated members, so each
+    archival run appends a new member to the partition instead of re-writing it.
+
+    Archived jobs are queried a partition at a time, newest first, using an opaque cursor of the form:
+    base64(json({"partition": "<YYYY-MM-DD>", "offset": <int>}))
+    """
+
+    def __init__(self, archive_dir: str, logger: logging.Logger):
+        self._archive_dir = archive_dir
+        self._logger = logger
+        self._archive_lock = RLock()
+        os.makedirs(self._archive_dir, exist_ok=True)
+
+    @staticmethod
+    def get_partition(job: SocaJob) -> str:
+        end_time = job.end_time
+        if end_time is None:
+            return arrow.get(0).format(ARCHIVE_DATE_FORMAT)
+        return arrow.get(end_time).to('utc').format(ARCHIVE_DATE_FORMAT)
+
+    def get_partition_file(self, partition: str) -> str:
+        return os.path.join(
+            self._archive_dir, f'{ARCHIVE_FILE_PREFIX}{partition}{ARCHIVE_FILE_SUFFIX}'
+        )
+
+    def list_partitions(
+        self, start: Optional[datetime] = None, end: Optional[datetime] = None
+    ) -> List[str]:
+        """
+        list partitions in descending order, optionally limited to the given date range (inclusive).
+        """
+        start_partition = None
+        if start is not None:
+            start_partition = arrow.get(start).to('utc').format(ARCHIVE_DATE_FORMAT)
+        end_partition = None
+        if end is not None:
+            end_partition = arrow.get(end).to('utc').format(ARCHIVE_DATE_FORMAT)
+
+        partitions = []
+        for file_name in os.listdir(self._archive_dir):
+            if not file_name.startswith(ARCHIVE_FILE_PREFIX):
+                continue
+            if not file_name.endswith(ARCHIVE_FILE_SUFFIX):
+                continue
+            partition = file_name[len(ARCHIVE_FILE_PREFIX) : -len(ARCHIVE_FILE_SUFFIX)]
+            if start_partition is not None and partition < start_partition:
+                continue
+            if end_partition is not None and partition > end_partition:
+                continue
+            partitions.append(partition)
+
+        partitions.sort(reverse=True)
+        return partitions
+
+    def archive(self, jobs: List[SocaJob]) -> int:
+        """
+        append jobs to their date partitions.
+        :return: the no. of jobs archived
+        """
+        if Utils.is_empty(jobs):
+            return 0
+
+        partitions: Dict[str, List[str]] = {}
+        for job in jobs:
+            partition = self.get_partition(job)
+            if partition not in partitions:
+                partitions[partition] = []
+            partitions[partition].append(Utils.to_json(job))
+
+        with self._archive_lock:
+            for partition, lines in partitions.items():
+                partition_file = self.get_partition_file(partition)
+                with gzip.open(partition_file, 'at', encoding='utf-8') as f:
+                    f.write(os.linesep.join(lines))
+                    f.write(os.linesep)
+
+        return len(jobs)
+
+    def read_partition(self, partition: str, **kwargs) -> List[SocaJob]:
+        """
+        read all jobs in a partition, sorted by (end_time, job_id) in descending order.
+        keyword arguments are applied as equality filters on job attributes.
+
+        a job may be present in a partition more than once if an archival run was interrupted after the partition
+        was written, but before the rows were deleted from the job cache db. the last entry wins.
+        """
+        partition_file = self.get_partition_file(partition)
+        if not os.path.isfile(partition_file):
+            return []
+
+        jobs: Dict[str, SocaJob] = {}
+        with self._archive_lock:
+            with gzip.open(partition_file, 'rt', encoding='utf-8') as f:
+                for line in f:
+                    line = line.strip()
+                    if Utils.is_empty(line):
+                        continue
+                    try:
+                        job = SocaJob(**Utils.from_json(line))
+                    except Exception as e:
+                        self._logger.warning(
+                            f'skipping invalid entry in archive partition: {partition} - {e}'
+                        )
+                        continue
+                    jobs[job.job_id] = job
+
+        result = []
+        for job in jobs.values():
+            matched = True
+            for key, value in kwargs.items():
+                if getattr(job, key, None) != value:
+                    matched = False
+                    break
+            if matched:
+                result.append(job)
+
+        result.sort(
+            key=lambda job_: (Utils.to_milliseconds(job_.end_time), job_.job_id),
+            reverse=True,
+        )
+        return result
+
+    @staticmethod
+    def encode_cursor(partition: str, offset: int) -> str:
+        return Utils.base64_encode(
+            Utils.to_json({'partition': partition, 'offset': offset})
+        )
+
+    @staticmethod
+    def decode_cursor(cursor: str) -> Tuple[str, int]:
+        try:
+            payload = Utils.from_json(Utils.base64_decode(cursor))
+            partition = Utils.get_value_as_string('partition', payload)
+            offset = Utils.get_value_as_int('offset', payload, 0)
+            return partition, offset
+        except Exception as e:
+            raise exceptions.invalid_params(f'invalid archive cursor: {e}')
+
+    def query(
+        self,
+        page_size: int,
+        cursor: Optional[str] = None,
+        start: Optional[datetime] = None,
+        end: Optional[datetime] = None,
+        **kwargs,
+    ) -> Tuple[List[SocaJob], Optional[str]]:
+        """
+        query archived jobs, newest first
+        :return: a tuple of (jobs, next cursor). next cursor is None when there are no more results.
+        """
+        partitions = self.list_partitions(start=start, end=end)
+
+        offset = 0
+        if Utils.is_not_empty(cursor):
+            cursor_partition, offset = self.decode_cursor(cursor)
+            partitions = [
+                partition for partition in partitions if partition <= cursor_partition
+            ]
+            if len(partitions) == 0 or partitions[0] != cursor_partition:
+                offset = 0
+
+        jobs = []
+        for partition in partitions:
+            entries = self.read_partition(partition, **kwargs)
+            if start is not None or end is not None:
+                entries = [
+                    entry
+                    for entry in entries
+                    if entry.end_time is not None
+                    and (start is None or entry.end_time >= start)
+                    and (end is None or entry.end_time <= end)
+                ]
+
+            remaining = page_size - len(jobs)
+            page = entries[offset : offset + remaining]
+            jobs += page
+            next_offset = offset + len(page)
+            offset = 0
+
+            if len(jobs) >= page_size:
+                if next_offset < len(entries):
+                    return jobs, self.encode_cursor(partition, next_offset)
+                next_partitions = partitions[partitions.index(partition) + 1 :]
+                if len(next_partitions) == 0:
+                    return jobs, None
+                return jobs, self.encode_cursor(next_partitions[0], 0)
+
+        return jobs, None
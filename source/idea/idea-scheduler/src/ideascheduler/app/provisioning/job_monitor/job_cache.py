@@ -10,14 +10,28 @@
 #  and limitations under the License.
 
 import ideascheduler
-from ideadatamodel import SocaJob, SocaJobExecutionHost, EC2Instance, SocaCapacityType
+from ideadatamodel import (
+    exceptions,
+    SocaJob,
+    SocaJobState,
+    SocaJobExecutionHost,
+    EC2Instance,
+    SocaCapacityType,
+)
 from ideascheduler.app.app_protocols import JobCacheProtocol
 from ideasdk.utils import Utils
 
-from typing import List, Optional, Dict
+from ideascheduler.app.provisioning.job_monitor.finished_jobs_archive import (
+    FinishedJobsArchive,
+)
+
+from typing import List, Optional, Dict, Tuple, FrozenSet
+from sqlalchemy import or_, and_
 import dataset
+import arrow
 import os
 import logging
+from datetime import datetime
 from threading import Event, RLock
 
 
@@ -27,6 +41,21 @@ EXECUTION_HOSTS_TABLE = 'execution_hosts'
 ACTIVE_JOB_LICENSES_TABLE = 'active_job_licenses'
 JOB_PROVISIONING_ERRORS = 'job_provisioning_errors'
 
+# columns of the finished_jobs table that can be used as equality filters for keyset pagination
+FINISHED_JOBS_FILTER_COLUMNS = (
+    'job_group',
+    'owner',
+    'queue',
+    'queue_profile',
+    'project',
+    'state',
+)
+ARCHIVE_BATCH_SIZE = 500
+
+# duration after which a job accepted by the job submission hook is no longer tracked, if the job was not synced to the
+# job cache. eg. job was rejected by the scheduler after the hook accepted the job.
+PENDING_SUBMISSION_TTL_SECONDS = 60
+
 
 class JobsDB:
     def __init__(self, context: ideascheduler.AppContext):
@@ -198,6 +227,22 @@ class JobsDB:
                         ['queue'], name='ix_finished_jobs_queue'
                     )
 
+                # keyset pagination indices for finished jobs: (end_time, job_id)
+                self.init_finished_jobs_keyset_columns()
+                if not self.db[FINISHED_JOBS_TABLE].has_index(
+                    'ix_finished_jobs_end_time_job_id'
+                ):
+                    self.db[FINISHED_JOBS_TABLE].create_index(
+                        ['end_time', 'job_id'], name='ix_finished_jobs_end_time_job_id'
+                    )
+                if not self.db[FINISHED_JOBS_TABLE].has_index(
+                    'ix_finished_jobs_owner_end_time_job_id'
+                ):
+                    self.db[FINISHED_JOBS_TABLE].create_index(
+                        ['owner', 'end_time', 'job_id'],
+                        name='ix_finished_jobs_owner_end_time_job_id',
+                    )
+
                 # execution hosts indices
                 if not self.db[EXECUTION_HOSTS_TABLE].has_index(
                     'ix_execution_hosts_job_id'
@@ -249,6 +294,44 @@ class JobsDB:
             self._logger.error(f'Error creating indices: {str(e)}')
             raise
 
+    def init_finished_jobs_keyset_columns(self):
+        """
+        ensure the columns used for keyset pagination of finished jobs exist, and back-fill end_time for
+        finished jobs added before the end_time column was introduced.
+        """
+        with self._db_lock:
+            table = self.db[FINISHED_JOBS_TABLE]
+            if not table.has_column('job_id'):
+                table.create_column('job_id', self.db.types.string)
+            if not table.has_column('owner'):
+                table.create_column('owner', self.db.types.string)
+            if not table.has_column('job_data'):
+                table.create_column('job_data', self.db.types.text)
+            if not table.has_column('end_time'):
+                table.create_column('end_time', self.db.types.bigint)
+
+            backfilled = 0
+            while True:
+                entries = list(table.find(end_time=None, _limit=ARCHIVE_BATCH_SIZE))
+                if len(entries) == 0:
+                    break
+                with self.db as tx:
+                    for entry in entries:
+                        job = self.convert_db_entry_to_job(entry)
+                        end_time = 0
+                        if job is not None:
+                            end_time = Utils.to_milliseconds(job.end_time)
+                        tx[FINISHED_JOBS_TABLE].update(
+                            row={'id': entry['id'], 'end_time': end_time},
+                            keys=['id'],
+                        )
+                backfilled += len(entries)
+
+            if backfilled > 0:
+                self._logger.info(
+                    f'back-filled end_time for {backfilled} finished job(s)'
+                )
+
     def get(self, job_id: str) -> Optional[SocaJob]:
         with self._db_lock:
             entry = self.db[JOBS_TABLE].find_one(job_id=job_id)
@@ -274,24 +357,35 @@ class JobsDB:
                     keys=['job_id'],
                 )
 
-    def add_finished_job(self, job: SocaJob):
+    @staticmethod
+    def build_finished_job_row(job: SocaJob) -> Dict:
+        return {
+            'job_id': job.job_id,
+            'job_group': job.job_group,
+            'job_uid': job.job_uid,
+            'desired_capacity': job.desired_capacity(),
+            'state': job.state.value,
+            'owner': job.owner,
+            'queue': job.queue,
+            'queue_profile': job.queue_type,
+            'project': job.project,
+            'end_time': Utils.to_milliseconds(job.end_time),
+            'job_data': Utils.to_json(job),
+        }
+
+    def add_finished_job(self, job: SocaJob) -> bool:
+        """
+        add or update a finished job
+        :return: True if a new finished job entry was created, False if an existing entry was updated
+        """
+        row = self.build_finished_job_row(job)
         with self._db_lock:
             with self.db as tx:
-                tx[FINISHED_JOBS_TABLE].upsert(
-                    row={
-                        'job_id': job.job_id,
-                        'job_group': job.job_group,
-                        'job_uid': job.job_uid,
-                        'desired_capacity': job.desired_capacity(),
-                        'state': job.state.value,
-                        'owner': job.owner,
-                        'queue': job.queue,
-                        'queue_profile': job.queue_type,
-                        'project': job.project,
-                        'job_data': Utils.to_json(job),
-                    },
-                    keys=['job_id'],
-                )
+                updated = tx[FINISHED_JOBS_TABLE].update(row=row, keys=['job_id'])
+                if updated:
+                    return False
+                tx[FINISHED_JOBS_TABLE].insert(row=row)
+                return True
 
     def get_finished_job(self, job_id: str) -> Optional[SocaJob]:
         with self._db_lock:
@@ -367,6 +461,67 @@ class JobsDB:
                 jobs.append(job)
             return jobs
 
+    def query_finished_jobs_page(
+        self,
+        page_size: int,
+        after: Optional[Tuple[int, str]] = None,
+        before: Optional[int] = None,
+        **kwargs,
+    ) -> List[Tuple[int, str, SocaJob]]:
+        """
+        keyset pagination for finished jobs, ordered by (end_time, job_id) in descending order.
+
+        :param page_size: max no. of entries to return
+        :param after: (end_time, job_id) of the last entry of the previous page
+        :param before: only return entries with end_time (in milliseconds) lower than the given value
+        :param kwargs: equality filters. must be one of FINISHED_JOBS_FILTER_COLUMNS
+        :return: list of (end_time, job_id, job) tuples
+        """
+        for key in kwargs:
+            if key not in FINISHED_JOBS_FILTER_COLUMNS:
+                raise exceptions.invalid_params(
+                    f'finished jobs cannot be filtered by: {key}'
+                )
+
+        with self._db_lock:
+            table = self.db[FINISHED_JOBS_TABLE]
+            columns = table.table.c
+            clauses = []
+            if after is not None:
+                end_time, job_id = after
+                clauses.append(
+                    or_(
+                        columns.end_time < end_time,
+                        and_(columns.end_time == end_time, columns.job_id < job_id),
+                    )
+                )
+            if before is not None:
+                clauses.append(columns.end_time < before)
+
+            result = table.find(
+                *clauses, _limit=page_size, order_by=['-end_time', '-job_id'], **kwargs
+            )
+            entries = []
+            for entry in result:
+                job = self.convert_db_entry_to_job(entry)
+                if job is None:
+                    continue
+                entries.append(
+                    (
+                        Utils.get_value_as_int('end_time', entry, 0),
+                        Utils.get_value_as_string('job_id', entry),
+                        job,
+                    )
+                )
+            return entries
+
+    def delete_finished_jobs(self, job_ids: List[str]):
+        if Utils.is_empty(job_ids):
+            return
+        with self._db_lock:
+            with self.db as tx:
+                tx[FINISHED_JOBS_TABLE].delete(job_id={'in': job_ids})
+
     def exists(self, job_id: str) -> bool:
         with self._db_lock:
             entry = self.db[JOBS_TABLE].find_one(job_id=job_id)
@@ -447,8 +602,64 @@ class JobCache(JobCacheProtocol):
         self._jobs_db = JobsDB(context=self._context)
         self._is_ready = Event()
 
+        self._finished_jobs_archive = FinishedJobsArchive(
+            archive_dir=os.path.join(
+                self._context.get_scheduler_app_deploy_dir(),
+                'db',
+                'finished-jobs-archive',
+            ),
+            logger=self._logger,
+        )
+
+        # finished jobs counts are cached per filter. counts are adjusted as finished jobs are added, and reset when
+        # finished jobs are archived.
+        self._completed_jobs_counts: Dict[FrozenSet, int] = {}
+        self._completed_jobs_counts_lock = RLock()
+
+        # jobs accepted by the job submission hook, which are not yet synced to the job cache.
+        # job_uid -> (job_group, submission time)
+        self._pending_submissions: Dict[str, Tuple[str, int]] = {}
+        self._pending_submissions_lock = RLock()
+
     def sync(self, jobs: List[SocaJob]):
         self._jobs_db.add_many(jobs=jobs)
+        with self._pending_submissions_lock:
+            if len(self._pending_submissions) == 0:
+                return
+            for job in jobs:
+                self._pending_submissions.pop(job.job_uid, None)
+
+    def job_submitted(self, job: SocaJob):
+        """
+        track a job accepted by the job submission hook, until the job is synced to the job cache.
+        job id is not available during submission, so jobs are tracked using job_uid.
+        """
+        if Utils.is_empty(job.job_uid):
+            return
+        with self._pending_submissions_lock:
+            self._pending_submissions[job.job_uid] = (
+                job.get_job_group(),
+                Utils.current_time(),
+            )
+
+    def get_expected_batch_size(self, job_group: str) -> int:
+        """
+        the no. of jobs in the job group, which are queued and not yet provisioned.
+        includes the jobs accepted by the job submission hook, which are not yet synced to the job cache.
+        """
+        pending = 0
+        with self._pending_submissions_lock:
+            expired_after = Utils.current_time() - PENDING_SUBMISSION_TTL_SECONDS
+            for job_uid in list(self._pending_submissions.keys()):
+                pending_job_group, submitted_at = self._pending_submissions[job_uid]
+                if submitted_at < expired_after:
+                    del self._pending_submissions[job_uid]
+                elif pending_job_group == job_group:
+                    pending += 1
+
+        return pending + self.get_count(
+            job_group=job_group, state=SocaJobState.QUEUED.value, provisioned=False
+        )
 
     def list_jobs(self, _limit: int = -1, _offset: int = 0, **kwargs) -> List[SocaJob]:
         if _limit > 0:
@@ -468,6 +679,83 @@ class JobCache(JobCacheProtocol):
         else:
             return self._jobs_db.query_finished_jobs(**kwargs)
 
+    def list_completed_jobs_page(
+        self, page_size: int, cursor: Optional[str] = None, **kwargs
+    ) -> Tuple[List[SocaJob], Optional[str]]:
+        """
+        keyset pagination for completed jobs, newest first.
+
+        the cursor is an opaque token: base64(json({"end_time": <ms>, "job_id": <str>})) of the last entry in the
+        previous page.
+        :return: a tuple of (jobs, next cursor). next cursor is None when there are no more results.
+        """
+        after = None
+        if Utils.is_not_empty(cursor):
+            try:
+                payload = Utils.from_json(Utils.base64_decode(cursor))
+                after = (
+                    Utils.get_value_as_int('end_time', payload, 0),
+                    Utils.get_value_as_string('job_id', payload),
+                )
+            except Exception as e:
+                raise exceptions.invalid_params(f'invalid cursor: {e}')
+
+        entries = self._jobs_db.query_finished_jobs_page(
+            page_size=page_size, after=after, **kwargs
+        )
+
+        next_cursor = None
+        if len(entries) == page_size:
+            end_time, job_id, _ = entries[-1]
+            next_cursor = Utils.base64_encode(
+                Utils.to_json({'end_time': end_time, 'job_id': job_id})
+            )
+
+        return [job for _, _, job in entries], next_cursor
+
+    def list_archived_jobs(
+        self,
+        page_size: int,
+        cursor: Optional[str] = None,
+        start: Optional[datetime] = None,
+        end: Optional[datetime] = None,
+        **kwargs,
+    ) -> Tuple[List[SocaJob], Optional[str]]:
+        return self._finished_jobs_archive.query(
+            page_size=page_size, cursor=cursor, start=start, end=end, **kwargs
+        )
+
+    def archive_completed_jobs(self, retention_days: int) -> int:
+        """
+        roll completed jobs that finished more than retention_days ago out of the job cache db, into the date
+        partitioned finished jobs archive.
+        :return: the no. of jobs archived
+        """
+        if retention_days <= 0:
+            return 0
+
+        cutoff = Utils.to_milliseconds(
+            arrow.utcnow().shift(days=-retention_days).datetime
+        )
+
+        total = 0
+        while True:
+            entries = self._jobs_db.query_finished_jobs_page(
+                page_size=ARCHIVE_BATCH_SIZE, before=cutoff
+            )
+            if len(entries) == 0:
+                break
+            jobs = [job for _, _, job in entries]
+            self._finished_jobs_archive.archive(jobs)
+            self._jobs_db.delete_finished_jobs([job_id for _, job_id, _ in entries])
+            total += len(jobs)
+
+        if total > 0:
+            with self._completed_jobs_counts_lock:
+                self._completed_jobs_counts.clear()
+
+        return total
+
     def get_job(self, job_id: str) -> Optional[SocaJob]:
         return self._jobs_db.get(job_id=job_id)
 
@@ -516,7 +804,19 @@ class JobCache(JobCacheProtocol):
         self._jobs_db.delete_execution(job_id=job_id)
 
     def add_finished_job(self, job: SocaJob):
-        self._jobs_db.add_finished_job(job)
+        with self._completed_jobs_counts_lock:
+            created = self._jobs_db.add_finished_job(job)
+            if not created or len(self._completed_jobs_counts) == 0:
+                return
+            row = JobsDB.build_finished_job_row(job)
+            for key in self._completed_jobs_counts:
+                matched = True
+                for name, value in key:
+                    if row.get(name) != value:
+                        matched = False
+                        break
+                if matched:
+                    self._completed_jobs_counts[key] += 1
 
     def get_jobs_table(self) -> dataset.Table:
         return self._jobs_db.db[JOBS_TABLE]
@@ -551,7 +851,13 @@ class JobCache(JobCacheProtocol):
         return self._jobs_db.db[JOBS_TABLE].count(**kwargs)
 
     def get_completed_jobs_count(self, **kwargs) -> int:
-        return self._jobs_db.db[FINISHED_JOBS_TABLE].count(**kwargs)
+        key = frozenset(kwargs.items())
+        with self._completed_jobs_counts_lock:
+            count = self._completed_jobs_counts.get(key)
+            if count is None:
+                count = self._jobs_db.db[FINISHED_JOBS_TABLE].count(**kwargs)
+                self._completed_jobs_counts[key] = count
+            return count
 
     def get_active_license_count(self, license_name: str) -> int:
         result = self._jobs_db.db.query(
@@ -512,6 +512,8 @@ class JobMonitor(SocaService, JobMonitorProtocol):
 
         :param job: SocaJob built using the event received from Scheduler
         """
+        # track the submission until the job is synced, so that batches for the job group wait for the job.
+        self._context.job_cache.job_submitted(job=job)
         self._state.job_queued(job=job)
 
     def job_modified(self, job: SocaJob):
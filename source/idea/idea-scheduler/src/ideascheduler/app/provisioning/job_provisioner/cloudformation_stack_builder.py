@@ -23,12 +23,13 @@ from ideasdk.utils import Utils
 from ideasdk.context import BootstrapContext
 from ideasdk.bootstrap import (
     BootstrapUserDataBuilder,
-    BootstrapPackageBuilder,
+    BootstrapPackageOverlay,
     BootstrapUtils,
 )
+from ideasdk.bootstrap.bootstrap_package_cache import OVERLAY_PLACEHOLDER_PREFIX
 
 from troposphere import Base64, GetAtt, Sub
-from troposphere import Ref, Template
+from troposphere import Parameter, Ref, Template
 from troposphere import Tags
 from troposphere.autoscaling import (
     AutoScalingGroup,
@@ -57,12 +58,27 @@ from troposphere.fsx import FileSystem, LustreConfiguration
 import troposphere.ec2 as ec2
 import os
 import logging
-from typing import Optional
+from typing import Optional, Dict, List, Tuple
+
+PARAM_COMPUTE_STACK = 'ComputeStack'
+PARAM_JOB_ID = 'JobId'
+PARAM_JOB_NAME = 'JobName'
+PARAM_JOB_OWNER = 'JobOwner'
+PARAM_JOB_OWNER_EMAIL = 'JobOwnerEmail'
+PARAM_JOB_GROUP = 'JobGroup'
+PARAM_STACK_UUID = 'StackUUID'
+PARAM_FSX_LUSTRE_EXPORT_PATH = 'FSxLustreExportPath'
+PARAM_BOOTSTRAP_PACKAGE_URI = 'BootstrapPackageUri'
+PARAM_BOOTSTRAP_OVERLAY_COMMAND = 'BootstrapOverlayCommand'
 
 
 class CloudFormationStackBuilder:
     """
     Build and Provision the CloudFormation Stack for IDEA Compute Nodes
+
+    The stack template is parameterized - per-job values such as job id, owner and compute stack name are provided as
+    stack Parameters (see build_parameters()). Templates are compiled once per job shape and cached by
+    CloudFormationTemplateCompiler.
     """
 
     def __init__(
@@ -76,6 +92,7 @@ class CloudFormationStackBuilder:
         self.job = job
         self.job.params.compute_stack = self.job.get_compute_stack()
         self.target_capacity_override = target_capacity_override
+        self._bootstrap_package: Optional[Tuple[str, str]] = None
 
         template = Template()
         template.set_version('2010-09-09')
@@ -84,7 +101,31 @@ class CloudFormationStackBuilder:
         )
         self.template = template
 
-    def get_common_tags(self):
+    def ref(self, name: str) -> Ref:
+        """
+        reference to a per-job value. the parameter is added to the template if it does not exist.
+        """
+        if name not in self.template.parameters:
+            self.template.add_parameter(Parameter(name, Type='String'))
+        return Ref(name)
+
+    def get_project_tags(self) -> Dict[str, str]:
+        tags = {}
+        if not self.job.project:
+            return tags
+        get_project_result = self.context.projects_client.get_project(
+            GetProjectRequest(project_name=self.job.project)
+        )
+        project = get_project_result.project
+        if project is not None and Utils.is_not_empty(project.tags):
+            for tag in project.tags:
+                tags[tag.key] = tag.value
+        return tags
+
+    def get_common_tags(self, parameterized: bool = False):
+        """
+        :param parameterized: if True, per-job tag values are returned as references to stack parameters
+        """
         terminate_when_idle = str(self.job.provisioning_options.terminate_when_idle)
         keep_forever = str(self.job.provisioning_options.keep_forever).lower()
         scaling_mode = str(self.job.scaling_mode)
@@ -115,40 +156,83 @@ class CloudFormationStackBuilder:
         if self.job.name:
             tags[constants.IDEA_TAG_JOB_NAME] = self.job.name
 
+        if parameterized:
+            tags[constants.IDEA_TAG_NAME] = self.ref(PARAM_COMPUTE_STACK)
+            tags[constants.IDEA_TAG_JOB_ID] = self.ref(PARAM_JOB_ID)
+            tags[constants.IDEA_TAG_JOB_OWNER] = self.ref(PARAM_JOB_OWNER)
+            tags[constants.IDEA_TAG_JOB_GROUP] = self.ref(PARAM_JOB_GROUP)
+            tags[constants.IDEA_TAG_COMPUTE_STACK] = self.ref(PARAM_COMPUTE_STACK)
+            if constants.IDEA_TAG_JOB_OWNER_EMAIL in tags:
+                tags[constants.IDEA_TAG_JOB_OWNER_EMAIL] = self.ref(
+                    PARAM_JOB_OWNER_EMAIL
+                )
+            if constants.IDEA_TAG_JOB_NAME in tags:
+                tags[constants.IDEA_TAG_JOB_NAME] = self.ref(PARAM_JOB_NAME)
+
         if self.job.project:
             tags[constants.IDEA_TAG_PROJECT] = self.job.project
 
             # assign custom project if available
-            get_project_result = self.context.projects_client.get_project(
-                GetProjectRequest(project_name=self.job.project)
-            )
-            project = get_project_result.project
-            if project is not None and Utils.is_not_empty(project.tags):
-                for tag in project.tags:
-                    tags[tag.key] = tag.value
+            tags.update(self.get_project_tags())
 
         custom_tags = self.context.config().get_list('global-settings.custom_tags', [])
         custom_tags_dict = Utils.convert_custom_tags_to_key_value_pairs(custom_tags)
 
         return {**custom_tags_dict, **tags}
 
-    def build_user_data(self):
-        base_os = self.job.params.base_os
+    def build_template_job(self, overlay: BootstrapPackageOverlay) -> SocaJob:
+        """
+        build a copy of the job to render the bootstrap package and the stack template.
 
-        module_id = self.context.module_id()
-        bootstrap_context = BootstrapContext(
-            config=self.context.config(),
-            module_name=self.context.module_name(),
-            module_id=module_id,
-            module_set=self.context.module_set(),
-            base_os=base_os,
-            instance_type=self.job.params.instance_types[0],
+        per-job values are replaced with overlay placeholders and runtime state is removed, so that jobs with the
+        same shape (queue profile, instance types, params) render to the same bootstrap package and stack template.
+        """
+        # derived values are resolved using the actual job, before the values they are derived from are replaced
+        job_group = self.job.job_group
+        if job_group is None and self.job.is_shared_capacity():
+            job_group = self.job.get_job_group()
+        compute_stack = self.job.get_compute_stack()
+
+        job = self.job.model_copy(deep=True)
+        job.state = None
+        job.exit_status = None
+        job.provisioned = None
+        job.error_message = None
+        job.queue_time = None
+        job.provisioning_time = None
+        job.start_time = None
+        job.end_time = None
+        job.total_time_secs = None
+        job.comment = None
+        job.capacity_added = None
+        job.estimated_budget_usage = None
+        job.estimated_bom_cost = None
+        job.execution_hosts = None
+        job.notifications = None
+
+        job.job_id = overlay.placeholder('job_id', job.job_id)
+        job.job_uid = overlay.placeholder('job_uid', job.job_uid)
+        job.job_group = overlay.placeholder('job_group', job_group)
+        job.name = overlay.placeholder('job_name', job.name)
+        job.owner = overlay.placeholder('job_owner', job.owner)
+        job.owner_email = overlay.placeholder('job_owner_email', job.owner_email)
+        job.params.compute_stack = overlay.placeholder('compute_stack', compute_stack)
+        job.params.stack_id = overlay.placeholder('stack_id', job.params.stack_id)
+        job.params.job_group = overlay.placeholder(
+            'params_job_group', job.params.job_group
         )
-        bootstrap_context.vars.job = self.job
-        bootstrap_context.vars.project = self.job.project
-        bootstrap_context.vars.queue_profile = self.job.queue_type
+        if job.provisioning_options is not None:
+            job.provisioning_options.stack_uuid = overlay.placeholder(
+                'stack_uuid', job.provisioning_options.stack_uuid
+            )
+        return job
 
-        # Fetch job owner's email and add it to job context
+    def resolve_owner_email(self):
+        """
+        fetch job owner's email and add it to job context
+        """
+        if self.job.owner_email:
+            return
         try:
             get_user_result = self.context.accounts_client.get_user(
                 GetUserRequest(username=self.job.owner)
@@ -163,21 +247,41 @@ class CloudFormationStackBuilder:
                 f'{self.job.log_tag} failed to fetch owner email: {str(e)}'
             )
 
-        job_directory = self.context.get_job_dir(self.job)
+    def build_bootstrap_package(self) -> Tuple[str, str]:
+        """
+        the bootstrap package is rendered using placeholders for per-job values and is shared across jobs
+        with the same shape. placeholders are replaced by the overlay command in user data during boot.
+
+        :return: a tuple of (bootstrap package uri, overlay command)
+        """
+        if self._bootstrap_package is not None:
+            return self._bootstrap_package
 
-        bootstrap_context.vars.job_directory = job_directory
+        base_os = self.job.params.base_os
 
-        cluster_s3_bucket = self.context.config().get_string(
-            'cluster.cluster_s3_bucket', required=True
+        module_id = self.context.module_id()
+        bootstrap_context = BootstrapContext(
+            config=self.context.config(),
+            module_name=self.context.module_name(),
+            module_id=module_id,
+            module_set=self.context.module_set(),
+            base_os=base_os,
+            instance_type=self.job.params.instance_types[0],
         )
 
-        bootstrap_tmp_dir = os.path.join(job_directory, 'bootstrap')
-        if self.job.is_shared_capacity():
-            bootstrap_package_suffix = f'{self.job.get_job_group()}-{self.job.job_uid}'
-            metrics_namespace = f'{self.context.cluster_name()}/{self.context.module_id()}/job-{self.job.get_job_group()}'
+        # the overlay command is provided as a stack parameter and is not processed by Fn::Sub
+        overlay = BootstrapPackageOverlay(substitution_support=False)
+        job = self.build_template_job(overlay)
+
+        bootstrap_context.vars.job = job
+        bootstrap_context.vars.project = job.project
+        bootstrap_context.vars.queue_profile = job.queue_type
+        bootstrap_context.vars.job_directory = self.context.get_job_dir(job)
+
+        if job.is_shared_capacity():
+            metrics_namespace = f'{self.context.cluster_name()}/{self.context.module_id()}/job-{job.get_job_group()}'
         else:
-            bootstrap_package_suffix = f'{self.job.job_id}-{self.job.job_uid}'
-            metrics_namespace = f'{self.context.cluster_name()}/{self.context.module_id()}/job-{self.job.job_id}'
+            metrics_namespace = f'{self.context.cluster_name()}/{self.context.module_id()}/job-{job.job_id}'
 
         # Configure CloudWatch logging and metrics for compute nodes
         cloudwatch_logs_enabled = self.context.config().get_bool(
@@ -190,10 +294,10 @@ class CloudFormationStackBuilder:
             from ideasdk.metrics.cloudwatch import CloudWatchAgentLogFileOptions
 
             # Use the same naming pattern as metrics_namespace for log groups
-            if self.job.is_shared_capacity():
-                log_group_name = f'/{self.context.cluster_name()}/{self.context.module_id()}/job-{self.job.get_job_group()}'
+            if job.is_shared_capacity():
+                log_group_name = f'/{self.context.cluster_name()}/{self.context.module_id()}/job-{job.get_job_group()}'
             else:
-                log_group_name = f'/{self.context.cluster_name()}/{self.context.module_id()}/job-{self.job.job_id}'
+                log_group_name = f'/{self.context.cluster_name()}/{self.context.module_id()}/job-{job.job_id}'
 
             log_files = [
                 CloudWatchAgentLogFileOptions(
@@ -222,31 +326,28 @@ class CloudFormationStackBuilder:
             ),
         )
 
-        bootstrap_source_dir = self.context.get_bootstrap_dir()
-        bootstrap_package_archive_file = BootstrapPackageBuilder(
+        bootstrap_package_uri = self.context.bootstrap_package_cache.get_package_uri(
             bootstrap_context=bootstrap_context,
-            source_directory=bootstrap_source_dir,
-            target_package_basename=f'compute-node-{bootstrap_package_suffix}',
+            source_directory=self.context.get_bootstrap_dir(),
+            target_package_basename='compute-node',
             components=['compute-node'],
-            tmp_dir=bootstrap_tmp_dir,
-            force_build=True,
-            logger=self.logger,
-        ).build()
-        self.logger.info(
-            f'{self.job.log_tag} built bootstrap package: {bootstrap_package_archive_file}'
         )
-
-        bootstrap_package_key = f'idea/{self.context.module_id()}/bootstrap/{os.path.basename(bootstrap_package_archive_file)}'
-        bootstrap_package_uri = f's3://{cluster_s3_bucket}/{bootstrap_package_key}'
         self.logger.info(
-            f'{self.job.log_tag} uploading bootstrap package: {bootstrap_package_uri}'
-        )
-        self.context.aws().s3().upload_file(
-            Bucket=cluster_s3_bucket,
-            Filename=bootstrap_package_archive_file,
-            Key=bootstrap_package_key,
+            f'{self.job.log_tag} using bootstrap package: {bootstrap_package_uri}'
         )
 
+        overlay_command = Utils.get_as_string(overlay.get_apply_command(), default='')
+        self._bootstrap_package = (bootstrap_package_uri, overlay_command)
+        return self._bootstrap_package
+
+    def build_user_data(self):
+        """
+        user data is the same for all jobs of the same shape. the bootstrap package uri and the overlay command
+        are substituted from the stack parameters.
+        """
+        self.ref(PARAM_BOOTSTRAP_PACKAGE_URI)
+        self.ref(PARAM_BOOTSTRAP_OVERLAY_COMMAND)
+
         https_proxy = self.context.config().get_string(
             'cluster.network.https_proxy', required=False, default=''
         )
@@ -263,10 +364,13 @@ class CloudFormationStackBuilder:
 
         return BootstrapUserDataBuilder(
             aws_region=self.context.aws().aws_region(),
-            bootstrap_package_uri=bootstrap_package_uri,
-            install_commands=['/bin/bash compute-node/setup.sh'],
+            bootstrap_package_uri=f'${{{PARAM_BOOTSTRAP_PACKAGE_URI}}}',
+            install_commands=[
+                f'${{{PARAM_BOOTSTRAP_OVERLAY_COMMAND}}}',
+                '/bin/bash compute-node/setup.sh',
+            ],
             proxy_config=proxy_config,
-            base_os=base_os,
+            base_os=self.job.params.base_os,
         ).build()
 
     def build_spot_fleet(self, launch_template: LaunchTemplate) -> ec2.SpotFleet:
@@ -348,7 +452,7 @@ class CloudFormationStackBuilder:
 
         spot_instance_request_tags = ec2.TagSpecifications(
             ResourceType='spot-instances-request',
-            Tags=Tags(**self.get_common_tags(), **tags),
+            Tags=Tags(**self.get_common_tags(parameterized=True), **tags),
         )
         launch_template.LaunchTemplateData.TagSpecifications.append(
             spot_instance_request_tags
@@ -410,7 +514,7 @@ class CloudFormationStackBuilder:
                 asg.DependsOn = ['NodeLaunchTemplate', 'ComputeNodePlacementGroup']
 
         tags = {constants.IDEA_TAG_NODE_TYPE: constants.NODE_TYPE_COMPUTE}
-        asg.Tags = AsgTags(**self.get_common_tags(), **tags)
+        asg.Tags = AsgTags(**self.get_common_tags(parameterized=True), **tags)
 
         mip = MixedInstancesPolicy()
         mip.LaunchTemplate = asg_lt
@@ -453,7 +557,7 @@ class CloudFormationStackBuilder:
 
     def build_launch_template(self) -> LaunchTemplate:
         launch_template = LaunchTemplate('NodeLaunchTemplate')
-        launch_template.LaunchTemplateName = self.job.get_compute_stack()
+        launch_template.LaunchTemplateName = self.ref(PARAM_COMPUTE_STACK)
 
         launch_template_data = LaunchTemplateData('NodeLaunchTemplateData')
         launch_template.LaunchTemplateData = launch_template_data
@@ -577,10 +681,12 @@ class CloudFormationStackBuilder:
         tags = {constants.IDEA_TAG_NODE_TYPE: constants.NODE_TYPE_COMPUTE}
         launch_template_data.TagSpecifications = [
             ec2.TagSpecifications(
-                ResourceType='instance', Tags=Tags(**self.get_common_tags(), **tags)
+                ResourceType='instance',
+                Tags=Tags(**self.get_common_tags(parameterized=True), **tags),
             ),
             ec2.TagSpecifications(
-                ResourceType='volume', Tags=Tags(**self.get_common_tags(), **tags)
+                ResourceType='volume',
+                Tags=Tags(**self.get_common_tags(parameterized=True), **tags),
             ),
         ]
 
@@ -610,11 +716,11 @@ class CloudFormationStackBuilder:
 
         if self.job.params.fsx_lustre.s3_backend:
             fsx_lustre_configuration.ImportPath = self.job.get_fsx_lustre_import_path()
-            fsx_lustre_configuration.ExportPath = self.job.get_fsx_lustre_export_path()
+            fsx_lustre_configuration.ExportPath = self.ref(PARAM_FSX_LUSTRE_EXPORT_PATH)
 
         fsx_tags = {constants.IDEA_TAG_FSX: 'true'}
         fsx_lustre.LustreConfiguration = fsx_lustre_configuration
-        fsx_lustre.Tags = Tags(**self.get_common_tags(), **fsx_tags)
+        fsx_lustre.Tags = Tags(**self.get_common_tags(parameterized=True), **fsx_tags)
         return fsx_lustre
 
     def build_metrics(self) -> SocaAnonymousMetrics:
@@ -636,7 +742,7 @@ class CloudFormationStackBuilder:
         metrics.RootSize = str(self.job.params.root_storage_size.int_val())
         metrics.SpotPrice = spot_price
         metrics.BaseOS = str(self.job.params.base_os)
-        metrics.StackUUID = self.job.provisioning_options.stack_uuid
+        metrics.StackUUID = self.ref(PARAM_STACK_UUID)
         metrics.KeepForever = str(self.job.provisioning_options.keep_forever).lower()
         metrics.FsxLustre = str(self.job.params.fsx_lustre.enabled).lower()
 
@@ -711,6 +817,78 @@ class CloudFormationStackBuilder:
 
         return self.template.to_yaml()
 
+    def build_parameters(self) -> Dict[str, str]:
+        """
+        per-job values for the parameters of the stack template
+        """
+        bootstrap_package_uri, overlay_command = self.build_bootstrap_package()
+        parameters = {
+            PARAM_COMPUTE_STACK: self.job.get_compute_stack(),
+            PARAM_JOB_ID: self.job.job_id,
+            PARAM_JOB_NAME: self.job.name,
+            PARAM_JOB_OWNER: self.job.owner,
+            PARAM_JOB_OWNER_EMAIL: self.job.owner_email,
+            PARAM_JOB_GROUP: self.job.get_job_group(),
+            PARAM_STACK_UUID: self.job.provisioning_options.stack_uuid,
+            PARAM_FSX_LUSTRE_EXPORT_PATH: self.job.get_fsx_lustre_export_path(),
+            PARAM_BOOTSTRAP_PACKAGE_URI: bootstrap_package_uri,
+            PARAM_BOOTSTRAP_OVERLAY_COMMAND: overlay_command,
+        }
+        return {
+            name: Utils.get_as_string(value, default='')
+            for name, value in parameters.items()
+        }
+
+    def get_fsx_mode(self) -> str:
+        if not self.job.params.fsx_lustre.enabled:
+            return 'none'
+        if self.job.params.fsx_lustre.existing_fsx:
+            return 'existing'
+        return 'new'
+
+    def get_template_key(self) -> str:
+        """
+        key of the compiled template for the job shape: <queue profile>.<capacity type>.<fsx mode>.<base os>.<sha256>
+        the sha256 covers all other inputs to the template: the job with per-job values replaced, the cluster config
+        version, project tags and target capacity override.
+        """
+        template_job = self.build_template_job(BootstrapPackageOverlay())
+        fingerprint = {
+            'config_version': self.context.config().version,
+            'job': template_job.model_dump(mode='json', exclude_none=True),
+            'project_tags': self.get_project_tags(),
+            'target_capacity_override': self.target_capacity_override,
+        }
+        return '.'.join(
+            [
+                str(self.job.queue_type),
+                str(self.job.capacity_type()),
+                self.get_fsx_mode(),
+                str(self.job.params.base_os),
+                Utils.sha256(Utils.to_json(fingerprint)),
+            ]
+        )
+
+    def compile_template(self) -> Tuple[str, List[str]]:
+        """
+        build the stack template using the job with per-job values replaced by placeholders.
+        any placeholders in the result indicate a per-job value which is not provided as a stack parameter.
+
+        :return: a tuple of (template body, template parameter names)
+        """
+        template_job = self.build_template_job(BootstrapPackageOverlay())
+        builder = CloudFormationStackBuilder(
+            context=self.context,
+            job=template_job,
+            target_capacity_override=self.target_capacity_override,
+        )
+        template_body = builder.build_template()
+        if OVERLAY_PLACEHOLDER_PREFIX in template_body:
+            raise exceptions.general_exception(
+                f'{self.job.log_tag} failed to compile template: per-job values found in template'
+            )
+        return template_body, list(builder.template.parameters.keys())
+
     def build_cfn_stack_tags(self) -> list:
         # tags can be provided by user while provisioning always on capacity
         tags = self.job.provisioning_options.tags
@@ -732,15 +910,14 @@ class CloudFormationStackBuilder:
 
     def get_job_as_yaml_comment(self) -> str:
         """
-        Add the Soca Job Information YML to Template as Comment.
+        Add the Soca Job Information JSON to Template as Comment.
 
         WARNING: Do not change this format. If changed, AWSUtil.get_soca_job_from_stack() will not be able to
         retrieve Soca Job information.
         :return:
         """
-        job_json = Utils.to_json(self.job, indent=True)
+        job_json = Utils.to_json(self.job)
         result = []
-        lines = job_json.splitlines(keepends=True)
         result.append(f'{os.linesep}{os.linesep}{os.linesep}')
         result.append(f'# {"-" * 100} {os.linesep}')
         target_capacity_override = ''
@@ -750,29 +927,37 @@ class CloudFormationStackBuilder:
             )
         result.append(f'# {" " * 40} IDEA Job{target_capacity_override}{os.linesep}')
         result.append(f'# {"-" * 100} {os.linesep}')
-        for line in lines:
-            result.append(f'# {line}')
-        result.append(f'{os.linesep}')
+        result.append(f'# {job_json}{os.linesep}')
         result.append(f'# {"-" * 100} {os.linesep}')
         return ''.join(result)
 
-    def get_template(self):
-        yaml_job = self.get_job_as_yaml_comment()
-        yaml_template = self.build_template()
+    def get_template(self) -> Tuple[str, List[Dict[str, str]]]:
+        """
+        :return: a tuple of (template body, stack parameters)
+        """
+        self.resolve_owner_email()
+
+        compiled_template = self.context.cloudformation_template_compiler.compile(self)
+        parameter_values = self.build_parameters()
+        parameters = [
+            {'ParameterKey': name, 'ParameterValue': parameter_values[name]}
+            for name in compiled_template.parameters
+        ]
 
-        template = yaml_template + yaml_job
+        template = compiled_template.template_body + self.get_job_as_yaml_comment()
 
-        return template
+        return template, parameters
 
     def build(self) -> str:
         try:
-            template = self.get_template()
+            template, parameters = self.get_template()
 
             if self.logger.isEnabledFor(logging.DEBUG):
                 self.logger.debug(
                     f'---- CFN Template: Start ---{os.linesep}'
                     f'{template}{os.linesep}'
-                    f'---- CFN Template: End ---'
+                    f'---- CFN Template: End ---{os.linesep}'
+                    f'Parameters: {Utils.to_json(parameters)}'
                 )
 
             compute_stack = self.job.get_compute_stack()
@@ -782,6 +967,7 @@ class CloudFormationStackBuilder:
                 .create_stack(
                     StackName=compute_stack,
                     TemplateBody=template,
+                    Parameters=parameters,
                     Tags=self.build_cfn_stack_tags(),
                 )
             )
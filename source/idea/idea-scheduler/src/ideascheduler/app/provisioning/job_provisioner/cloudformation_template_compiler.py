@@ -0,0 +1,69 @@
+#  Copyright Amazon.com, Inc. or its affiliates. All Rights Reserved.
+#
+#  Licensed under the Apache License, Version 2.0 (the "License"). You may not use this file except in compliance
+#  with the License. A copy of the License is located at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+#  or in the 'license' file accompanying this file. This file is distributed on an 'AS IS' BASIS, WITHOUT WARRANTIES
+#  OR CONDITIONS OF ANY KIND, express or implied. See the License for the specific language governing permissions
+#  and limitations under the License.
+
+from cacheout import Cache
+from typing import List, Optional
+import logging
+
+
+class CompiledTemplate:
+    def __init__(self, template_key: str, template_body: str, parameters: List[str]):
+        self.template_key = template_key
+        self.template_body = template_body
+        self.parameters = parameters
+
+
+class CloudFormationTemplateCompiler:
+    """
+    Cache for parameterized compute node stack templates.
+
+    Templates are compiled by CloudFormationStackBuilder.compile_template() from a copy of the job where per-job
+    values (job id, owner, compute stack name etc.) are replaced with placeholders. Per-job values are provided as
+    stack Parameters during stack creation, so jobs of the same shape share a single template body.
+
+    Templates are cached using CloudFormationStackBuilder.get_template_key(), which is of the form:
+    <queue profile>.<capacity type>.<fsx mode>.<base os>.<sha256 of the remaining template inputs>
+    """
+
+    def __init__(
+        self,
+        logger: Optional[logging.Logger] = None,
+        max_size: int = 1000,
+        ttl_seconds: int = 24 * 60 * 60,
+    ):
+        self._logger = logger
+        self._templates = Cache(maxsize=max_size, ttl=ttl_seconds)
+
+    def compile(self, builder) -> CompiledTemplate:
+        """
+        :param builder: CloudFormationStackBuilder for the job
+        :return: the cached template for the job shape. the template is compiled if it does not exist.
+        """
+        template_key = builder.get_template_key()
+        compiled_template = self._templates.get(template_key)
+        if compiled_template is not None:
+            return compiled_template
+
+        template_body, parameters = builder.compile_template()
+        compiled_template = CompiledTemplate(
+            template_key=template_key,
+            template_body=template_body,
+            parameters=parameters,
+        )
+        self._templates.set(template_key, compiled_template)
+        if self._logger is not None:
+            self._logger.info(
+                f'compiled template: {template_key}, size: {len(template_body)} bytes'
+            )
+        return compiled_template
+
+    def clear(self):
+        self._templates.clear()
@@ -35,7 +35,6 @@ from threading import Thread, Event
 import arrow
 import logging
 from pydantic import Field
-from ideascheduler.app.scheduler.openpbs.openpbs_qselect import OpenPBSQSelect
 from ideascheduler.app.provisioning.job_provisioner.batch_capacity_helper import (
     BatchCapacityHelper,
 )
@@ -152,11 +151,16 @@ class ProvisionJobs:
 
         self.provisioning_util.check_service_quota()
 
-        self.provisioning_util.check_reserved_instance_usage()
+        try:
+            self.provisioning_util.check_reserved_instance_usage()
 
-        self.provisioning_util.check_licenses()
+            self.provisioning_util.check_licenses()
 
-        result = self.provisioning_util.update_capacity()
+            result = self.provisioning_util.update_capacity()
+        except BaseException as e:
+            # capacity was not updated
+            self.provisioning_util.release_service_quota()
+            raise e
 
         provisioned_jobs = result.provisioned_jobs
         unprovisioned_jobs = result.unprovisioned_jobs
@@ -196,24 +200,34 @@ class ProvisionJobs:
 
         self.provisioning_util.check_service_quota()
 
-        self.provisioning_util.check_reserved_instance_usage()
-
-        self.provisioning_util.check_licenses()
+        try:
+            self.provisioning_util.check_reserved_instance_usage()
 
-        if self.is_batch:
-            result = BatchCapacityHelper(
-                context=self._context,
-                jobs=self.jobs,
-                provisioned_capacity=self.provisioning_util.provisioned_capacity,
-            ).invoke()
+            self.provisioning_util.check_licenses()
 
-            stack_builder = CloudFormationStackBuilder(
-                context=self._context,
-                job=self.job,
-                target_capacity_override=result.capacity_info.target_capacity,
-            )
+            result = None
+            if self.is_batch:
+                result = BatchCapacityHelper(
+                    context=self._context,
+                    jobs=self.jobs,
+                    provisioned_capacity=self.provisioning_util.provisioned_capacity,
+                ).invoke()
+                stack_builder = CloudFormationStackBuilder(
+                    context=self._context,
+                    job=self.job,
+                    target_capacity_override=result.capacity_info.target_capacity,
+                )
+            else:
+                stack_builder = CloudFormationStackBuilder(
+                    context=self._context, job=self.job
+                )
             stack_id = stack_builder.build()
+        except BaseException as e:
+            # stack was not created
+            self.provisioning_util.release_service_quota()
+            raise e
 
+        if self.is_batch:
             spot_or_asg = 'ASG'
             if self.job.is_spot_capacity():
                 spot_or_asg = 'SpotFleet'
@@ -226,10 +240,6 @@ class ProvisionJobs:
             unprovisioned_jobs = result.unprovisioned_jobs
 
         else:
-            stack_builder = CloudFormationStackBuilder(
-                context=self._context, job=self.job
-            )
-            stack_id = stack_builder.build()
             self.provision_job_in_scheduler(job=self.job, stack_id=stack_id)
             unprovisioned_jobs = []
 
@@ -313,6 +323,13 @@ class ProvisionJobs:
         )
 
     def invoke(self) -> ProvisionJobsResult:
+        try:
+            return self._invoke()
+        finally:
+            # provisioned jobs are tracked in job cache active licenses
+            self._context.license_service.release_licenses(self.jobs)
+
+    def _invoke(self) -> ProvisionJobsResult:
         try:
             provisioning_status = self.provisioning_status
             if provisioning_status == ProvisioningStatus.NOT_PROVISIONED:
@@ -336,6 +353,7 @@ class ProvisionJobs:
                 ProvisioningStatus.TIMEOUT,
             ):
                 self.print_status()
+                self.provisioning_util.invalidate_preflight_cache()
                 # For failed/timeout jobs, return a special error code to indicate
                 # they should be left for the node housekeeper to clean up
                 # rather than being continuously retried
@@ -368,6 +386,7 @@ class ProvisionJobs:
                 # need to know the job context, to understand why provisioning is failing.
                 if e.error_code == errorcodes.CLOUDFORMATION_STACK_BUILDER_FAILED:
                     self._logger.error(f'{self.log_tag()} {Utils.to_json(self.job)}')
+                    self.provisioning_util.invalidate_preflight_cache()
 
                 if e.exception is not None:
                     self._logger.exception(f'{self.log_tag()} {e}')
@@ -406,7 +425,7 @@ class JobProvisioner(SocaService):
         logger_name = f'job_provisioner_{queue.queue_type}'
         self._logger = context.logger(logger_name)
         self._context = context
-        self._queue_poller_thread: Optional[Thread] = None
+        self._queue_poller_threads: List[Thread] = []
         self._exit: Optional[Event] = None
         self._is_running = False
 
@@ -416,6 +435,44 @@ class JobProvisioner(SocaService):
     def service_id(self) -> str:
         return f'{self.__class__.__name__}.QueueType.{self._queue.queue_type}'
 
+    def get_provisioning_workers(self) -> int:
+        """
+        the no. of workers polling the queue concurrently.
+
+        concurrent provisioning is applicable only for ephemeral capacity, where each job is provisioned on its own
+        stack. batch and shared capacity queues update shared stacks, and queue limits and license checks are
+        evaluated before capacity is provisioned. these queues are always provisioned by a single worker.
+
+        AWS API calls from all workers are paced by the scheduler's AwsRateGovernor.
+        """
+        queue_profile = self._queue.queue_profile
+
+        if queue_profile.scaling_mode != SocaScalingMode.SINGLE_JOB:
+            return 1
+        if Utils.is_true(queue_profile.keep_forever):
+            return 1
+        if Utils.get_as_int(queue_profile.terminate_when_idle, 0) > 0:
+            return 1
+        if queue_profile.queue_mode == SocaQueueMode.LICENSE_OPTIMIZED:
+            return 1
+
+        queue_params = queue_profile.queue_management_params
+        provisioning_workers = None
+        if queue_params is not None:
+            if Utils.get_as_int(queue_params.max_running_jobs, 0) > 0:
+                return 1
+            if Utils.get_as_int(queue_params.max_provisioned_instances, 0) > 0:
+                return 1
+            if Utils.get_as_int(queue_params.max_provisioned_capacity, 0) > 0:
+                return 1
+            provisioning_workers = queue_params.provisioning_workers
+
+        if provisioning_workers is None:
+            provisioning_workers = self._context.config().get_int(
+                'scheduler.job_provisioning.provisioning_workers', default=4
+            )
+        return max(1, provisioning_workers)
+
     def _provision_with_retry_backoff(
         self, jobs: List[SocaJob], max_retries: int = 5
     ) -> ProvisionJobsResult:
@@ -486,24 +543,32 @@ class JobProvisioner(SocaService):
         """
         Drain the batch queue to fetch all Jobs.
 
-        Implementation waits for 3 seconds before returning the result. This means, jobs submitted within 3 seconds intervals
-        will be processed in a single batch.
+        The expected batch size for each job group is the no. of queued jobs in the group which are not yet provisioned,
+        as per the job cache, and the jobs accepted by the job submission hook which are not yet synced to the job cache.
+        Batches are returned as soon as all expected jobs are received from the queue.
+
+        If batches are incomplete, provisioner waits until more jobs are queued, for up to
+        batch_provisioning_wait_interval_seconds, before the expected batch sizes are evaluated again.
 
         :return: a mapping of jobs group -> list of jobs in the group
         """
         # job_group -> (job_id, job)
         batches: Dict[str, Dict[str, SocaJob]] = {}
 
-        more_jobs_available = True
+        wait_interval = self._context.config().get_float(
+            'scheduler.job_provisioning.batch_provisioning_wait_interval_seconds',
+            default=3,
+        )
 
-        while more_jobs_available:
-            if self._exit.is_set():
-                break
+        while not self._exit.is_set():
+            put_count = self._queue.put_count
 
-            iterations = 0
+            # block for the first job. subsequent jobs are drained without waiting.
+            timeout = 1 if len(batches) == 0 else 0
             while True:
                 try:
-                    job = self._queue.get(timeout=1)
+                    job = self._queue.get(timeout=timeout)
+                    timeout = 0
 
                     if job.is_provisioned():
                         continue
@@ -517,20 +582,14 @@ class JobProvisioner(SocaService):
 
                     jobs[job.job_id] = job
 
-                    iterations += 1
-
                 except JobProvisioningQueueEmpty:
                     break
 
             jobs_to_be_provisioned = 0
             for job_group, jobs in batches.items():
-                expected_batch_size = OpenPBSQSelect(
-                    context=self._context,
-                    logger=self._logger,
-                    log_tag=f'JobGroup: {job_group}',
-                    job_group=job_group,
-                    stack_id='tbd',
-                ).get_count()
+                expected_batch_size = self._context.job_cache.get_expected_batch_size(
+                    job_group=job_group
+                )
                 current_batch_size = len(jobs)
                 self._logger.info(
                     f'JobGroup: {job_group}, ExpectedBatchSize: {expected_batch_size}, CurrentBatchSize: {len(jobs)}'
@@ -549,14 +608,10 @@ class JobProvisioner(SocaService):
             for jobs in batches.values():
                 total_jobs += len(jobs)
 
-            more_jobs_available = total_jobs < jobs_to_be_provisioned
-            if more_jobs_available:
-                self._exit.wait(
-                    timeout=self._context.config().get_int(
-                        'scheduler.job_provisioning.batch_provisioning_wait_interval_seconds',
-                        default=3,
-                    )
-                )
+            if total_jobs >= jobs_to_be_provisioned:
+                break
+
+            self._queue.wait_for_jobs(put_count=put_count, timeout=wait_interval)
 
         result = {}
         for job_group in batches:
@@ -641,28 +696,39 @@ class JobProvisioner(SocaService):
                 # add an artificial delay, after each job provisioning run, to ensure
                 # we don't flood AWS with provisioning requests.
                 self._exit.wait(
-                    timeout=self._context.config().get_int(
+                    timeout=self._context.config().get_float(
                         'scheduler.job_provisioning.job_provisioning_interval_seconds',
                         default=1,
                     )
                 )
 
     def _initialize(self):
-        self._queue_poller_thread = Thread(
-            name=f'job-queue-{self._queue.queue_type}', target=self._poll_queue
-        )
+        provisioning_workers = self.get_provisioning_workers()
+        self._queue_poller_threads = []
+        for worker in range(provisioning_workers):
+            name = f'job-queue-{self._queue.queue_type}'
+            if worker > 0:
+                name = f'{name}-{worker}'
+            self._queue_poller_threads.append(
+                Thread(name=name, target=self._poll_queue)
+            )
         self._exit = Event()
+        self._logger.info(
+            f'queue profile: {self._queue.queue_type}, provisioning workers: {provisioning_workers}'
+        )
 
     def start(self):
         if self._is_running:
             return
         self._initialize()
         self._is_running = True
-        self._queue_poller_thread.start()
+        for thread in self._queue_poller_threads:
+            thread.start()
 
     def stop(self):
         if not self._is_running:
             return
         self._is_running = False
         self._exit.set()
-        self._queue_poller_thread.join()
+        for thread in self._queue_poller_threads:
+            thread.join()
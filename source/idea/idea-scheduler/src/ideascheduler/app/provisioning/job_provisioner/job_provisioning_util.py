@@ -35,7 +35,7 @@ from ideascheduler.app.provisioning.job_provisioner.batch_capacity_helper import
 )
 from pydantic import Field
 from botocore.exceptions import ClientError
-from typing import Optional, List
+from typing import Optional, List, Tuple
 import arrow
 import os
 import logging
@@ -77,6 +77,8 @@ class JobProvisioningUtil:
         self._stack_resources: Optional[CloudFormationStackResources] = None
         self._spot_fleet: Optional[EC2SpotFleetRequestConfig] = None
         self._auto_scaling_group: Optional[AutoScalingGroup] = None
+        # (quota key, vCPUs) reserved in the launch preflight cache by check_service_quota()
+        self._service_quota_reservations: List[Tuple[str, int]] = []
 
     @property
     def config(self):
@@ -317,8 +319,53 @@ class JobProvisioningUtil:
             else:
                 raise exc
 
+    def get_dry_run_key(self, instance_type: str) -> str:
+        params = self.job.params
+        return '.'.join(
+            [
+                str(params.instance_ami),
+                instance_type,
+                str(params.subnet_ids[0]),
+                ','.join(params.security_groups),
+                str(params.nodes),
+                str(params.base_os),
+            ]
+        )
+
+    @staticmethod
+    def get_quota_key(instance_types: List[str], quota_type: int) -> str:
+        return f'{quota_type}.{",".join(sorted(instance_types))}'
+
+    def invalidate_preflight_cache(self):
+        """
+        invalidate cached dry run verdicts and service quota headroom for the launch shape of the job
+        """
+        preflight_cache = self.context.launch_preflight_cache
+        if preflight_cache is None:
+            return
+        instance_types = self.job.params.instance_types
+        preflight_cache.invalidate(
+            dry_run_keys=[
+                self.get_dry_run_key(instance_type) for instance_type in instance_types
+            ],
+            quota_keys=[
+                self.get_quota_key(instance_types, quota_type)
+                for quota_type in (
+                    constants.EC2_SERVICE_QUOTA_ONDEMAND,
+                    constants.EC2_SERVICE_QUOTA_SPOT,
+                    constants.EC2_SERVICE_QUOTA_DEDICATED,
+                )
+            ],
+        )
+
     def ec2_dry_run(self):
+        preflight_cache = self.context.launch_preflight_cache
         for instance_type in self.job.params.instance_types:
+            dry_run_key = self.get_dry_run_key(instance_type)
+            if preflight_cache is not None and preflight_cache.is_dry_run_verified(
+                dry_run_key
+            ):
+                continue
             try:
                 self.context.aws().ec2().run_instances(
                     ImageId=self.job.params.instance_ami,
@@ -343,8 +390,10 @@ class JobProvisioningUtil:
                 )
             except ClientError as e:
                 if e.response['Error'].get('Code') == 'DryRunOperation':
-                    pass
+                    if preflight_cache is not None:
+                        preflight_cache.set_dry_run_verified(dry_run_key)
                 else:
+                    self.invalidate_preflight_cache()
                     raise exceptions.SocaException(
                         error_code=errorcodes.EC2_DRY_RUN_FAILED,
                         message=f'EC2 dry run failed for instance_type: {instance_type}, Err: {e}',
@@ -404,6 +453,8 @@ class JobProvisioningUtil:
             result.quotas += quota.quotas
 
         if not result:
+            # for mixed capacity, the on-demand quota may have been reserved before the spot quota check failed
+            self.release_service_quota()
             raise exceptions.SocaException(
                 error_code=errorcodes.SERVICE_QUOTA_NOT_AVAILABLE,
                 message=f'service quota not available for instance_types: {self.job.params.instance_types}',
@@ -532,12 +583,43 @@ class JobProvisioningUtil:
             error codes:
             > EC2_SERVICE_QUOTA_NOT_FOUND
         """
-        return EC2ServiceQuotaHelper(
-            context=self.context,
-            instance_types=instance_types,
-            quota_type=quota_type,
+        preflight_cache = self.context.launch_preflight_cache
+        if preflight_cache is None:
+            return EC2ServiceQuotaHelper(
+                context=self.context,
+                instance_types=instance_types,
+                quota_type=quota_type,
+                desired_capacity=desired_capacity,
+            ).check_service_quota()
+
+        quota_key = self.get_quota_key(instance_types, quota_type)
+        result = preflight_cache.check_service_quota(
+            quota_key=quota_key,
             desired_capacity=desired_capacity,
-        ).check_service_quota()
+            sample=EC2ServiceQuotaHelper(
+                context=self.context,
+                instance_types=instance_types,
+                quota_type=quota_type,
+            ).check_service_quota,
+        )
+        if result:
+            self._service_quota_reservations.append((quota_key, desired_capacity))
+        return result
+
+    def release_service_quota(self):
+        """
+        release service quota reserved in the launch preflight cache by check_service_quota(), when the capacity could
+        not be provisioned
+        """
+        preflight_cache = self.context.launch_preflight_cache
+        reservations = self._service_quota_reservations
+        self._service_quota_reservations = []
+        if preflight_cache is None:
+            return
+        for quota_key, desired_capacity in reservations:
+            preflight_cache.release_service_quota(
+                quota_key=quota_key, desired_capacity=desired_capacity
+            )
 
     @staticmethod
     def fail_message(key: str = None, message: str = None):
@@ -554,34 +636,11 @@ class JobProvisioningUtil:
             ).check_budget_availability()
 
     def check_licenses(self):
-        for job in self.jobs:
-            if job.params.licenses is None or len(job.params.licenses) == 0:
-                continue
-            for license_ask in job.params.licenses:
-                available = self.context.license_service.get_available_licenses(
-                    license_resource_name=license_ask.name
-                )
-                active_license_usage_count = (
-                    self.context.job_cache.get_active_license_count(
-                        license_name=license_ask.name
-                    )
-                )
-                total_required = active_license_usage_count + license_ask.count
-                if available < total_required:
-                    raise exceptions.SocaException(
-                        error_code=errorcodes.NOT_ENOUGH_LICENSES,
-                        message=f'Not enough licenses available for: {license_ask.name}. '
-                        f'licenses available: {available}, '
-                        f'total required: {total_required}, '
-                        f'job required: {license_ask.count}',
-                    )
-                else:
-                    self._logger.info(
-                        f'{job.log_tag} - {license_ask.name} - '
-                        f'licenses available: {available}, '
-                        f'total required: {total_required}, '
-                        f'job required: {license_ask.count}'
-                    )
+        """
+        reserve the licenses requested by the jobs. licenses are reserved until the jobs are added to active licenses
+        in job cache, or provisioning fails. see ProvisionJobs.invoke()
+        """
+        self.context.license_service.reserve_licenses(self.jobs, logger=self._logger)
 
     def check_acls(self) -> bool:
         user_projects = self.context.projects_client.get_user_projects(
@@ -0,0 +1,171 @@
+#  Copyright Amazon.com, Inc. or its affiliates. All Rights Reserved.
+#
+#  Licensed under the Apache License, Version 2.0 (the "License"). You may not use this file except in compliance
+#  with the License. A copy of the License is located at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+#  or in the 'license' file accompanying this file. This file is distributed on an 'AS IS' BASIS, WITHOUT WARRANTIES
+#  OR CONDITIONS OF ANY KIND, express or implied. See the License for the specific language governing permissions
+#  and limitations under the License.
+
+from ideadatamodel import CheckServiceQuotaResult, ServiceQuota
+
+from cacheout import Cache
+from threading import RLock
+from typing import Callable, List, Optional
+import logging
+
+
+class LaunchPreflightCache:
+    """
+    Cache for job provisioning preflight checks, keyed by launch shape.
+
+    EC2 dry runs and service quota checks depend on the launch shape (AMI, instance types, subnets, security groups,
+    capacity type), not on the individual job. Jobs of the same shape share:
+
+    > successful EC2 dry run verdicts, per instance type. failed dry runs are not cached.
+    > service quota headroom, per quota. the quota value and consumed vCPUs are sampled once per ttl. vCPUs requested
+        by jobs provisioned after the sample are added to consumed, so that jobs provisioned back to back do not exceed
+        the quota before the new instances are launched. vCPUs are reserved when the quota check passes and must be
+        released if the capacity is not provisioned.
+
+    Entries for a launch shape are invalidated when the EC2 dry run or stack creation fails for the shape, as the
+    requested capacity may not be launched.
+    """
+
+    def __init__(
+        self,
+        logger: Optional[logging.Logger] = None,
+        max_size: int = 1000,
+        ttl_seconds: int = 120,
+    ):
+        self._logger = logger
+        self._dry_runs = Cache(maxsize=max_size, ttl=ttl_seconds)
+        # launch shape quota key -> applicable quota names
+        self._quota_shapes = Cache(maxsize=max_size, ttl=ttl_seconds)
+        # quota name -> ServiceQuota (available, consumed)
+        self._quotas = Cache(maxsize=max_size, ttl=ttl_seconds)
+        self._quotas_lock = RLock()
+
+    def is_dry_run_verified(self, dry_run_key: str) -> bool:
+        return self._dry_runs.get(dry_run_key) is not None
+
+    def set_dry_run_verified(self, dry_run_key: str):
+        self._dry_runs.set(dry_run_key, True)
+
+    def _get_quotas(self, quota_key: str) -> Optional[List[ServiceQuota]]:
+        quota_names = self._quota_shapes.get(quota_key)
+        if quota_names is None:
+            return None
+        quotas = []
+        for quota_name in quota_names:
+            quota = self._quotas.get(quota_name)
+            if quota is None:
+                return None
+            quotas.append(quota)
+        return quotas
+
+    def _sample_quotas(
+        self, quota_key: str, sample: Callable[[], CheckServiceQuotaResult]
+    ) -> List[ServiceQuota]:
+        sampled = sample()
+        quota_names = []
+        quotas = []
+        for sampled_quota in sampled.quotas:
+            # quotas shared with other launch shapes retain vCPUs requested since their last sample
+            quota = self._quotas.get(sampled_quota.quota_name)
+            if quota is None:
+                quota = ServiceQuota(
+                    quota_name=sampled_quota.quota_name,
+                    available=sampled_quota.available,
+                    consumed=sampled_quota.consumed,
+                )
+                self._quotas.set(sampled_quota.quota_name, quota)
+            quota_names.append(sampled_quota.quota_name)
+            quotas.append(quota)
+        self._quota_shapes.set(quota_key, quota_names)
+        if self._logger is not None:
+            self._logger.info(f'sampled service quotas: {quota_key} - {quota_names}')
+        return quotas
+
+    def check_service_quota(
+        self,
+        quota_key: str,
+        desired_capacity: int,
+        sample: Callable[[], CheckServiceQuotaResult],
+    ) -> CheckServiceQuotaResult:
+        """
+        check service quota headroom for the desired vCPUs. if quota is available, desired vCPUs are added to consumed.
+        callers must invoke release_service_quota() if the capacity is not provisioned.
+
+        :param quota_key: launch shape quota key. see JobProvisioningUtil.get_service_quota()
+        :param desired_capacity: desired vCPUs
+        :param sample: returns the quotas applicable for the launch shape, with the current consumed vCPUs
+        """
+        with self._quotas_lock:
+            quotas = self._get_quotas(quota_key)
+            if quotas is None:
+                quotas = self._sample_quotas(quota_key, sample)
+
+            result = self._build_result(quotas, desired_capacity)
+            if result:
+                for quota in quotas:
+                    quota.consumed = quota.consumed + desired_capacity
+
+            return result
+
+    def release_service_quota(self, quota_key: str, desired_capacity: int):
+        """
+        release vCPUs reserved by check_service_quota(), when the capacity was not provisioned.
+        quotas invalidated or expired since the check are sampled again and do not retain the reservation.
+        """
+        with self._quotas_lock:
+            quotas = self._get_quotas(quota_key)
+            if quotas is None:
+                return
+            for quota in quotas:
+                quota.consumed = max(0, quota.consumed - desired_capacity)
+
+    @staticmethod
+    def _build_result(
+        quotas: List[ServiceQuota], desired_capacity: int
+    ) -> CheckServiceQuotaResult:
+        return CheckServiceQuotaResult(
+            quotas=[
+                ServiceQuota(
+                    quota_name=quota.quota_name,
+                    available=quota.available,
+                    consumed=quota.consumed,
+                    desired=desired_capacity,
+                )
+                for quota in quotas
+            ]
+        )
+
+    def _invalidate_quotas(self, quota_key: str):
+        with self._quotas_lock:
+            quota_names = self._quota_shapes.get(quota_key)
+            self._quota_shapes.delete(quota_key)
+            if quota_names is None:
+                return
+            for quota_name in quota_names:
+                self._quotas.delete(quota_name)
+
+    def invalidate(
+        self,
+        dry_run_keys: Optional[List[str]] = None,
+        quota_keys: Optional[List[str]] = None,
+    ):
+        if dry_run_keys is not None:
+            for dry_run_key in dry_run_keys:
+                self._dry_runs.delete(dry_run_key)
+        if quota_keys is not None:
+            for quota_key in quota_keys:
+                self._invalidate_quotas(quota_key)
+
+    def clear(self):
+        self._dry_runs.clear()
+        with self._quotas_lock:
+            self._quota_shapes.clear()
+            self._quotas.clear()
@@ -126,6 +126,9 @@ class HpcQueueProfilesDAO:
         queue_management_params.allowed_instance_profiles = Utils.get_value_as_list(
             'allowed_instance_profiles', db_queue_profile
         )
+        queue_management_params.provisioning_workers = Utils.get_value_as_int(
+            'provisioning_workers', db_queue_profile
+        )
 
         default_job_params = SocaJobParams()
         queue_profile.default_job_params = default_job_params
@@ -347,6 +350,10 @@ class HpcQueueProfilesDAO:
                 db_queue_profile['allowed_instance_profiles'] = (
                     queue_management_params.allowed_instance_profiles
                 )
+            if queue_management_params.provisioning_workers is not None:
+                db_queue_profile['provisioning_workers'] = (
+                    queue_management_params.provisioning_workers
+                )
 
         job_params = queue_profile.default_job_params
         if job_params is not None:
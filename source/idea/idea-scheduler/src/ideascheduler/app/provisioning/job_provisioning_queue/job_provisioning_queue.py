@@ -26,7 +26,7 @@ from ideascheduler.app.app_protocols import JobProvisioningQueueProtocol
 
 from typing import Optional, Dict, List
 from queue import Queue, PriorityQueue
-from threading import RLock, Event
+from threading import RLock, Event, Condition
 import queue
 import time
 import arrow
@@ -73,29 +73,41 @@ class RoundRobinPriorityQueue:
         self._maxsize_per_queue = maxsize_per_queue
 
     def get(self, timeout: float = 1) -> QueuedJob:
-        if len(self._queues) == 0:
-            time.sleep(timeout)
-            raise queue.Empty()
-
+        """
+        the lock is held only to select the next queue. the blocking get on the selected queue is called without
+        the lock, so that concurrent consumers and producers are not blocked by a consumer waiting on an empty queue.
+        """
         with self._lock:
-            try:
-                entry = self._queues[self._index]
-
-                queued_job = entry.priority_queue.get(timeout=timeout)
-
-                self._index += 1
+            entry = None
+            if len(self._queues) > 0:
                 self._index = self._index % len(self._queues)
-
-                return queued_job
-
-            except queue.Empty as e:
                 entry = self._queues[self._index]
-                del self._queue_map[entry.group]
-                del self._queues[self._index]
-                self._index -= 1
-                self._index = max(0, self._index)
+                self._index = (self._index + 1) % len(self._queues)
 
-                raise e
+        if entry is None:
+            time.sleep(timeout)
+            raise queue.Empty()
+
+        try:
+            return entry.priority_queue.get(timeout=timeout)
+        except queue.Empty as e:
+            with self._lock:
+                # remove the drained queue, unless a job was added in the meantime or another consumer already
+                # removed it. put() adds jobs with the lock held.
+                if (
+                    entry.priority_queue.empty()
+                    and self._queue_map.get(entry.group) is entry
+                ):
+                    index = self._queues.index(entry)
+                    del self._queue_map[entry.group]
+                    del self._queues[index]
+                    if index < self._index:
+                        self._index -= 1
+                    if len(self._queues) > 0:
+                        self._index = self._index % len(self._queues)
+                    else:
+                        self._index = 0
+            raise e
 
     def put(self, item: QueuedJob):
         with self._lock:
@@ -118,7 +130,7 @@ class RoundRobinPriorityQueue:
         """
         if Utils.is_not_empty(key):
             with self._lock:
-                if key in self._queues:
+                if key in self._queue_map:
                     return self._queue_map[key].priority_queue.qsize()
                 return 0
         else:
@@ -159,6 +171,10 @@ class JobProvisioningQueue(JobProvisioningQueueProtocol):
         self._lock = RLock()
         self._is_running = Event()
 
+        # no. of jobs queued so far. used by the job provisioner to wait for new jobs without polling.
+        self._put_count = 0
+        self._put_condition = Condition()
+
         self._provisioning_not_ready_retry_attempt = 0
 
         self._limit_flag_set: Optional[arrow.Arrow] = None
@@ -305,6 +321,26 @@ class JobProvisioningQueue(JobProvisioningQueueProtocol):
             self._queue.put(item=queued_job)
             self._queued_jobs[queued_job.job_id] = queued_job
 
+        with self._put_condition:
+            self._put_count += 1
+            self._put_condition.notify_all()
+
+    @property
+    def put_count(self) -> int:
+        return self._put_count
+
+    def wait_for_jobs(self, put_count: int, timeout: float) -> bool:
+        """
+        block until a job is queued after put_count was read, or until timeout
+        :param put_count: value of put_count before the queue was drained
+        :param timeout: max duration to wait in seconds
+        :return: True if a job was queued, False if the timeout expired
+        """
+        with self._put_condition:
+            return self._put_condition.wait_for(
+                lambda: self._put_count > put_count, timeout=timeout
+            )
+
     def delete(self, job_id: str):
         """
         mark a queued job for deletion. this should be called when the job has begun running.
@@ -454,12 +490,15 @@ class JobProvisioningQueue(JobProvisioningQueueProtocol):
             try:
                 if not self._context.is_ready():
                     while not self._context.is_ready():
+                        # the queue is consumed by multiple provisioning workers
+                        with self._lock:
+                            current_retry = self._provisioning_not_ready_retry_attempt
+                            self._provisioning_not_ready_retry_attempt += 1
                         interval = Utils.get_retry_backoff_interval(
-                            current_retry=self._provisioning_not_ready_retry_attempt,
+                            current_retry=current_retry,
                             max_retries=PROVISIONING_RETRY_BACKOFF_MAX,
                             backoff_in_seconds=timeout,
                         )
-                        self._provisioning_not_ready_retry_attempt += 1
                         self._block(interval)
                         if not self._context.is_ready():
                             self._logger.warning('job provisioning not ready. skip.')
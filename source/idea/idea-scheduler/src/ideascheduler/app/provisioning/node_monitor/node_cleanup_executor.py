@@ -0,0 +1,139 @@
+#  Copyright Amazon.com, Inc. or its affiliates. All Rights Reserved.
+#
+#  Licensed under the Apache License, Version 2.0 (the "License"). You may not use this file except in compliance
+#  with the License. A copy of the License is located at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+#  or in the 'license' file accompanying this file. This file is distributed on an 'AS IS' BASIS, WITHOUT WARRANTIES
+#  OR CONDITIONS OF ANY KIND, express or implied. See the License for the specific language governing permissions
+#  and limitations under the License.
+
+import ideascheduler
+from ideadatamodel import exceptions
+from ideasdk.aws import TokenBucket
+from ideasdk.utils import Utils
+
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from typing import Dict, List
+import logging
+
+# max. no. of instance ids supported by a single ec2:TerminateInstances request
+EC2_TERMINATE_INSTANCES_MAX_BATCH_SIZE = 1000
+
+
+class NodeCleanupExecutor:
+    """
+    Batched and concurrent clean-up of scheduler nodes, ec2 instances and cloudformation stacks for NodeHouseKeeper
+
+    * scheduler nodes are deleted using a single scheduler session (qmgr for openpbs).
+    * ec2 instances are terminated in batches of up to 1000 instances. if a batch request fails, the instances in
+      the batch are terminated individually, so that a single invalid instance does not fail the entire batch.
+    * cloudformation stacks are deleted concurrently by a pool of workers, paced by a token bucket.
+
+    all operations return the errors for individual items instead of raising an exception, so that a failure for
+    one item does not prevent clean-up of the remaining items.
+    """
+
+    def __init__(self, context: ideascheduler.AppContext, logger: logging.Logger):
+        self._context = context
+        self._logger = logger
+
+        self.stack_deletion_workers = max(
+            1,
+            context.config().get_int(
+                'scheduler.job_provisioning.node_housekeeping_cleanup.stack_deletion_workers',
+                default=8,
+            ),
+        )
+        rate = context.config().get_float(
+            'scheduler.job_provisioning.node_housekeeping_cleanup.stack_deletion_rate',
+            default=3,
+        )
+        burst = context.config().get_int(
+            'scheduler.job_provisioning.node_housekeeping_cleanup.stack_deletion_burst',
+            default=5,
+        )
+        self._stack_deletion_bucket = TokenBucket(rate=rate, burst=burst)
+
+    @property
+    def aws_util(self):
+        return self._context.aws_util()
+
+    def delete_nodes(self, hosts: List[str]) -> Dict[str, exceptions.SocaException]:
+        """
+        :return: errors for hosts that could not be deleted
+        """
+        if Utils.is_empty(hosts):
+            return {}
+        try:
+            return self._context.scheduler.delete_nodes(hosts=hosts)
+        except exceptions.SocaException as e:
+            return {host: e for host in hosts}
+
+    def _terminate_instances(
+        self, instance_ids: List[str], force: bool
+    ) -> Dict[str, Exception]:
+        try:
+            self.aws_util.ec2_terminate_instances(
+                instance_ids=instance_ids, force=force, skip_os_shutdown=force
+            )
+            return {}
+        except Exception as e:
+            if len(instance_ids) == 1:
+                return {instance_ids[0]: e}
+            self._logger.warning(
+                f'failed to terminate {len(instance_ids)} instance(s): {e}. retrying individual instances ...'
+            )
+
+        errors = {}
+        for instance_id in instance_ids:
+            errors.update(
+                self._terminate_instances(instance_ids=[instance_id], force=force)
+            )
+        return errors
+
+    def terminate_instances(
+        self, instance_ids: List[str], force: bool = False
+    ) -> Dict[str, Exception]:
+        """
+        :param instance_ids: ec2 instance ids to terminate
+        :param force: use force termination and skip OS shutdown for stuck or unresponsive instances
+        :return: errors for instances that could not be terminated
+        """
+        errors = {}
+        for offset in range(
+            0, len(instance_ids), EC2_TERMINATE_INSTANCES_MAX_BATCH_SIZE
+        ):
+            batch = instance_ids[
+                offset : offset + EC2_TERMINATE_INSTANCES_MAX_BATCH_SIZE
+            ]
+            errors.update(self._terminate_instances(instance_ids=batch, force=force))
+        return errors
+
+    def _delete_stack(self, stack_name: str):
+        self._stack_deletion_bucket.acquire()
+        self._logger.debug(f'initiating CloudFormation stack deletion: {stack_name}')
+        self.aws_util.cloudformation_delete_stack(stack_name=stack_name)
+
+    def delete_stacks(self, stack_names: List[str]) -> Dict[str, Exception]:
+        """
+        :return: errors for stacks that could not be deleted
+        """
+        if Utils.is_empty(stack_names):
+            return {}
+
+        errors = {}
+        max_workers = min(self.stack_deletion_workers, len(stack_names))
+        with ThreadPoolExecutor(
+            max_workers=max_workers, thread_name_prefix='node-cleanup'
+        ) as executor:
+            futures = {
+                executor.submit(self._delete_stack, stack_name): stack_name
+                for stack_name in stack_names
+            }
+            for future in as_completed(futures):
+                error = future.exception()
+                if error is not None:
+                    errors[futures[future]] = error
+        return errors
@@ -11,7 +11,6 @@
 
 import ideascheduler
 from ideadatamodel import (
-    exceptions,
     SocaCapacityType,
     SocaComputeNode,
     SocaComputeNodeState,
@@ -24,12 +23,14 @@ from ideasdk.metrics import BaseMetrics
 
 from ideascheduler.app.provisioning import JobProvisioningUtil
 from ideascheduler.app.scheduler.openpbs.openpbs_qselect import OpenPBSQSelect
+from ideascheduler.app.provisioning.node_monitor.node_cleanup_executor import (
+    NodeCleanupExecutor,
+)
 
 from typing import Dict, List, Optional, Set, Union, Tuple
 from threading import Thread, Event
 import arrow
 import logging
-import time
 
 minutes = Utils.minutes
 
@@ -47,9 +48,20 @@ class NodeHouseKeepingSession:
     Perform Housekeeping activities for the Soca Cluster
     """
 
-    def __init__(self, context: ideascheduler.AppContext, logger: logging.Logger):
+    def __init__(
+        self,
+        context: ideascheduler.AppContext,
+        logger: logging.Logger,
+        cleanup_executor: Optional[NodeCleanupExecutor] = None,
+    ):
         self._context = context
         self._logger = logger
+        if cleanup_executor is None:
+            cleanup_executor = NodeCleanupExecutor(context=context, logger=logger)
+        self._cleanup_executor = cleanup_executor
+
+        # scheduler nodes (host -> node), shared by all passes within the housekeeping session
+        self.nodes: Dict[str, SocaComputeNode] = {}
 
         # pass 1
         self.job_groups: Dict[str, List[EC2Instance]] = {}
@@ -85,6 +97,14 @@ class NodeHouseKeepingSession:
     def aws_util(self):
         return self._context.aws_util()
 
+    def refresh_nodes(self) -> List[SocaComputeNode]:
+        """
+        fetch all nodes from the scheduler with a single query and refresh the node snapshot for the session.
+        """
+        nodes = self._context.scheduler.list_nodes()
+        self.nodes = {node.host: node for node in nodes}
+        return nodes
+
     @staticmethod
     def log_tag(instance: Union[EC2Instance, SocaComputeNode]):
         s = '('
@@ -364,7 +384,7 @@ class NodeHouseKeepingSession:
 
         cluster_name = self._context.cluster_name()
 
-        nodes = self._context.scheduler.list_nodes()
+        nodes = self.refresh_nodes()
 
         for node in nodes:
             if not node.is_provisioned():
@@ -492,12 +512,18 @@ class NodeHouseKeepingSession:
         # if between pass1 and pass4, if there were any jobs that were provisioned on this node,
         # the node could become busy again.
 
-        # fetch node from scheduler and filter again
+        # fetch nodes from scheduler and filter again
+
+        if (
+            len(self.spot_fleet_instances) > 0
+            or len(self.auto_scaling_group_instances) > 0
+        ):
+            self.refresh_nodes()
 
         nodes_to_set_offline = set()
         for instances in self.spot_fleet_instances.values():
             for instance in instances:
-                node = self._context.scheduler.get_node(host=instance.private_dns_name)
+                node = self.nodes.get(instance.private_dns_name)
                 if node is None:
                     continue
                 if node.has_state(
@@ -508,7 +534,7 @@ class NodeHouseKeepingSession:
 
         for instances in self.auto_scaling_group_instances.values():
             for instance in instances:
-                node = self._context.scheduler.get_node(host=instance.private_dns_name)
+                node = self.nodes.get(instance.private_dns_name)
                 if node is None:
                     continue
                 if node.has_state(
@@ -661,23 +687,34 @@ class NodeHouseKeepingSession:
             - updates spot fleet capacities
         """
 
-        deletion_failed_instances = set()
+        nodes_by_host: Dict[str, Union[SocaComputeNode, EC2Instance]] = {}
         for node in self.nodes_to_delete:
             self._logger.info(f'{self.log_tag(node)} deleting node')
+            if isinstance(node, SocaComputeNode):
+                nodes_by_host[node.host] = node
+            else:
+                nodes_by_host[node.private_dns_name] = node
 
+        deletion_failed_instances = set()
+        node_deletion_errors = self._cleanup_executor.delete_nodes(
+            hosts=list(nodes_by_host.keys())
+        )
+        for host, node in nodes_by_host.items():
+            error = node_deletion_errors.get(host)
+            if error is not None:
+                self._logger.warning(f'{self.log_tag(node)} {error.message}')
+                deletion_failed_instances.add(node.instance_id)
+                continue
             if isinstance(node, SocaComputeNode):
-                host = node.host
                 queue_type = node.queue_type
             else:
-                host = node.private_dns_name
                 queue_type = node.soca_queue_type
-            try:
-                self._context.scheduler.delete_node(host=host)
-                self._context.metrics.nodes_deleted(queue_type=queue_type)
-            except exceptions.SocaException as e:
-                self._logger.warning(f'{self.log_tag(node)} {e.message}')
-                deletion_failed_instances.add(node.instance_id)
+            self._context.metrics.nodes_deleted(queue_type=queue_type)
+            self.nodes.pop(host, None)
 
+        instances: Dict[str, EC2Instance] = {}
+        force_terminate_instance_ids = []
+        terminate_instance_ids = []
         for instance in self.instances_to_terminate:
             if instance.instance_id in deletion_failed_instances:
                 self._logger.warning(
@@ -686,6 +723,7 @@ class NodeHouseKeepingSession:
                 continue
 
             self._logger.info(f'{self.log_tag(instance)} terminating ec2 instance')
+            instances[instance.instance_id] = instance
 
             # Use force termination for instances that are stuck or unresponsive
             # Force termination is used when instances are in shutting-down state for too long
@@ -700,15 +738,26 @@ class NodeHouseKeepingSession:
                 self._logger.warning(
                     f'{self.log_tag(instance)} using force termination with skip OS shutdown for stuck instance'
                 )
-                self.aws_util.ec2_terminate_instances(
-                    instance_ids=[instance.instance_id],
-                    force=True,
-                    skip_os_shutdown=True,
-                )
+                force_terminate_instance_ids.append(instance.instance_id)
             else:
-                self.aws_util.ec2_terminate_instances(
-                    instance_ids=[instance.instance_id]
+                terminate_instance_ids.append(instance.instance_id)
+
+        termination_errors = self._cleanup_executor.terminate_instances(
+            instance_ids=force_terminate_instance_ids, force=True
+        )
+        termination_errors.update(
+            self._cleanup_executor.terminate_instances(
+                instance_ids=terminate_instance_ids
+            )
+        )
+
+        for instance_id, instance in instances.items():
+            error = termination_errors.get(instance_id)
+            if error is not None:
+                self._logger.warning(
+                    f'{self.log_tag(instance)} failed to terminate ec2 instance: {error}'
                 )
+                continue
 
             self._context.metrics.instances_terminated(
                 queue_type=instance.soca_queue_type
@@ -719,134 +768,7 @@ class NodeHouseKeepingSession:
                 queue_type=instance.soca_queue_type, duration_secs=duration.seconds
             )
 
-            # Send AD automation event to delete the computer object
-            try:
-                # First check if directory service is properly configured
-                provider = self._context.config().get_string(
-                    'directoryservice.provider', default=None
-                )
-                if not provider or provider not in [
-                    'aws_managed_activedirectory',
-                    'activedirectory',
-                ]:
-                    self._logger.debug(
-                        f'Skipping AD computer deletion for {instance.instance_id}, directory service provider is {provider}'
-                    )
-                    continue
-
-                # Get AD automation queue URL from config - fail early if not configured
-                ad_automation_queue_url = self._context.config().get_string(
-                    'directoryservice.ad_automation.sqs_queue_url', default=None
-                )
-                if not ad_automation_queue_url:
-                    self._logger.warning(
-                        'AD automation queue URL not configured. Skipping AD computer deletion.'
-                    )
-                    continue
-
-                # Try to determine the computer name for this instance
-                computer_name = None
-
-                # First try standard methods to get hostname
-                if hasattr(instance, 'private_dns_name') and instance.private_dns_name:
-                    # Extract hostname from private DNS name (e.g., ip-10-0-0-1.ec2.internal -> ip-10-0-0-1)
-                    computer_name = instance.private_dns_name.split('.')[0]
-                    self._logger.debug(
-                        f'Using private_dns_name derived hostname: {computer_name}'
-                    )
-                elif hasattr(instance, 'host') and instance.host:
-                    computer_name = instance.host
-                    self._logger.debug(f'Using host as hostname: {computer_name}')
-
-                # For Windows instances or when hostname couldn't be determined, generate using standard algorithm
-                if not computer_name:
-                    try:
-                        # Get cluster config values for hostname generation
-                        aws_region = self._context.config().get_string(
-                            'cluster.aws.region', required=True
-                        )
-                        aws_account = self._context.config().get_string(
-                            'cluster.aws.account_id', required=True
-                        )
-                        cluster_name = self._context.config().get_string(
-                            'cluster.cluster_name', required=True
-                        )
-
-                        hostname_data = f'{aws_region}|{aws_account}|{cluster_name}|{instance.instance_id}'
-                        hostname_prefix = self._context.config().get_string(
-                            'directoryservice.ad_automation.hostname_prefix',
-                            default='IDEA-',
-                        )
-
-                        # Calculate available characters (max length of AD computer name is 15)
-                        avail_chars = 15 - len(hostname_prefix)
-                        if avail_chars < 4:
-                            self._logger.warning(
-                                f'Hostname prefix too long: {hostname_prefix}, using default IDEA-'
-                            )
-                            hostname_prefix = 'IDEA-'
-                            avail_chars = 10  # 15 - 5
-
-                        # Take the last n-chars from the resulting shake256 bucket of 256
-                        shake_value = Utils.shake_256(hostname_data, 256)[
-                            (avail_chars * -1) :
-                        ]
-                        computer_name = f'{hostname_prefix}{shake_value}'.upper()
-
-                        self._logger.info(
-                            f'Generated hostname for instance {instance.instance_id}: {computer_name}'
-                        )
-                    except Exception as e:
-                        self._logger.error(
-                            f'Failed to generate hostname for instance: {str(e)}'
-                        )
-
-                if not computer_name:
-                    self._logger.warning(
-                        f'Unable to determine computer name for instance {instance.instance_id}. Skipping AD computer deletion.'
-                    )
-                    continue
-
-                self._logger.info(
-                    f'Sending AD automation delete event for computer: {computer_name}, instance: {instance.instance_id}'
-                )
-
-                # Create the AD automation request
-                request = {
-                    'header': {'namespace': 'ADAutomation.DeleteComputer'},
-                    'payload': {
-                        'computer_name': computer_name,
-                        'instance_id': instance.instance_id,
-                    },
-                }
-
-                # Send the message to SQS - always using FIFO parameters since AD automation queue is always FIFO
-                message_deduplication_id = (
-                    f'{instance.instance_id}-{Utils.current_time_ms()}'
-                )
-                self._logger.debug(
-                    f'Using message deduplication ID: {message_deduplication_id}'
-                )
-
-                sqs_response = (
-                    self._context.aws()
-                    .sqs()
-                    .send_message(
-                        QueueUrl=ad_automation_queue_url,
-                        MessageBody=Utils.to_json(request),
-                        MessageGroupId='ADAutomation.DeleteComputer',
-                        MessageDeduplicationId=message_deduplication_id,
-                    )
-                )
-
-                self._logger.info(
-                    f'Successfully sent AD delete request for {computer_name}, SQS MessageId: {sqs_response.get("MessageId", "unknown")}'
-                )
-            except Exception as e:
-                self._logger.warning(
-                    f'Failed to send AD automation delete event: {str(e)}',
-                    exc_info=True,
-                )
+            self._send_ad_computer_delete_event(instance)
 
         # todo - refactor this implementation to create a NodeHouseKeeperContext:
         #  - get rid of all the tuple returns and simplify the code.
@@ -901,12 +823,149 @@ class NodeHouseKeepingSession:
         for stack_name in self.stacks_to_delete:
             queue_type, info = self.stack_info[stack_name]
             self._logger.info(f'{info} deleting stack')
+
+        stack_deletion_errors = self._cleanup_executor.delete_stacks(
+            stack_names=list(self.stacks_to_delete)
+        )
+        for stack_name in self.stacks_to_delete:
+            queue_type, info = self.stack_info[stack_name]
+            error = stack_deletion_errors.get(stack_name)
+            if error is not None:
+                self._logger.warning(f'{info} failed to delete stack: {error}')
+                continue
+            self._context.metrics.stacks_deleted(queue_type)
+
+    def _send_ad_computer_delete_event(self, instance: EC2Instance):
+        """
+        Send AD automation event to delete the computer object
+        """
+        try:
+            # First check if directory service is properly configured
+            provider = self._context.config().get_string(
+                'directoryservice.provider', default=None
+            )
+            if not provider or provider not in [
+                'aws_managed_activedirectory',
+                'activedirectory',
+            ]:
+                self._logger.debug(
+                    f'Skipping AD computer deletion for {instance.instance_id}, directory service provider is {provider}'
+                )
+                return
+
+            # Get AD automation queue URL from config - fail early if not configured
+            ad_automation_queue_url = self._context.config().get_string(
+                'directoryservice.ad_automation.sqs_queue_url', default=None
+            )
+            if not ad_automation_queue_url:
+                self._logger.warning(
+                    'AD automation queue URL not configured. Skipping AD computer deletion.'
+                )
+                return
+
+            # Try to determine the computer name for this instance
+            computer_name = None
+
+            # First try standard methods to get hostname
+            if hasattr(instance, 'private_dns_name') and instance.private_dns_name:
+                # Extract hostname from private DNS name (e.g., ip-10-0-0-1.ec2.internal -> ip-10-0-0-1)
+                computer_name = instance.private_dns_name.split('.')[0]
+                self._logger.debug(
+                    f'Using private_dns_name derived hostname: {computer_name}'
+                )
+            elif hasattr(instance, 'host') and instance.host:
+                computer_name = instance.host
+                self._logger.debug(f'Using host as hostname: {computer_name}')
+
+            # For Windows instances or when hostname couldn't be determined, generate using standard algorithm
+            if not computer_name:
+                try:
+                    # Get cluster config values for hostname generation
+                    aws_region = self._context.config().get_string(
+                        'cluster.aws.region', required=True
+                    )
+                    aws_account = self._context.config().get_string(
+                        'cluster.aws.account_id', required=True
+                    )
+                    cluster_name = self._context.config().get_string(
+                        'cluster.cluster_name', required=True
+                    )
+
+                    hostname_data = f'{aws_region}|{aws_account}|{cluster_name}|{instance.instance_id}'
+                    hostname_prefix = self._context.config().get_string(
+                        'directoryservice.ad_automation.hostname_prefix',
+                        default='IDEA-',
+                    )
+
+                    # Calculate available characters (max length of AD computer name is 15)
+                    avail_chars = 15 - len(hostname_prefix)
+                    if avail_chars < 4:
+                        self._logger.warning(
+                            f'Hostname prefix too long: {hostname_prefix}, using default IDEA-'
+                        )
+                        hostname_prefix = 'IDEA-'
+                        avail_chars = 10  # 15 - 5
+
+                    # Take the last n-chars from the resulting shake256 bucket of 256
+                    shake_value = Utils.shake_256(hostname_data, 256)[
+                        (avail_chars * -1) :
+                    ]
+                    computer_name = f'{hostname_prefix}{shake_value}'.upper()
+
+                    self._logger.info(
+                        f'Generated hostname for instance {instance.instance_id}: {computer_name}'
+                    )
+                except Exception as e:
+                    self._logger.error(
+                        f'Failed to generate hostname for instance: {str(e)}'
+                    )
+
+            if not computer_name:
+                self._logger.warning(
+                    f'Unable to determine computer name for instance {instance.instance_id}. Skipping AD computer deletion.'
+                )
+                return
+
+            self._logger.info(
+                f'Sending AD automation delete event for computer: {computer_name}, instance: {instance.instance_id}'
+            )
+
+            # Create the AD automation request
+            request = {
+                'header': {'namespace': 'ADAutomation.DeleteComputer'},
+                'payload': {
+                    'computer_name': computer_name,
+                    'instance_id': instance.instance_id,
+                },
+            }
+
+            # Send the message to SQS - always using FIFO parameters since AD automation queue is always FIFO
+            message_deduplication_id = (
+                f'{instance.instance_id}-{Utils.current_time_ms()}'
+            )
             self._logger.debug(
-                f'initiating CloudFormation stack deletion: {stack_name}'
+                f'Using message deduplication ID: {message_deduplication_id}'
+            )
+
+            sqs_response = (
+                self._context.aws()
+                .sqs()
+                .send_message(
+                    QueueUrl=ad_automation_queue_url,
+                    MessageBody=Utils.to_json(request),
+                    MessageGroupId='ADAutomation.DeleteComputer',
+                    MessageDeduplicationId=message_deduplication_id,
+                )
+            )
+
+            self._logger.info(
+                f'Successfully sent AD delete request for {computer_name}, SQS MessageId: {sqs_response.get("MessageId", "unknown")}'
+            )
+        except Exception as e:
+            self._logger.warning(
+                f'Failed to send AD automation delete event: {str(e)}',
+                exc_info=True,
             )
-            self.aws_util.cloudformation_delete_stack(stack_name=stack_name)
-            time.sleep(0.3)
-            self._context.metrics.stacks_deleted(queue_type)
 
     def retry_provisioning_cleanup(self):
         """
@@ -1144,7 +1203,8 @@ class NodeHouseKeepingSession:
                     )
 
     def publish_cluster_metrics_and_index_in_opensearch(self):
-        nodes = self._context.scheduler.list_nodes()
+        # nodes deleted during cleanup are removed from the snapshot
+        nodes = list(self.nodes.values())
         if Utils.is_empty(nodes):
             return
 
@@ -1288,11 +1348,18 @@ class NodeHouseKeeper:
     def __init__(self, context: ideascheduler.AppContext):
         self._context = context
         self._logger = self._context.logger(name='node_housekeeper')
+        self._cleanup_executor = NodeCleanupExecutor(
+            context=self._context, logger=self._logger
+        )
         self._is_running = Event()
         self._house_keeping_thread: Optional[Thread] = None
 
     def do_job(self):
-        session = NodeHouseKeepingSession(context=self._context, logger=self._logger)
+        session = NodeHouseKeepingSession(
+            context=self._context,
+            logger=self._logger,
+            cleanup_executor=self._cleanup_executor,
+        )
         session.begin()
 
     def invoke(self):
@@ -13,4 +13,8 @@ import ideascheduler.app.scheduler.openpbs.openpbs_constants as constants
 from ideascheduler.app.scheduler.openpbs.openpbs_model import OpenPBSJob, OpenPBSEvent
 from ideascheduler.app.scheduler.openpbs.openpbs_converter import OpenPBSConverter
 from ideascheduler.app.scheduler.openpbs.openpbs_qstat import OpenPBSQStat
+from ideascheduler.app.scheduler.openpbs.openpbs_qmgr_session import (
+    OpenPBSQmgrSession,
+    QmgrCommandResult,
+)
 from ideascheduler.app.scheduler.openpbs.openpbs_scheduler import OpenPBSScheduler
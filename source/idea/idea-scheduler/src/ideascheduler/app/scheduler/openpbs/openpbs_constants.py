@@ -17,6 +17,8 @@ QSTAT_ERROR_CODE_UNKNOWN_QUEUE = 170
 QALTER_ERROR_CODE_JOB_IS_RUNNING = 167
 
 QMGR_ERROR_CODE_OBJECT_BUSY = 179
+# PBSE_OBJBUSY, as reported by qmgr for each failed directive: qmgr: Error (15027) returned from server
+QMGR_SERVER_ERROR_CODE_OBJECT_BUSY = 15027
 
 QSTAT = '/opt/pbs/bin/qstat'
 QMGR = '/opt/pbs/bin/qmgr'
@@ -0,0 +1,229 @@
+#  Copyright Amazon.com, Inc. or its affiliates. All Rights Reserved.
+#
+#  Licensed under the Apache License, Version 2.0 (the "License"). You may not use this file except in compliance
+#  with the License. A copy of the License is located at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+#  or in the 'license' file accompanying this file. This file is distributed on an 'AS IS' BASIS, WITHOUT WARRANTIES
+#  OR CONDITIONS OF ANY KIND, express or implied. See the License for the specific language governing permissions
+#  and limitations under the License.
+
+from ideadatamodel import exceptions, errorcodes
+from ideasdk.utils import Utils
+from ideascheduler.app.scheduler.openpbs import openpbs_constants
+
+from typing import List, Optional
+from threading import RLock, Thread
+from queue import Queue, Empty
+import subprocess
+import logging
+import re
+
+QMGR_SERVER_ERROR_PATTERN = re.compile(r'^qmgr: Error \((\d+)\) returned from server')
+
+# error code reported when the qmgr session exits or does not respond before the directive is processed
+QMGR_SESSION_ERROR_CODE = -1
+
+
+class QmgrCommandResult:
+    def __init__(
+        self, command: str, error_code: int = 0, messages: Optional[List[str]] = None
+    ):
+        self.command = command
+        self.error_code = error_code
+        self.messages = messages or []
+
+    @property
+    def success(self) -> bool:
+        return self.error_code == 0
+
+    def is_object_busy(self) -> bool:
+        return self.error_code == openpbs_constants.QMGR_SERVER_ERROR_CODE_OBJECT_BUSY
+
+    def __str__(self):
+        if self.success:
+            return f'qmgr> {self.command} >> ok'
+        return f'qmgr> {self.command} >> error: {self.error_code} >> {" ".join(self.messages)}'
+
+
+class OpenPBSQmgrSession:
+    """
+    Long-lived qmgr process, accepting pipelined directives over stdin.
+
+    Forking qmgr for each directive costs a process start-up, a connection and an authentication with the PBS server.
+    The session keeps a single qmgr process running and writes directives to its stdin as they are executed.
+
+    qmgr reports errors on stderr and continues with the next directive. There is no explicit acknowledgement for a
+    successful directive, so each directive is followed by a marker directive (list node <marker>), which always fails
+    with an "Unknown node" error for the marker object. All output received before the marker error belongs to the
+    directive:
+
+        qmgr obj=<object> svr=default: <error message>      <- directive error, if any
+        qmgr: Error (<error code>) returned from server
+        qmgr obj=<marker> svr=default: Unknown node          <- end of directive
+        qmgr: Error (15062) returned from server
+
+    stdout and stderr are read from a single pipe, so only directives which do not print to stdout are supported
+    (create, set, unset and delete). Use qstat or pbsnodes to query the server.
+
+    The qmgr process is started on first use, and restarted after it exits or fails to respond within timeout_seconds.
+    """
+
+    def __init__(
+        self,
+        logger: Optional[logging.Logger] = None,
+        cmd: Optional[List[str]] = None,
+        timeout_seconds: float = 30,
+    ):
+        self._logger = logger
+        if cmd is None:
+            cmd = [openpbs_constants.QMGR]
+        self._cmd = cmd
+        self._timeout_seconds = timeout_seconds
+
+        self._process: Optional[subprocess.Popen] = None
+        self._output: Optional[Queue] = None
+        self._marker_seq = 0
+        self._lock = RLock()
+
+    def is_running(self) -> bool:
+        return self._process is not None and self._process.poll() is None
+
+    @staticmethod
+    def _read_output(process: subprocess.Popen, output: Queue):
+        for line in process.stdout:
+            output.put(line.rstrip('\n'))
+        output.put(None)
+
+    def _start(self):
+        try:
+            self._process = subprocess.Popen(
+                self._cmd,
+                stdin=subprocess.PIPE,
+                stdout=subprocess.PIPE,
+                stderr=subprocess.STDOUT,
+                text=True,
+                bufsize=1,
+            )
+        except OSError as e:
+            raise exceptions.SocaException(
+                error_code=errorcodes.SCHEDULER_ERROR,
+                message=f'failed to start qmgr session: {e}',
+            )
+        self._output = Queue()
+        Thread(
+            name='qmgr-session-reader',
+            target=self._read_output,
+            args=(self._process, self._output),
+            daemon=True,
+        ).start()
+        if self._logger is not None:
+            self._logger.debug(f'qmgr session started. pid: {self._process.pid}')
+
+    def close(self, force: bool = False):
+        """
+        close the session. qmgr exits after processing pending directives.
+        :param force: kill the qmgr process without waiting for pending directives
+        """
+        with self._lock:
+            process = self._process
+            self._process = None
+            self._output = None
+            if process is None:
+                return
+            try:
+                if force:
+                    process.kill()
+                elif process.poll() is None:
+                    process.stdin.close()
+                    process.wait(timeout=5)
+            except (OSError, subprocess.TimeoutExpired):
+                process.kill()
+
+    def _next_marker(self) -> str:
+        self._marker_seq += 1
+        return f'__idea_qmgr_marker_{self._marker_seq}'
+
+    def _read_line(self) -> Optional[str]:
+        try:
+            return self._output.get(timeout=self._timeout_seconds)
+        except Empty:
+            return None
+
+    def _read_result(self, command: str, marker: str) -> Optional[QmgrCommandResult]:
+        """
+        read the output for a directive until the marker error is received
+        :return: None if the session exited or did not respond
+        """
+        marker_prefix = f'qmgr obj={marker} '
+        error_code = 0
+        messages = []
+        while True:
+            line = self._read_line()
+            if line is None:
+                return None
+            if line.startswith(marker_prefix):
+                # consume: qmgr: Error (15062) returned from server
+                if self._read_line() is None:
+                    return None
+                return QmgrCommandResult(
+                    command=command, error_code=error_code, messages=messages
+                )
+            match = QMGR_SERVER_ERROR_PATTERN.match(line)
+            if match is not None:
+                error_code = Utils.get_as_int(match.group(1), default=0)
+            elif Utils.is_not_empty(line):
+                messages.append(line.strip())
+
+    def execute(self, commands: List[str]) -> List[QmgrCommandResult]:
+        """
+        execute qmgr directives in the session. directives are written to qmgr at once and results are read in order.
+
+        :param commands: qmgr directives. eg. set node ip-10-0-0-1 state=offline
+        :return: result for each directive, in the same order as commands
+        """
+        if Utils.is_empty(commands):
+            return []
+
+        with self._lock:
+            if not self.is_running():
+                self._start()
+
+            markers = [self._next_marker() for _ in commands]
+            directives = ''.join(
+                f'{command}\nlist node {marker}\n'
+                for command, marker in zip(commands, markers)
+            )
+
+            results = []
+            try:
+                self._process.stdin.write(directives)
+                self._process.stdin.flush()
+                for command, marker in zip(commands, markers):
+                    result = self._read_result(command=command, marker=marker)
+                    if result is None:
+                        break
+                    if not result.success and self._logger is not None:
+                        self._logger.debug(result)
+                    results.append(result)
+            except OSError as e:
+                if self._logger is not None:
+                    self._logger.warning(f'qmgr session failed: {e}')
+
+            if len(results) < len(commands):
+                if self._logger is not None:
+                    self._logger.warning(
+                        'qmgr session exited or did not respond. restarting session ...'
+                    )
+                self.close(force=True)
+                for command in commands[len(results) :]:
+                    results.append(
+                        QmgrCommandResult(
+                            command=command,
+                            error_code=QMGR_SESSION_ERROR_CODE,
+                            messages=['qmgr session exited or did not respond'],
+                        )
+                    )
+
+            return results
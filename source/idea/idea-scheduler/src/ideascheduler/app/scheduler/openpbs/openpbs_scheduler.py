@@ -21,7 +21,12 @@ from ideadatamodel.scheduler import (
 )
 from ideasdk.shell import ShellInvoker
 from ideasdk.utils import Utils
-from ideascheduler.app.scheduler.openpbs import OpenPBSConverter, OpenPBSQStat
+from ideascheduler.app.scheduler.openpbs import (
+    OpenPBSConverter,
+    OpenPBSQStat,
+    OpenPBSQmgrSession,
+    QmgrCommandResult,
+)
 from ideascheduler.app.scheduler.openpbs import openpbs_constants
 
 from ideascheduler.app.app_protocols import SocaSchedulerProtocol
@@ -43,6 +48,47 @@ class OpenPBSScheduler(SocaSchedulerProtocol):
         self._logger = context.logger('openpbs')
         self._shell = ShellInvoker(logger=self._logger)
         self._converter = OpenPBSConverter(context=self._context, logger=self._logger)
+        self._qmgr_session: Optional[OpenPBSQmgrSession] = None
+        if context.config().get_bool(
+            'scheduler.openpbs.qmgr_session.enabled', default=True
+        ):
+            self._qmgr_session = OpenPBSQmgrSession(
+                logger=self._logger, timeout_seconds=self.qmgr_timeout_seconds
+            )
+
+    @property
+    def qmgr_timeout_seconds(self) -> float:
+        return self._context.config().get_float(
+            'scheduler.openpbs.qmgr_session.timeout_seconds', default=30
+        )
+
+    def qmgr(self, commands: List[str]) -> List[QmgrCommandResult]:
+        """
+        execute qmgr directives using the long-lived qmgr session.
+        if the session is disabled, a new qmgr process is started for the directives.
+        """
+        if self._qmgr_session is not None:
+            return self._qmgr_session.execute(commands)
+        session = OpenPBSQmgrSession(
+            logger=self._logger, timeout_seconds=self.qmgr_timeout_seconds
+        )
+        try:
+            return session.execute(commands)
+        finally:
+            session.close()
+
+    def _qmgr_or_raise(self, command: str, busy_error_code: Optional[str] = None):
+        result = self.qmgr([command])[0]
+        if result.success:
+            return
+        self._logger.error(result)
+        if busy_error_code is not None and result.is_object_busy():
+            raise exceptions.SocaException(
+                error_code=busy_error_code, message=f'{result}'
+            )
+        raise exceptions.SocaException(
+            error_code=errorcodes.SCHEDULER_ERROR, message=f'{result}'
+        )
 
     def is_ready(self) -> bool:
         result = self._shell.invoke('systemctl status pbs', shell=True)
@@ -113,16 +159,7 @@ class OpenPBSScheduler(SocaSchedulerProtocol):
             raise e
 
     def create_node(self, node: SocaComputeNode) -> bool:
-        cmd = [
-            openpbs_constants.QMGR,
-            '-c',
-            f'create node {node.host} queue={node.queue}',
-        ]
-        result = self._shell.invoke(cmd)
-        if result.returncode != 0:
-            raise exceptions.SocaException(
-                error_code=errorcodes.SCHEDULER_ERROR, message=f'{result}'
-            )
+        self._qmgr_or_raise(f'create node {node.host} queue={node.queue}')
 
         launch_time = None
         if node.launch_time:
@@ -188,34 +225,41 @@ class OpenPBSScheduler(SocaSchedulerProtocol):
         return nodes[0]
 
     def delete_node(self, host: str) -> bool:
-        cmd = [openpbs_constants.QMGR, '-c', 'delete node ' + host]
-        result = self._shell.invoke(cmd=cmd)
-        if result.returncode != 0:
-            if result.returncode == openpbs_constants.QMGR_ERROR_CODE_OBJECT_BUSY:
-                raise exceptions.SocaException(
-                    error_code=errorcodes.SCHEDULER_NODE_BUSY, message=f'{result}'
-                )
-            else:
-                raise exceptions.SocaException(
-                    error_code=errorcodes.SCHEDULER_ERROR, message=f'{result}'
-                )
+        self._qmgr_or_raise(
+            f'delete node {host}', busy_error_code=errorcodes.SCHEDULER_NODE_BUSY
+        )
         return True
 
-    def set_node_state(self, host: str, state: SocaComputeNodeState) -> bool:
-        pbs_state = self._converter.from_soca_compute_node_state(state)
-        cmd = [openpbs_constants.QMGR, '-c', f'set node {host} state={pbs_state}']
-        result = self._shell.invoke(cmd)
+    def delete_nodes(self, hosts: List[str]) -> Dict[str, exceptions.SocaException]:
+        """
+        delete multiple nodes using pipelined qmgr directives.
+        qmgr continues to process remaining directives when a directive fails.
 
-        if result.returncode != 0:
-            raise exceptions.SocaException(
-                error_code=errorcodes.SCHEDULER_ERROR, message=f'{result}'
+        :return: errors for the hosts that could not be deleted. hosts not included in the result were deleted.
+        """
+        if Utils.is_empty(hosts):
+            return {}
+
+        results = self.qmgr([f'delete node {host}' for host in hosts])
+        errors: Dict[str, exceptions.SocaException] = {}
+        for host, result in zip(hosts, results):
+            if result.success:
+                continue
+            if result.is_object_busy():
+                error_code = errorcodes.SCHEDULER_NODE_BUSY
+            else:
+                error_code = errorcodes.SCHEDULER_ERROR
+            errors[host] = exceptions.SocaException(
+                error_code=error_code, message=f'{result}'
             )
+        return errors
 
+    def set_node_state(self, host: str, state: SocaComputeNodeState) -> bool:
+        pbs_state = self._converter.from_soca_compute_node_state(state)
+        self._qmgr_or_raise(f'set node {host} state={pbs_state}')
         return True
 
     def set_node_attributes(self, host: str, attributes: Dict[str, Any]) -> bool:
-        cmd = [openpbs_constants.QMGR, '-c']
-
         tokens = []
         for attr in attributes:
             value = attributes[attr]
@@ -224,14 +268,7 @@ class OpenPBSScheduler(SocaSchedulerProtocol):
             tokens.append(f'resources_available.{attr}={value}')
 
         args = ','.join(tokens)
-        cmd.append(f'set node {host} {args}')
-        result = self._shell.invoke(cmd)
-
-        if result.returncode != 0:
-            raise exceptions.SocaException(
-                error_code=errorcodes.SCHEDULER_ERROR, message=f'{result}'
-            )
-
+        self._qmgr_or_raise(f'set node {host} {args}')
         return True
 
     def create_queue(self, queue_name: str):
@@ -242,14 +279,7 @@ class OpenPBSScheduler(SocaSchedulerProtocol):
                 found = existing_queue
 
         if found is None:
-            result = self._shell.invoke(
-                [openpbs_constants.QMGR, '-c', f'create queue {queue_name}'],
-                skip_error_logging=True,
-            )
-            if result.returncode != 0:
-                raise exceptions.SocaException(
-                    error_code=errorcodes.SCHEDULER_ERROR, message=f'{result}'
-                )
+            self._qmgr_or_raise(f'create queue {queue_name}')
             is_enabled = False
         else:
             is_enabled = Utils.is_true(found.enabled, False) and Utils.is_false(
@@ -267,8 +297,6 @@ class OpenPBSScheduler(SocaSchedulerProtocol):
             )
 
     def set_queue_attributes(self, queue_name: str, attributes: Dict[str, Any]):
-        cmd = [openpbs_constants.QMGR, '-c']
-
         tokens = []
         for attr in attributes:
             value = attributes[attr]
@@ -277,13 +305,7 @@ class OpenPBSScheduler(SocaSchedulerProtocol):
             tokens.append(f'{attr}={value}')
 
         args = ','.join(tokens)
-        cmd.append(f'set queue {queue_name} {args}')
-        result = self._shell.invoke(cmd)
-
-        if result.returncode != 0:
-            raise exceptions.SocaException(
-                error_code=errorcodes.SCHEDULER_ERROR, message=f'{result}'
-            )
+        self._qmgr_or_raise(f'set queue {queue_name} {args}')
 
     def list_queues(self, queue: Optional[str] = None) -> List[SocaQueue]:
         json_data = None
@@ -345,17 +367,10 @@ class OpenPBSScheduler(SocaSchedulerProtocol):
                 queue_name, attributes={'enabled': False, 'started': False}
             )
 
-        cmd = [openpbs_constants.QMGR, '-c', f'delete queue {queue_name}']
-        result = self._shell.invoke(cmd=cmd)
-        if result.returncode != 0:
-            if result.returncode == openpbs_constants.QMGR_ERROR_CODE_OBJECT_BUSY:
-                raise exceptions.SocaException(
-                    error_code=errorcodes.SCHEDULER_QUEUE_BUSY, message=f'{result}'
-                )
-            else:
-                raise exceptions.SocaException(
-                    error_code=errorcodes.SCHEDULER_ERROR, message=f'{result}'
-                )
+        self._qmgr_or_raise(
+            f'delete queue {queue_name}',
+            busy_error_code=errorcodes.SCHEDULER_QUEUE_BUSY,
+        )
 
     def get_queue(self, queue: str) -> Optional[SocaQueue]:
         try:
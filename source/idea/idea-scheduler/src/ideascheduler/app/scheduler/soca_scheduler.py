@@ -10,6 +10,7 @@
 #  and limitations under the License.
 
 import ideascheduler
+from ideadatamodel import exceptions
 from ideadatamodel.scheduler import (
     SocaJob,
     SocaComputeNode,
@@ -61,6 +62,9 @@ class SocaScheduler(SocaSchedulerProtocol):
     def delete_node(self, host: str) -> bool:
         return self._scheduler.delete_node(host=host)
 
+    def delete_nodes(self, hosts: List[str]) -> Dict[str, exceptions.SocaException]:
+        return self._scheduler.delete_nodes(hosts=hosts)
+
     def set_node_state(self, host: str, state: SocaComputeNodeState):
         return self._scheduler.set_node_state(host=host, state=state)
 
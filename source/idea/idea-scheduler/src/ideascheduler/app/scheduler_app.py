@@ -20,6 +20,8 @@ from ideasdk.client import (
     SocaClientOptions,
 )
 from ideasdk.shell import ShellInvoker
+from ideasdk.bootstrap import BootstrapPackageCache
+from ideasdk.aws import AwsRateGovernor, TokenBucket
 from ideasdk.utils import GroupNameHelper
 
 import ideascheduler
@@ -33,6 +35,8 @@ from ideascheduler.app.provisioning import (
     JobSubmissionTracker,
     JobProvisioner,
     HpcQueueProfilesService,
+    CloudFormationTemplateCompiler,
+    LaunchPreflightCache,
 )
 from ideascheduler.app.scheduler import SocaScheduler
 from ideascheduler.app.documents import DocumentStore
@@ -147,6 +151,8 @@ class SchedulerApp(ideasdk.app.SocaApp):
             document_store.initialize()
         self.context.document_store = document_store
 
+        self.initialize_aws_rate_governor()
+
         self.context.instance_cache = InstanceCache(context=self.context)
         self.instance_monitor = InstanceMonitor(
             context=self.context, instance_cache=self.context.instance_cache
@@ -172,6 +178,40 @@ class SchedulerApp(ideasdk.app.SocaApp):
         self.context.queue_profiles = HpcQueueProfilesService(context=self.context)
         self.context.applications = HpcApplicationsService(context=self.context)
         self.context.shell = ShellInvoker()
+        self.context.bootstrap_package_cache = BootstrapPackageCache(
+            context=self.context,
+            logger=self.context.logger('bootstrap-package-cache'),
+            max_size=self.context.config().get_int(
+                'scheduler.job_provisioning.bootstrap_package_cache.max_size',
+                default=1000,
+            ),
+            ttl_seconds=self.context.config().get_int(
+                'scheduler.job_provisioning.bootstrap_package_cache.ttl_seconds',
+                default=86400,
+            ),
+        )
+        self.context.cloudformation_template_compiler = CloudFormationTemplateCompiler(
+            logger=self.context.logger('cloudformation-template-compiler'),
+            max_size=self.context.config().get_int(
+                'scheduler.job_provisioning.template_cache.max_size',
+                default=1000,
+            ),
+            ttl_seconds=self.context.config().get_int(
+                'scheduler.job_provisioning.template_cache.ttl_seconds',
+                default=86400,
+            ),
+        )
+        self.context.launch_preflight_cache = LaunchPreflightCache(
+            logger=self.context.logger('launch-preflight-cache'),
+            max_size=self.context.config().get_int(
+                'scheduler.job_provisioning.preflight_cache.max_size',
+                default=1000,
+            ),
+            ttl_seconds=self.context.config().get_int(
+                'scheduler.job_provisioning.preflight_cache.ttl_seconds',
+                default=120,
+            ),
+        )
         self.context.license_service = LicenseService(context=self.context)
         self.context.notifications_client = NotificationsAsyncClient(
             context=self.context
@@ -180,6 +220,34 @@ class SchedulerApp(ideasdk.app.SocaApp):
             context=self.context, notifications_client=self.context.notifications_client
         )
 
+    def initialize_aws_rate_governor(self):
+        """
+        pace CloudFormation, EC2 and S3 API calls across all job provisioning workers and background services
+        """
+        if not self.context.config().get_bool(
+            'scheduler.job_provisioning.aws_rate_governor.enabled', default=True
+        ):
+            return
+
+        governor = AwsRateGovernor(logger=self.context.logger('aws-rate-governor'))
+        clients = {
+            'cloudformation': (self.context.aws().cloudformation(), 2, 5),
+            'ec2': (self.context.aws().ec2(), 20, 50),
+            's3': (self.context.aws().s3(), 50, 100),
+        }
+        for service_name, (client, default_rate, default_burst) in clients.items():
+            rate = self.context.config().get_float(
+                f'scheduler.job_provisioning.aws_rate_governor.{service_name}.rate',
+                default=default_rate,
+            )
+            burst = self.context.config().get_int(
+                f'scheduler.job_provisioning.aws_rate_governor.{service_name}.burst',
+                default=default_burst,
+            )
+            governor.add_bucket(service_name, TokenBucket(rate=rate, burst=burst))
+            governor.attach(client, service_name)
+        self.context.aws_rate_governor = governor
+
     def app_start(self):
         self.instance_monitor.start()
         self.context.queue_profiles.start()
@@ -70,6 +70,16 @@ class JobQuery:
     def is_history(self) -> bool:
         return Utils.get_value_as_bool('history', self.kwargs, False)
 
+    @property
+    def is_archive(self) -> bool:
+        if not self.is_history:
+            return False
+        return Utils.get_value_as_bool('archive', self.kwargs, False)
+
+    @property
+    def cursor(self) -> Optional[str]:
+        return Utils.get_value_as_string('cursor', self.kwargs)
+
     @property
     def page_size(self) -> int:
         return Utils.get_value_as_int('page_size', self.kwargs, DEFAULT_PAGE_SIZE)
@@ -206,7 +216,9 @@ class JobQuery:
         period_key, period_start, period_end = self.period
         return ListJobsRequest(
             queue_type=self.queue_type,
-            paginator=SocaPaginator(page_size=self.page_size, start=self.start),
+            paginator=SocaPaginator(
+                page_size=self.page_size, start=self.start, cursor=self.cursor
+            ),
             sort_by=SocaSortBy(key=sort_by_key, order=sort_by_order),
             date_range=SocaDateRange(
                 key=period_key, start=period_start.datetime, end=period_end.datetime
@@ -539,7 +551,9 @@ class JobListing:
         self.query = query
 
     def invoke(self) -> ListJobsResult:
-        if self.query.is_history:
+        if self.query.is_archive:
+            namespace = 'SchedulerAdmin.ListArchivedJobs'
+        elif self.query.is_history:
             namespace = 'SchedulerAdmin.ListCompletedJobs'
         else:
             namespace = 'SchedulerAdmin.ListActiveJobs'
@@ -594,6 +608,12 @@ def jobs():
 @click.option(
     '--history', '-H', is_flag=True, help='List finished jobs from OpenSearch.'
 )
+@click.option(
+    '--archive',
+    '-a',
+    is_flag=True,
+    help='(History Only) List finished jobs from the local finished jobs archive.',
+)
 @click.option(
     '--bom',
     '-b',
@@ -618,6 +638,11 @@ def jobs():
 @click.option(
     '--start', '-ps', help='Used for paging next batch of results. Default: 0'
 )
+@click.option(
+    '--cursor',
+    '-C',
+    help='Used for paging next batch of results, using the cursor returned by the previous listing.',
+)
 @click.option(
     '--file-export',
     '-x',
@@ -660,6 +685,10 @@ def list_jobs(**kwargs):
         - for a date range:
           $ ideactl jobs list -H --period start=2021-06-05,end=2021-11-10
 
+    \b
+    * list archived finished jobs for last month
+    $ ideactl jobs list -H --archive --period last-month
+
     \b
     * list finished jobs for last month, sorted by end time in ascending order
     $ ideactl jobs list -H --sort-by q:asc --sort-order asc --period last-month
@@ -673,19 +702,22 @@ def list_jobs(**kwargs):
         context.print('No Jobs found.')
         return
 
-    if query.is_history:
+    if query.is_archive:
+        title = 'Archived Jobs'
+    elif query.is_history:
         title = 'Finished Jobs'
     else:
         title = 'Active Jobs'
 
     title += ' ('
-    title += f'Total: {result.paginator.total}'
+    if result.paginator.total is not None:
+        title += f'Total: {result.paginator.total}, '
     query_string = str(query)
     if not Utils.is_empty(query_string):
-        title += f', {query_string}'
-    title += (
-        f', PageSize: {result.paginator.page_size}, Start: {result.paginator.start}'
-    )
+        title += f'{query_string}, '
+    title += f'PageSize: {result.paginator.page_size}'
+    if result.paginator.start is not None:
+        title += f', Start: {result.paginator.start}'
     title += ')'
 
     table = Table(title=title, box=box.HEAVY_HEAD, show_lines=True)
@@ -700,3 +732,6 @@ def list_jobs(**kwargs):
         row = JobRow(context=context, query=query, job=job).build()
         table.add_row(*row)
     context.print(table)
+
+    if Utils.is_not_empty(result.paginator.cursor):
+        context.print(f'Next Page: --cursor {result.paginator.cursor}')
@@ -20,9 +20,36 @@ from ideasdk.utils import Utils
 from ideasdk.aws import AWSUtil, EC2InstanceTypesDB, AwsClientProvider
 from ideasdk.client import ProjectsClient, SocaClientOptions
 from ideasdk.auth import TokenService, TokenServiceOptions
+from ideasdk.bootstrap import BootstrapPackageCache
+from ideascheduler.app.provisioning import (
+    CloudFormationTemplateCompiler,
+    LaunchPreflightCache,
+)
 
 from ideatestutils import MockInstanceTypes, MockConfig, MockProjects
 from ideatestutils import IdeaTestProps
+from ideatestutils.dynamodb.dynamodb_local import DynamoDBLocal
+
+
+@pytest.fixture(scope='session')
+def ddb_local():
+    ddb_local = DynamoDBLocal(db_name='scheduler', reset=True)
+
+    # Check and install DynamoDB Local if not already installed
+    install_success = ddb_local.check_and_install()
+    if not install_success:
+        pytest.skip('DynamoDB Local installation failed')
+
+    ddb_local.start()
+
+    # Wait for DynamoDB Local to actually be ready
+    if not ddb_local.wait_until_ready(timeout=30):
+        ddb_local.stop()
+        pytest.skip('DynamoDB Local failed to start')
+
+    yield ddb_local
+
+    ddb_local.stop()
 
 
 @pytest.fixture()
@@ -46,6 +73,7 @@ def context(monkeypatch):
 
     mock_s3_client = SocaAnyPayload()
     mock_s3_client.upload_file = lambda **_: {}
+    mock_s3_client.put_object = lambda **_: {}
     mock_s3_client.get_bucket_acl = lambda **_: {}
 
     # Mock the EC2InstanceTypesDB initialization to prevent AWS calls
@@ -54,22 +82,21 @@ def context(monkeypatch):
         self._logger = context.logger()
         self._cache_refresh_interval = 43200  # 12 hours
         self._cache_last_refresh = Utils.current_time()
-        # Create a simple cache-like object that returns the mock instance types
-        from cacheout import Cache
-
-        self._cache = Cache(maxsize=512, ttl=1296000)  # 15 days TTL
         from threading import RLock
 
         self._instance_types_lock = RLock()
+        self._refresh_thread = None
+        self._snapshot_file = None
 
-        # Pre-populate cache with mock instance types
+        # Pre-populate catalog with mock instance types
         from ideatestutils.aws.mock_instance_types import MOCK_INSTANCE_TYPES
 
-        for instance_type_name in MOCK_INSTANCE_TYPES:
-            ec2_instance_type = MockInstanceTypes().get_instance_type(
+        self._catalog = {
+            instance_type_name: MockInstanceTypes().get_instance_type(
                 instance_type_name
             )
-            self._cache.set(key=instance_type_name, value=ec2_instance_type)
+            for instance_type_name in MOCK_INSTANCE_TYPES
+        }
 
     monkeypatch.setattr(EC2InstanceTypesDB, '__init__', mock_ec2_instance_types_db_init)
     monkeypatch.setattr(
@@ -130,4 +157,8 @@ def context(monkeypatch):
         token_service=context.token_service,
     )
 
+    context.bootstrap_package_cache = BootstrapPackageCache(context=context)
+    context.cloudformation_template_compiler = CloudFormationTemplateCompiler()
+    context.launch_preflight_cache = LaunchPreflightCache()
+
     return context
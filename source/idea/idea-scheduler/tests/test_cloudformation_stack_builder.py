@@ -37,14 +37,14 @@ class BuildTemplateResult(SocaBaseModel):
     template_yml: str
 
 
-def build_template(
+def build_mock_job(
     context: AppContext,
     params: Dict,
     queue_profile: HpcQueueProfile,
     job_name: str = 'mock-job',
     job_id: str = '1',
     stack_uuid: str = None,
-) -> BuildTemplateResult:
+) -> SocaJob:
     builder = SocaJobBuilder(
         context=context,
         params=params,
@@ -73,6 +73,25 @@ def build_template(
         provisioning_options=provisioning_options,
     )
     mock_job.job_group = mock_job.get_job_group()
+    return mock_job
+
+
+def build_template(
+    context: AppContext,
+    params: Dict,
+    queue_profile: HpcQueueProfile,
+    job_name: str = 'mock-job',
+    job_id: str = '1',
+    stack_uuid: str = None,
+) -> BuildTemplateResult:
+    mock_job = build_mock_job(
+        context=context,
+        params=params,
+        queue_profile=queue_profile,
+        job_name=job_name,
+        job_id=job_id,
+        stack_uuid=stack_uuid,
+    )
 
     try:
         builder = CloudFormationStackBuilder(
@@ -82,15 +101,23 @@ def build_template(
 
         template_yml = builder.build_template()
         print(template_yml)
+        parameters = builder.build_parameters()
 
         class CfnAny:
             def __init__(self, *args, **kwargs):
                 self.args = args
                 self.kwargs = kwargs
 
+        def resolve_ref(loader_, node):
+            # per-job values are resolved using the stack parameters
+            name = loader_.construct_scalar(node)
+            if name in parameters:
+                return parameters[name]
+            return CfnAny(loader_, node)
+
         loader = yaml.SafeLoader
         loader.add_constructor('!Base64', CfnAny)
-        loader.add_constructor('!Ref', CfnAny)
+        loader.add_constructor('!Ref', resolve_ref)
         loader.add_constructor('!GetAtt', CfnAny)
 
         template = ConfigFactory.from_dict(Utils.from_yaml(template_yml))
@@ -465,3 +492,141 @@ def test_cfn_stack_builder_no_placement_group_no_dependency(context):
     except Exception:
         # This is expected - no placement group reference should exist
         pass
+
+
+def build_ondemand_queue_profile() -> HpcQueueProfile:
+    return HpcQueueProfile(
+        name='compute',
+        queues=['normal'],
+        scaling_mode=SocaScalingMode.SINGLE_JOB,
+        default_job_params=SocaJobParams(instance_types=['c5.large']),
+    )
+
+
+def test_cfn_stack_builder_bootstrap_package_is_shared_across_jobs(
+    context, monkeypatch
+):
+    """
+    jobs with the same shape share a single bootstrap package. per job values are applied via the overlay in user data.
+    """
+    uploaded_keys = []
+    s3 = context.aws().s3()
+    monkeypatch.setattr(
+        s3, 'put_object', lambda **kwargs: uploaded_keys.append(kwargs['Key'])
+    )
+
+    bootstrap_packages = []
+    for job_id in ('101', '102'):
+        job = build_mock_job(
+            context=context,
+            job_name=f'job-{job_id}',
+            job_id=job_id,
+            params={'nodes': 1, 'cpus': 1},
+            queue_profile=build_ondemand_queue_profile(),
+        )
+        bootstrap_packages.append(
+            CloudFormationStackBuilder(
+                context=context, job=job
+            ).build_bootstrap_package()
+        )
+
+    assert len(uploaded_keys) == 1
+    assert uploaded_keys[0].startswith('idea/scheduler/bootstrap/cache/compute-node-')
+    for job_id, (package_uri, overlay_command) in zip(
+        ('101', '102'), bootstrap_packages
+    ):
+        assert package_uri.endswith(uploaded_keys[0])
+        assert f"'s|@@IDEA_OVERLAY_JOB_ID@@|{job_id}|g'" in overlay_command
+        assert f'idea-mock-compute-ondemand-{job_id}' in overlay_command
+
+
+def test_cfn_stack_builder_template_is_shared_across_jobs(context, monkeypatch):
+    """
+    jobs with the same shape share a compiled template. per job values are provided as stack parameters.
+    """
+    compiled = []
+    compile_template = CloudFormationStackBuilder.compile_template
+
+    def compile_template_spy(self):
+        compiled.append(self.job.job_id)
+        return compile_template(self)
+
+    monkeypatch.setattr(
+        CloudFormationStackBuilder, 'compile_template', compile_template_spy
+    )
+    context.cloudformation_template_compiler.clear()
+
+    results = []
+    for job_id in ('201', '202'):
+        job = build_mock_job(
+            context=context,
+            job_name=f'job-{job_id}',
+            job_id=job_id,
+            params={'nodes': 1, 'cpus': 1},
+            queue_profile=build_ondemand_queue_profile(),
+        )
+        builder = CloudFormationStackBuilder(context=context, job=job)
+        template, parameters = builder.get_template()
+        results.append(
+            (
+                builder,
+                template,
+                {p['ParameterKey']: p['ParameterValue'] for p in parameters},
+            )
+        )
+
+    assert compiled == ['201']
+
+    template_bodies = [template.split('# ---')[0] for _, template, _ in results]
+    assert template_bodies[0] == template_bodies[1]
+    assert 'job-201' not in template_bodies[0]
+
+    for job_id, (builder, template, parameters) in zip(('201', '202'), results):
+        assert parameters['JobId'] == job_id
+        assert parameters['JobName'] == f'job-{job_id}'
+        assert parameters['ComputeStack'] == f'idea-mock-compute-ondemand-{job_id}'
+        assert (
+            f"'s|@@IDEA_OVERLAY_JOB_ID@@|{job_id}|g'"
+            in parameters['BootstrapOverlayCommand']
+        )
+
+        # compact job payload can be retrieved from the stack template
+        monkeypatch.setattr(
+            context.aws_util(),
+            'cloudformation_get_template',
+            lambda stack_name, template_=template: template_,
+        )
+        job = context.aws_util().get_soca_job_from_stack(stack_name='mock')
+        assert job.job_id == job_id
+        assert job.params.instance_types == ['c5.large']
+
+    # different shape compiles a different template
+    spot_job = build_mock_job(
+        context=context,
+        job_id='203',
+        params={'nodes': 1, 'cpus': 1, 'spot_price': 'auto'},
+        queue_profile=build_ondemand_queue_profile(),
+    )
+    CloudFormationStackBuilder(context=context, job=spot_job).get_template()
+    assert compiled == ['201', '203']
+
+
+def test_cfn_stack_builder_compact_job_payload(context):
+    """
+    the job payload in the template is serialized as compact json
+    """
+    job = build_mock_job(
+        context=context,
+        job_name='job-301',
+        job_id='301',
+        params={'nodes': 1, 'cpus': 1},
+        queue_profile=build_ondemand_queue_profile(),
+    )
+    builder = CloudFormationStackBuilder(context=context, job=job)
+    template, _ = builder.get_template()
+
+    compact_job_comment = builder.get_job_as_yaml_comment()
+    assert template.endswith(compact_job_comment)
+    lines = Utils.to_json(job, indent=True).splitlines(keepends=True)
+    indented_job_comment = ''.join([f'# {line}' for line in lines])
+    assert len(compact_job_comment) < len(indented_job_comment)
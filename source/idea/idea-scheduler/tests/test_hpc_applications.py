@@ -0,0 +1,310 @@
+#  Copyright Amazon.com, Inc. or its affiliates. All Rights Reserved.
+#
+#  Licensed under the Apache License, Version 2.0 (the "License"). You may not use this file except in compliance
+#  with the License. A copy of the License is located at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+#  or in the 'license' file accompanying this file. This file is distributed on an 'AS IS' BASIS, WITHOUT WARRANTIES
+#  OR CONDITIONS OF ANY KIND, express or implied. See the License for the specific language governing permissions
+#  and limitations under the License.
+
+"""
+Test Cases for HpcApplicationsService
+"""
+
+from ideadatamodel import (
+    SocaAnyPayload,
+    GetUserApplicationsRequest,
+    ListHpcApplicationsRequest,
+    SocaPaginator,
+    Project,
+)
+from ideasdk.aws import AwsClientProvider
+from ideasdk.utils import Utils
+
+from ideatestutils.dynamodb.dynamodb_requests import DynamoDBRequests
+
+from ideascheduler.app.applications.hpc_applications_dao import (
+    APPLICATION_PROJECTS_INDEX_BACKFILL,
+)
+from ideascheduler.app.applications.hpc_applications_service import (
+    HpcApplicationsService,
+)
+
+from typing import Dict, List, Set, Tuple
+import pytest
+
+CLUSTER_NAME = 'idea-mock'
+APPLICATIONS_TABLE = f'{CLUSTER_NAME}.scheduler.applications'
+APPLICATION_PROJECTS_TABLE = f'{CLUSTER_NAME}.scheduler.application-projects'
+
+# items returned in a single scan or query page (Limit)
+PAGE_SIZE = 100
+
+
+def scan_all(db, table_name: str) -> List[Dict]:
+    table = db.resource.Table(table_name)
+    scan_request = {}
+    items = []
+    while True:
+        scan_result = table.scan(**scan_request)
+        items += scan_result['Items']
+        if 'LastEvaluatedKey' not in scan_result:
+            return items
+        scan_request['ExclusiveStartKey'] = scan_result['LastEvaluatedKey']
+
+
+def get_index(db) -> Set[Tuple[str, str]]:
+    return {
+        (entry['project_id'], entry['application_id'])
+        for entry in scan_all(db, APPLICATION_PROJECTS_TABLE)
+    }
+
+
+@pytest.fixture()
+def db(ddb_local, monkeypatch):
+    """
+    applications and application-projects tables in dynamodb local. the tables are deleted after each test.
+    """
+    client = ddb_local.client()
+    resource = ddb_local.resource()
+    monkeypatch.setattr(AwsClientProvider, 'dynamodb', lambda *_: client)
+    monkeypatch.setattr(AwsClientProvider, 'dynamodb_table', lambda *_: resource)
+
+    yield SocaAnyPayload(
+        resource=resource,
+        requests=DynamoDBRequests(resource.meta.client, page_size=PAGE_SIZE),
+    )
+
+    for table_name in (APPLICATIONS_TABLE, APPLICATION_PROJECTS_TABLE):
+        try:
+            client.delete_table(TableName=table_name)
+        except client.exceptions.ResourceNotFoundException:
+            pass
+
+
+class FakeProjectsClient:
+    """
+    counts the requests to cluster-manager. each project is requested over HTTP (no client cache).
+    """
+
+    def __init__(self, project_count: int, user_project_ids: List[str]):
+        self.requests = 0
+        self.projects = {
+            f'project-{index}': Project(
+                project_id=f'project-{index}',
+                name=f'project{index}',
+                title=f'Project {index}',
+                enabled=True,
+            )
+            for index in range(project_count)
+        }
+        self.user_project_ids = user_project_ids
+
+    def get_project_by_id(self, project_id: str) -> Project:
+        self.requests += 1
+        return self.projects[project_id]
+
+    def get_user_projects(self, username: str) -> List[Project]:
+        self.requests += 1
+        return [self.projects[project_id] for project_id in self.user_project_ids]
+
+
+def build_db_application(index: int, project_count: int) -> Dict:
+    return {
+        'application_id': f'application-{index:05d}',
+        'title': f'Application {index}',
+        'thumbnail_data': 'data:image/png;base64,' + 'A' * 64,
+        'form_template': Utils.to_json({'sections': [{'name': 'main', 'params': []}]}),
+        'job_script_interpreter': 'pbs',
+        'job_script_template': '#!/bin/bash\n' + 'echo hello\n' * 100,
+        'job_script_type': 'jinja2',
+        'project_ids': [f'project-{index % project_count}'],
+        'created_on': 1700000000000,
+        'updated_on': 1700000000000,
+    }
+
+
+def build_service(
+    context, projects_client: FakeProjectsClient
+) -> HpcApplicationsService:
+    context.projects_client = projects_client
+    return HpcApplicationsService(context)
+
+
+def populate(context, db, application_count: int, project_count: int):
+    """
+    applications created before the application-projects table was added
+    """
+    context.aws_util().dynamodb_create_table(
+        create_table_request={
+            'TableName': APPLICATIONS_TABLE,
+            'AttributeDefinitions': [
+                {'AttributeName': 'application_id', 'AttributeType': 'S'}
+            ],
+            'KeySchema': [{'AttributeName': 'application_id', 'KeyType': 'HASH'}],
+            'BillingMode': 'PAY_PER_REQUEST',
+        },
+        wait=True,
+    )
+    with db.resource.Table(APPLICATIONS_TABLE).batch_writer() as batch:
+        for index in range(application_count):
+            batch.put_item(Item=build_db_application(index, project_count))
+
+
+def is_index_built(context) -> bool:
+    return context.aws_util().dynamodb_is_backfill_complete(
+        APPLICATION_PROJECTS_TABLE, APPLICATION_PROJECTS_INDEX_BACKFILL
+    )
+
+
+def test_hpc_applications_index_built_for_existing_applications(context, db):
+    populate(context, db, application_count=250, project_count=10)
+    projects_client = FakeProjectsClient(project_count=10, user_project_ids=[])
+
+    build_service(context, projects_client)
+
+    # all scan pages are indexed (ExclusiveStartKey)
+    assert db.requests.counts['Scan'] == 3
+    index = get_index(db)
+    assert len(index) == 250
+    assert ('project-3', 'application-00013') in index
+    assert is_index_built(context)
+
+
+def test_hpc_applications_index_build_resumes(context, db):
+    """
+    an interrupted index build is re-run on the next initialize, until the build completes
+    """
+    populate(context, db, application_count=250, project_count=10)
+    projects_client = FakeProjectsClient(project_count=10, user_project_ids=[])
+
+    db.requests.errors['Scan'].append(ConnectionError('connection reset'))
+    with pytest.raises(ConnectionError):
+        build_service(context, projects_client)
+    assert not is_index_built(context)
+
+    # the application-projects table exists. the index is built again.
+    service = build_service(context, projects_client)
+    assert len(get_index(db)) == 250
+    assert is_index_built(context)
+
+    scans = db.requests.counts['Scan']
+    service.applications_dao.initialize()
+    assert db.requests.counts['Scan'] == scans
+
+
+def test_hpc_applications_get_user_applications_stale_index(context, db):
+    """
+    index entries of projects no longer assigned to the application are ignored
+    """
+    populate(context, db, application_count=10, project_count=2)
+    projects_client = FakeProjectsClient(
+        project_count=2, user_project_ids=['project-0', 'project-1']
+    )
+    service = build_service(context, projects_client)
+    db.resource.Table(APPLICATION_PROJECTS_TABLE).put_item(
+        Item={'project_id': 'project-1', 'application_id': 'application-00000'}
+    )
+
+    result = service.get_user_applications(
+        GetUserApplicationsRequest(username='user1', lite=True)
+    )
+    applications = {
+        application.application_id: application for application in result.applications
+    }
+    assert len(applications) == 10
+    assert [p.project_id for p in applications['application-00000'].projects] == [
+        'project-0'
+    ]
+
+
+def test_hpc_applications_list_applications_cursor(context, db):
+    populate(context, db, application_count=250, project_count=10)
+    projects_client = FakeProjectsClient(project_count=10, user_project_ids=[])
+    service = build_service(context, projects_client)
+
+    projects_client.requests = 0
+    result = service.list_applications(ListHpcApplicationsRequest(lite=True))
+    assert len(result.listing) == PAGE_SIZE
+    assert result.listing[0].form_template is None
+    assert result.listing[0].thumbnail_data is not None
+    # projects are resolved once per page
+    assert projects_client.requests == len(
+        {application.projects[0].project_id for application in result.listing}
+    )
+
+    application_ids = [application.application_id for application in result.listing]
+    pages = 1
+    while result.paginator.cursor is not None:
+        result = service.list_applications(
+            ListHpcApplicationsRequest(
+                lite=True, paginator=SocaPaginator(cursor=result.paginator.cursor)
+            )
+        )
+        application_ids += [
+            application.application_id for application in result.listing
+        ]
+        pages += 1
+    assert pages == 3
+    assert len(application_ids) == 250
+    assert len(set(application_ids)) == 250
+
+
+def test_hpc_applications_get_user_applications(context, db):
+    populate(context, db, application_count=1000, project_count=50)
+    projects_client = FakeProjectsClient(
+        project_count=50, user_project_ids=['project-1', 'project-2']
+    )
+    service = build_service(context, projects_client)
+
+    db.requests.counts.clear()
+    projects_client.requests = 0
+    result = service.get_user_applications(
+        GetUserApplicationsRequest(username='user1', lite=True)
+    )
+    assert len(result.applications) == 40
+    # applications are read using the project index, without a table scan
+    assert db.requests.counts['Scan'] == 0
+    assert db.requests.counts['BatchGetItem'] == 1
+    for application in result.applications:
+        assert application.projects[0].project_id in ('project-1', 'project-2')
+        assert application.form_template is None
+        assert application.job_script_template is None
+    # project metadata is resolved from the user projects
+    assert projects_client.requests == 1
+
+    # open an application
+    result = service.get_user_applications(
+        GetUserApplicationsRequest(
+            username='user1', application_ids=['application-00001', 'application-00003']
+        )
+    )
+    assert [application.application_id for application in result.applications] == [
+        'application-00001'
+    ]
+    assert result.applications[0].form_template is not None
+    assert result.applications[0].job_script_template is not None
+
+
+def test_hpc_applications_index_updated_on_write(context, db):
+    projects_client = FakeProjectsClient(project_count=5, user_project_ids=[])
+    service = build_service(context, projects_client)
+    dao = service.applications_dao
+
+    created = dao.create_application({'title': 'app', 'project_ids': ['project-1']})
+    application_id = created['application_id']
+    assert dao.get_application_ids_by_project('project-1') == [application_id]
+
+    dao.update_application(
+        {'application_id': application_id, 'project_ids': ['project-2', 'project-3']}
+    )
+    assert dao.get_application_ids_by_project('project-1') == []
+    assert get_index(db) == {
+        ('project-2', application_id),
+        ('project-3', application_id),
+    }
+
+    dao.delete_application(application_id)
+    assert len(get_index(db)) == 0
@@ -0,0 +1,189 @@
+#  Copyright Amazon.com, Inc. or its affiliates. All Rights Reserved.
+#
+#  Licensed under the Apache License, Version 2.0 (the "License"). You may not use this file except in compliance
+#  with the License. A copy of the License is located at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+#  or in the 'license' file accompanying this file. This file is distributed on an 'AS IS' BASIS, WITHOUT WARRANTIES
+#  OR CONDITIONS OF ANY KIND, express or implied. See the License for the specific language governing permissions
+#  and limitations under the License.
+
+"""
+Test Cases for JobCache finished jobs pagination and archival, and expected batch sizes
+"""
+
+from ideascheduler import AppContext
+from ideascheduler.app.provisioning import JobCache
+from ideascheduler.app.provisioning.job_monitor import job_cache as job_cache_module
+from ideadatamodel import SocaJob, SocaJobState, SocaJobParams
+
+from typing import List
+import arrow
+import pytest
+
+
+@pytest.fixture()
+def job_cache(context: AppContext, monkeypatch, tmp_path) -> JobCache:
+    monkeypatch.setattr(context, 'get_scheduler_app_deploy_dir', lambda: str(tmp_path))
+    return JobCache(context=context)
+
+
+def build_finished_job(job_id: str, owner: str, days_ago: int) -> SocaJob:
+    return SocaJob(
+        job_id=job_id,
+        job_uid=f'uid-{job_id}',
+        job_group=f'group-{job_id}',
+        name=f'job-{job_id}',
+        owner=owner,
+        queue='normal',
+        queue_type='compute',
+        project='default',
+        state=SocaJobState.FINISHED,
+        params=SocaJobParams(nodes=1, cpus=1),
+        end_time=arrow.utcnow().shift(days=-days_ago).floor('day').datetime,
+    )
+
+
+def build_queued_job(job_id: str, job_group: str, provisioned: bool = False) -> SocaJob:
+    return SocaJob(
+        job_id=job_id,
+        job_uid=f'uid-{job_id}',
+        job_group=job_group,
+        name=f'job-{job_id}',
+        owner='user1',
+        queue='normal',
+        queue_type='compute',
+        project='default',
+        state=SocaJobState.QUEUED,
+        provisioned=provisioned,
+        params=SocaJobParams(nodes=1, cpus=1),
+    )
+
+
+def list_all_pages(job_cache: JobCache, page_size: int, **kwargs) -> List[str]:
+    job_ids = []
+    cursor = None
+    while True:
+        jobs, cursor = job_cache.list_completed_jobs_page(
+            page_size=page_size, cursor=cursor, **kwargs
+        )
+        job_ids += [job.job_id for job in jobs]
+        if cursor is None:
+            return job_ids
+
+
+def test_job_cache_completed_jobs_keyset_pagination(job_cache: JobCache):
+    """
+    pages are ordered by (end_time, job_id) desc and do not skip or repeat entries with the same end_time
+    """
+    for i in range(10):
+        job_cache.add_finished_job(
+            build_finished_job(job_id=f'{i:02d}', owner='user1', days_ago=i % 3)
+        )
+
+    job_ids = list_all_pages(job_cache, page_size=3)
+    assert job_ids == ['09', '06', '03', '00', '07', '04', '01', '08', '05', '02']
+
+
+def test_job_cache_completed_jobs_count_is_cached_and_adjusted(job_cache: JobCache):
+    job_cache.add_finished_job(build_finished_job('1', owner='user1', days_ago=0))
+    assert job_cache.get_completed_jobs_count() == 1
+    assert job_cache.get_completed_jobs_count(owner='user1') == 1
+    assert job_cache.get_completed_jobs_count(owner='user2') == 0
+
+    job_cache.add_finished_job(build_finished_job('2', owner='user2', days_ago=0))
+    # updates to an existing finished job must not change the count
+    job_cache.add_finished_job(build_finished_job('1', owner='user1', days_ago=0))
+
+    assert job_cache.get_completed_jobs_count() == 2
+    assert job_cache.get_completed_jobs_count(owner='user1') == 1
+    assert job_cache.get_completed_jobs_count(owner='user2') == 1
+
+
+def test_job_cache_archive_completed_jobs(job_cache: JobCache):
+    for i in range(6):
+        job_cache.add_finished_job(
+            build_finished_job(job_id=f'{i}', owner='user1', days_ago=i * 10)
+        )
+    assert job_cache.get_completed_jobs_count() == 6
+
+    archived = job_cache.archive_completed_jobs(retention_days=25)
+    assert archived == 3
+
+    assert job_cache.get_completed_jobs_count() == 3
+    assert list_all_pages(job_cache, page_size=10) == ['0', '1', '2']
+
+    jobs, cursor = job_cache.list_archived_jobs(page_size=2)
+    assert [job.job_id for job in jobs] == ['3', '4']
+    assert cursor is not None
+    jobs, cursor = job_cache.list_archived_jobs(page_size=2, cursor=cursor)
+    assert [job.job_id for job in jobs] == ['5']
+    assert cursor is None
+
+    jobs, _ = job_cache.list_archived_jobs(
+        page_size=10,
+        start=arrow.utcnow().shift(days=-45).floor('day').datetime,
+        end=arrow.utcnow().shift(days=-35).datetime,
+    )
+    assert [job.job_id for job in jobs] == ['4']
+
+
+def test_job_cache_expected_batch_size(job_cache: JobCache):
+    """
+    queued jobs of the job group that are not provisioned, including submitted jobs that are not yet synced
+    """
+    job_cache.sync(
+        [
+            build_queued_job('1', 'group-a'),
+            build_queued_job('2', 'group-a'),
+            build_queued_job('3', 'group-a', provisioned=True),
+            build_queued_job('4', 'group-b'),
+        ]
+    )
+    running_job = build_queued_job('5', 'group-a')
+    running_job.state = SocaJobState.RUNNING
+    job_cache.sync([running_job])
+    assert job_cache.get_expected_batch_size('group-a') == 2
+    assert job_cache.get_expected_batch_size('group-b') == 1
+    assert job_cache.get_expected_batch_size('group-c') == 0
+
+    # accepted by the job submission hook. job id is not available yet.
+    submitted_job = build_queued_job('6', 'group-a')
+    submitted_job.job_id = None
+    job_cache.job_submitted(submitted_job)
+    assert job_cache.get_expected_batch_size('group-a') == 3
+    assert job_cache.get_expected_batch_size('group-b') == 1
+
+    # the submitted job is counted once after it is synced
+    job_cache.sync([build_queued_job('6', 'group-a')])
+    assert job_cache.get_expected_batch_size('group-a') == 3
+
+    # provisioned jobs are no longer part of the batch
+    job_cache.sync(
+        [
+            build_queued_job('1', 'group-a', provisioned=True),
+            build_queued_job('6', 'group-a', provisioned=True),
+        ]
+    )
+    assert job_cache.get_expected_batch_size('group-a') == 1
+
+
+def test_job_cache_expected_batch_size_pending_submission_expiry(
+    job_cache: JobCache, monkeypatch
+):
+    """
+    submitted jobs that are never synced (eg. rejected by the scheduler) are no longer counted after the ttl
+    """
+    job_cache.job_submitted(build_queued_job('1', 'group-a'))
+    # jobs without a job_uid are not tracked
+    job_without_uid = build_queued_job('2', 'group-a')
+    job_without_uid.job_uid = None
+    job_cache.job_submitted(job_without_uid)
+    assert job_cache.get_expected_batch_size('group-a') == 1
+
+    monkeypatch.setattr(job_cache_module, 'PENDING_SUBMISSION_TTL_SECONDS', -1)
+    assert job_cache.get_expected_batch_size('group-a') == 0
+
+    monkeypatch.setattr(job_cache_module, 'PENDING_SUBMISSION_TTL_SECONDS', 60)
+    assert job_cache.get_expected_batch_size('group-a') == 0
@@ -0,0 +1,225 @@
+#  Copyright Amazon.com, Inc. or its affiliates. All Rights Reserved.
+#
+#  Licensed under the Apache License, Version 2.0 (the "License"). You may not use this file except in compliance
+#  with the License. A copy of the License is located at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+#  or in the 'license' file accompanying this file. This file is distributed on an 'AS IS' BASIS, WITHOUT WARRANTIES
+#  OR CONDITIONS OF ANY KIND, express or implied. See the License for the specific language governing permissions
+#  and limitations under the License.
+
+"""
+Test Cases for JobProvisioner
+"""
+
+from ideascheduler import AppContext
+from ideascheduler.app.provisioning import JobProvisioningQueueEmpty
+from ideascheduler.app.provisioning.job_provisioner import job_provisioner
+from ideascheduler.app.provisioning.job_provisioner.job_provisioner import (
+    JobProvisioner,
+    ProvisionJobsResult,
+)
+from ideadatamodel import (
+    SocaAnyPayload,
+    SocaJob,
+    SocaScalingMode,
+    SocaQueueMode,
+    SocaQueueManagementParams,
+    HpcQueueProfile,
+)
+
+from queue import Queue, Empty
+from threading import Barrier, Condition, Event, RLock, Thread
+from typing import Dict
+import time
+
+# simulated duration to provision a job: build template, create stack and update the job in scheduler
+PROVISIONING_LATENCY_SECONDS = 0.001
+
+
+class FakeJobProvisioningQueue:
+    def __init__(self, queue_profile: HpcQueueProfile):
+        self.queue_profile = queue_profile
+        self.queue_type = queue_profile.name
+        self.queue_mode = queue_profile.queue_mode
+        self._queue = Queue()
+        self._put_count = 0
+        self._put_condition = Condition()
+
+    def put(self, job: SocaJob):
+        self._queue.put(job)
+        with self._put_condition:
+            self._put_count += 1
+            self._put_condition.notify_all()
+
+    @property
+    def put_count(self) -> int:
+        return self._put_count
+
+    def wait_for_jobs(self, put_count: int, timeout: float) -> bool:
+        with self._put_condition:
+            return self._put_condition.wait_for(
+                lambda: self._put_count > put_count, timeout=timeout
+            )
+
+    def get(self, timeout: float = 1) -> SocaJob:
+        try:
+            return self._queue.get(timeout=timeout)
+        except Empty:
+            raise JobProvisioningQueueEmpty()
+
+
+def build_queue_profile(**kwargs) -> HpcQueueProfile:
+    return HpcQueueProfile(
+        name='compute',
+        queues=['normal'],
+        scaling_mode=SocaScalingMode.SINGLE_JOB,
+        queue_mode=SocaQueueMode.FIFO,
+        **kwargs,
+    )
+
+
+def test_job_provisioner_provisioning_workers(context):
+    def get_provisioning_workers(**kwargs) -> int:
+        queue = FakeJobProvisioningQueue(build_queue_profile(**kwargs))
+        return JobProvisioner(context=context, queue=queue).get_provisioning_workers()
+
+    assert get_provisioning_workers() == 4
+    assert (
+        get_provisioning_workers(
+            queue_management_params=SocaQueueManagementParams(provisioning_workers=8)
+        )
+        == 8
+    )
+    assert get_provisioning_workers(keep_forever=True) == 1
+    assert get_provisioning_workers(terminate_when_idle=3) == 1
+    assert (
+        get_provisioning_workers(
+            queue_management_params=SocaQueueManagementParams(max_running_jobs=10)
+        )
+        == 1
+    )
+    queue = FakeJobProvisioningQueue(build_queue_profile())
+    queue.queue_profile.scaling_mode = SocaScalingMode.BATCH
+    assert JobProvisioner(context=context, queue=queue).get_provisioning_workers() == 1
+
+
+def test_job_provisioner_concurrent_provisioning(context, monkeypatch):
+    """
+    queued jobs are provisioned by provisioning_workers workers in parallel. each job is provisioned once.
+    """
+    total_jobs = 200
+    provisioning_workers = 8
+    # the first job of each worker is provisioned only after all workers are provisioning a job
+    barrier = Barrier(provisioning_workers, timeout=10)
+    started = []
+    provisioned = []
+    lock = RLock()
+
+    class FakeProvisionJobs:
+        def __init__(self, context, jobs, logger):
+            self.jobs = jobs
+
+        def invoke(self) -> ProvisionJobsResult:
+            with lock:
+                started.extend(self.jobs)
+                wait = len(started) <= provisioning_workers
+            if wait:
+                barrier.wait()
+            time.sleep(PROVISIONING_LATENCY_SECONDS)
+            with lock:
+                provisioned.extend(self.jobs)
+            return ProvisionJobsResult(status=True)
+
+    monkeypatch.setattr(job_provisioner, 'ProvisionJobs', FakeProvisionJobs)
+    context.scheduler = SocaAnyPayload(is_job_queued_or_running=lambda **_: True)
+    context.config().put(
+        'scheduler.job_provisioning.job_provisioning_interval_seconds', 0.001
+    )
+
+    queue = FakeJobProvisioningQueue(
+        build_queue_profile(
+            queue_management_params=SocaQueueManagementParams(
+                provisioning_workers=provisioning_workers
+            )
+        )
+    )
+    for job_id in range(total_jobs):
+        queue.put(SocaJob(job_id=str(job_id), provisioned=False))
+
+    provisioner = JobProvisioner(context=context, queue=queue)
+    provisioner.start()
+    deadline = time.monotonic() + 30
+    while len(provisioned) < total_jobs and time.monotonic() < deadline:
+        time.sleep(0.01)
+    provisioner.stop()
+
+    assert not barrier.broken
+    assert sorted(int(job.job_id) for job in provisioned) == list(range(total_jobs))
+
+
+def build_batch_provisioner(
+    context: AppContext, expected_batch_sizes: Dict[str, int]
+) -> JobProvisioner:
+    context.job_cache = SocaAnyPayload(
+        get_expected_batch_size=lambda job_group: expected_batch_sizes.get(job_group, 0)
+    )
+    context.config().put(
+        'scheduler.job_provisioning.batch_provisioning_wait_interval_seconds', 10
+    )
+    queue_profile = build_queue_profile()
+    queue_profile.scaling_mode = SocaScalingMode.BATCH
+    provisioner = JobProvisioner(
+        context=context, queue=FakeJobProvisioningQueue(queue_profile)
+    )
+    provisioner._exit = Event()
+    return provisioner
+
+
+def test_job_provisioner_drain_batch_queue(context):
+    """
+    complete batches are returned without waiting for batch_provisioning_wait_interval_seconds
+    """
+    provisioner = build_batch_provisioner(context, {'job-group-1': 3, 'job-group-2': 1})
+    for job_id in range(3):
+        provisioner._queue.put(
+            SocaJob(job_id=f'1{job_id}', job_group='job-group-1', provisioned=False)
+        )
+    provisioner._queue.put(
+        SocaJob(job_id='20', job_group='job-group-2', provisioned=False)
+    )
+
+    start = time.perf_counter()
+    batches = provisioner._drain_batch_queue()
+
+    assert time.perf_counter() - start < 1
+    assert [job.job_id for job in batches['job-group-1']] == ['10', '11', '12']
+    assert [job.job_id for job in batches['job-group-2']] == ['20']
+
+
+def test_job_provisioner_drain_batch_queue_incomplete_batch(context):
+    """
+    incomplete batches are returned as soon as the remaining jobs are queued
+    """
+    provisioner = build_batch_provisioner(context, {'job-group-1': 3})
+    for job_id in range(2):
+        provisioner._queue.put(
+            SocaJob(job_id=f'1{job_id}', job_group='job-group-1', provisioned=False)
+        )
+
+    def put_remaining_job():
+        time.sleep(0.2)
+        provisioner._queue.put(
+            SocaJob(job_id='12', job_group='job-group-1', provisioned=False)
+        )
+
+    thread = Thread(target=put_remaining_job)
+    start = time.perf_counter()
+    thread.start()
+    batches = provisioner._drain_batch_queue()
+    elapsed = time.perf_counter() - start
+    thread.join()
+
+    assert 0.2 <= elapsed < 2
+    assert [job.job_id for job in batches['job-group-1']] == ['10', '11', '12']
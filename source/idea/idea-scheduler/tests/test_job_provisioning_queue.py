@@ -0,0 +1,98 @@
+#  Copyright Amazon.com, Inc. or its affiliates. All Rights Reserved.
+#
+#  Licensed under the Apache License, Version 2.0 (the "License"). You may not use this file except in compliance
+#  with the License. A copy of the License is located at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+#  or in the 'license' file accompanying this file. This file is distributed on an 'AS IS' BASIS, WITHOUT WARRANTIES
+#  OR CONDITIONS OF ANY KIND, express or implied. See the License for the specific language governing permissions
+#  and limitations under the License.
+
+"""
+Test Cases for RoundRobinPriorityQueue
+"""
+
+from ideascheduler.app.provisioning.job_provisioning_queue.job_provisioning_queue import (
+    RoundRobinPriorityQueue,
+)
+from ideadatamodel import QueuedJob
+
+from queue import Empty
+from threading import Event, Lock, Thread
+from typing import List
+
+
+def test_round_robin_priority_queue_round_robin():
+    """
+    jobs are returned round-robin across groups, in priority order within a group
+    """
+    q = RoundRobinPriorityQueue()
+    q.put(QueuedJob(priority=2, job_id='a2', job_group='a'))
+    q.put(QueuedJob(priority=1, job_id='a1', job_group='a'))
+    q.put(QueuedJob(priority=1, job_id='b1', job_group='b'))
+
+    assert q.qsize() == 3
+    assert q.qsize('a') == 2
+    assert q.get(timeout=0.01).job_id == 'a1'
+    assert q.get(timeout=0.01).job_id == 'b1'
+    assert q.get(timeout=0.01).job_id == 'a2'
+    assert q.qsize('a') == 0
+
+
+def test_round_robin_priority_queue_concurrent_consumers():
+    """
+    multiple consumers polling the queue while producers add and drain groups must consume every job exactly once,
+    without errors from groups being removed concurrently
+    """
+    q = RoundRobinPriorityQueue()
+    producers = 4
+    consumers = 4
+    jobs_per_producer = 500
+
+    consumed: List[str] = []
+    consumed_lock = Lock()
+    errors: List[BaseException] = []
+    producers_done = Event()
+
+    def produce(producer_id: int):
+        for i in range(jobs_per_producer):
+            q.put(
+                QueuedJob(
+                    priority=i,
+                    job_id=f'{producer_id}-{i}',
+                    job_group=f'group-{i % 7}',
+                )
+            )
+
+    def consume():
+        try:
+            while True:
+                try:
+                    job = q.get(timeout=0.001)
+                except Empty:
+                    if producers_done.is_set() and q.qsize() == 0:
+                        return
+                    continue
+                with consumed_lock:
+                    consumed.append(job.job_id)
+        except BaseException as e:
+            errors.append(e)
+
+    consumer_threads = [Thread(target=consume) for _ in range(consumers)]
+    producer_threads = [
+        Thread(target=produce, args=(producer_id,)) for producer_id in range(producers)
+    ]
+    for thread in consumer_threads + producer_threads:
+        thread.start()
+    for thread in producer_threads:
+        thread.join()
+    producers_done.set()
+    for thread in consumer_threads:
+        thread.join(timeout=30)
+
+    assert errors == []
+    assert not any(thread.is_alive() for thread in consumer_threads)
+    assert len(consumed) == producers * jobs_per_producer
+    assert len(set(consumed)) == producers * jobs_per_producer
+    assert q.qsize() == 0
@@ -0,0 +1,202 @@
+#  Copyright Amazon.com, Inc. or its affiliates. All Rights Reserved.
+#
+#  Licensed under the Apache License, Version 2.0 (the "License"). You may not use this file except in compliance
+#  with the License. A copy of the License is located at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+#  or in the 'license' file accompanying this file. This file is distributed on an 'AS IS' BASIS, WITHOUT WARRANTIES
+#  OR CONDITIONS OF ANY KIND, express or implied. See the License for the specific language governing permissions
+#  and limitations under the License.
+
+"""
+Test Cases for LaunchPreflightCache
+"""
+
+from ideascheduler import AppContext
+from ideascheduler.app.aws import EC2ServiceQuotaHelper
+from ideascheduler.app.provisioning import JobProvisioningUtil, LaunchPreflightCache
+from ideascheduler.app.scheduler import SocaJobBuilder
+from ideadatamodel import (
+    exceptions,
+    errorcodes,
+    constants,
+    SocaJob,
+    HpcQueueProfile,
+    SocaScalingMode,
+    SocaJobParams,
+    CheckServiceQuotaResult,
+    ServiceQuota,
+)
+from ideasdk.aws import AwsClientProvider
+
+from botocore.exceptions import ClientError
+import time
+import pytest
+
+QUOTA_NAME = 'Running On-Demand Standard (A, C, D, H, I, M, R, T, Z) instances'
+SPOT_QUOTA_NAME = 'All Standard (A, C, D, H, I, M, R, T, Z) Spot Instance Requests'
+
+# simulated latency of a RunInstances dry run
+DRY_RUN_LATENCY_SECONDS = 0.0005
+
+
+class FakePreflightBackend:
+    """
+    RunInstances dry runs and service quota samples. counts dry runs and quota samples.
+    """
+
+    def __init__(self, quota: int, spot_quota: int = 0):
+        self.quota = quota
+        self.spot_quota = spot_quota
+        self.consumed = 0
+        self.dry_runs = 0
+        self.quota_samples = 0
+        self.dry_run_error_code = 'DryRunOperation'
+
+    def run_instances(self, **kwargs):
+        self.dry_runs += 1
+        time.sleep(DRY_RUN_LATENCY_SECONDS)
+        raise ClientError(
+            {'Error': {'Code': self.dry_run_error_code, 'Message': 'dry run'}},
+            'RunInstances',
+        )
+
+    def check_service_quota(self, helper: EC2ServiceQuotaHelper):
+        self.quota_samples += 1
+        if helper.quota_type == constants.EC2_SERVICE_QUOTA_SPOT:
+            return CheckServiceQuotaResult(
+                quotas=[
+                    ServiceQuota(
+                        quota_name=SPOT_QUOTA_NAME,
+                        available=self.spot_quota,
+                        consumed=0,
+                        desired=helper.desired_capacity,
+                    )
+                ]
+            )
+        return CheckServiceQuotaResult(
+            quotas=[
+                ServiceQuota(
+                    quota_name=QUOTA_NAME,
+                    available=self.quota,
+                    consumed=self.consumed,
+                    desired=helper.desired_capacity,
+                )
+            ]
+        )
+
+
+@pytest.fixture()
+def backend(context: AppContext, monkeypatch) -> FakePreflightBackend:
+    fake_backend = FakePreflightBackend(quota=5000)
+    monkeypatch.setattr(AwsClientProvider, 'ec2', lambda *_: fake_backend)
+    monkeypatch.setattr(
+        EC2ServiceQuotaHelper,
+        'check_service_quota',
+        lambda helper: fake_backend.check_service_quota(helper),
+    )
+    return fake_backend
+
+
+def build_job(context: AppContext, job_id: str, nodes: int = 1) -> SocaJob:
+    queue_profile = HpcQueueProfile(
+        name='compute',
+        queues=['normal'],
+        scaling_mode=SocaScalingMode.SINGLE_JOB,
+        default_job_params=SocaJobParams(instance_types=['c5.large']),
+    )
+    builder = SocaJobBuilder(
+        context=context,
+        params={'nodes': nodes, 'cpus': 1},
+        queue_profile=queue_profile,
+    )
+    job_params, provisioning_options = builder.build()
+    return SocaJob(
+        name='preflight',
+        job_id=job_id,
+        owner='mockuser',
+        project='default',
+        cluster_name='idea-mock',
+        params=job_params,
+        queue='normal',
+        queue_type=queue_profile.name,
+        scaling_mode=queue_profile.scaling_mode,
+        provisioning_options=provisioning_options,
+    )
+
+
+def preflight(context: AppContext, job: SocaJob):
+    provisioning_util = JobProvisioningUtil(context=context, jobs=[job])
+    provisioning_util.ec2_dry_run()
+    provisioning_util.check_service_quota()
+
+
+def test_launch_preflight_cache_quota_headroom(context, backend):
+    backend.quota = 10
+    context.launch_preflight_cache = LaunchPreflightCache()
+
+    # c5.large: 2 vCPUs. headroom is deducted locally before the instances are launched
+    for index in range(5):
+        preflight(context, build_job(context, str(index)))
+    with pytest.raises(exceptions.SocaException) as exc_info:
+        preflight(context, build_job(context, '5'))
+    assert exc_info.value.error_code == errorcodes.SERVICE_QUOTA_NOT_AVAILABLE
+    assert backend.dry_runs == 1
+    assert backend.quota_samples == 1
+
+    # stack creation failed. capacity was not launched.
+    JobProvisioningUtil(
+        context=context, jobs=[build_job(context, '5')]
+    ).invalidate_preflight_cache()
+    preflight(context, build_job(context, '5'))
+    assert backend.dry_runs == 2
+    assert backend.quota_samples == 2
+
+
+def test_launch_preflight_cache_dry_run_failure(context, backend):
+    context.launch_preflight_cache = LaunchPreflightCache()
+
+    # dry runs are cached per launch shape
+    preflight(context, build_job(context, '1'))
+    preflight(context, build_job(context, '2', nodes=2))
+    assert backend.dry_runs == 2
+
+    # failed dry runs are not cached
+    backend.dry_run_error_code = 'UnauthorizedOperation'
+    context.launch_preflight_cache.clear()
+    for _ in range(2):
+        with pytest.raises(exceptions.SocaException) as exc_info:
+            preflight(context, build_job(context, '3'))
+        assert exc_info.value.error_code == errorcodes.EC2_DRY_RUN_FAILED
+    assert backend.dry_runs == 4
+
+
+def test_launch_preflight_cache_release_on_failure(context, backend):
+    """
+    vCPUs reserved for capacity that was not provisioned are released, so that jobs can be provisioned on retry
+    """
+    backend.quota = 4
+    context.launch_preflight_cache = LaunchPreflightCache()
+
+    # mixed capacity: the on-demand quota check passes, the spot quota check fails
+    job = build_job(context, '1', nodes=2)
+    job.params.spot = True
+    job.params.spot_allocation_count = 1
+    with pytest.raises(exceptions.SocaException) as exc_info:
+        preflight(context, job)
+    assert exc_info.value.error_code == errorcodes.SERVICE_QUOTA_NOT_AVAILABLE
+
+    # stack creation or capacity update failed after the quota check
+    provisioning_util = JobProvisioningUtil(
+        context=context, jobs=[build_job(context, '2', nodes=2)]
+    )
+    provisioning_util.check_service_quota()
+    provisioning_util.release_service_quota()
+
+    # retry: the on-demand quota headroom was not consumed by the failed attempts
+    preflight(context, build_job(context, '3', nodes=2))
+    with pytest.raises(exceptions.SocaException) as exc_info:
+        preflight(context, build_job(context, '4', nodes=1))
+    assert exc_info.value.error_code == errorcodes.SERVICE_QUOTA_NOT_AVAILABLE
+    assert backend.quota_samples == 2
@@ -0,0 +1,173 @@
+#  Copyright Amazon.com, Inc. or its affiliates. All Rights Reserved.
+#
+#  Licensed under the Apache License, Version 2.0 (the "License"). You may not use this file except in compliance
+#  with the License. A copy of the License is located at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+#  or in the 'license' file accompanying this file. This file is distributed on an 'AS IS' BASIS, WITHOUT WARRANTIES
+#  OR CONDITIONS OF ANY KIND, express or implied. See the License for the specific language governing permissions
+#  and limitations under the License.
+
+"""
+Test Cases for LicenseAvailabilitySampler
+"""
+
+from ideadatamodel import (
+    SocaAnyPayload,
+    SocaJob,
+    SocaJobParams,
+    SocaJobLicenseAsk,
+    errorcodes,
+    exceptions,
+)
+
+from ideascheduler.app.licenses.license_availability_sampler import (
+    LicenseAvailabilitySampler,
+)
+
+from concurrent.futures import ThreadPoolExecutor
+from threading import Lock
+from typing import Dict
+import logging
+import time
+import pytest
+
+PROBE_SECONDS = 0.05
+
+
+class FakeLicenseServer:
+    """
+    availability check cmd for license resources. each probe takes PROBE_SECONDS.
+    """
+
+    def __init__(self, available: Dict[str, int]):
+        self.available = available
+        self.probes = 0
+        self._lock = Lock()
+
+    def probe(self, license_name: str) -> int:
+        with self._lock:
+            self.probes += 1
+        time.sleep(PROBE_SECONDS)
+        return self.available.get(license_name, 0)
+
+
+def build_sampler(server: FakeLicenseServer, config: Dict, active: Dict[str, int]):
+    context = SocaAnyPayload(
+        config=lambda: SocaAnyPayload(
+            get_int=lambda key, default=None, required=False: config.get(key, default)
+        ),
+        logger=lambda name=None: logging.getLogger(name),
+        job_cache=SocaAnyPayload(
+            get_active_license_count=lambda license_name: active.get(license_name, 0)
+        ),
+    )
+    return LicenseAvailabilitySampler(context=context, probe=server.probe)
+
+
+def build_job(job_id: str, **licenses) -> SocaJob:
+    return SocaJob(
+        job_id=job_id,
+        owner='user1',
+        params=SocaJobParams(
+            licenses=[
+                SocaJobLicenseAsk(name=name, count=count)
+                for name, count in licenses.items()
+            ]
+        ),
+    )
+
+
+def test_license_availability_sampler_single_probe():
+    server = FakeLicenseServer({'ansys_lic_fluent': 10})
+    config = {'scheduler.job_provisioning.license_sample_interval_seconds': 30}
+    sampler = build_sampler(server, config, active={})
+
+    with ThreadPoolExecutor(max_workers=8) as executor:
+        results = list(
+            executor.map(
+                lambda _: sampler.get_available_licenses('ansys_lic_fluent'), range(8)
+            )
+        )
+    assert results == [10] * 8
+    assert server.probes == 1
+
+    # license resource updated
+    server.available['ansys_lic_fluent'] = 4
+    sampler.invalidate('ansys_lic_fluent')
+    assert sampler.get_available_licenses('ansys_lic_fluent') == 4
+    assert server.probes == 2
+
+    # sample expired
+    config['scheduler.job_provisioning.license_sample_interval_seconds'] = 0
+    sampler.get_available_licenses('ansys_lic_fluent')
+    assert server.probes == 3
+
+
+def test_license_availability_sampler_reservations():
+    server = FakeLicenseServer({'ansys_lic_fluent': 10, 'ansys_lic_mech': 4})
+    sampler = build_sampler(server, {}, active={'ansys_lic_fluent': 2})
+
+    job1 = build_job('1', ansys_lic_fluent=5)
+    sampler.reserve([job1])
+    assert sampler.get_reserved_count('ansys_lic_fluent') == 5
+
+    # active: 2, reserved: 5, required: 5
+    with pytest.raises(exceptions.SocaException) as exc_info:
+        sampler.reserve([build_job('2', ansys_lic_fluent=5)])
+    assert exc_info.value.error_code == errorcodes.NOT_ENOUGH_LICENSES
+
+    # all or none: job 3 fits, job 4 does not.
+    with pytest.raises(exceptions.SocaException):
+        sampler.reserve(
+            [
+                build_job('3', ansys_lic_fluent=1),
+                build_job('4', ansys_lic_fluent=1, ansys_lic_mech=5),
+            ]
+        )
+    assert sampler.get_reserved_count('ansys_lic_fluent') == 5
+    assert sampler.get_reserved_count('ansys_lic_mech') == 0
+
+    sampler.release([job1])
+    sampler.reserve([build_job('2', ansys_lic_fluent=5)])
+    assert sampler.get_reserved_count('ansys_lic_fluent') == 5
+    assert server.probes == 2
+
+    # concurrent provisioners do not overcommit
+    sampler.release([build_job('2')])
+    reserved = []
+
+    def reserve(index: int):
+        job = build_job(f'job-{index}', ansys_lic_fluent=1)
+        try:
+            sampler.reserve([job])
+            reserved.append(job)
+        except exceptions.SocaException:
+            pass
+
+    with ThreadPoolExecutor(max_workers=8) as executor:
+        list(executor.map(reserve, range(20)))
+    assert len(reserved) == 8
+    assert sampler.get_reserved_count('ansys_lic_fluent') == 8
+
+
+def test_license_availability_sampler_concurrent_reservations():
+    """
+    license checks for 40 queued jobs across 4 provisioners, each job requesting 2 license resources, share a single
+    probe per license resource
+    """
+    job_count = 40
+    jobs = [
+        build_job(str(index), ansys_lic_fluent=1, ansys_lic_mech=1)
+        for index in range(job_count)
+    ]
+    server = FakeLicenseServer({'ansys_lic_fluent': 100, 'ansys_lic_mech': 100})
+    sampler = build_sampler(server, {}, active={})
+
+    with ThreadPoolExecutor(max_workers=4) as executor:
+        list(executor.map(lambda job: sampler.reserve([job]), jobs))
+
+    assert server.probes == 2
+    assert sampler.get_reserved_count('ansys_lic_fluent') == job_count
+    assert sampler.get_reserved_count('ansys_lic_mech') == job_count
@@ -0,0 +1,147 @@
+#  Copyright Amazon.com, Inc. or its affiliates. All Rights Reserved.
+#
+#  Licensed under the Apache License, Version 2.0 (the "License"). You may not use this file except in compliance
+#  with the License. A copy of the License is located at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+#  or in the 'license' file accompanying this file. This file is distributed on an 'AS IS' BASIS, WITHOUT WARRANTIES
+#  OR CONDITIONS OF ANY KIND, express or implied. See the License for the specific language governing permissions
+#  and limitations under the License.
+
+"""
+Test Cases for NodeCleanupExecutor
+"""
+
+from ideascheduler import AppContext
+from ideascheduler.app.provisioning.node_monitor.node_cleanup_executor import (
+    NodeCleanupExecutor,
+)
+from ideadatamodel import exceptions
+
+from threading import RLock
+from typing import List
+import time
+
+# simulated latency of a cloudformation DeleteStack request
+DELETE_STACK_LATENCY_SECONDS = 0.02
+
+
+class FakeAWSUtil:
+    def __init__(self, invalid_instance_ids: List[str] = None):
+        self.invalid_instance_ids = set(invalid_instance_ids or [])
+        self.terminate_requests = []
+        self.deleted_stacks = []
+        self.max_concurrent_deletions = 0
+        self._concurrent_deletions = 0
+        self._lock = RLock()
+
+    def ec2_terminate_instances(
+        self, instance_ids: List[str], force: bool = False, skip_os_shutdown=False
+    ):
+        self.terminate_requests.append((list(instance_ids), force, skip_os_shutdown))
+        # a single invalid instance id fails the entire request
+        invalid = self.invalid_instance_ids.intersection(instance_ids)
+        if len(invalid) > 0:
+            raise exceptions.general_exception(
+                f'InvalidInstanceID.NotFound: {",".join(invalid)}'
+            )
+
+    def cloudformation_delete_stack(self, stack_name: str):
+        with self._lock:
+            self._concurrent_deletions += 1
+            self.max_concurrent_deletions = max(
+                self.max_concurrent_deletions, self._concurrent_deletions
+            )
+        time.sleep(DELETE_STACK_LATENCY_SECONDS)
+        with self._lock:
+            self._concurrent_deletions -= 1
+        if stack_name.endswith('-invalid'):
+            raise exceptions.general_exception(f'stack not found: {stack_name}')
+        with self._lock:
+            self.deleted_stacks.append(stack_name)
+
+
+def build_executor(context: AppContext, aws_util: FakeAWSUtil, **config):
+    for key, value in config.items():
+        context.config().put(
+            f'scheduler.job_provisioning.node_housekeeping_cleanup.{key}', value
+        )
+    context.aws_util = lambda: aws_util
+    return NodeCleanupExecutor(context=context, logger=context.logger())
+
+
+def test_node_cleanup_executor_terminate_instances_in_batches(context):
+    aws_util = FakeAWSUtil()
+    executor = build_executor(context, aws_util)
+    instance_ids = [f'i-{index:017d}' for index in range(2500)]
+
+    errors = executor.terminate_instances(instance_ids=instance_ids)
+
+    assert errors == {}
+    assert [len(request[0]) for request in aws_util.terminate_requests] == [
+        1000,
+        1000,
+        500,
+    ]
+    assert all(request[1:] == (False, False) for request in aws_util.terminate_requests)
+
+    executor.terminate_instances(instance_ids=instance_ids[0:10], force=True)
+    assert aws_util.terminate_requests[-1] == (instance_ids[0:10], True, True)
+
+
+def test_node_cleanup_executor_terminate_instances_batch_failure(context):
+    aws_util = FakeAWSUtil(invalid_instance_ids=['i-invalid'])
+    executor = build_executor(context, aws_util)
+    instance_ids = ['i-1', 'i-2', 'i-invalid', 'i-3']
+
+    errors = executor.terminate_instances(instance_ids=instance_ids)
+
+    # the failed batch is retried per instance, and only the invalid instance is reported
+    assert list(errors.keys()) == ['i-invalid']
+    assert [request[0] for request in aws_util.terminate_requests] == [
+        instance_ids,
+        ['i-1'],
+        ['i-2'],
+        ['i-invalid'],
+        ['i-3'],
+    ]
+
+
+def test_node_cleanup_executor_delete_stacks(context):
+    aws_util = FakeAWSUtil()
+    executor = build_executor(
+        context,
+        aws_util,
+        stack_deletion_workers=8,
+        stack_deletion_rate=1000,
+        stack_deletion_burst=1000,
+    )
+    stack_names = [f'idea-mock-job-{index}' for index in range(100)]
+    stack_names.append('idea-mock-job-invalid')
+
+    errors = executor.delete_stacks(stack_names=stack_names)
+
+    assert list(errors.keys()) == ['idea-mock-job-invalid']
+    assert sorted(aws_util.deleted_stacks) == sorted(stack_names[0:100])
+    assert 1 < aws_util.max_concurrent_deletions <= 8
+
+
+def test_node_cleanup_executor_delete_stacks_rate_limit(context):
+    aws_util = FakeAWSUtil()
+    executor = build_executor(
+        context,
+        aws_util,
+        stack_deletion_workers=8,
+        stack_deletion_rate=100,
+        stack_deletion_burst=1,
+    )
+
+    start = time.perf_counter()
+    executor.delete_stacks(
+        stack_names=[f'idea-mock-job-{index}' for index in range(21)]
+    )
+    elapsed = time.perf_counter() - start
+
+    # 1 burst token + 20 requests paced at 100/s
+    assert elapsed >= 0.2
@@ -0,0 +1,158 @@
+#  Copyright Amazon.com, Inc. or its affiliates. All Rights Reserved.
+#
+#  Licensed under the Apache License, Version 2.0 (the "License"). You may not use this file except in compliance
+#  with the License. A copy of the License is located at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+#  or in the 'license' file accompanying this file. This file is distributed on an 'AS IS' BASIS, WITHOUT WARRANTIES
+#  OR CONDITIONS OF ANY KIND, express or implied. See the License for the specific language governing permissions
+#  and limitations under the License.
+
+"""
+Test Cases for OpenPBSQmgrSession
+"""
+
+from ideascheduler import AppContext
+from ideascheduler.app.scheduler.openpbs import (
+    OpenPBSQmgrSession,
+    OpenPBSScheduler,
+    openpbs_constants,
+)
+from ideascheduler.app.scheduler.openpbs.openpbs_qmgr_session import (
+    QMGR_SESSION_ERROR_CODE,
+)
+from ideadatamodel import errorcodes, exceptions, SocaComputeNodeState
+
+import os
+import sys
+import pytest
+
+# simulated qmgr start-up: process start, connection and authentication with the PBS server
+QMGR_STARTUP_SECONDS = 0.02
+
+# simulated server side processing of a single directive
+QMGR_DIRECTIVE_SECONDS = 0.0005
+
+FAKE_QMGR = f"""#!{sys.executable}
+# fake qmgr: reads directives from stdin and reports errors on stderr in the same format as qmgr.
+#   busy-*: object is busy and cannot be deleted
+#   unknown-*, __idea_qmgr_marker_*: object does not exist
+#   crash-*: qmgr exits
+#   hang-*: qmgr does not respond
+import sys
+import time
+
+time.sleep({QMGR_STARTUP_SECONDS})
+
+
+def error(name, message, code):
+    sys.stderr.write(f'qmgr obj={{name}} svr=default: {{message}}\\n')
+    sys.stderr.write(f'qmgr: Error ({{code}}) returned from server\\n')
+    sys.stderr.flush()
+
+
+def execute(directive):
+    tokens = directive.split()
+    if len(tokens) < 3:
+        return
+    verb, object_type, name = tokens[0:3]
+    time.sleep({QMGR_DIRECTIVE_SECONDS})
+    if name.startswith('crash-'):
+        sys.exit(1)
+    if name.startswith('hang-'):
+        time.sleep(60)
+    if name.startswith('unknown-') or name.startswith('__idea_qmgr_marker_'):
+        error(name, f'Unknown {{object_type}} ', 15062)
+    elif verb == 'delete' and name.startswith('busy-'):
+        error(name, 'Cannot delete busy object', 15027)
+
+
+for line in sys.stdin:
+    execute(line.strip())
+"""
+
+
+@pytest.fixture()
+def fake_qmgr(tmp_path, monkeypatch) -> str:
+    path = os.path.join(tmp_path, 'qmgr')
+    with open(path, 'w') as f:
+        f.write(FAKE_QMGR)
+    os.chmod(path, 0o755)
+    monkeypatch.setattr(openpbs_constants, 'QMGR', path)
+    return path
+
+
+def build_scheduler(context: AppContext, qmgr_session: bool) -> OpenPBSScheduler:
+    context.config().put('scheduler.openpbs.qmgr_session.enabled', qmgr_session)
+    return OpenPBSScheduler(context=context)
+
+
+def test_openpbs_qmgr_session_execute(fake_qmgr):
+    session = OpenPBSQmgrSession(cmd=[fake_qmgr])
+    try:
+        results = session.execute(
+            [
+                'set node ip-10-0-0-1 state=offline',
+                'delete node busy-1',
+                'set node unknown-1 state=offline',
+                'delete node ip-10-0-0-2',
+            ]
+        )
+        assert [result.error_code for result in results] == [0, 15027, 15062, 0]
+        assert results[1].is_object_busy()
+        assert results[1].messages == [
+            'qmgr obj=busy-1 svr=default: Cannot delete busy object'
+        ]
+
+        # the same qmgr process is used for subsequent directives
+        pid = session._process.pid
+        assert session.execute(['create node ip-10-0-0-3 queue=normal'])[0].success
+        assert session._process.pid == pid
+    finally:
+        session.close()
+
+
+def test_openpbs_qmgr_session_restart(fake_qmgr):
+    session = OpenPBSQmgrSession(cmd=[fake_qmgr], timeout_seconds=0.5)
+    try:
+        results = session.execute(
+            [
+                'delete node ip-10-0-0-1',
+                'delete node crash-1',
+                'delete node ip-10-0-0-2',
+            ]
+        )
+        assert results[0].success
+        assert results[1].error_code == QMGR_SESSION_ERROR_CODE
+        assert results[2].error_code == QMGR_SESSION_ERROR_CODE
+        assert not session.is_running()
+
+        # session is restarted on next use
+        assert session.execute(['delete node ip-10-0-0-2'])[0].success
+
+        results = session.execute(['delete node hang-1'])
+        assert results[0].error_code == QMGR_SESSION_ERROR_CODE
+        assert session.execute(['delete node ip-10-0-0-3'])[0].success
+    finally:
+        session.close()
+
+
+def test_openpbs_scheduler_qmgr_errors(context, fake_qmgr):
+    scheduler = build_scheduler(context, qmgr_session=True)
+
+    assert scheduler.set_node_state('ip-10-0-0-1', SocaComputeNodeState.OFFLINE)
+    assert scheduler.delete_node('ip-10-0-0-1')
+
+    with pytest.raises(exceptions.SocaException) as exc_info:
+        scheduler.delete_node('busy-1')
+    assert exc_info.value.error_code == errorcodes.SCHEDULER_NODE_BUSY
+
+    with pytest.raises(exceptions.SocaException) as exc_info:
+        scheduler.set_node_attributes('unknown-1', {'instance_id': 'i-1'})
+    assert exc_info.value.error_code == errorcodes.SCHEDULER_ERROR
+
+    errors = scheduler.delete_nodes(['ip-10-0-0-1', 'busy-1', 'unknown-1'])
+    assert sorted(errors.keys()) == ['busy-1', 'unknown-1']
+    assert errors['busy-1'].error_code == errorcodes.SCHEDULER_NODE_BUSY
+    assert errors['unknown-1'].error_code == errorcodes.SCHEDULER_ERROR
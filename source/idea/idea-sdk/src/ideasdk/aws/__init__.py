@@ -10,6 +10,11 @@
 #  and limitations under the License.
 
 from ideasdk.aws.aws_endpoints import AwsEndpoints
+from ideasdk.aws.aws_transport import (
+    AwsTransportProfile,
+    AwsTransportOptions,
+    AwsTransportStats,
+)
 from ideasdk.aws.aws_client_provider import (
     AWSClientProviderOptions,
     AwsClientProvider,
@@ -18,5 +23,7 @@ from ideasdk.aws.aws_client_provider import (
 from ideasdk.aws.instance_metadata_util import InstanceMetadataUtil
 from ideasdk.aws.iam_permission_util import IamPermissionUtil
 from ideasdk.aws.ec2_instance_types_db import EC2InstanceTypesDB
+from ideasdk.aws.ec2_pricing_catalog import EC2PricingCatalog
 from ideasdk.aws.aws_util import AWSUtil
 from ideasdk.aws.aws_resources import AwsResources
+from ideasdk.aws.aws_rate_governor import AwsRateGovernor, TokenBucket
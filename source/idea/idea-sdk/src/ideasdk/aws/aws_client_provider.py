@@ -12,6 +12,7 @@
 from ideasdk.protocols import AwsClientProviderProtocol
 from ideasdk.aws.aws_endpoints import AwsEndpoints
 from ideasdk.aws.instance_metadata_util import InstanceMetadataUtil
+from ideasdk.aws.aws_transport import AwsTransportOptions, AwsTransportStats
 from ideadatamodel import SocaBaseModel, exceptions
 from ideasdk.utils import Utils
 
@@ -19,7 +20,6 @@ from threading import RLock
 from typing import List, Dict, Any, Optional, Set
 from pydantic import Field
 import botocore.exceptions
-from botocore.client import Config
 
 AWS_CLIENT_S3 = 's3'
 AWS_CLIENT_EC2 = 'ec2'
@@ -105,6 +105,7 @@ class AWSClientProviderOptions(SocaBaseModel):
     region: Optional[str] = Field(default=None)
     pricing_api_region: Optional[str] = Field(default=None)
     endpoints: Optional[List[AwsServiceEndpoint]] = Field(default=None)
+    transport: Optional[AwsTransportOptions] = Field(default=None)
 
     @staticmethod
     def default():
@@ -126,6 +127,12 @@ class AwsClientProvider(AwsClientProviderProtocol):
         else:
             self.options = options
 
+        if self.options.transport is None:
+            self._transport = AwsTransportOptions.build_default()
+        else:
+            self._transport = self.options.transport
+        self._transport_stats = AwsTransportStats()
+
         self._session = Utils.create_boto_session(
             aws_region=self.options.region, aws_profile=self.options.profile
         )
@@ -167,18 +174,22 @@ class AwsClientProvider(AwsClientProviderProtocol):
                 return self._clients[client_key]
 
             if service_name in (AWS_RESOURCE_DYNAMODB_TABLE, AWS_RESOURCE_S3_BUCKET):
-                config = None
+                config_params = {}
 
                 if service_name == AWS_RESOURCE_DYNAMODB_TABLE:
                     inferred_service_name = AWS_CLIENT_DYNAMODB
                 elif service_name == AWS_RESOURCE_S3_BUCKET:
                     inferred_service_name = AWS_CLIENT_S3
-                    config = Config(signature_version='s3v4')
+                    config_params['signature_version'] = 's3v4'
                 else:
                     raise exceptions.general_exception(
                         f'aws boto3 resource not implemented for service name: {service_name}'
                     )
 
+                config = self._transport.get_profile(
+                    inferred_service_name
+                ).build_config(**config_params)
+
                 aws_endpoint = self.get_service_endpoint_url(inferred_service_name)
                 client = self._session.resource(
                     service_name=inferred_service_name,
@@ -188,11 +199,16 @@ class AwsClientProvider(AwsClientProviderProtocol):
                     else None,
                     config=config,
                 )
+                self._transport_stats.attach(client.meta.client, inferred_service_name)
 
             else:
-                config = None
+                config_params = {}
                 if service_name == AWS_CLIENT_S3:
-                    config = Config(signature_version='s3v4')
+                    config_params['signature_version'] = 's3v4'
+
+                config = self._transport.get_profile(service_name).build_config(
+                    **config_params
+                )
 
                 aws_endpoint = self.get_service_endpoint_url(service_name)
                 client = self._session.client(
@@ -203,6 +219,7 @@ class AwsClientProvider(AwsClientProviderProtocol):
                     else None,
                     config=config,
                 )
+                self._transport_stats.attach(client, service_name)
 
             self._clients[client_key] = client
             return client
@@ -212,6 +229,13 @@ class AwsClientProvider(AwsClientProviderProtocol):
     def aws_endpoints(self) -> AwsEndpoints:
         return self._aws_endpoints
 
+    @property
+    def transport_stats(self) -> AwsTransportStats:
+        """
+        per-service api call latency, retry and throttle counters for all clients built by this provider
+        """
+        return self._transport_stats
+
     def aws_partition(self) -> str:
         return self._session.get_partition_for_region(self.aws_region())
 
@@ -0,0 +1,192 @@
+#  Copyright Amazon.com, Inc. or its affiliates. All Rights Reserved.
+#
+#  Licensed under the Apache License, Version 2.0 (the "License"). You may not use this file except in compliance
+#  with the License. A copy of the License is located at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+#  or in the 'license' file accompanying this file. This file is distributed on an 'AS IS' BASIS, WITHOUT WARRANTIES
+#  OR CONDITIONS OF ANY KIND, express or implied. See the License for the specific language governing permissions
+#  and limitations under the License.
+
+from ideadatamodel import exceptions
+from ideasdk.utils import Utils
+
+from typing import Dict, Optional, Callable, Any
+from threading import RLock
+import logging
+import time
+
+THROTTLING_ERROR_CODES = {
+    'Throttling',
+    'ThrottlingException',
+    'ThrottledException',
+    'RequestThrottled',
+    'RequestThrottledException',
+    'RequestLimitExceeded',
+    'TooManyRequestsException',
+    'SlowDown',
+    'ProvisionedThroughputExceededException',
+    'EC2ThrottledException',
+}
+
+
+class TokenBucket:
+    """
+    Thread safe token bucket with additive increase / multiplicative decrease (AIMD) of the refill rate.
+
+    acquire() reserves a token and blocks until the token is available. tokens are reserved in the order of
+    arrival, so concurrent callers are paced at the current rate instead of competing for the next token.
+
+    on_throttle() halves the rate (bounded by min_rate) and drains the bucket, so that burst capacity is not used
+    right after a throttling error. on_success() increases the rate by increase_step, up to max_rate.
+    """
+
+    def __init__(
+        self,
+        rate: float,
+        burst: float,
+        min_rate: Optional[float] = None,
+        max_rate: Optional[float] = None,
+        increase_step: float = 0.05,
+        backoff_factor: float = 0.5,
+        clock: Callable[[], float] = time.monotonic,
+        sleep: Callable[[float], Any] = time.sleep,
+    ):
+        if rate <= 0:
+            raise exceptions.invalid_params('rate must be greater than 0')
+        if burst < 1:
+            raise exceptions.invalid_params('burst must be greater than or equal to 1')
+
+        self.max_rate = float(max_rate if max_rate is not None else rate)
+        self.min_rate = float(min_rate if min_rate is not None else rate / 20)
+        self.burst = float(burst)
+        self.increase_step = increase_step
+        self.backoff_factor = backoff_factor
+
+        self._rate = float(rate)
+        self._tokens = float(burst)
+        self._clock = clock
+        self._sleep = sleep
+        self._last_refill = clock()
+        self._lock = RLock()
+
+        self.throttle_count = 0
+        self.total_wait_seconds = 0.0
+
+    @property
+    def rate(self) -> float:
+        return self._rate
+
+    def _refill(self, now: float):
+        elapsed = now - self._last_refill
+        if elapsed > 0:
+            self._tokens = min(self.burst, self._tokens + elapsed * self._rate)
+            self._last_refill = now
+
+    def reserve(self, tokens: float = 1) -> float:
+        """
+        reserve tokens without blocking
+        :return: the duration in seconds the caller must wait before proceeding
+        """
+        with self._lock:
+            self._refill(self._clock())
+            self._tokens -= tokens
+            if self._tokens >= 0:
+                return 0.0
+            wait = -self._tokens / self._rate
+            self.total_wait_seconds += wait
+            return wait
+
+    def acquire(self, tokens: float = 1) -> float:
+        wait = self.reserve(tokens)
+        if wait > 0:
+            self._sleep(wait)
+        return wait
+
+    def on_throttle(self):
+        with self._lock:
+            self._refill(self._clock())
+            self.throttle_count += 1
+            self._rate = max(self.min_rate, self._rate * self.backoff_factor)
+            self._tokens = min(self._tokens, 0.0)
+
+    def on_success(self):
+        with self._lock:
+            if self._rate < self.max_rate:
+                self._refill(self._clock())
+                self._rate = min(self.max_rate, self._rate + self.increase_step)
+
+
+class AwsRateGovernor:
+    """
+    Client side rate limits for AWS API calls, shared across threads.
+
+    A TokenBucket is maintained per AWS service. Buckets are applied to boto3 clients using botocore event hooks:
+    * before-send: a token is acquired before each HTTP request, including retries.
+    * needs-retry: throttling errors reduce the rate of the service bucket. successful responses gradually restore it.
+
+    services without a configured bucket are not rate limited.
+    """
+
+    def __init__(self, logger: Optional[logging.Logger] = None):
+        self._logger = logger
+        self._buckets: Dict[str, TokenBucket] = {}
+        self._lock = RLock()
+
+    def add_bucket(self, service_name: str, bucket: TokenBucket) -> TokenBucket:
+        with self._lock:
+            self._buckets[service_name] = bucket
+        return bucket
+
+    def get_bucket(self, service_name: str) -> Optional[TokenBucket]:
+        return self._buckets.get(service_name)
+
+    def acquire(self, service_name: str, tokens: float = 1) -> float:
+        bucket = self.get_bucket(service_name)
+        if bucket is None:
+            return 0.0
+        return bucket.acquire(tokens)
+
+    @staticmethod
+    def is_throttling_error(error_code: Optional[str]) -> bool:
+        return error_code in THROTTLING_ERROR_CODES
+
+    def on_response(self, service_name: str, error_code: Optional[str] = None):
+        bucket = self.get_bucket(service_name)
+        if bucket is None:
+            return
+        if self.is_throttling_error(error_code):
+            bucket.on_throttle()
+            if self._logger is not None:
+                self._logger.warning(
+                    f'{service_name} API calls throttled ({error_code}). '
+                    f'reducing request rate to: {bucket.rate:.2f}/s'
+                )
+        elif error_code is None:
+            bucket.on_success()
+
+    def attach(self, client, service_name: str):
+        """
+        attach the governor to a boto3 client. attach must be called only once per client instance.
+        """
+        event_name = client.meta.service_model.service_id.hyphenize()
+
+        def before_send(**_):
+            self.acquire(service_name)
+            # returning None lets botocore send the request
+            return None
+
+        def needs_retry(response=None, **_):
+            if response is None:
+                return None
+            parsed = response[1]
+            error_code = Utils.get_value_as_string(
+                'Code', Utils.get_value_as_dict('Error', parsed)
+            )
+            self.on_response(service_name, error_code)
+            return None
+
+        client.meta.events.register(f'before-send.{event_name}', before_send)
+        client.meta.events.register(f'needs-retry.{event_name}', needs_retry)
+        return client
@@ -0,0 +1,255 @@
+#  Copyright Amazon.com, Inc. or its affiliates. All Rights Reserved.
+#
+#  Licensed under the Apache License, Version 2.0 (the "License"). You may not use this file except in compliance
+#  with the License. A copy of the License is located at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+#  or in the 'license' file accompanying this file. This file is distributed on an 'AS IS' BASIS, WITHOUT WARRANTIES
+#  OR CONDITIONS OF ANY KIND, express or implied. See the License for the specific language governing permissions
+#  and limitations under the License.
+
+from ideadatamodel import SocaBaseModel
+from ideasdk.aws.aws_rate_governor import THROTTLING_ERROR_CODES
+from ideasdk.utils import Utils
+
+from typing import Dict, Optional
+from threading import RLock
+from pydantic import Field
+from botocore.client import Config
+import time
+
+# botocore default
+DEFAULT_MAX_POOL_CONNECTIONS = 10
+
+# connections reserved for background threads (monitors, pollers, housekeeping etc.), in addition to api server workers
+BACKGROUND_POOL_CONNECTIONS = 10
+
+DEFAULT_RETRY_MODE = 'adaptive'
+DEFAULT_MAX_ATTEMPTS = 5
+
+# request context key used to track the start time of an api call
+CALL_START_CONTEXT_KEY = 'idea_transport_call_start'
+
+
+class AwsTransportProfile(SocaBaseModel):
+    """
+    HTTP transport and retry configuration for a boto3 client.
+    fields that are not set use the botocore defaults.
+    """
+
+    max_pool_connections: Optional[int] = Field(default=None)
+    retry_mode: Optional[str] = Field(default=None)
+    max_attempts: Optional[int] = Field(default=None)
+    connect_timeout: Optional[float] = Field(default=None)
+    read_timeout: Optional[float] = Field(default=None)
+    tcp_keepalive: Optional[bool] = Field(default=None)
+
+    def merge(self, profile: Optional['AwsTransportProfile']) -> 'AwsTransportProfile':
+        """
+        :return: a new profile with the fields set in profile overriding the fields in this profile
+        """
+        result = self.model_copy()
+        if profile is None:
+            return result
+        for name, value in profile.model_dump(exclude_none=True).items():
+            setattr(result, name, value)
+        return result
+
+    def build_config(self, **kwargs) -> Config:
+        """
+        :param kwargs: additional botocore Config parameters. eg. signature_version
+        """
+        params = dict(kwargs)
+        if self.max_pool_connections is not None:
+            params['max_pool_connections'] = self.max_pool_connections
+        if self.connect_timeout is not None:
+            params['connect_timeout'] = self.connect_timeout
+        if self.read_timeout is not None:
+            params['read_timeout'] = self.read_timeout
+        if self.tcp_keepalive is not None:
+            params['tcp_keepalive'] = self.tcp_keepalive
+        retries = {}
+        if self.retry_mode is not None:
+            retries['mode'] = self.retry_mode
+        if self.max_attempts is not None:
+            retries['total_max_attempts'] = self.max_attempts
+        if len(retries) > 0:
+            params['retries'] = retries
+        return Config(**params)
+
+
+class AwsTransportOptions(SocaBaseModel):
+    default: Optional[AwsTransportProfile] = Field(default=None)
+    # service name -> profile overrides. eg. dynamodb, sqs, ec2
+    services: Optional[Dict[str, AwsTransportProfile]] = Field(default=None)
+
+    @staticmethod
+    def build_default(max_workers: int = 0) -> 'AwsTransportOptions':
+        """
+        default transport options, with connection pools sized for max_workers concurrent api server workers
+        """
+        return AwsTransportOptions(
+            default=AwsTransportProfile(
+                max_pool_connections=max(
+                    DEFAULT_MAX_POOL_CONNECTIONS,
+                    max_workers + BACKGROUND_POOL_CONNECTIONS,
+                ),
+                retry_mode=DEFAULT_RETRY_MODE,
+                max_attempts=DEFAULT_MAX_ATTEMPTS,
+                tcp_keepalive=True,
+            )
+        )
+
+    @staticmethod
+    def from_config(
+        transport_config: Optional[Dict], max_workers: int = 0
+    ) -> 'AwsTransportOptions':
+        """
+        build transport options from module settings. settings override the defaults.
+
+        aws_transport:
+          max_pool_connections: 32
+          retry_mode: adaptive
+          services:
+            dynamodb:
+              max_pool_connections: 64
+        """
+        options = AwsTransportOptions.build_default(max_workers=max_workers)
+        if Utils.is_empty(transport_config):
+            return options
+
+        default_config = {
+            key: value for key, value in transport_config.items() if key != 'services'
+        }
+        options.default = options.default.merge(AwsTransportProfile(**default_config))
+
+        services = {}
+        services_config = Utils.get_value_as_dict(
+            'services', transport_config, default={}
+        )
+        for service_name, service_config in services_config.items():
+            services[service_name] = AwsTransportProfile(**dict(service_config))
+        options.services = services
+        return options
+
+    def get_profile(self, service_name: str) -> AwsTransportProfile:
+        profile = self.default
+        if profile is None:
+            profile = AwsTransportProfile()
+        if self.services is not None:
+            profile = profile.merge(self.services.get(service_name))
+        return profile
+
+
+class AwsServiceCallStats:
+    def __init__(self):
+        self.calls = 0
+        self.errors = 0
+        self.retries = 0
+        self.throttles = 0
+        self.latency_ms_total = 0.0
+        self.latency_ms_max = 0.0
+
+    def to_dict(self) -> Dict:
+        return {
+            'calls': self.calls,
+            'errors': self.errors,
+            'retries': self.retries,
+            'throttles': self.throttles,
+            'latency_ms_total': self.latency_ms_total,
+            'latency_ms_max': self.latency_ms_max,
+        }
+
+
+class AwsTransportStats:
+    """
+    Per-service AWS API call latency, retry and throttle counters.
+
+    Counters are collected using botocore event hooks and are cumulative since start-up:
+    * before-call: start time of the api call, including all retry attempts
+    * needs-retry: emitted after each attempt. attempts > 1 are counted as retries and throttling errors as throttles.
+    * after-call/after-call-error: latency of the api call and errors
+    """
+
+    def __init__(self):
+        self._stats: Dict[str, AwsServiceCallStats] = {}
+        self._lock = RLock()
+
+    def _get_stats(self, service_name: str) -> AwsServiceCallStats:
+        stats = self._stats.get(service_name)
+        if stats is not None:
+            return stats
+        with self._lock:
+            stats = self._stats.get(service_name)
+            if stats is None:
+                stats = AwsServiceCallStats()
+                self._stats[service_name] = stats
+            return stats
+
+    def _on_call_complete(self, service_name: str, context: Dict, error: bool):
+        start = context.pop(CALL_START_CONTEXT_KEY, None)
+        stats = self._get_stats(service_name)
+        with self._lock:
+            stats.calls += 1
+            if error:
+                stats.errors += 1
+            if start is not None:
+                latency_ms = (time.perf_counter() - start) * 1000
+                stats.latency_ms_total += latency_ms
+                stats.latency_ms_max = max(stats.latency_ms_max, latency_ms)
+
+    def _on_attempt(self, service_name: str, attempts: int, response):
+        retry = attempts is not None and attempts > 1
+        throttle = False
+        if response is not None:
+            error_code = Utils.get_value_as_string(
+                'Code', Utils.get_value_as_dict('Error', response[1])
+            )
+            throttle = error_code in THROTTLING_ERROR_CODES
+        if not retry and not throttle:
+            return
+        stats = self._get_stats(service_name)
+        with self._lock:
+            if retry:
+                stats.retries += 1
+            if throttle:
+                stats.throttles += 1
+
+    def attach(self, client, service_name: str):
+        """
+        attach the stats collectors to a boto3 client. attach must be called only once per client instance.
+        """
+        event_name = client.meta.service_model.service_id.hyphenize()
+
+        def before_call(context=None, **_):
+            if context is not None:
+                context[CALL_START_CONTEXT_KEY] = time.perf_counter()
+            return None
+
+        def needs_retry(attempts=None, response=None, **_):
+            self._on_attempt(service_name, attempts, response)
+            return None
+
+        def after_call(http_response=None, context=None, **_):
+            error = http_response is not None and http_response.status_code >= 300
+            self._on_call_complete(service_name, context or {}, error=error)
+
+        def after_call_error(context=None, **_):
+            self._on_call_complete(service_name, context or {}, error=True)
+
+        client.meta.events.register(f'before-call.{event_name}', before_call)
+        client.meta.events.register(f'needs-retry.{event_name}', needs_retry)
+        client.meta.events.register(f'after-call.{event_name}', after_call)
+        client.meta.events.register(f'after-call-error.{event_name}', after_call_error)
+        return client
+
+    def snapshot(self) -> Dict[str, Dict]:
+        """
+        :return: service name -> cumulative counters
+        """
+        with self._lock:
+            return {
+                service_name: stats.to_dict()
+                for service_name, stats in self._stats.items()
+            }
@@ -32,12 +32,11 @@ from ideadatamodel import (
     AwsProjectBudget,
     SocaJob,
 )
-from ideasdk.aws import EC2InstanceTypesDB
+from ideasdk.aws import EC2InstanceTypesDB, EC2PricingCatalog
 
 from typing import Dict, List, Optional, Tuple, Set, Callable, TypeVar
 import botocore.exceptions
 from threading import RLock
-from ast import literal_eval
 import time
 
 T = TypeVar('T')
@@ -81,6 +80,7 @@ class AWSUtil(AWSUtilProtocol):
         self._context = context
         self._logger = context.logger()
         self._ec2_instance_types_db = EC2InstanceTypesDB(context=self._context)
+        self._ec2_pricing_catalog = EC2PricingCatalog(context=self._context, aws=aws)
         self._cluster_config_lock = RLock()
         self._aws = aws
 
@@ -589,7 +589,7 @@ class AWSUtil(AWSUtilProtocol):
                 instance_count = Utils.get_value_as_int(
                     'InstanceCount', reservation, default=0
                 )
-                if instance_type in instance_types:
+                if instance_type in response:
                     response[instance_type] += instance_count
                 else:
                     response[instance_type] = instance_count
@@ -811,108 +811,7 @@ class AWSUtil(AWSUtilProtocol):
     def get_ec2_instance_type_unit_price(
         self, instance_type: str
     ) -> EC2InstanceUnitPrice:
-        cache_key = f'aws.pricing.instance-type.{instance_type}'
-
-        pricing = self._context.cache().long_term().get(key=cache_key)
-        if pricing is not None:
-            return pricing
-
-        # todo - move external / autodiscovery
-        region_mapping = {
-            'af-south-1': 'AFS1-',
-            'ap-east-1': 'APE1-',
-            'ap-northeast-1': 'APN1-',
-            'ap-northeast-2': 'APN2-',
-            'ap-northeast-3': 'APN3-',
-            'ap-south-1': 'APS3-',
-            'ap-southeast-1': 'APS1-',
-            'ap-southeast-2': 'APS2-',
-            'ap-southeast-3': 'APS4-',
-            'ca-central-1': 'CAC1-',
-            'eu-central-1': 'EUC1-',
-            'eu-north-1': 'EUN1-',
-            'eu-south-1': 'EUS1-',
-            'eu-west-1': 'EUW1-',
-            'eu-west-2': 'EUW2-',
-            'eu-west-3': 'EUW3-',
-            'me-central-1': 'MEC1-',
-            'me-south-1': 'MES1-',
-            'sa-east-1': 'SAE1-',
-            'us-east-1': '',
-            'us-east-2': 'USE2-',
-            'us-gov-east-1': 'UGE1-',
-            'us-gov-west-1': 'UGW1-',
-            'us-west-1': 'USW1-',
-            'us-west-2': 'USW2-',
-        }
-
-        region = self.aws().aws_region()
-        try:
-            response = (
-                self.aws()
-                .pricing()
-                .get_products(
-                    ServiceCode='AmazonEC2',
-                    Filters=[
-                        {
-                            'Type': 'TERM_MATCH',
-                            'Field': 'usageType',
-                            'Value': f'{region_mapping[region]}BoxUsage:{instance_type}',
-                        }
-                    ],
-                )
-            )
-        except Exception as err:
-            # raise exceptions.soca_exception(
-            #   error_code=errorcodes.GETPRODUCTS_FAILURE,
-            #    message=f'GetProducts failure: {region}/{instance_type}: {err}'
-            # )
-            # todo - should this be a param to determine blocking behavior?
-            # If we fail here - newly submitted jobs would fail for something like a pricing API failure.
-            # todo - this also takes place in GovCloud as there is no pricing API endpoint _in_ GovCloud and we may not have commercial region credentials
-            self._logger.warning(
-                f'Failure trying to determine pricing for {region}/{instance_type}: {err}'
-            )
-            pricing = EC2InstanceUnitPrice(ondemand=0.0, reserved=0.0)
-            self._context.cache().long_term().set(key=cache_key, value=pricing)
-            return pricing
-
-        ondemand = 0.0
-        reserved = 0.0
-        for data in response['PriceList']:
-            data = literal_eval(data)
-            for k, v in data['terms'].items():
-                if k == 'OnDemand':
-                    for skus in v.keys():
-                        for ratecode in v[skus]['priceDimensions'].keys():
-                            instance_data = v[skus]['priceDimensions'][ratecode]
-                            if (
-                                f'on demand linux {instance_type} instance hour'
-                                in instance_data['description'].lower()
-                            ):
-                                ondemand = float(instance_data['pricePerUnit']['USD'])
-                else:
-                    for skus in v.keys():
-                        if (
-                            v[skus]['termAttributes']['OfferingClass'] == 'standard'
-                            and v[skus]['termAttributes']['LeaseContractLength']
-                            == '1yr'
-                            and v[skus]['termAttributes']['PurchaseOption']
-                            == 'No Upfront'
-                        ):
-                            for ratecode in v[skus]['priceDimensions'].keys():
-                                instance_data = v[skus]['priceDimensions'][ratecode]
-                                if (
-                                    'Linux/UNIX (Amazon VPC)'
-                                    in instance_data['description']
-                                ):
-                                    reserved = float(
-                                        instance_data['pricePerUnit']['USD']
-                                    )
-
-        pricing = EC2InstanceUnitPrice(ondemand=ondemand, reserved=reserved)
-        self._context.cache().long_term().set(key=cache_key, value=pricing)
-        return pricing
+        return self._ec2_pricing_catalog.get(instance_type=instance_type)
 
     def budgets_get_budget(self, budget_name: str) -> Optional[AwsProjectBudget]:
         """
@@ -1015,7 +914,7 @@ class AWSUtil(AWSUtilProtocol):
                     continue
                 if line.startswith('# ---'):
                     continue
-                line = line.replace('# ', '')
+                line = line[2:]
                 job_lines.append(line)
 
         if len(job_lines) == 0:
@@ -1074,6 +973,88 @@ class AWSUtil(AWSUtilProtocol):
             else:
                 raise e
 
+    def dynamodb_get_global_secondary_index_status(
+        self, table_name: str, index_name: str
+    ) -> Optional[str]:
+        """
+        :return: IndexStatus of the global secondary index (CREATING, UPDATING, DELETING, ACTIVE) or None if the index does not exist
+        """
+        describe_table_result = (
+            self.aws().dynamodb().describe_table(TableName=table_name)
+        )
+        global_secondary_indexes = Utils.get_value_as_list(
+            'GlobalSecondaryIndexes', describe_table_result['Table'], []
+        )
+        for index in global_secondary_indexes:
+            if index['IndexName'] == index_name:
+                return index['IndexStatus']
+        return None
+
+    def dynamodb_create_global_secondary_index(
+        self, table_name: str, index: Dict, attribute_definitions: List[Dict]
+    ) -> bool:
+        """
+        add a global secondary index to an existing table.
+        the index is backfilled asynchronously by DynamoDB. check the index status before querying the index.
+
+        :param table_name:
+        :param index: GlobalSecondaryIndex definition (IndexName, KeySchema, Projection)
+        :param attribute_definitions: definitions of the index key attributes
+        :return: True if the index did not exist and was created. False if the index already exists
+        """
+        index_name = index['IndexName']
+        status = self.dynamodb_get_global_secondary_index_status(table_name, index_name)
+        if status is not None:
+            return False
+
+        self._logger.info(
+            f'creating global secondary index: {index_name} for dynamodb table: {table_name} ...'
+        )
+        self.aws().dynamodb().update_table(
+            TableName=table_name,
+            AttributeDefinitions=attribute_definitions,
+            GlobalSecondaryIndexUpdates=[{'Create': index}],
+        )
+        return True
+
+    def dynamodb_is_backfill_complete(
+        self, table_name: str, backfill_name: str
+    ) -> bool:
+        """
+        check if a backfill of existing items (e.g. for a global secondary index added to an existing table) was
+        completed. see dynamodb_set_backfill_complete()
+        """
+        dynamodb = self.aws().dynamodb()
+        table_arn = dynamodb.describe_table(TableName=table_name)['Table']['TableArn']
+        tag_key = f'{constants.IDEA_TAG_BACKFILL_PREFIX}{backfill_name}'
+        list_tags_request = {'ResourceArn': table_arn}
+        while True:
+            result = dynamodb.list_tags_of_resource(**list_tags_request)
+            for tag in Utils.get_value_as_list('Tags', result, []):
+                if tag['Key'] == tag_key:
+                    return True
+            next_token = Utils.get_value_as_string('NextToken', result)
+            if Utils.is_empty(next_token):
+                return False
+            list_tags_request['NextToken'] = next_token
+
+    def dynamodb_set_backfill_complete(self, table_name: str, backfill_name: str):
+        """
+        record the completion of a backfill as a table tag.
+        backfills are expected to be idempotent and re-run until the completion is recorded.
+        """
+        dynamodb = self.aws().dynamodb()
+        table_arn = dynamodb.describe_table(TableName=table_name)['Table']['TableArn']
+        dynamodb.tag_resource(
+            ResourceArn=table_arn,
+            Tags=[
+                {
+                    'Key': f'{constants.IDEA_TAG_BACKFILL_PREFIX}{backfill_name}',
+                    'Value': 'completed',
+                }
+            ],
+        )
+
     def get_default_dynamodb_tags(self):
         default_tags = {
             constants.IDEA_TAG_CLUSTER_NAME: self._context.cluster_name(),
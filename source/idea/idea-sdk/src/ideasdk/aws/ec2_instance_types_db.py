@@ -13,14 +13,9 @@ from ideasdk.protocols import SocaContextProtocol
 from ideasdk.utils import Utils
 from ideadatamodel import exceptions, errorcodes, EC2InstanceType
 
-from typing import Optional, Set, List
-from cacheout import Cache
-from threading import RLock
-
-INSTANCE_TYPES_CACHE_SIZE: int = (
-    2048  # AWS has 700-800+ instance types; use 2x for headroom
-)
-INSTANCE_TYPES_TTL_SECS: int = 15 * 24 * 60 * 60  # 15 days
+from typing import Optional, Set, List, Dict
+from threading import RLock, Thread
+import os
 
 # EC2 instance capability cache from describe_instance_types
 # This is the amount of time that an instance type could remain
@@ -29,8 +24,24 @@ FALLBACK_INSTANCE_TYPES_REFRESH_INTERVAL = int(
     12 * 60 * 60
 )  # 12-hours default. Value is in seconds
 
+INSTANCE_TYPES_SNAPSHOT_VERSION = 1
+
 
 class EC2InstanceTypesDB:
+    """
+    Catalog of EC2 instance types available in the region, as returned by ec2:DescribeInstanceTypes
+
+    The catalog is a dict, which is never modified after it is published. Refreshes build a new catalog and replace
+    the reference at once, so lookups never wait for a refresh and never see a partially populated catalog:
+
+    * when the refresh interval expires, a background thread builds a new catalog. lookups are served from the
+      current catalog until the new catalog is swapped in.
+    * the last good catalog is saved to a snapshot file on local disk. on start-up, the snapshot is loaded and lookups
+      are served immediately. if the snapshot is older than the refresh interval, a refresh is started in background.
+    * instance types not found in the catalog (eg. released after the last refresh) are fetched individually and added
+      to a copy of the catalog.
+    """
+
     def __init__(self, context: SocaContextProtocol):
         self._context = context
         self._logger = context.logger()
@@ -39,89 +50,211 @@ class EC2InstanceTypesDB:
             default=int(FALLBACK_INSTANCE_TYPES_REFRESH_INTERVAL),
         )
         self._cache_last_refresh = int(0)  # Force refresh
-        self._cache = Cache(
-            maxsize=INSTANCE_TYPES_CACHE_SIZE, ttl=INSTANCE_TYPES_TTL_SECS
-        )
+        self._catalog: Dict[str, EC2InstanceType] = {}
         self._instance_types_lock = RLock()
-        self._add_instance_data_to_cache()
+        self._refresh_thread: Optional[Thread] = None
+        self._snapshot_file = self._get_snapshot_file()
 
-    def _add_instance_data_to_cache(self):
-        _start_ec2_data: int = Utils.current_time_ms()
-        self._logger.debug('Starting EC2 instance type cache collection')
+        if self._load_snapshot():
+            if self._is_refresh_due():
+                self._start_background_refresh()
+        else:
+            self._refresh_catalog()
 
-        with self._instance_types_lock:
-            if self._cache.size():
+    def _get_snapshot_file(self) -> Optional[str]:
+        enabled = self._context.config().get_bool(
+            key='scheduler.cache.instance_types_snapshot_enabled', default=True
+        )
+        if not enabled:
+            return None
+        region = self._context.aws().aws_region()
+        return os.path.join(
+            Utils.app_deploy_dir(), 'cache', f'ec2-instance-types-{region}.json'
+        )
+
+    def _load_snapshot(self) -> bool:
+        """
+        load the catalog from the snapshot file
+        :return: True if the catalog was loaded, False if snapshot is disabled, not found or invalid
+        """
+        if self._snapshot_file is None or not os.path.isfile(self._snapshot_file):
+            return False
+        try:
+            with open(self._snapshot_file, 'r') as f:
+                snapshot = Utils.from_json(f.read())
+
+            version = Utils.get_value_as_int('version', snapshot, default=0)
+            if version != INSTANCE_TYPES_SNAPSHOT_VERSION:
                 self._logger.info(
-                    f'Emptying EC2 instance type cache: {self._cache.size()}'
+                    f'Ignoring EC2 instance type snapshot with version: {version}'
                 )
-                self._cache.clear()
+                return False
+
+            catalog = {}
+            for instance_data in Utils.get_value_as_list(
+                'instance_types', snapshot, default=[]
+            ):
+                instance_name = Utils.get_value_as_string('InstanceType', instance_data)
+                if instance_name is None:
+                    continue
+                catalog[instance_name] = EC2InstanceType(data=instance_data)
 
-            try:
-                _ec2_paginator = (
-                    self._context.aws().ec2().get_paginator('describe_instance_types')
+            if len(catalog) == 0:
+                return False
+
+            with self._instance_types_lock:
+                self._catalog = catalog
+                self._cache_last_refresh = Utils.get_value_as_int(
+                    'refreshed_at', snapshot, default=0
                 )
-                _ec2_iterator = _ec2_paginator.paginate(MaxResults=100)
+            self._logger.info(
+                f'Loaded {len(catalog)} EC2 instance types from snapshot: {self._snapshot_file}'
+            )
+            return True
+        except Exception as e:
+            self._logger.warning(
+                f'Failed to load EC2 instance type snapshot: {self._snapshot_file} - {e}'
+            )
+            return False
 
-                _page_num: int = 0
-                for _page in _ec2_iterator:
-                    _page_num += 1
-                    _page_start: int = Utils.current_time_ms()
+    def _save_snapshot(self, catalog: Dict[str, EC2InstanceType], refreshed_at: int):
+        if self._snapshot_file is None:
+            return
+        try:
+            os.makedirs(os.path.dirname(self._snapshot_file), exist_ok=True)
+            snapshot = {
+                'version': INSTANCE_TYPES_SNAPSHOT_VERSION,
+                'refreshed_at': refreshed_at,
+                'instance_types': [
+                    instance_type.instance_type_data()
+                    for instance_type in catalog.values()
+                ],
+            }
+            # write to a temp file and rename, so that a partially written snapshot is never loaded
+            temp_file = f'{self._snapshot_file}.{os.getpid()}.tmp'
+            with open(temp_file, 'w') as f:
+                f.write(Utils.to_json(snapshot))
+            os.replace(temp_file, self._snapshot_file)
+        except Exception as e:
+            self._logger.warning(
+                f'Failed to save EC2 instance type snapshot: {self._snapshot_file} - {e}'
+            )
 
-                    _instance_types: list = Utils.get_value_as_list(
-                        key='InstanceTypes', obj=_page
-                    )
+    def _build_catalog(self, catalog: Dict[str, EC2InstanceType]):
+        _ec2_paginator = (
+            self._context.aws().ec2().get_paginator('describe_instance_types')
+        )
+        _ec2_iterator = _ec2_paginator.paginate(MaxResults=100)
 
-                    for _instance_data in _instance_types:
-                        _instance_name: str = Utils.get_value_as_string(
-                            key='InstanceType', obj=_instance_data, default=None
-                        )
-
-                        if _instance_name is None:
-                            self._logger.error(
-                                f'Missing InstanceType? InstanceType: {_instance_name} for: {_instance_data}'
-                            )
-                            raise exceptions.SocaException(
-                                error_code=errorcodes.INVALID_EC2_INSTANCE_TYPE,
-                                message=f'ec2 instance_type is invalid: {_instance_name}',
-                            )
-
-                        self._cache.set(
-                            key=_instance_name,
-                            value=EC2InstanceType(data=_instance_data),
-                        )
-
-                    _page_stop: int = Utils.current_time_ms()
-                    self._logger.debug(
-                        f'Instance Type Cache - Page #{_page_num}: Added {len(_instance_types)} to {self._cache.size()} - duration {_page_stop - _page_start}ms'
-                    )
+        _page_num: int = 0
+        for _page in _ec2_iterator:
+            _page_num += 1
+            _page_start: int = Utils.current_time_ms()
 
-                _end_ec2_data: int = Utils.current_time_ms()
-                self._cache_last_refresh = Utils.current_time()
-                self._logger.info(
-                    f'EC2 instance type cache refresh completed - '
-                    f'Cached {self._cache.size()} instance types in {_end_ec2_data - _start_ec2_data}ms'
-                )
+            _instance_types: list = Utils.get_value_as_list(
+                key='InstanceTypes', obj=_page
+            )
 
-            except Exception as e:
-                self._logger.error(
-                    f'Failed to populate EC2 instance type cache completely. Cache may be incomplete. Error: {e}',
-                    exc_info=True,
+            for _instance_data in _instance_types:
+                _instance_name: str = Utils.get_value_as_string(
+                    key='InstanceType', obj=_instance_data, default=None
                 )
+
+                if _instance_name is None:
+                    self._logger.error(
+                        f'Missing InstanceType? InstanceType: {_instance_name} for: {_instance_data}'
+                    )
+                    raise exceptions.SocaException(
+                        error_code=errorcodes.INVALID_EC2_INSTANCE_TYPE,
+                        message=f'ec2 instance_type is invalid: {_instance_name}',
+                    )
+
+                catalog[_instance_name] = EC2InstanceType(data=_instance_data)
+
+            _page_stop: int = Utils.current_time_ms()
+            self._logger.debug(
+                f'Instance Type Catalog - Page #{_page_num}: Added {len(_instance_types)} to {len(catalog)} - duration {_page_stop - _page_start}ms'
+            )
+
+    def _refresh_catalog(self):
+        """
+        build a new catalog from ec2:DescribeInstanceTypes and swap it in.
+        on failure, the current catalog is retained.
+        """
+        _start_ec2_data: int = Utils.current_time_ms()
+        self._logger.debug('Starting EC2 instance type catalog refresh')
+
+        catalog: Dict[str, EC2InstanceType] = {}
+        try:
+            self._build_catalog(catalog)
+        except Exception as e:
+            self._logger.error(
+                f'Failed to refresh EC2 instance type catalog. Error: {e}',
+                exc_info=True,
+            )
+            with self._instance_types_lock:
                 # Set last refresh time anyway to avoid hammering the API
                 self._cache_last_refresh = Utils.current_time()
-                # Re-raise if cache is empty - this is a critical failure
-                if self._cache.size() == 0:
+                if len(self._catalog) > 0:
+                    self._logger.warning(
+                        f'Retaining current EC2 instance type catalog: {len(self._catalog)} instance types'
+                    )
+                    return
+                # Re-raise if catalog is empty - this is a critical failure
+                if len(catalog) == 0:
                     raise
+                self._logger.warning(
+                    f'EC2 instance type catalog is incomplete: {len(catalog)} instance types'
+                )
+                self._catalog = catalog
+            return
+
+        refreshed_at = Utils.current_time()
+        with self._instance_types_lock:
+            self._catalog = catalog
+            self._cache_last_refresh = refreshed_at
+
+        _end_ec2_data: int = Utils.current_time_ms()
+        self._logger.info(
+            f'EC2 instance type catalog refresh completed - '
+            f'Cached {len(catalog)} instance types in {_end_ec2_data - _start_ec2_data}ms'
+        )
+        self._save_snapshot(catalog=catalog, refreshed_at=refreshed_at)
+
+    def _background_refresh(self):
+        try:
+            self._refresh_catalog()
+        except Exception as e:
+            self._logger.error(f'EC2 instance type catalog refresh failed: {e}')
+
+    def _is_refresh_due(self) -> bool:
+        return (
+            Utils.current_time() - self._cache_refresh_interval
+        ) > self._cache_last_refresh
+
+    def _start_background_refresh(self):
+        with self._instance_types_lock:
+            if self._refresh_thread is not None and self._refresh_thread.is_alive():
+                return
+            self._logger.debug(
+                f'Refreshing EC2 Describe_Instance_Types catalog in background... Last refresh: {self._cache_last_refresh}. MaxAllowed: {self._cache_refresh_interval}'
+            )
+            self._refresh_thread = Thread(
+                name='ec2-instance-types-refresh',
+                target=self._background_refresh,
+                daemon=True,
+            )
+            self._refresh_thread.start()
 
     def _instance_type_names_from_botocore(self) -> List[str]:
         """
-        Return all instance type names from the cache.
+        Return all instance type names from the catalog.
         This method exists primarily to be mocked during unit tests.
         """
-        return list(self._cache.keys())
+        return list(self._catalog.keys())
 
     def all_instance_type_names(self) -> Set[str]:
-        return set(self._cache.keys())
+        return set(self._catalog.keys())
 
     def _fetch_single_instance_type(
         self, instance_type: str
@@ -142,9 +275,11 @@ class EC2InstanceTypesDB:
             if instance_types:
                 instance_data = instance_types[0]
                 ec2_instance_type = EC2InstanceType(data=instance_data)
-                # Cache the instance type for future use
+                # Add the instance type to a copy of the catalog for future use
                 with self._instance_types_lock:
-                    self._cache.set(key=instance_type, value=ec2_instance_type)
+                    catalog = dict(self._catalog)
+                    catalog[instance_type] = ec2_instance_type
+                    self._catalog = catalog
                 self._logger.info(
                     f'Successfully fetched and cached instance type: {instance_type}'
                 )
@@ -157,20 +292,15 @@ class EC2InstanceTypesDB:
             return None
 
     def get(self, instance_type: str) -> Optional[EC2InstanceType]:
-        _current_time: int = Utils.current_time()
-        if (_current_time - self._cache_refresh_interval) > self._cache_last_refresh:
-            self._logger.debug(
-                f'Refreshing EC2 Describe_Instance_Types cache... Last refresh: {self._cache_last_refresh} . Current: {_current_time}  MaxAllowed: {self._cache_refresh_interval}'
-            )
-            self._add_instance_data_to_cache()
+        if self._is_refresh_due():
+            self._start_background_refresh()
 
-        # Check cache first
-        if instance_type in self._cache:
-            ec2_instance_type = self._cache.get(key=instance_type)
-            if ec2_instance_type is not None:
-                return ec2_instance_type
+        # Check catalog first
+        ec2_instance_type = self._catalog.get(instance_type)
+        if ec2_instance_type is not None:
+            return ec2_instance_type
 
-        # Instance type not in cache - try to fetch it directly from AWS
+        # Instance type not in catalog - try to fetch it directly from AWS
         self._logger.warning(
             f'Instance type {instance_type} not found in cache. Attempting on-demand fetch from AWS API.'
         )
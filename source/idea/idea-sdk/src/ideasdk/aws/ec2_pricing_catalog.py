@@ -0,0 +1,355 @@
+#  Copyright Amazon.com, Inc. or its affiliates. All Rights Reserved.
+#
+#  Licensed under the Apache License, Version 2.0 (the "License"). You may not use this file except in compliance
+#  with the License. A copy of the License is located at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+#  or in the 'license' file accompanying this file. This file is distributed on an 'AS IS' BASIS, WITHOUT WARRANTIES
+#  OR CONDITIONS OF ANY KIND, express or implied. See the License for the specific language governing permissions
+#  and limitations under the License.
+
+from ideasdk.protocols import SocaContextProtocol, AwsClientProviderProtocol
+from ideasdk.utils import Utils
+from ideadatamodel import EC2InstanceUnitPrice
+
+from typing import Dict, Optional, List, Tuple
+from threading import RLock, Thread
+import os
+import json
+
+# pricing usage type prefix for the region
+# todo - move external / autodiscovery
+PRICING_USAGE_TYPE_REGION_PREFIX = {
+    'af-south-1': 'AFS1-',
+    'ap-east-1': 'APE1-',
+    'ap-northeast-1': 'APN1-',
+    'ap-northeast-2': 'APN2-',
+    'ap-northeast-3': 'APN3-',
+    'ap-south-1': 'APS3-',
+    'ap-southeast-1': 'APS1-',
+    'ap-southeast-2': 'APS2-',
+    'ap-southeast-3': 'APS4-',
+    'ca-central-1': 'CAC1-',
+    'eu-central-1': 'EUC1-',
+    'eu-north-1': 'EUN1-',
+    'eu-south-1': 'EUS1-',
+    'eu-west-1': 'EUW1-',
+    'eu-west-2': 'EUW2-',
+    'eu-west-3': 'EUW3-',
+    'me-central-1': 'MEC1-',
+    'me-south-1': 'MES1-',
+    'sa-east-1': 'SAE1-',
+    'us-east-1': '',
+    'us-east-2': 'USE2-',
+    'us-gov-east-1': 'UGE1-',
+    'us-gov-west-1': 'UGW1-',
+    'us-west-1': 'USW1-',
+    'us-west-2': 'USW2-',
+}
+
+# Linux on-demand and reserved instance pricing, for shared tenancy instances without pre-installed software.
+# these filters select the same SKUs as the BoxUsage:<instance-type> usage type, for all instance types at once.
+PRICING_BULK_FILTERS = {
+    'operatingSystem': 'Linux',
+    'tenancy': 'Shared',
+    'preInstalledSw': 'NA',
+    'capacitystatus': 'Used',
+    'licenseModel': 'No License required',
+}
+
+PRICING_PAGE_SIZE = 100
+
+FALLBACK_PRICING_REFRESH_INTERVAL = 7 * 24 * 60 * 60  # 7 days
+
+PRICING_SNAPSHOT_VERSION = 1
+
+
+class EC2PricingCatalog:
+    """
+    EC2 Linux on-demand and 1yr No Upfront reserved unit prices for the region, keyed by pricing usage type
+    (eg. USE2-BoxUsage:c5.large)
+
+    * the catalog is loaded on first use, using paginated pricing:GetProducts requests for all instance types in the
+      region, instead of a request per instance type.
+    * the catalog is saved to a snapshot file on local disk and loaded on start-up.
+    * when the refresh interval expires, a new catalog is built in background and swapped in once complete. lookups are
+      served from the current catalog in the mean time.
+    * instance types not found in the catalog are fetched individually and added to a copy of the catalog.
+
+    pricing API is not available in all partitions (eg. GovCloud). if prices cannot be fetched, unit prices
+    are reported as 0.0.
+    """
+
+    def __init__(
+        self, context: SocaContextProtocol, aws: AwsClientProviderProtocol = None
+    ):
+        self._context = context
+        self._logger = context.logger()
+        self._aws = aws
+        self._refresh_interval = self._context.config().get_int(
+            key='scheduler.cache.pricing_refresh_interval',
+            default=FALLBACK_PRICING_REFRESH_INTERVAL,
+        )
+        self._snapshot_enabled = self._context.config().get_bool(
+            key='scheduler.cache.pricing_snapshot_enabled', default=True
+        )
+
+        # usage type -> unit price
+        self._catalog: Optional[Dict[str, EC2InstanceUnitPrice]] = None
+        self._last_refresh = 0
+        self._catalog_lock = RLock()
+        self._refresh_thread: Optional[Thread] = None
+
+    def aws(self) -> AwsClientProviderProtocol:
+        if self._aws is not None:
+            return self._aws
+        return self._context.aws()
+
+    @property
+    def region(self) -> str:
+        return self.aws().aws_region()
+
+    def get_usage_type(self, instance_type: str) -> str:
+        prefix = Utils.get_value_as_string(
+            self.region, PRICING_USAGE_TYPE_REGION_PREFIX, default=''
+        )
+        return f'{prefix}BoxUsage:{instance_type}'
+
+    def get_snapshot_file(self) -> Optional[str]:
+        if not self._snapshot_enabled:
+            return None
+        return os.path.join(
+            Utils.app_deploy_dir(), 'cache', f'ec2-pricing-{self.region}.json'
+        )
+
+    @staticmethod
+    def parse_price_list_item(
+        price_list_item: str,
+    ) -> Optional[Tuple[str, EC2InstanceUnitPrice]]:
+        """
+        parse a pricing:GetProducts PriceList entry (a JSON document)
+        :return: tuple of usage type and unit price, or None if the entry is not for an instance type
+        """
+        data = json.loads(price_list_item)
+        attributes = data.get('product', {}).get('attributes', {})
+        usage_type = attributes.get('usagetype')
+        instance_type = attributes.get('instanceType')
+        if usage_type is None or instance_type is None:
+            return None
+
+        ondemand = 0.0
+        reserved = 0.0
+        for term_type, terms in data.get('terms', {}).items():
+            if term_type == 'OnDemand':
+                for term in terms.values():
+                    for price_dimension in term['priceDimensions'].values():
+                        if (
+                            f'on demand linux {instance_type} instance hour'
+                            in price_dimension['description'].lower()
+                        ):
+                            ondemand = float(price_dimension['pricePerUnit']['USD'])
+            else:
+                for term in terms.values():
+                    term_attributes = term.get('termAttributes', {})
+                    if (
+                        term_attributes.get('OfferingClass') == 'standard'
+                        and term_attributes.get('LeaseContractLength') == '1yr'
+                        and term_attributes.get('PurchaseOption') == 'No Upfront'
+                    ):
+                        for price_dimension in term['priceDimensions'].values():
+                            if (
+                                'Linux/UNIX (Amazon VPC)'
+                                in price_dimension['description']
+                            ):
+                                reserved = float(price_dimension['pricePerUnit']['USD'])
+
+        return usage_type, EC2InstanceUnitPrice(ondemand=ondemand, reserved=reserved)
+
+    def _add_price_list(
+        self, catalog: Dict[str, EC2InstanceUnitPrice], price_list: List[str]
+    ):
+        for price_list_item in price_list:
+            result = self.parse_price_list_item(price_list_item)
+            if result is None:
+                continue
+            usage_type, unit_price = result
+            catalog[usage_type] = unit_price
+
+    def _build_catalog(self) -> Dict[str, EC2InstanceUnitPrice]:
+        filters = [{'Type': 'TERM_MATCH', 'Field': 'regionCode', 'Value': self.region}]
+        for field, value in PRICING_BULK_FILTERS.items():
+            filters.append({'Type': 'TERM_MATCH', 'Field': field, 'Value': value})
+
+        catalog = {}
+        paginator = self.aws().pricing().get_paginator('get_products')
+        for page in paginator.paginate(
+            ServiceCode='AmazonEC2', Filters=filters, MaxResults=PRICING_PAGE_SIZE
+        ):
+            self._add_price_list(
+                catalog, Utils.get_value_as_list('PriceList', page, default=[])
+            )
+        return catalog
+
+    def _load_snapshot(self) -> bool:
+        snapshot_file = self.get_snapshot_file()
+        if snapshot_file is None or not os.path.isfile(snapshot_file):
+            return False
+        try:
+            with open(snapshot_file, 'r') as f:
+                snapshot = json.load(f)
+            if Utils.get_value_as_int('version', snapshot) != PRICING_SNAPSHOT_VERSION:
+                return False
+
+            # compact format: usage type -> [ondemand, reserved]
+            catalog = {}
+            for usage_type, prices in Utils.get_value_as_dict(
+                'prices', snapshot, default={}
+            ).items():
+                catalog[usage_type] = EC2InstanceUnitPrice(
+                    ondemand=prices[0], reserved=prices[1]
+                )
+            if len(catalog) == 0:
+                return False
+
+            self._catalog = catalog
+            self._last_refresh = Utils.get_value_as_int(
+                'refreshed_at', snapshot, default=0
+            )
+            self._logger.info(
+                f'Loaded {len(catalog)} EC2 instance unit prices from snapshot: {snapshot_file}'
+            )
+            return True
+        except Exception as e:
+            self._logger.warning(
+                f'Failed to load EC2 pricing snapshot: {snapshot_file} - {e}'
+            )
+            return False
+
+    def _save_snapshot(
+        self, catalog: Dict[str, EC2InstanceUnitPrice], refreshed_at: int
+    ):
+        snapshot_file = self.get_snapshot_file()
+        if snapshot_file is None:
+            return
+        try:
+            os.makedirs(os.path.dirname(snapshot_file), exist_ok=True)
+            snapshot = {
+                'version': PRICING_SNAPSHOT_VERSION,
+                'region': self.region,
+                'refreshed_at': refreshed_at,
+                'prices': {
+                    usage_type: [unit_price.ondemand, unit_price.reserved]
+                    for usage_type, unit_price in catalog.items()
+                },
+            }
+            temp_file = f'{snapshot_file}.{os.getpid()}.tmp'
+            with open(temp_file, 'w') as f:
+                json.dump(snapshot, f, separators=(',', ':'))
+            os.replace(temp_file, snapshot_file)
+        except Exception as e:
+            self._logger.warning(
+                f'Failed to save EC2 pricing snapshot: {snapshot_file} - {e}'
+            )
+
+    def refresh(self):
+        """
+        build a new catalog using bulk pricing:GetProducts requests and swap it in.
+        on failure, the current catalog is retained.
+        """
+        start = Utils.current_time_ms()
+        try:
+            catalog = self._build_catalog()
+        except Exception as e:
+            self._logger.warning(
+                f'Failed to refresh EC2 pricing catalog for region: {self.region} - {e}'
+            )
+            with self._catalog_lock:
+                # set last refresh time anyway to avoid hammering the API
+                self._last_refresh = Utils.current_time()
+                if self._catalog is None:
+                    self._catalog = {}
+            return
+
+        refreshed_at = Utils.current_time()
+        with self._catalog_lock:
+            self._catalog = catalog
+            self._last_refresh = refreshed_at
+        self._logger.info(
+            f'EC2 pricing catalog refresh completed - '
+            f'{len(catalog)} instance unit prices in {Utils.current_time_ms() - start}ms'
+        )
+        if len(catalog) > 0:
+            self._save_snapshot(catalog=catalog, refreshed_at=refreshed_at)
+
+    def _start_background_refresh(self):
+        with self._catalog_lock:
+            if self._refresh_thread is not None and self._refresh_thread.is_alive():
+                return
+            self._refresh_thread = Thread(
+                name='ec2-pricing-refresh', target=self.refresh, daemon=True
+            )
+            self._refresh_thread.start()
+
+    def _get_catalog(self) -> Dict[str, EC2InstanceUnitPrice]:
+        catalog = self._catalog
+        if catalog is None:
+            # first use: load from snapshot, or build the catalog. concurrent callers wait for a single load.
+            with self._catalog_lock:
+                if self._catalog is None:
+                    if not self._load_snapshot():
+                        self.refresh()
+                catalog = self._catalog
+
+        if (Utils.current_time() - self._refresh_interval) > self._last_refresh:
+            self._start_background_refresh()
+
+        return catalog
+
+    def fetch_unit_price(self, instance_type: str) -> EC2InstanceUnitPrice:
+        """
+        fetch the unit price for a single instance type using pricing:GetProducts
+        """
+        usage_type = self.get_usage_type(instance_type)
+        try:
+            response = (
+                self.aws()
+                .pricing()
+                .get_products(
+                    ServiceCode='AmazonEC2',
+                    Filters=[
+                        {
+                            'Type': 'TERM_MATCH',
+                            'Field': 'usageType',
+                            'Value': usage_type,
+                        }
+                    ],
+                )
+            )
+        except Exception as err:
+            # todo - should this be a param to determine blocking behavior?
+            # If we fail here - newly submitted jobs would fail for something like a pricing API failure.
+            # todo - this also takes place in GovCloud as there is no pricing API endpoint _in_ GovCloud and we may not have commercial region credentials
+            self._logger.warning(
+                f'Failure trying to determine pricing for {self.region}/{instance_type}: {err}'
+            )
+            return EC2InstanceUnitPrice(ondemand=0.0, reserved=0.0)
+
+        catalog = {}
+        self._add_price_list(
+            catalog, Utils.get_value_as_list('PriceList', response, default=[])
+        )
+        return catalog.get(usage_type, EC2InstanceUnitPrice(ondemand=0.0, reserved=0.0))
+
+    def get(self, instance_type: str) -> EC2InstanceUnitPrice:
+        usage_type = self.get_usage_type(instance_type)
+        unit_price = self._get_catalog().get(usage_type)
+        if unit_price is not None:
+            return unit_price
+
+        unit_price = self.fetch_unit_price(instance_type)
+        with self._catalog_lock:
+            catalog = dict(self._catalog)
+            catalog[usage_type] = unit_price
+            self._catalog = catalog
+        return unit_price
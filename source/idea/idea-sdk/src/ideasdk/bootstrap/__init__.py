@@ -12,3 +12,7 @@
 from ideasdk.bootstrap.bootstrap_userdata_builder import BootstrapUserDataBuilder
 from ideasdk.bootstrap.bootstrap_package_builder import BootstrapPackageBuilder
 from ideasdk.bootstrap.bootstrap_utils import BootstrapUtils
+from ideasdk.bootstrap.bootstrap_package_cache import (
+    BootstrapPackageCache,
+    BootstrapPackageOverlay,
+)
@@ -15,18 +15,38 @@ from ideasdk.context import BootstrapContext
 from ideasdk.utils import Utils, Jinja2Utils
 from ideadatamodel import exceptions
 
-from typing import List
+from jinja2 import Environment
+from typing import List, Dict
 import os
+import io
+import gzip
+import tarfile
 import tempfile
 
 _BOOTSTRAP_BUILDER_LOCK = RLock()
 
+# jinja2 environments are cached per source directory, so that compiled templates are re-used across builds.
+# the FileSystemLoader checks template mtime on each lookup, so updates to the sources are still picked up.
+_JINJA2_ENV_CACHE: Dict[str, Environment] = {}
+_JINJA2_ENV_CACHE_LOCK = RLock()
+
+
+def get_bootstrap_jinja2_env(source_directory: str) -> Environment:
+    with _JINJA2_ENV_CACHE_LOCK:
+        env = _JINJA2_ENV_CACHE.get(source_directory)
+        if env is None:
+            env = Jinja2Utils.env_using_file_system_loader(source_directory)
+            _JINJA2_ENV_CACHE[source_directory] = env
+        return env
+
 
 class BootstrapPackageBuilder:
     """
     Renders the bootstrap module and returns the path to the rendered bootstrap tar.gz file.
     The final packaged tar.gz will be returned as string path by the build method
     The caller is responsible to clean up the temporary package after uploading to S3.
+
+    Use build_archive() to render the package in memory, without writing to a temporary directory.
     """
 
     def __init__(
@@ -105,7 +125,7 @@ class BootstrapPackageBuilder:
                     shutil.make_archive(target_dir, 'gztar', target_dir)
                     return target_archive
 
-            env = Jinja2Utils.env_using_file_system_loader(self.source_directory)
+            env = get_bootstrap_jinja2_env(self.source_directory)
 
             components = os.listdir(self.source_directory)
             for component in components:
@@ -142,3 +162,89 @@ class BootstrapPackageBuilder:
 
             shutil.make_archive(target_dir, 'gztar', target_dir)
             return os.path.join(tmp_dir, f'{self.target_package_basename}.tar.gz')
+
+    @staticmethod
+    def _add_archive_entry(
+        tar: tarfile.TarFile, name: str, mode: int, content: bytes = None
+    ):
+        # owner and mtime are reset so that the archive only depends on the package contents
+        info = tarfile.TarInfo(name=name)
+        info.mode = mode
+        info.mtime = 0
+        info.uid = 0
+        info.gid = 0
+        info.uname = ''
+        info.gname = ''
+        if content is None:
+            info.type = tarfile.DIRTYPE
+            tar.addfile(info)
+        else:
+            info.size = len(content)
+            tar.addfile(info, io.BytesIO(content))
+
+    def _add_archive_directory(
+        self, tar: tarfile.TarFile, source_dir: str, archive_dir: str
+    ):
+        self._add_archive_entry(tar, archive_dir, mode=0o755)
+        for file in sorted(os.listdir(source_dir)):
+            source_file = os.path.join(source_dir, file)
+            archive_file = f'{archive_dir}/{file}'
+            if os.path.isdir(source_file):
+                self._add_archive_directory(tar, source_file, archive_file)
+            else:
+                with open(source_file, 'rb') as f:
+                    content = f.read()
+                mode = os.stat(source_file).st_mode & 0o777
+                self._add_archive_entry(tar, archive_file, mode=mode, content=content)
+
+    def build_archive(self) -> bytes:
+        """
+        render the bootstrap package in memory and return the tar.gz archive as bytes.
+
+        the archive is reproducible - entries are sorted, and timestamps and ownership are not included. the same
+        bootstrap context and sources always result in the same archive bytes, which enables the archive to be
+        addressed by its content hash. the archive layout is identical to the one created by build().
+        """
+        env = get_bootstrap_jinja2_env(self.source_directory)
+
+        buffer = io.BytesIO()
+        with gzip.GzipFile(filename='', mode='wb', fileobj=buffer, mtime=0) as gz:
+            with tarfile.open(fileobj=gz, mode='w', format=tarfile.GNU_FORMAT) as tar:
+                self._add_archive_entry(tar, '.', mode=0o755)
+                for component in sorted(os.listdir(self.source_directory)):
+                    if component == '_templates':
+                        continue
+                    if component not in self.components:
+                        continue
+                    source_component_dir = os.path.join(
+                        self.source_directory, component
+                    )
+                    self._add_archive_entry(tar, f'./{component}', mode=0o755)
+                    for file in sorted(os.listdir(source_component_dir)):
+                        if file == '_templates':
+                            continue
+                        source_file = os.path.join(source_component_dir, file)
+                        if file.endswith('.jinja2'):
+                            template = env.get_template(f'{component}/{file}')
+                            content = template.render(context=self.bootstrap_context)
+                            self._add_archive_entry(
+                                tar,
+                                f'./{component}/{file.replace(".jinja2", "")}',
+                                mode=0o644,
+                                content=content.encode('utf-8'),
+                            )
+                        elif os.path.isdir(source_file):
+                            self._add_archive_directory(
+                                tar, source_file, f'./{component}/{file}'
+                            )
+                        else:
+                            with open(source_file, 'rb') as f:
+                                content = f.read()
+                            self._add_archive_entry(
+                                tar,
+                                f'./{component}/{file}',
+                                mode=os.stat(source_file).st_mode & 0o777,
+                                content=content,
+                            )
+
+        return buffer.getvalue()
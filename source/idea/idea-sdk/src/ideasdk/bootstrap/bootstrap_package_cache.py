@@ -0,0 +1,204 @@
+#  Copyright Amazon.com, Inc. or its affiliates. All Rights Reserved.
+#
+#  Licensed under the Apache License, Version 2.0 (the "License"). You may not use this file except in compliance
+#  with the License. A copy of the License is located at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+#  or in the 'license' file accompanying this file. This file is distributed on an 'AS IS' BASIS, WITHOUT WARRANTIES
+#  OR CONDITIONS OF ANY KIND, express or implied. See the License for the specific language governing permissions
+#  and limitations under the License.
+
+from ideasdk.protocols import SocaContextProtocol
+from ideasdk.context import BootstrapContext
+from ideasdk.bootstrap.bootstrap_package_builder import BootstrapPackageBuilder
+from ideasdk.utils import Utils
+from ideadatamodel import SocaAnyPayload
+
+from cacheout import Cache
+from pydantic import BaseModel
+from threading import RLock
+from typing import Dict, List, Optional, Any
+import hashlib
+import shlex
+
+OVERLAY_PLACEHOLDER_PREFIX = '@@IDEA_OVERLAY_'
+OVERLAY_PLACEHOLDER_SUFFIX = '@@'
+
+
+class BootstrapPackageOverlay:
+    """
+    Per-instance values applied to a shared bootstrap package at boot time.
+
+    Values such as job id or owner are rendered into the bootstrap package as placeholders, so that the package
+    contents are the same for all instances with the same shape. The placeholders are replaced with the actual values
+    by the command returned by get_apply_command(), which must be executed from the bootstrap package directory
+    before the package install commands.
+    """
+
+    def __init__(self, substitution_support: bool = True):
+        self.substitution_support = substitution_support
+        self._values: Dict[str, str] = {}
+
+    def placeholder(self, name: str, value: Optional[Any]) -> Optional[str]:
+        """
+        register the value for name and return the placeholder to be used while rendering the bootstrap package.
+        None values are returned as is, and are rendered into the package.
+        """
+        if value is None:
+            return None
+        placeholder = (
+            f'{OVERLAY_PLACEHOLDER_PREFIX}{name.upper()}{OVERLAY_PLACEHOLDER_SUFFIX}'
+        )
+        self._values[placeholder] = str(value)
+        return placeholder
+
+    @property
+    def values(self) -> Dict[str, str]:
+        return dict(self._values)
+
+    @staticmethod
+    def _escape_sed_replacement(value: str) -> str:
+        return (
+            value.replace('\\', '\\\\')
+            .replace('|', '\\|')
+            .replace('&', '\\&')
+            .replace('\n', '\\n')
+        )
+
+    def get_apply_command(self) -> Optional[str]:
+        if len(self._values) == 0:
+            return None
+        expressions = []
+        for placeholder in sorted(self._values.keys()):
+            value = self._escape_sed_replacement(self._values[placeholder])
+            expressions.append(f'-e {shlex.quote(f"s|{placeholder}|{value}|g")}')
+        command = (
+            f'grep -rlZ {shlex.quote(OVERLAY_PLACEHOLDER_PREFIX)} . '
+            f'| xargs -0 -r sed -i {" ".join(expressions)}'
+        )
+        if self.substitution_support:
+            # user data is passed through Fn::Sub. escape variables to be rendered as is.
+            command = command.replace('${', '${!')
+        return command
+
+
+class BootstrapPackageCache:
+    """
+    Content addressed cache for rendered bootstrap packages.
+
+    Bootstrap packages are rendered in memory and uploaded to S3 under a key derived from the sha256 of the package
+    contents: idea/<module-id>/bootstrap/cache/<package-basename>-<sha256>.tar.gz
+    Instances with the same shape share a single package, which is rendered and uploaded only once.
+
+    Rendering is memoized using a fingerprint of the inputs to the templates: the cluster config version,
+    bootstrap sources, components, base os, instance type and the bootstrap context vars. Per-instance values must
+    be provided via BootstrapPackageOverlay placeholders to be able to share packages.
+    """
+
+    def __init__(
+        self,
+        context: SocaContextProtocol,
+        logger=None,
+        max_size: int = 1000,
+        ttl_seconds: int = 24 * 60 * 60,
+    ):
+        self._context = context
+        self._logger = logger
+        self._packages = Cache(maxsize=max_size, ttl=ttl_seconds)
+        self._uploaded_keys = Cache(maxsize=max_size, ttl=ttl_seconds)
+        self._upload_lock = RLock()
+
+    def log_debug(self, message: str):
+        if self._logger is not None:
+            self._logger.debug(message)
+
+    @staticmethod
+    def _to_fingerprint_value(value: Any) -> Any:
+        if isinstance(value, SocaAnyPayload):
+            value = vars(value)
+        if isinstance(value, BaseModel):
+            return value.model_dump(mode='json', exclude_none=True)
+        if isinstance(value, dict):
+            return {
+                str(key): BootstrapPackageCache._to_fingerprint_value(entry)
+                for key, entry in value.items()
+            }
+        if isinstance(value, (list, tuple)):
+            return [
+                BootstrapPackageCache._to_fingerprint_value(entry) for entry in value
+            ]
+        return value
+
+    @staticmethod
+    def get_fingerprint(
+        bootstrap_context: BootstrapContext,
+        source_directory: str,
+        target_package_basename: str,
+        components: List[str],
+    ) -> str:
+        fingerprint = {
+            'config_version': bootstrap_context.config.version,
+            'source_directory': source_directory,
+            'target_package_basename': target_package_basename,
+            'components': components,
+            'module_id': bootstrap_context.module_id,
+            'base_os': bootstrap_context.base_os,
+            'instance_type': bootstrap_context.instance_type,
+            'vars': bootstrap_context.vars,
+        }
+        return Utils.sha256(
+            Utils.to_json(BootstrapPackageCache._to_fingerprint_value(fingerprint))
+        )
+
+    def get_package_key(self, target_package_basename: str, content: bytes) -> str:
+        content_hash = hashlib.sha256(content).hexdigest()
+        return f'idea/{self._context.module_id()}/bootstrap/cache/{target_package_basename}-{content_hash}.tar.gz'
+
+    def get_package_uri(
+        self,
+        bootstrap_context: BootstrapContext,
+        source_directory: str,
+        target_package_basename: str,
+        components: List[str],
+        base_os: str = None,
+    ) -> str:
+        """
+        render and upload the bootstrap package if it does not exist and return the S3 URI of the package.
+        """
+        fingerprint = self.get_fingerprint(
+            bootstrap_context=bootstrap_context,
+            source_directory=source_directory,
+            target_package_basename=target_package_basename,
+            components=components,
+        )
+        package_uri = self._packages.get(fingerprint)
+        if package_uri is not None:
+            self.log_debug(f'bootstrap package cache hit: {package_uri}')
+            return package_uri
+
+        content = BootstrapPackageBuilder(
+            bootstrap_context=bootstrap_context,
+            source_directory=source_directory,
+            target_package_basename=target_package_basename,
+            components=list(components),
+            base_os=base_os,
+            logger=self._logger,
+        ).build_archive()
+
+        cluster_s3_bucket = self._context.config().get_string(
+            'cluster.cluster_s3_bucket', required=True
+        )
+        package_key = self.get_package_key(target_package_basename, content)
+        package_uri = f's3://{cluster_s3_bucket}/{package_key}'
+
+        with self._upload_lock:
+            if not self._uploaded_keys.has(package_key):
+                self.log_debug(f'uploading bootstrap package: {package_uri}')
+                self._context.aws().s3().put_object(
+                    Bucket=cluster_s3_bucket, Key=package_key, Body=content
+                )
+                self._uploaded_keys.set(package_key, True)
+
+        self._packages.set(fingerprint, package_uri)
+        return package_uri
@@ -63,7 +63,12 @@ class ClusterConfig(SocaConfig, DynamoDBStreamSubscriber):
         if not Utils.is_empty(module_id):
             self.set_module_id(module_id)
 
-        config = self.db.build_config_from_db()
+        entries = self.db.get_config_entries()
+        # key -> value of config entries in db. used to apply only the changed entries during resync.
+        self._entries: Dict[str, Any] = {
+            entry['key']: entry.get('value') for entry in entries
+        }
+        config = ClusterConfigDB.build_config(entries)
 
         super().__init__(config=config.as_dict())
 
@@ -168,6 +173,7 @@ class ClusterConfig(SocaConfig, DynamoDBStreamSubscriber):
             print(log_message)
         key = entry['key']
         value = entry.get('value')
+        self._entries[key] = value
         super().put(key, value)
 
     def on_update(self, old_entry: Dict, new_entry: Dict):
@@ -180,6 +186,7 @@ class ClusterConfig(SocaConfig, DynamoDBStreamSubscriber):
             print(log_message)
         key = new_entry['key']
         value = new_entry.get('value')
+        self._entries[key] = value
         super().put(key, value)
 
     def on_delete(self, entry: Dict):
@@ -189,8 +196,23 @@ class ClusterConfig(SocaConfig, DynamoDBStreamSubscriber):
         else:
             print(log_message)
         key = entry['key']
+        self._entries.pop(key, None)
         super().pop(key)
 
+    def on_resync(self):
+        """
+        stream records may have been missed. read all entries from db and apply created, updated and deleted entries.
+        """
+        entries = {entry['key']: entry for entry in self.db.get_config_entries()}
+        for key, entry in entries.items():
+            if key not in self._entries:
+                self.on_create(entry)
+            elif self._entries[key] != entry.get('value'):
+                self.on_update({'key': key, 'value': self._entries[key]}, entry)
+        for key in list(self._entries.keys()):
+            if key not in entries:
+                self.on_delete({'key': key, 'value': self._entries[key]})
+
     def get_cluster_external_endpoint(self) -> str:
         cluster_module_id = self.get_module_id(constants.MODULE_CLUSTER)
         external_alb_dns = self.get_string(
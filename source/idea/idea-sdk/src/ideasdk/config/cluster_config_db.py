@@ -332,6 +332,10 @@ class ClusterConfigDB(DynamoDBStreamSubscriber):
         """
 
         entries = self.get_config_entries(query=query)
+        return self.build_config(entries)
+
+    @staticmethod
+    def build_config(entries: List[Dict]) -> SocaConfig:
         config = SocaConfig(config={})
 
         for entry in entries:
@@ -413,6 +417,22 @@ class ClusterConfigDB(DynamoDBStreamSubscriber):
         result = self.modules_table.get_item(Key={'module_id': module_id})
         return Utils.get_value_as_dict('Item', result)
 
+    def set_module_deployment_fingerprint(self, module_id: str, fingerprint: str):
+        """
+        save the fingerprint of the synthesized template and packages that were last deployed for the module.
+        see CdkInvoker.get_deployment_fingerprint()
+        """
+        self.modules_table.update_item(
+            Key={'module_id': module_id},
+            UpdateExpression='SET #deployment_fingerprint=:deployment_fingerprint',
+            ExpressionAttributeNames={
+                '#deployment_fingerprint': 'deployment_fingerprint',
+            },
+            ExpressionAttributeValues={
+                ':deployment_fingerprint': fingerprint,
+            },
+        )
+
     def get_cluster_modules(self) -> List[Dict]:
         modules = []
         result = self.modules_table.scan()
@@ -532,6 +552,9 @@ class ClusterConfigDB(DynamoDBStreamSubscriber):
         updated_entry = self.post_process_ddb_config_entry(entry)
         self.stream_subscriber.on_delete(updated_entry)
 
+    def on_resync(self):
+        self.stream_subscriber.on_resync()
+
     def stop(self):
         if self.stream_subscription is None:
             return
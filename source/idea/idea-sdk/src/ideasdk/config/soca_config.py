@@ -19,17 +19,28 @@ from typing import Optional, List, Dict, Any
 class SocaConfig:
     def __init__(self, config: Dict):
         self._config = ConfigFactory.from_dict(config)
+        self._version = 0
+
+    @property
+    def version(self) -> int:
+        """
+        incremented each time a config entry is updated or removed.
+        can be used as part of cache keys for values derived from config.
+        """
+        return self._version
 
     def pop(self, key, default=None, required=False):
         if required:
             self._config.pop(key)
         else:
             self._config.pop(key, default=default)
+        self._version += 1
 
     def put(self, key, value):
         if Utils.is_empty(value):
             value = None
         self._config.put(key, value)
+        self._version += 1
 
     @staticmethod
     def handle_exception(e: Exception, key: str):
@@ -28,6 +28,7 @@ from ideasdk.aws import (
     InstanceMetadataUtil,
     AWSUtil,
     AwsServiceEndpoint,
+    AwsTransportOptions,
 )
 
 from ideasdk.logging import SocaLogging
@@ -38,7 +39,7 @@ from ideasdk.config.soca_config import SocaConfig
 from ideasdk.config.cluster_config import ClusterConfig
 from ideasdk.distributed_lock import DistributedLock
 from ideasdk.clustering import LeaderElection
-from ideasdk.metrics import MetricsService
+from ideasdk.metrics import MetricsService, AwsTransportMetrics
 
 from logging import Logger
 from typing import Optional, List, Dict, Any
@@ -111,6 +112,7 @@ class SocaContext(SocaContextProtocol):
             self._aws_util: Optional[AWSUtil] = None
             self._distributed_lock: Optional[DistributedLock] = None
             self._metrics_service: Optional[MetricsService] = None
+            self._aws_transport_metrics: Optional[AwsTransportMetrics] = None
             self._leader_election: Optional[LeaderElection] = None
             self._analytics_service: Optional[AnalyticsService] = None
 
@@ -202,11 +204,25 @@ class SocaContext(SocaContextProtocol):
                             )
                         )
 
+                # size connection pools for api server workers of the module, in addition to background threads
+                transport_config = None
+                max_workers = 0
+                if Utils.is_not_empty(options.module_id):
+                    transport_config = self.config().get_config(
+                        f'{options.module_id}.aws_transport'
+                    )
+                    max_workers = self.config().get_int(
+                        f'{options.module_id}.server.max_workers', default=0
+                    )
+
                 self._aws = AwsClientProvider(
                     options=AWSClientProviderOptions(
                         profile=options.aws_profile,
                         region=options.aws_region,
                         endpoints=endpoints,
+                        transport=AwsTransportOptions.from_config(
+                            transport_config=transport_config, max_workers=max_workers
+                        ),
                     )
                 )
 
@@ -251,6 +267,10 @@ class SocaContext(SocaContextProtocol):
                 self._metrics_service = MetricsService(
                     context=self, default_namespace=options.metrics_namespace
                 )
+                if self._aws is not None:
+                    self._aws_transport_metrics = AwsTransportMetrics(
+                        context=self, transport_stats=self._aws.transport_stats
+                    )
 
         except BaseException as e:
             if self._distributed_lock is not None:
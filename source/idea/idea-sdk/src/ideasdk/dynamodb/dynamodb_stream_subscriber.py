@@ -21,3 +21,10 @@ class DynamoDBStreamSubscriber(ABC):
 
     @abstractmethod
     def on_delete(self, entry: Dict): ...
+
+    def on_resync(self):
+        """
+        invoked when stream records may have been missed. subscribers holding state derived from the table
+        should reconcile it with the table.
+        """
+        ...
@@ -17,8 +17,9 @@ import os
 from botocore.config import Config
 from boto3.dynamodb.types import TypeDeserializer
 
+from concurrent.futures import ThreadPoolExecutor
 import threading
-from typing import Dict, Optional
+from typing import Dict, List, Optional
 import time
 import random
 import traceback
@@ -26,10 +27,51 @@ import traceback
 SHARD_ITERATOR_INITIALIZER_INTERVAL = (10, 30)
 SHARD_PROCESSOR_INTERVAL = (10, 30)
 
+# each shard supports up to 5 GetRecords requests per second, shared across all applications subscribed to the stream
+GET_RECORDS_INTERVAL_SECONDS = 1
+GET_RECORDS_LIMIT = 1000
+
+# max. no. of shards read concurrently
+SHARD_READER_WORKERS = 4
+
+CHECKPOINT_VERSION = 1
+
+
+class ShardState:
+    """
+    read position of a shard. the sequence number of the last record processed is checkpointed.
+    """
+
+    def __init__(
+        self,
+        shard_id: str,
+        parent_shard_id: Optional[str] = None,
+        sequence_number: Optional[str] = None,
+        finished: bool = False,
+        start_at_latest: bool = False,
+    ):
+        self.shard_id = shard_id
+        self.parent_shard_id = parent_shard_id
+        self.sequence_number = sequence_number
+        self.finished = finished
+        self.start_at_latest = start_at_latest
+        self.shard_iterator: Optional[str] = None
+        self.in_progress = False
+
 
 class DynamoDBStreamSubscription:
     """
     Create subscription for a DynamoDB Stream and Publish updates via DynamoDBStreamSubscriber protocol
+
+    > shards are read concurrently by a pool of shard readers. a child shard is read after its parent shard is closed
+        and all records from the parent shard are processed, so that updates to an item are published in order.
+    > the sequence number of the last processed record of each shard is checkpointed to a local file. after a restart,
+        shards are read from the checkpoint (AFTER_SEQUENCE_NUMBER), and shards created since the checkpoint
+        from TRIM_HORIZON. when no checkpoint exists, shards are read from LATEST.
+    > if records may have been missed (checkpoint older than the stream retention, records trimmed before they were
+        read, shard or stream no longer available), DynamoDBStreamSubscriber.on_resync() is called, so that the
+        subscriber can reconcile its state with the table.
+    > subscriber callbacks are never invoked concurrently.
     """
 
     def __init__(
@@ -39,6 +81,8 @@ class DynamoDBStreamSubscription:
         aws_region: str,
         aws_profile: Optional[str] = None,
         logger=None,
+        checkpoint_file: Optional[str] = None,
+        auto_start: bool = True,
     ):
         self.stream_subscriber = stream_subscriber
         self.table_name = table_name
@@ -64,9 +108,37 @@ class DynamoDBStreamSubscription:
 
         self.ddb_type_deserializer = TypeDeserializer()
 
-        self._shard_iterator_lock = threading.RLock()
+        if checkpoint_file is None:
+            checkpoint_file = os.path.join(
+                Utils.app_deploy_dir(), 'cache', f'dynamodb-stream.{table_name}.json'
+            )
+        self.checkpoint_file = checkpoint_file
+
+        # shard registry. held only to update shard states, never during api calls.
+        self._shards_lock = threading.RLock()
+        self.shards: Dict[str, ShardState] = {}
+        self._checkpoint_lock = threading.Lock()
+        self._checkpoint_stream_arn: Optional[str] = None
+        self._checkpoint_shards: Optional[Dict[str, Dict]] = None
+        self._discovered = False
+        # subscriber callbacks and resync
+        self._subscriber_lock = threading.RLock()
+        self.resync_count = 0
+
         self._exit = threading.Event()
-        self.shard_iterators_map: Dict[str, str] = {}
+        self._executor = ThreadPoolExecutor(
+            max_workers=SHARD_READER_WORKERS,
+            thread_name_prefix=f'{self.table_name}.shard-reader',
+        )
+        self.shard_initializer_thread: Optional[threading.Thread] = None
+        self.shard_processor_thread: Optional[threading.Thread] = None
+
+        self.load_checkpoint()
+
+        if auto_start:
+            self.start()
+
+    def start(self):
         self.shard_initializer_thread = threading.Thread(
             name=f'{self.table_name}.shard-iterator-initializer',
             target=self.shard_iterator_initializer,
@@ -97,77 +169,186 @@ class DynamoDBStreamSubscription:
         if logger is not None:
             logger.debug(message)
 
-    def shard_iterator_initializer(self):
+    def load_checkpoint(self):
+        """
+        load shard checkpoints from the checkpoint file. shard states are initialized during shard discovery,
+        after the stream arn is verified.
+        """
+        if Utils.is_empty(self.checkpoint_file) or not os.path.isfile(
+            self.checkpoint_file
+        ):
+            return
+        try:
+            with open(self.checkpoint_file, 'r') as f:
+                checkpoint = Utils.from_json(f.read())
+            version = Utils.get_value_as_int('version', checkpoint, default=0)
+            if version != CHECKPOINT_VERSION:
+                self.log_info(
+                    f'{self.table_name} - ignoring stream checkpoint with version: {version}',
+                    logger=self.logger,
+                )
+                return
+            self._checkpoint_stream_arn = Utils.get_value_as_string(
+                'stream_arn', checkpoint
+            )
+            self._checkpoint_shards = Utils.get_value_as_dict(
+                'shards', checkpoint, default={}
+            )
+        except Exception as e:
+            self.log_exception(
+                f'{self.table_name} - failed to load stream checkpoint: {self.checkpoint_file} - {e}',
+                logger=self.logger,
+            )
+
+    def save_checkpoint(self):
+        if Utils.is_empty(self.checkpoint_file) or Utils.is_empty(self.stream_arn):
+            return
+        with self._shards_lock:
+            shards = {
+                shard.shard_id: {
+                    'parent_shard_id': shard.parent_shard_id,
+                    'sequence_number': shard.sequence_number,
+                    'finished': shard.finished,
+                }
+                for shard in self.shards.values()
+            }
+        checkpoint = {
+            'version': CHECKPOINT_VERSION,
+            'stream_arn': self.stream_arn,
+            'shards': shards,
+        }
+        with self._checkpoint_lock:
+            try:
+                os.makedirs(os.path.dirname(self.checkpoint_file), exist_ok=True)
+                # write to a temp file and rename, so that a partially written checkpoint is never loaded
+                temp_file = f'{self.checkpoint_file}.{os.getpid()}.tmp'
+                with open(temp_file, 'w') as f:
+                    f.write(Utils.to_json(checkpoint))
+                os.replace(temp_file, self.checkpoint_file)
+            except Exception as e:
+                self.log_exception(
+                    f'{self.table_name} - failed to save stream checkpoint: {self.checkpoint_file} - {e}',
+                    logger=self.logger,
+                )
+
+    def resync(self, reason: str):
+        """
+        records may have been missed. the subscriber reconciles its state with the table.
+        """
+        self.log_info(
+            f'{self.table_name} - stream resync: {reason}', logger=self.logger
+        )
+        with self._subscriber_lock:
+            self.resync_count += 1
+            try:
+                self.stream_subscriber.on_resync()
+            except Exception as e:
+                self.log_exception(
+                    f'{self.table_name} - failed to resync: {e}', logger=self.logger
+                )
+
+    def describe_stream_shards(self) -> List[Dict]:
+        shards = []
+        exclusive_start_shard_id = None
+        while True:
+            if exclusive_start_shard_id is None:
+                describe_stream_result = self.dynamodb_streams_client.describe_stream(
+                    StreamArn=self.stream_arn
+                )
+            else:
+                describe_stream_result = self.dynamodb_streams_client.describe_stream(
+                    StreamArn=self.stream_arn,
+                    ExclusiveStartShardId=exclusive_start_shard_id,
+                )
+            stream_description = describe_stream_result['StreamDescription']
+            shards += stream_description.get('Shards', [])
+            exclusive_start_shard_id = stream_description.get('LastEvaluatedShardId')
+            if exclusive_start_shard_id is None:
+                break
+        return shards
+
+    def discover_shards(self):
         """
-        for a given dynamodb stream, find all available shards and initialize the shard iterator.
+        for a given dynamodb stream, find all available shards and initialize shard states.
         a shard can be added or closed and this operation should be performed periodically.
-        a clean-up operation is performed for all closed shards. a shard considered is closed, the NextShardIterator returns null value in GetRecords response.
-        :return:
+        shards that are closed, fully processed and no longer returned by DescribeStream are removed.
         """
-        while not self._exit.is_set():
+        # lazy initialize stream arn - once
+        if Utils.is_empty(self.stream_arn):
             try:
-                with self._shard_iterator_lock:
-                    # lazy initialize stream arn - once
-                    if Utils.is_empty(self.stream_arn):
-                        try:
-                            describe_table_result = self.dynamodb_client.describe_table(
-                                TableName=self.table_name
-                            )
-                            table = describe_table_result['Table']
-                            self.stream_arn = table['LatestStreamArn']
-                        except botocore.exceptions.ClientError as e:
-                            if (
-                                e.response['Error']['Code']
-                                == 'ResourceNotFoundException'
-                            ):
-                                # table may not be created yet due to race condition in module deployments
-                                continue
-                            else:
-                                raise e
-
-                    describe_stream_result = (
-                        self.dynamodb_streams_client.describe_stream(
-                            StreamArn=self.stream_arn
+                describe_table_result = self.dynamodb_client.describe_table(
+                    TableName=self.table_name
+                )
+                table = describe_table_result['Table']
+                self.stream_arn = table['LatestStreamArn']
+            except botocore.exceptions.ClientError as e:
+                if e.response['Error']['Code'] == 'ResourceNotFoundException':
+                    # table may not be created yet due to race condition in module deployments
+                    return
+                else:
+                    raise e
+
+        shards = self.describe_stream_shards()
+
+        gaps = []
+        with self._shards_lock:
+            start_at_latest = False
+            if not self._discovered:
+                self._discovered = True
+                if self._checkpoint_shards is None:
+                    # no checkpoint. read shards from LATEST.
+                    start_at_latest = True
+                elif self._checkpoint_stream_arn == self.stream_arn:
+                    for shard_id, entry in self._checkpoint_shards.items():
+                        self.shards[shard_id] = ShardState(
+                            shard_id=shard_id,
+                            parent_shard_id=Utils.get_value_as_string(
+                                'parent_shard_id', entry
+                            ),
+                            sequence_number=Utils.get_value_as_string(
+                                'sequence_number', entry
+                            ),
+                            finished=Utils.get_value_as_bool(
+                                'finished', entry, default=False
+                            ),
                         )
+                else:
+                    gaps.append(
+                        f'stream changed from: {self._checkpoint_stream_arn} to: {self.stream_arn}'
                     )
-                    shards = describe_stream_result['StreamDescription']['Shards']
-                    for shard in shards:
-                        shard_id = shard['ShardId']
-                        shard_iterator = self.shard_iterators_map.get(shard_id)
-                        if shard_iterator is None:
-                            success = False
-                            while not success:
-                                try:
-                                    get_shard_iterator_result = (
-                                        self.dynamodb_streams_client.get_shard_iterator(
-                                            StreamArn=self.stream_arn,
-                                            ShardId=shard_id,
-                                            ShardIteratorType='LATEST',
-                                        )
-                                    )
-                                    self.shard_iterators_map[shard_id] = (
-                                        get_shard_iterator_result['ShardIterator']
-                                    )
-                                    success = True
-                                except botocore.exceptions.ClientError as e:
-                                    if (
-                                        e.response['Error']['Code']
-                                        == 'ProvisionedThroughputExceededException'
-                                    ):
-                                        time.sleep(1)
-                                        continue
-                                    else:
-                                        raise e
-
-                    # clean up closed shards
-                    shards_closed = []
-                    for shard_id in self.shard_iterators_map.keys():
-                        shard_iterator = self.shard_iterators_map.get(shard_id)
-                        if shard_iterator is None:
-                            shards_closed.append(shard_id)
-                    for shard_id in shards_closed:
-                        del self.shard_iterators_map[shard_id]
+                self._checkpoint_shards = None
+
+            shard_ids = set()
+            for shard in shards:
+                shard_id = shard['ShardId']
+                shard_ids.add(shard_id)
+                if shard_id in self.shards:
+                    continue
+                self.shards[shard_id] = ShardState(
+                    shard_id=shard_id,
+                    parent_shard_id=shard.get('ParentShardId'),
+                    start_at_latest=start_at_latest,
+                )
 
+            # clean up closed shards
+            for shard_id in list(self.shards.keys()):
+                if shard_id in shard_ids:
+                    continue
+                shard_state = self.shards[shard_id]
+                if shard_state.in_progress:
+                    continue
+                if not shard_state.finished:
+                    gaps.append(f'shard: {shard_id} is no longer available')
+                del self.shards[shard_id]
+
+        self.save_checkpoint()
+        if len(gaps) > 0:
+            self.resync(', '.join(gaps))
+
+    def shard_iterator_initializer(self):
+        while not self._exit.is_set():
+            try:
+                self.discover_shards()
             except Exception as e:
                 self.log_exception(
                     f'failed to initialize {self.table_name} shard iterator: {e}',
@@ -176,123 +357,218 @@ class DynamoDBStreamSubscription:
             finally:
                 self._exit.wait(random.randint(*SHARD_ITERATOR_INITIALIZER_INTERVAL))
 
-    def shard_processor(self):
+    def get_shard_iterator(self, shard_state: ShardState) -> Optional[str]:
         """
-        iterate over all shards periodically, and read all records from the latest shard iterator.
-        the anticipated volume for configuration updates will be low to very low.
+        :return: shard iterator from the checkpoint, TRIM_HORIZON or LATEST. None if the shard is not available.
+        """
+        while True:
+            if shard_state.sequence_number is not None:
+                kwargs = {
+                    'ShardIteratorType': 'AFTER_SEQUENCE_NUMBER',
+                    'SequenceNumber': shard_state.sequence_number,
+                }
+            elif shard_state.start_at_latest:
+                kwargs = {'ShardIteratorType': 'LATEST'}
+            else:
+                kwargs = {'ShardIteratorType': 'TRIM_HORIZON'}
+            try:
+                result = self.dynamodb_streams_client.get_shard_iterator(
+                    StreamArn=self.stream_arn, ShardId=shard_state.shard_id, **kwargs
+                )
+                return result.get('ShardIterator')
+            except botocore.exceptions.ClientError as e:
+                error_code = e.response['Error']['Code']
+                if error_code == 'ProvisionedThroughputExceededException':
+                    time.sleep(1)
+                    continue
+                elif error_code == 'TrimmedDataAccessException':
+                    # checkpoint is older than the stream retention period
+                    self.resync(
+                        f'shard: {shard_state.shard_id}, checkpoint: {shard_state.sequence_number} is trimmed'
+                    )
+                    shard_state.sequence_number = None
+                    shard_state.start_at_latest = False
+                    continue
+                elif error_code == 'ResourceNotFoundException':
+                    self.resync(f'shard: {shard_state.shard_id} not found')
+                    return None
+                else:
+                    raise e
+
+    def publish(self, record: Dict):
+        event_name = record['eventName']
+        with self._subscriber_lock:
+            if event_name == 'INSERT':
+                config_entry_raw = record['dynamodb']['NewImage']
+                config_entry = {
+                    k: self.ddb_type_deserializer.deserialize(v)
+                    for k, v in config_entry_raw.items()
+                }
+                self.stream_subscriber.on_create(config_entry)
+            elif event_name == 'MODIFY':
+                old_config_entry_raw = record['dynamodb']['OldImage']
+                old_config_entry = {
+                    k: self.ddb_type_deserializer.deserialize(v)
+                    for k, v in old_config_entry_raw.items()
+                }
+                new_config_entry_raw = record['dynamodb']['NewImage']
+                new_config_entry = {
+                    k: self.ddb_type_deserializer.deserialize(v)
+                    for k, v in new_config_entry_raw.items()
+                }
+                self.stream_subscriber.on_update(old_config_entry, new_config_entry)
+            elif event_name == 'REMOVE':
+                config_entry_raw = record['dynamodb']['OldImage']
+                config_entry = {
+                    k: self.ddb_type_deserializer.deserialize(v)
+                    for k, v in config_entry_raw.items()
+                }
+                self.stream_subscriber.on_delete(config_entry)
 
-        since each application needs to read all configuration updates, all shards are read sequentially.
-        :return:
+    def read_shard(self, shard_state: ShardState):
+        """
+        read all available records from the shard and checkpoint the last processed record.
+        """
+        shard_id = shard_state.shard_id
+        try:
+            if shard_state.shard_iterator is None:
+                shard_state.shard_iterator = self.get_shard_iterator(shard_state)
+                if shard_state.shard_iterator is None:
+                    shard_state.finished = True
+                    return
+
+            while not self._exit.is_set():
+                try:
+                    get_records_result = self.dynamodb_streams_client.get_records(
+                        ShardIterator=shard_state.shard_iterator,
+                        Limit=GET_RECORDS_LIMIT,
+                    )
+                except botocore.exceptions.ClientError as e:
+                    error_code = e.response['Error']['Code']
+                    if error_code == 'ProvisionedThroughputExceededException':
+                        time.sleep(1)
+                        continue
+                    elif error_code == 'ExpiredIteratorException':
+                        # iterators expire after 15 minutes. resume from the checkpoint.
+                        shard_state.shard_iterator = self.get_shard_iterator(
+                            shard_state
+                        )
+                        if shard_state.shard_iterator is None:
+                            shard_state.finished = True
+                            return
+                        continue
+                    elif error_code == 'TrimmedDataAccessException':
+                        # records were trimmed before they could be read
+                        self.resync(
+                            f'shard: {shard_id}, records after: {shard_state.sequence_number} are trimmed'
+                        )
+                        shard_state.sequence_number = None
+                        shard_state.start_at_latest = False
+                        shard_state.shard_iterator = self.get_shard_iterator(
+                            shard_state
+                        )
+                        if shard_state.shard_iterator is None:
+                            shard_state.finished = True
+                            return
+                        continue
+                    else:
+                        raise e
+
+                # records can be an empty set, even when NextShardIterator is not None as the shard is not closed yet.
+                records = get_records_result.get('Records', [])
+                if len(records) > 0:
+                    self.log_info(
+                        f'{shard_id} - got {len(records)} records',
+                        logger=self.logger,
+                    )
+
+                for record in records:
+                    try:
+                        self.publish(record)
+                    except Exception as e:
+                        self.log_exception(
+                            f'failed to process {self.table_name} stream update: {e}, record: {record}',
+                            logger=self.logger,
+                        )
+                    shard_state.sequence_number = record['dynamodb'].get(
+                        'SequenceNumber', shard_state.sequence_number
+                    )
+
+                # when the shard is closed, next shard iterator will be None
+                shard_state.shard_iterator = get_records_result.get('NextShardIterator')
+                if shard_state.shard_iterator is None:
+                    shard_state.finished = True
+
+                if len(records) > 0 or shard_state.finished:
+                    self.save_checkpoint()
+
+                if len(records) == 0 or shard_state.finished:
+                    break
+
+                self._exit.wait(GET_RECORDS_INTERVAL_SECONDS)
+        finally:
+            with self._shards_lock:
+                shard_state.in_progress = False
+
+    def get_ready_shards(self) -> List[ShardState]:
+        """
+        shards that can be read. child shards are read after the parent shard is finished.
+        """
+        with self._shards_lock:
+            ready = []
+            for shard_state in self.shards.values():
+                if shard_state.finished or shard_state.in_progress:
+                    continue
+                parent = self.shards.get(shard_state.parent_shard_id)
+                if parent is not None and not parent.finished:
+                    continue
+                shard_state.in_progress = True
+                ready.append(shard_state)
+            return ready
+
+    def process_shards(self):
+        """
+        read all shards concurrently. when a parent shard is finished, its child shards are read in the same cycle.
         """
         while not self._exit.is_set():
-            try:
-                with self._shard_iterator_lock:
-                    # randomize polling for shards so to avoid polling limit conflicts across servers
-                    shard_ids = list(self.shard_iterators_map.keys())
-                    random.shuffle(shard_ids)
-
-                    for shard_id in shard_ids:
-                        shard_iterator = self.shard_iterators_map[shard_id]
-
-                        # shard is closed. skip
-                        if shard_iterator is None:
-                            continue
-
-                        next_shard_iterator = shard_iterator
-                        while True:
-                            try:
-                                get_records_result = (
-                                    self.dynamodb_streams_client.get_records(
-                                        ShardIterator=next_shard_iterator, Limit=1000
-                                    )
-                                )
-                            except botocore.exceptions.ClientError as e:
-                                if (
-                                    e.response['Error']['Code']
-                                    == 'ProvisionedThroughputExceededException'
-                                ):
-                                    time.sleep(1)
-                                    continue
-                                elif e.response['Error']['Code'] in (
-                                    'ExpiredIteratorException',
-                                    'TrimmedDataAccessException',
-                                ):
-                                    next_shard_iterator = None
-                                    break
-                                else:
-                                    raise e
-
-                            # when the shard is closed, next shard iterator will be None
-                            next_shard_iterator = get_records_result.get(
-                                'NextShardIterator'
-                            )
-                            # records can be an empty set, even when NextShardIterator is not None as the shard is not closed yet.
-                            records = get_records_result.get('Records', [])
-
-                            if len(records) > 0:
-                                self.log_info(
-                                    f'{shard_id} - got {len(records)} records',
-                                    logger=self.logger,
-                                )
-
-                            for record in records:
-                                try:
-                                    event_name = record['eventName']
-                                    if event_name == 'INSERT':
-                                        config_entry_raw = record['dynamodb'][
-                                            'NewImage'
-                                        ]
-                                        config_entry = {
-                                            k: self.ddb_type_deserializer.deserialize(v)
-                                            for k, v in config_entry_raw.items()
-                                        }
-                                        self.stream_subscriber.on_create(config_entry)
-                                    elif event_name == 'MODIFY':
-                                        old_config_entry_raw = record['dynamodb'][
-                                            'OldImage'
-                                        ]
-                                        old_config_entry = {
-                                            k: self.ddb_type_deserializer.deserialize(v)
-                                            for k, v in old_config_entry_raw.items()
-                                        }
-                                        new_config_entry_raw = record['dynamodb'][
-                                            'NewImage'
-                                        ]
-                                        new_config_entry = {
-                                            k: self.ddb_type_deserializer.deserialize(v)
-                                            for k, v in new_config_entry_raw.items()
-                                        }
-                                        self.stream_subscriber.on_update(
-                                            old_config_entry, new_config_entry
-                                        )
-                                    elif event_name == 'REMOVE':
-                                        config_entry_raw = record['dynamodb'][
-                                            'OldImage'
-                                        ]
-                                        config_entry = {
-                                            k: self.ddb_type_deserializer.deserialize(v)
-                                            for k, v in config_entry_raw.items()
-                                        }
-                                        self.stream_subscriber.on_delete(config_entry)
-                                except Exception as e:
-                                    self.log_exception(
-                                        f'failed to process {self.table_name} stream update: {e}, record: {record}'
-                                    )
-
-                            if len(records) == 0:
-                                break
-                            else:
-                                time.sleep(1)
-
-                        self.shard_iterators_map[shard_id] = next_shard_iterator
+            ready = self.get_ready_shards()
+            if len(ready) == 0:
+                break
+            # randomize polling for shards so to avoid polling limit conflicts across servers
+            random.shuffle(ready)
+            futures = [
+                self._executor.submit(self.read_shard, shard_state)
+                for shard_state in ready
+            ]
+            for future in futures:
+                try:
+                    future.result()
+                except Exception as e:
+                    self.log_exception(
+                        f'failed to process {self.table_name} update: {e}',
+                        logger=self.logger,
+                    )
+            if not any(shard_state.finished for shard_state in ready):
+                break
 
+    def shard_processor(self):
+        while not self._exit.is_set():
+            try:
+                self.process_shards()
             except Exception as e:
-                self.log_exception(f'failed to process {self.table_name} update: {e}')
+                self.log_exception(
+                    f'failed to process {self.table_name} update: {e}',
+                    logger=self.logger,
+                )
             finally:
                 # since each shard has polling limit of 5 per second, ensure polling intervals are spread out across all applications
                 self._exit.wait(random.randint(*SHARD_PROCESSOR_INTERVAL))
 
     def stop(self):
         self._exit.set()
-        self.shard_initializer_thread.join()
-        self.shard_processor_thread.join()
+        if self.shard_initializer_thread is not None:
+            self.shard_initializer_thread.join()
+        if self.shard_processor_thread is not None:
+            self.shard_processor_thread.join()
+        self._executor.shutdown(wait=True)
+        self.save_checkpoint()
@@ -16,3 +16,4 @@ from ideasdk.metrics.base_metrics import BaseMetrics
 from ideasdk.metrics.cloudwatch import *
 from ideasdk.metrics.prometheus import *
 from ideasdk.metrics.metrics_service import MetricsService
+from ideasdk.metrics.aws_transport_metrics import AwsTransportMetrics
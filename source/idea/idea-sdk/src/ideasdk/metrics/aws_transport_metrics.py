@@ -0,0 +1,72 @@
+#  Copyright Amazon.com, Inc. or its affiliates. All Rights Reserved.
+#
+#  Licensed under the Apache License, Version 2.0 (the "License"). You may not use this file except in compliance
+#  with the License. A copy of the License is located at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+#  or in the 'license' file accompanying this file. This file is distributed on an 'AS IS' BASIS, WITHOUT WARRANTIES
+#  OR CONDITIONS OF ANY KIND, express or implied. See the License for the specific language governing permissions
+#  and limitations under the License.
+
+from ideasdk.protocols import SocaContextProtocol
+from ideasdk.metrics.base_metrics import BaseMetrics
+from ideasdk.metrics.base_accumulator import BaseAccumulator
+
+from typing import Dict
+
+
+class AwsServiceMetrics(BaseMetrics):
+    def __init__(self, context: SocaContextProtocol, service_name: str):
+        super().__init__(context)
+        self.with_dimension('aws_service', service_name)
+        self.split_dimensions = False
+
+
+class AwsTransportMetrics(BaseMetrics, BaseAccumulator):
+    """
+    publishes per-service AWS API call counts, average latency, retries and throttles collected by AwsTransportStats
+    """
+
+    def __init__(self, context: SocaContextProtocol, transport_stats):
+        # BaseMetrics does not call super().__init__(), so the accumulator is initialized explicitly to register
+        # with the metrics service
+        BaseMetrics.__init__(self, context)
+        BaseAccumulator.__init__(self, context)
+        self.context = context
+        self.split_dimensions = False
+        self._transport_stats = transport_stats
+        self._service_metrics: Dict[str, AwsServiceMetrics] = {}
+        self._published: Dict[str, Dict] = {}
+
+    @property
+    def accumulator_id(self):
+        return 'aws-transport-metrics'
+
+    def publish_metrics(self):
+        for service_name, stats in self._transport_stats.snapshot().items():
+            published = self._published.get(service_name, {})
+            self._published[service_name] = stats
+
+            calls = stats['calls'] - published.get('calls', 0)
+            if calls <= 0:
+                continue
+
+            service_metrics = self._service_metrics.get(service_name)
+            if service_metrics is None:
+                service_metrics = AwsServiceMetrics(
+                    context=self.context, service_name=service_name
+                )
+                self._service_metrics[service_name] = service_metrics
+
+            latency_ms = stats['latency_ms_total'] - published.get(
+                'latency_ms_total', 0.0
+            )
+            service_metrics.count(MetricName='aws_api_calls', Value=calls)
+            service_metrics.milliseconds(
+                MetricName='aws_api_latency', Value=latency_ms / calls
+            )
+            for name in ('errors', 'retries', 'throttles'):
+                value = stats[name] - published.get(name, 0)
+                if value > 0:
+                    service_metrics.count(MetricName=f'aws_api_{name}', Value=value)
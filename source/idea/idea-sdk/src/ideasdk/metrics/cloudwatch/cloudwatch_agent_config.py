@@ -25,6 +25,23 @@ from ideasdk.config.cluster_config import ClusterConfig
 
 from typing import Dict, Optional, List, Union, Any
 from pydantic import Field
+from jinja2 import Environment
+from threading import RLock
+
+# the agent config templates are packaged with the sdk and do not change at runtime.
+# the environment is created once, so that compiled templates are re-used across builds.
+_TEMPLATES_ENV: Optional[Environment] = None
+_TEMPLATES_ENV_LOCK = RLock()
+
+
+def _get_templates_env() -> Environment:
+    global _TEMPLATES_ENV
+    with _TEMPLATES_ENV_LOCK:
+        if _TEMPLATES_ENV is None:
+            _TEMPLATES_ENV = Jinja2Utils.env_using_package_loader(
+                package_name='ideasdk.metrics.cloudwatch', package_path='templates'
+            )
+        return _TEMPLATES_ENV
 
 
 class CloudWatchAgentMetricsCollectedOptions(SocaBaseModel):
@@ -314,9 +331,7 @@ class CloudWatchAgentConfig:
             'metrics_collected': self.metrics_collected,
         }
 
-        env = Jinja2Utils.env_using_package_loader(
-            package_name='ideasdk.metrics.cloudwatch', package_path='templates'
-        )
+        env = _get_templates_env()
 
         template = env.get_template(f'amazon-cloudwatch-agent-{self.platform}.yml')
         content = template.render(**context)
@@ -459,6 +459,16 @@ class AWSUtilProtocol(SocaBaseProtocol):
         ttl_attribute_name: str = None,
     ) -> bool: ...
 
+    @abstractmethod
+    def dynamodb_get_global_secondary_index_status(
+        self, table_name: str, index_name: str
+    ) -> Optional[str]: ...
+
+    @abstractmethod
+    def dynamodb_create_global_secondary_index(
+        self, table_name: str, index: Dict, attribute_definitions: List[Dict]
+    ) -> bool: ...
+
 
 class SocaContextProtocol(SocaBaseProtocol):
     @property
@@ -14,7 +14,7 @@ __all__ = ('ModuleMetadata', 'ModuleMetadataHelper')
 
 from ideadatamodel import constants, exceptions, SocaBaseModel
 
-from typing import Dict
+from typing import Dict, List, Set
 
 
 class ModuleMetadata(SocaBaseModel):
@@ -22,6 +22,8 @@ class ModuleMetadata(SocaBaseModel):
     title: str
     type: str
     deployment_priority: int
+    # names of modules that must be deployed before this module
+    depends_on: List[str] = []
 
 
 MODULE_METADATA = [
@@ -42,60 +44,76 @@ MODULE_METADATA = [
         title='Cluster',
         type=constants.MODULE_TYPE_STACK,
         deployment_priority=2,
+        depends_on=[constants.MODULE_BOOTSTRAP],
     ),
     ModuleMetadata(
         name=constants.MODULE_ANALYTICS,
         title='Analytics',
         type=constants.MODULE_TYPE_STACK,
         deployment_priority=3,
+        depends_on=[constants.MODULE_CLUSTER],
     ),
     ModuleMetadata(
         name=constants.MODULE_METRICS,
         title='Metrics & Monitoring',
         type=constants.MODULE_TYPE_STACK,
         deployment_priority=3,
+        depends_on=[constants.MODULE_CLUSTER],
     ),
     ModuleMetadata(
         name=constants.MODULE_IDENTITY_PROVIDER,
         title='Identity Provider',
         type=constants.MODULE_TYPE_STACK,
         deployment_priority=3,
+        depends_on=[constants.MODULE_CLUSTER],
     ),
     ModuleMetadata(
         name=constants.MODULE_DIRECTORYSERVICE,
         title='Directory Service',
         type=constants.MODULE_TYPE_STACK,
         deployment_priority=3,
+        depends_on=[constants.MODULE_CLUSTER],
     ),
     ModuleMetadata(
         name=constants.MODULE_SHARED_STORAGE,
         title='Shared Storage',
         type=constants.MODULE_TYPE_STACK,
         deployment_priority=4,
+        depends_on=[constants.MODULE_CLUSTER],
     ),
     ModuleMetadata(
         name=constants.MODULE_CLUSTER_MANAGER,
         title='Cluster Manager',
         type=constants.MODULE_TYPE_APP,
         deployment_priority=5,
+        depends_on=[
+            constants.MODULE_ANALYTICS,
+            constants.MODULE_METRICS,
+            constants.MODULE_IDENTITY_PROVIDER,
+            constants.MODULE_DIRECTORYSERVICE,
+            constants.MODULE_SHARED_STORAGE,
+        ],
     ),
     ModuleMetadata(
         name=constants.MODULE_VIRTUAL_DESKTOP_CONTROLLER,
         title='eVDI',
         type=constants.MODULE_TYPE_APP,
         deployment_priority=6,
+        depends_on=[constants.MODULE_CLUSTER_MANAGER],
     ),
     ModuleMetadata(
         name=constants.MODULE_SCHEDULER,
         title='Scale-Out Computing',
         type=constants.MODULE_TYPE_APP,
         deployment_priority=6,
+        depends_on=[constants.MODULE_CLUSTER_MANAGER],
     ),
     ModuleMetadata(
         name=constants.MODULE_BASTION_HOST,
         title='Bastion Host',
         type=constants.MODULE_TYPE_STACK,
         deployment_priority=7,
+        depends_on=[constants.MODULE_SCHEDULER],
     ),
 ]
 
@@ -120,3 +138,17 @@ class ModuleMetadataHelper:
     def get_module_deployment_priority(self, module_name: str) -> int:
         module_meta = self.get_module_metadata(module_name)
         return module_meta.deployment_priority
+
+    def get_module_prerequisites(self, module_name: str) -> Set[str]:
+        """
+        returns the names of all modules the given module depends on, directly or transitively.
+        """
+        prerequisites = set()
+        pending = list(self.get_module_metadata(module_name).depends_on)
+        while len(pending) > 0:
+            dependency = pending.pop()
+            if dependency in prerequisites:
+                continue
+            prerequisites.add(dependency)
+            pending += self.get_module_metadata(dependency).depends_on
+        return prerequisites
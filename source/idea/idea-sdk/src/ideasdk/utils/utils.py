@@ -225,13 +225,11 @@ class Utils:
 
     @staticmethod
     def deep_copy(payload: Union[BaseModel, Dict]) -> Dict:
-        json_string = ModelUtils.to_json(payload)
-        return Utils.from_json(json_string)
+        return ModelUtils.to_json_object(payload)
 
     @staticmethod
     def to_yaml(payload: Union[BaseModel, Any], sort_keys=False, width=140) -> str:
-        json_string = Utils.to_json(payload)
-        json_dict = Utils.from_json(json_string)
+        json_dict = ModelUtils.to_json_object(payload)
         return yaml.dump(json_dict, sort_keys=sort_keys, width=width)
 
     @staticmethod
@@ -421,7 +419,8 @@ class Utils:
     def compute_checksum_for_dirs(dir_paths: List[str]) -> str:
         checksum = ''
         for dir_path in dir_paths:
-            for file_path in pathlib.Path(dir_path).glob('**/*'):
+            # sorted, so that the checksum does not depend on the file system listing order
+            for file_path in sorted(pathlib.Path(dir_path).glob('**/*')):
                 file_path = str(file_path.absolute())
                 if Utils.is_file(file_path):
                     checksum = f'{checksum}{Utils.compute_checksum_for_file(file_path)}'
@@ -557,8 +556,7 @@ class Utils:
     def to_dict(obj: Optional[BaseModel], default=None) -> Dict:
         if obj is None:
             return default
-        json_str = Utils.to_json(obj)
-        return Utils.from_json(json_str)
+        return ModelUtils.to_json_object(obj)
 
     @staticmethod
     def is_binary_file(file: str) -> bool:
@@ -0,0 +1,106 @@
+#  Copyright Amazon.com, Inc. or its affiliates. All Rights Reserved.
+#
+#  Licensed under the Apache License, Version 2.0 (the "License"). You may not use this file except in compliance
+#  with the License. A copy of the License is located at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+#  or in the 'license' file accompanying this file. This file is distributed on an 'AS IS' BASIS, WITHOUT WARRANTIES
+#  OR CONDITIONS OF ANY KIND, express or implied. See the License for the specific language governing permissions
+#  and limitations under the License.
+
+from ideasdk.aws import AwsRateGovernor, TokenBucket
+
+from botocore.awsrequest import AWSResponse
+import boto3
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+    def sleep(self, seconds: float):
+        self.now += seconds
+
+
+def test_token_bucket_paces_requests_after_burst():
+    clock = FakeClock()
+    bucket = TokenBucket(rate=2, burst=2, clock=clock, sleep=clock.sleep)
+
+    waits = [bucket.acquire() for _ in range(6)]
+
+    assert waits[0:2] == [0.0, 0.0]
+    assert waits[2:] == [0.5, 0.5, 0.5, 0.5]
+    assert clock.now == 2.0
+
+
+def test_token_bucket_backs_off_on_throttle_and_recovers():
+    clock = FakeClock()
+    bucket = TokenBucket(
+        rate=4, burst=4, increase_step=1, clock=clock, sleep=clock.sleep
+    )
+
+    bucket.on_throttle()
+    assert bucket.rate == 2
+    # burst capacity is drained after throttling
+    assert bucket.acquire() == 0.5
+
+    bucket.on_throttle()
+    bucket.on_throttle()
+    bucket.on_throttle()
+    bucket.on_throttle()
+    assert bucket.rate == 0.2
+    assert bucket.throttle_count == 5
+
+    for _ in range(10):
+        bucket.on_success()
+    assert bucket.rate == 4
+
+
+def test_aws_rate_governor_attach_to_client():
+    clock = FakeClock()
+    governor = AwsRateGovernor()
+    governor.add_bucket(
+        'cloudformation',
+        TokenBucket(rate=1, burst=1, clock=clock, sleep=clock.sleep),
+    )
+
+    client = boto3.client(
+        'cloudformation',
+        region_name='us-east-1',
+        aws_access_key_id='mock',
+        aws_secret_access_key='mock',
+    )
+    governor.attach(client, 'cloudformation')
+
+    responses = [
+        (400, b'<ErrorResponse><Error><Code>Throttling</Code></Error></ErrorResponse>'),
+        (
+            200,
+            b'<DescribeStacksResponse><DescribeStacksResult/></DescribeStacksResponse>',
+        ),
+    ]
+
+    def send(request, **_):
+        status_code, body = responses.pop(0)
+        return AWSResponse(request.url, status_code, {}, FakeRaw(body))
+
+    client.meta.events.register('before-send.cloudformation', send)
+    client.describe_stacks()
+
+    bucket = governor.get_bucket('cloudformation')
+    assert bucket.throttle_count == 1
+    assert len(responses) == 0
+    # first request uses the burst token, the retry waits for the throttled rate
+    assert clock.now == 2.0
+
+
+class FakeRaw:
+    def __init__(self, body: bytes):
+        self.body = body
+
+    def stream(self, **_):
+        yield self.body
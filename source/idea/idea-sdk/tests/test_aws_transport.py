@@ -0,0 +1,249 @@
+#  Copyright Amazon.com, Inc. or its affiliates. All Rights Reserved.
+#
+#  Licensed under the Apache License, Version 2.0 (the "License"). You may not use this file except in compliance
+#  with the License. A copy of the License is located at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+#  or in the 'license' file accompanying this file. This file is distributed on an 'AS IS' BASIS, WITHOUT WARRANTIES
+#  OR CONDITIONS OF ANY KIND, express or implied. See the License for the specific language governing permissions
+#  and limitations under the License.
+
+"""
+Test Cases for AWS transport profiles and AwsTransportStats
+"""
+
+from ideasdk.aws import (
+    AwsClientProvider,
+    AWSClientProviderOptions,
+    AwsServiceEndpoint,
+    AwsTransportOptions,
+)
+from ideasdk.context import SocaContext
+from ideasdk.metrics.aws_transport_metrics import AwsTransportMetrics
+
+from concurrent.futures import ThreadPoolExecutor
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from threading import Thread, RLock
+from typing import Dict, List
+import time
+import pytest
+
+# simulated service side latency of an api call
+STUB_LATENCY_SECONDS = 0.002
+
+STUB_THREADS = 32
+
+# application work between api calls in each thread. connections are idle in the pool in the mean time.
+WORKER_THINK_SECONDS = 0.02
+
+
+class StubDynamoDB(ThreadingHTTPServer):
+    """
+    local DynamoDB endpoint. responds to all requests with an empty ListTables response.
+    """
+
+    daemon_threads = True
+
+    def __init__(self):
+        super().__init__(('127.0.0.1', 0), StubRequestHandler)
+        self.connections = 0
+        self.requests = 0
+        self.throttle_requests = 0
+        self.lock = RLock()
+
+    @property
+    def endpoint_url(self) -> str:
+        return f'http://127.0.0.1:{self.server_address[1]}'
+
+
+class StubRequestHandler(BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'
+
+    def setup(self):
+        super().setup()
+        with self.server.lock:
+            self.server.connections += 1
+
+    def log_message(self, *args):
+        pass
+
+    def do_POST(self):
+        self.rfile.read(int(self.headers.get('Content-Length', 0)))
+        time.sleep(STUB_LATENCY_SECONDS)
+        with self.server.lock:
+            self.server.requests += 1
+            throttle = self.server.throttle_requests > 0
+            if throttle:
+                self.server.throttle_requests -= 1
+
+        if throttle:
+            status = 400
+            body = b'{"__type":"com.amazonaws.dynamodb.v20120810#ThrottlingException","message":"Rate exceeded"}'
+        else:
+            status = 200
+            body = b'{"TableNames":[]}'
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/x-amz-json-1.0')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+
+@pytest.fixture()
+def stub(monkeypatch) -> StubDynamoDB:
+    monkeypatch.setenv('AWS_ACCESS_KEY_ID', 'mock')
+    monkeypatch.setenv('AWS_SECRET_ACCESS_KEY', 'mock')
+    server = StubDynamoDB()
+    thread = Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield server
+    server.shutdown()
+    server.server_close()
+
+
+def build_provider(
+    stub: StubDynamoDB, transport: AwsTransportOptions
+) -> AwsClientProvider:
+    return AwsClientProvider(
+        options=AWSClientProviderOptions(
+            region='us-east-1',
+            endpoints=[
+                AwsServiceEndpoint(
+                    service_name='dynamodb', endpoint_url=stub.endpoint_url
+                )
+            ],
+            transport=transport,
+        )
+    )
+
+
+def test_aws_transport_options_from_config():
+    options = AwsTransportOptions.from_config(
+        transport_config={
+            'read_timeout': 30,
+            'services': {'dynamodb': {'max_pool_connections': 64}},
+        },
+        max_workers=16,
+    )
+    profile = options.get_profile('ec2')
+    assert profile.max_pool_connections == 26
+    assert profile.retry_mode == 'adaptive'
+    assert profile.read_timeout == 30
+
+    profile = options.get_profile('dynamodb')
+    assert profile.max_pool_connections == 64
+    assert profile.read_timeout == 30
+
+    config = profile.build_config(signature_version='s3v4')
+    assert config.max_pool_connections == 64
+    assert config.retries == {'mode': 'adaptive', 'total_max_attempts': 5}
+    assert config.tcp_keepalive is True
+    assert config.signature_version == 's3v4'
+
+    # defaults are not sized below the botocore default
+    assert AwsTransportOptions.build_default().default.max_pool_connections == 10
+
+
+def test_aws_transport_stats(stub):
+    provider = build_provider(stub, AwsTransportOptions.build_default())
+    client = provider.dynamodb()
+
+    for _ in range(3):
+        client.list_tables()
+    stub.throttle_requests = 1
+    client.list_tables()
+
+    stats = provider.transport_stats.snapshot()['dynamodb']
+    assert stats['calls'] == 4
+    assert stats['errors'] == 0
+    assert stats['retries'] == 1
+    assert stats['throttles'] == 1
+    assert stats['latency_ms_total'] >= STUB_LATENCY_SECONDS * 1000 * 5
+    assert stats['latency_ms_max'] >= STUB_LATENCY_SECONDS * 1000 * 2
+
+
+class FakeMetricsService:
+    def __init__(self):
+        self.accumulators = {}
+        self.metric_data: List[Dict] = []
+
+    def service_id(self) -> str:
+        return 'metrics-service'
+
+    def register_accumulator(self, accumulator):
+        self.accumulators[accumulator.accumulator_id] = accumulator
+
+    def publish(self, metric_data: List[Dict]):
+        self.metric_data.extend(metric_data)
+
+
+class FakeTransportStats:
+    def __init__(self):
+        self.stats = {}
+
+    def snapshot(self) -> Dict[str, Dict]:
+        return dict(self.stats)
+
+
+def test_aws_transport_metrics_accumulator(context: SocaContext):
+    """
+    AwsTransportMetrics registers with the metrics service and publishes the delta since the last publish
+    """
+    context.config().put('metrics.provider', 'cloudwatch')
+    metrics_service = FakeMetricsService()
+    context.service_registry().register(metrics_service)
+    transport_stats = FakeTransportStats()
+
+    metrics = AwsTransportMetrics(context=context, transport_stats=transport_stats)
+    assert metrics_service.accumulators == {'aws-transport-metrics': metrics}
+
+    transport_stats.stats = {
+        'dynamodb': {
+            'calls': 4,
+            'latency_ms_total': 40.0,
+            'errors': 0,
+            'retries': 1,
+            'throttles': 1,
+        }
+    }
+    metrics_service.accumulators['aws-transport-metrics'].publish_metrics()
+    published = {
+        entry['MetricName']: entry['Value'] for entry in metrics_service.metric_data
+    }
+    assert published == {
+        'aws_api_calls': 4,
+        'aws_api_latency': 10.0,
+        'aws_api_retries': 1,
+        'aws_api_throttles': 1,
+    }
+    assert metrics_service.metric_data[0]['Dimensions'] == [
+        {'Name': 'aws_service', 'Value': 'dynamodb'}
+    ]
+
+    # no new calls since the last publish
+    metrics_service.metric_data.clear()
+    metrics.publish_metrics()
+    assert metrics_service.metric_data == []
+
+
+def test_aws_transport_connection_pool(stub):
+    """
+    concurrent api calls from STUB_THREADS threads using a shared client. connections are re-used when the pool is
+    sized to the no. of concurrent callers.
+    """
+    client = build_provider(
+        stub, AwsTransportOptions.build_default(max_workers=STUB_THREADS)
+    ).dynamodb()
+    calls_per_thread = 5
+
+    def worker(_):
+        for _ in range(calls_per_thread):
+            client.list_tables()
+            time.sleep(WORKER_THINK_SECONDS)
+
+    with ThreadPoolExecutor(max_workers=STUB_THREADS) as executor:
+        list(executor.map(worker, range(STUB_THREADS)))
+
+    assert stub.requests == STUB_THREADS * calls_per_thread
+    assert stub.connections <= STUB_THREADS
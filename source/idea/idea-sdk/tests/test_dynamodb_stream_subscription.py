@@ -0,0 +1,398 @@
+#  Copyright Amazon.com, Inc. or its affiliates. All Rights Reserved.
+#
+#  Licensed under the Apache License, Version 2.0 (the "License"). You may not use this file except in compliance
+#  with the License. A copy of the License is located at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+#  or in the 'license' file accompanying this file. This file is distributed on an 'AS IS' BASIS, WITHOUT WARRANTIES
+#  OR CONDITIONS OF ANY KIND, express or implied. See the License for the specific language governing permissions
+#  and limitations under the License.
+
+"""
+Test Cases for DynamoDBStreamSubscription
+"""
+
+from ideadatamodel import SocaAnyPayload
+from ideasdk.dynamodb import dynamodb_stream_subscription
+from ideasdk.dynamodb.dynamodb_stream_subscriber import DynamoDBStreamSubscriber
+from ideasdk.dynamodb.dynamodb_stream_subscription import DynamoDBStreamSubscription
+from ideasdk.utils import Utils
+
+from boto3.dynamodb.types import TypeSerializer
+from botocore.exceptions import ClientError
+from threading import Event, RLock, Thread
+from typing import Dict, List, Optional
+import time
+import pytest
+
+STREAM_ARN = (
+    'arn:aws:dynamodb:us-east-1:123456789012:table/idea-test.cluster-settings/stream/1'
+)
+
+
+class FakeShard:
+    def __init__(self, shard_id: str, parent_shard_id: Optional[str] = None):
+        self.shard_id = shard_id
+        self.parent_shard_id = parent_shard_id
+        self.records: List[Dict] = []
+        self.closed = False
+        # records before this index are trimmed
+        self.trim_index = 0
+
+
+class FakeDynamoDBStream:
+    """
+    in-memory table with a stream. supports shard splits, iterator expiration and trimmed records.
+    shard iterators are of the form: <shard id>|<position>|<generation>. expire_iterators() increments the generation.
+    """
+
+    def __init__(self):
+        self.lock = RLock()
+        self.items: Dict[str, Dict] = {}
+        self.shards: Dict[str, FakeShard] = {}
+        self.sequence_number = 0
+        self.generation = 0
+        self.get_records_calls = 0
+        # when set, GetRecords calls wait until the event is set. concurrent calls are counted.
+        self.get_records_release: Optional[Event] = None
+        self.get_records_in_flight = 0
+        self.get_records_max_in_flight = 0
+        self.describe_stream_page_size = 2
+        self.serializer = TypeSerializer()
+        self.add_shard('shard-0')
+
+    def add_shard(self, shard_id: str, parent_shard_id: Optional[str] = None):
+        self.shards[shard_id] = FakeShard(shard_id, parent_shard_id)
+
+    def open_shards(self) -> List[FakeShard]:
+        return [shard for shard in self.shards.values() if not shard.closed]
+
+    def split(self):
+        """
+        close all open shards. each closed shard is split into 2 child shards.
+        """
+        with self.lock:
+            for shard in self.open_shards():
+                shard.closed = True
+                self.add_shard(f'{shard.shard_id}.0', shard.shard_id)
+                self.add_shard(f'{shard.shard_id}.1', shard.shard_id)
+
+    def expire_iterators(self):
+        with self.lock:
+            self.generation += 1
+
+    def trim(self, shard_id: str):
+        with self.lock:
+            shard = self.shards[shard_id]
+            shard.trim_index = len(shard.records)
+
+    def remove_shard(self, shard_id: str):
+        with self.lock:
+            del self.shards[shard_id]
+
+    def image(self, item: Dict) -> Dict:
+        return {k: self.serializer.serialize(v) for k, v in item.items()}
+
+    def put(self, key: str, value):
+        with self.lock:
+            old_item = self.items.get(key)
+            new_item = {'key': key, 'value': value}
+            self.items[key] = new_item
+            record = {'eventName': 'MODIFY' if old_item else 'INSERT', 'dynamodb': {}}
+            record['dynamodb']['NewImage'] = self.image(new_item)
+            if old_item is not None:
+                record['dynamodb']['OldImage'] = self.image(old_item)
+            self._append(key, record)
+
+    def delete(self, key: str):
+        with self.lock:
+            old_item = self.items.pop(key)
+            self._append(
+                key,
+                {'eventName': 'REMOVE', 'dynamodb': {'OldImage': self.image(old_item)}},
+            )
+
+    def _append(self, key: str, record: Dict):
+        self.sequence_number += 1
+        record['dynamodb']['SequenceNumber'] = str(self.sequence_number)
+        open_shards = sorted(self.open_shards(), key=lambda shard: shard.shard_id)
+        shard = open_shards[sum(map(ord, key)) % len(open_shards)]
+        shard.records.append(record)
+
+    # dynamodb client
+
+    def describe_table(self, TableName: str):
+        return {'Table': {'TableName': TableName, 'LatestStreamArn': STREAM_ARN}}
+
+    # dynamodbstreams client
+
+    @staticmethod
+    def client_error(code: str, operation: str) -> ClientError:
+        return ClientError({'Error': {'Code': code, 'Message': code}}, operation)
+
+    def describe_stream(self, StreamArn: str, ExclusiveStartShardId: str = None):
+        with self.lock:
+            shard_ids = sorted(self.shards.keys())
+            start = 0
+            if ExclusiveStartShardId is not None:
+                start = shard_ids.index(ExclusiveStartShardId) + 1
+            page = shard_ids[start : start + self.describe_stream_page_size]
+            description = {
+                'Shards': [
+                    {
+                        'ShardId': shard_id,
+                        'ParentShardId': self.shards[shard_id].parent_shard_id,
+                    }
+                    for shard_id in page
+                ]
+            }
+            if start + len(page) < len(shard_ids):
+                description['LastEvaluatedShardId'] = page[-1]
+            return {'StreamDescription': description}
+
+    def get_shard_iterator(
+        self,
+        StreamArn: str,
+        ShardId: str,
+        ShardIteratorType: str,
+        SequenceNumber: str = None,
+    ):
+        with self.lock:
+            shard = self.shards.get(ShardId)
+            if shard is None:
+                raise self.client_error('ResourceNotFoundException', 'GetShardIterator')
+            if ShardIteratorType == 'TRIM_HORIZON':
+                position = shard.trim_index
+            elif ShardIteratorType == 'LATEST':
+                position = len(shard.records)
+            else:
+                position = None
+                for index, record in enumerate(shard.records):
+                    if record['dynamodb']['SequenceNumber'] == SequenceNumber:
+                        position = index + 1
+                if position is None or position < shard.trim_index:
+                    raise self.client_error(
+                        'TrimmedDataAccessException', 'GetShardIterator'
+                    )
+            return {'ShardIterator': f'{ShardId}|{position}|{self.generation}'}
+
+    def get_records(self, ShardIterator: str, Limit: int):
+        if self.get_records_release is not None:
+            with self.lock:
+                self.get_records_in_flight += 1
+                self.get_records_max_in_flight = max(
+                    self.get_records_max_in_flight, self.get_records_in_flight
+                )
+            self.get_records_release.wait(timeout=10)
+            with self.lock:
+                self.get_records_in_flight -= 1
+        with self.lock:
+            self.get_records_calls += 1
+            shard_id, position, generation = ShardIterator.split('|')
+            position = int(position)
+            if int(generation) != self.generation:
+                raise self.client_error('ExpiredIteratorException', 'GetRecords')
+            shard = self.shards[shard_id]
+            if position < shard.trim_index:
+                raise self.client_error('TrimmedDataAccessException', 'GetRecords')
+            records = shard.records[position : position + Limit]
+            position += len(records)
+            result = {'Records': records}
+            if not (shard.closed and position >= len(shard.records)):
+                result['NextShardIterator'] = f'{shard_id}|{position}|{generation}'
+            return result
+
+
+class FakeSubscriber(DynamoDBStreamSubscriber):
+    """
+    config entries derived from the stream. on resync, entries are read from the table.
+    """
+
+    def __init__(self, stream: FakeDynamoDBStream):
+        self.stream = stream
+        self.entries = {key: item['value'] for key, item in stream.items.items()}
+        self.events: List[str] = []
+        self.resyncs = 0
+
+    def on_create(self, entry: Dict):
+        self.events.append(f'create:{entry["key"]}={entry["value"]}')
+        self.entries[entry['key']] = entry['value']
+
+    def on_update(self, old_entry: Dict, new_entry: Dict):
+        self.events.append(f'update:{new_entry["key"]}={new_entry["value"]}')
+        self.entries[new_entry['key']] = new_entry['value']
+
+    def on_delete(self, entry: Dict):
+        self.events.append(f'delete:{entry["key"]}')
+        self.entries.pop(entry['key'], None)
+
+    def on_resync(self):
+        self.resyncs += 1
+        self.entries = {key: item['value'] for key, item in self.stream.items.items()}
+
+
+@pytest.fixture()
+def stream(monkeypatch) -> FakeDynamoDBStream:
+    fake_stream = FakeDynamoDBStream()
+    monkeypatch.setattr(
+        Utils,
+        'create_boto_session',
+        lambda *_, **__: SocaAnyPayload(client=lambda **_: fake_stream),
+    )
+    monkeypatch.setattr(dynamodb_stream_subscription, 'GET_RECORDS_INTERVAL_SECONDS', 0)
+    return fake_stream
+
+
+def subscribe(
+    stream: FakeDynamoDBStream, checkpoint_file: Optional[str]
+) -> DynamoDBStreamSubscription:
+    return DynamoDBStreamSubscription(
+        stream_subscriber=FakeSubscriber(stream),
+        table_name='idea-test.cluster-settings',
+        aws_region='us-east-1',
+        checkpoint_file=checkpoint_file,
+        auto_start=False,
+    )
+
+
+def poll(subscription: DynamoDBStreamSubscription):
+    subscription.discover_shards()
+    subscription.process_shards()
+
+
+def test_dynamodb_stream_subscription_resume_from_checkpoint(stream, tmp_path):
+    checkpoint_file = str(tmp_path / 'checkpoint.json')
+
+    subscription = subscribe(stream, checkpoint_file)
+    poll(subscription)
+    stream.put('cluster.a', 1)
+    stream.put('cluster.b', 2)
+    poll(subscription)
+    assert subscription.stream_subscriber.events == [
+        'create:cluster.a=1',
+        'create:cluster.b=2',
+    ]
+    subscription.stop()
+
+    # changes while the process is restarting
+    stream.put('cluster.a', 10)
+    stream.delete('cluster.b')
+
+    subscription = subscribe(stream, checkpoint_file)
+    subscriber = subscription.stream_subscriber
+    subscriber.entries = {'cluster.a': 1, 'cluster.b': 2}
+    poll(subscription)
+    assert subscriber.events == ['update:cluster.a=10', 'delete:cluster.b']
+    assert subscriber.entries == {'cluster.a': 10}
+    assert subscriber.resyncs == 0
+
+    # without a checkpoint, changes during restart are missed
+    stream.put('cluster.c', 3)
+    subscription = subscribe(stream, checkpoint_file='')
+    subscription.discover_shards()
+    stream.put('cluster.d', 4)
+    subscription.process_shards()
+    assert subscription.stream_subscriber.events == []
+
+
+def test_dynamodb_stream_subscription_shard_split(stream, tmp_path):
+    subscription = subscribe(stream, str(tmp_path / 'checkpoint.json'))
+    subscriber = subscription.stream_subscriber
+    poll(subscription)
+
+    stream.put('cluster.a', 1)
+    stream.split()
+    stream.put('cluster.a', 2)
+    stream.split()
+    for index in range(8):
+        stream.put(f'cluster.key{index}', index)
+    stream.put('cluster.a', 3)
+    poll(subscription)
+
+    # updates to an item are published in order across parent and child shards
+    assert [event for event in subscriber.events if 'cluster.a' in event] == [
+        'create:cluster.a=1',
+        'update:cluster.a=2',
+        'update:cluster.a=3',
+    ]
+    assert subscriber.entries == {
+        key: item['value'] for key, item in stream.items.items()
+    }
+    assert len(subscription.shards) == 7
+    assert subscriber.resyncs == 0
+
+    # closed shards past the stream retention period are removed
+    stream.remove_shard('shard-0')
+    poll(subscription)
+    assert 'shard-0' not in subscription.shards
+    assert subscriber.resyncs == 0
+
+
+def test_dynamodb_stream_subscription_expired_and_trimmed(stream, tmp_path):
+    checkpoint_file = str(tmp_path / 'checkpoint.json')
+    subscription = subscribe(stream, checkpoint_file)
+    subscriber = subscription.stream_subscriber
+    poll(subscription)
+    stream.put('cluster.a', 1)
+    poll(subscription)
+
+    # expired iterator resumes from the checkpoint
+    stream.expire_iterators()
+    stream.put('cluster.a', 2)
+    poll(subscription)
+    assert subscriber.events[-1] == 'update:cluster.a=2'
+    assert subscriber.resyncs == 0
+
+    # records trimmed before they were read
+    stream.put('cluster.b', 1)
+    stream.put('cluster.c', 1)
+    stream.trim('shard-0')
+    stream.put('cluster.d', 1)
+    poll(subscription)
+    assert subscriber.resyncs == 1
+    assert subscriber.entries == {
+        key: item['value'] for key, item in stream.items.items()
+    }
+
+    # checkpoint older than the stream retention period
+    subscription.stop()
+    stream.put('cluster.e', 1)
+    stream.trim('shard-0')
+    subscription = subscribe(stream, checkpoint_file)
+    poll(subscription)
+    assert subscription.stream_subscriber.resyncs == 1
+    assert 'cluster.e' in subscription.stream_subscriber.entries
+
+
+def test_dynamodb_stream_subscription_concurrent_shards(stream, tmp_path, monkeypatch):
+    """
+    shards are read by concurrent shard readers. shard discovery is not blocked while shards are being read.
+    """
+    workers = 4
+    for index in range(1, 8):
+        stream.add_shard(f'shard-{index}')
+    monkeypatch.setattr(dynamodb_stream_subscription, 'SHARD_READER_WORKERS', workers)
+    subscription = subscribe(stream, str(tmp_path / 'checkpoint.json'))
+    # read from TRIM_HORIZON
+    subscription._discovered = True
+    subscription.discover_shards()
+
+    stream.get_records_release = Event()
+    processor = Thread(target=subscription.process_shards)
+    processor.start()
+    deadline = time.monotonic() + 10
+    while stream.get_records_in_flight < workers and time.monotonic() < deadline:
+        time.sleep(0.001)
+
+    discovery = Thread(target=subscription.discover_shards)
+    discovery.start()
+    discovery.join(timeout=5)
+    discovery_completed = not discovery.is_alive()
+
+    stream.get_records_release.set()
+    processor.join()
+    subscription.stop()
+
+    assert stream.get_records_max_in_flight == workers
+    assert discovery_completed
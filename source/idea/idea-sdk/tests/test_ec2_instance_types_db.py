@@ -0,0 +1,139 @@
+#  Copyright Amazon.com, Inc. or its affiliates. All Rights Reserved.
+#
+#  Licensed under the Apache License, Version 2.0 (the "License"). You may not use this file except in compliance
+#  with the License. A copy of the License is located at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+#  or in the 'license' file accompanying this file. This file is distributed on an 'AS IS' BASIS, WITHOUT WARRANTIES
+#  OR CONDITIONS OF ANY KIND, express or implied. See the License for the specific language governing permissions
+#  and limitations under the License.
+
+"""
+Test Cases for EC2InstanceTypesDB
+"""
+
+from ideasdk.aws import EC2InstanceTypesDB
+from ideadatamodel import SocaAnyPayload
+
+from concurrent.futures import ThreadPoolExecutor
+from threading import Event
+from typing import List
+import os
+import time
+import pytest
+
+
+class FakeEC2:
+    def __init__(self, instance_types: List[str]):
+        self.instance_types = instance_types
+        self.paginate_calls = 0
+        self.describe_calls = 0
+        self.fail = False
+        # set to block paginate until released
+        self.release = Event()
+        self.release.set()
+
+    def _page(self, instance_types: List[str]) -> dict:
+        return {
+            'InstanceTypes': [
+                {'InstanceType': instance_type, 'VCpuInfo': {'DefaultVCpus': 2}}
+                for instance_type in instance_types
+            ]
+        }
+
+    def _paginate(self, **_):
+        self.paginate_calls += 1
+        if self.fail:
+            raise Exception('RequestLimitExceeded')
+        self.release.wait()
+        for offset in range(0, len(self.instance_types), 100):
+            yield self._page(self.instance_types[offset : offset + 100])
+
+    def get_paginator(self, operation_name: str):
+        return SocaAnyPayload(paginate=self._paginate)
+
+    def describe_instance_types(self, InstanceTypes: List[str]):
+        self.describe_calls += 1
+        return self._page([])
+
+
+@pytest.fixture()
+def fake_ec2(context, tmp_path, monkeypatch) -> FakeEC2:
+    monkeypatch.setenv('IDEA_APP_DEPLOY_DIR', str(tmp_path))
+    ec2 = FakeEC2(instance_types=[f'c5.{index}xlarge' for index in range(250)])
+    aws = SocaAnyPayload(ec2=lambda: ec2, aws_region=lambda: 'us-east-1')
+    context.aws = lambda: aws
+    return ec2
+
+
+def wait_for_refresh(db: EC2InstanceTypesDB):
+    if db._refresh_thread is not None:
+        db._refresh_thread.join(timeout=5)
+
+
+def test_ec2_instance_types_db_background_refresh(context, fake_ec2):
+    db = EC2InstanceTypesDB(context=context)
+    assert len(db.all_instance_type_names()) == 250
+
+    # expire the catalog and block the refresh
+    fake_ec2.instance_types = fake_ec2.instance_types + ['c7i.large']
+    fake_ec2.release.clear()
+    db._cache_last_refresh = 0
+
+    def lookup(_) -> float:
+        start = time.perf_counter()
+        assert db.get('c5.1xlarge').instance_type == 'c5.1xlarge'
+        return time.perf_counter() - start
+
+    with ThreadPoolExecutor(max_workers=8) as executor:
+        lookup_seconds = list(executor.map(lookup, range(1000)))
+
+    # lookups are served from the current catalog during the refresh
+    assert max(lookup_seconds) < 0.5
+    assert fake_ec2.describe_calls == 0
+    assert 'c7i.large' not in db.all_instance_type_names()
+
+    fake_ec2.release.set()
+    wait_for_refresh(db)
+    # a single refresh for all lookups
+    assert fake_ec2.paginate_calls == 2
+    assert 'c7i.large' in db.all_instance_type_names()
+    assert db.get('c7i.large').instance_type == 'c7i.large'
+
+
+def test_ec2_instance_types_db_refresh_failure_retains_catalog(context, fake_ec2):
+    db = EC2InstanceTypesDB(context=context)
+    fake_ec2.fail = True
+    db._cache_last_refresh = 0
+
+    assert db.get('c5.1xlarge').instance_type == 'c5.1xlarge'
+    wait_for_refresh(db)
+    assert len(db.all_instance_type_names()) == 250
+
+
+def test_ec2_instance_types_db_snapshot(context, fake_ec2):
+    db = EC2InstanceTypesDB(context=context)
+    assert os.path.isfile(db._snapshot_file)
+    assert fake_ec2.paginate_calls == 1
+
+    # restart: catalog is loaded from the snapshot, without paging the ec2 catalog
+    fake_ec2.fail = True
+    db = EC2InstanceTypesDB(context=context)
+    assert db._refresh_thread is None
+    assert len(db.all_instance_type_names()) == 250
+    assert db.get('c5.2xlarge').instance_type == 'c5.2xlarge'
+    assert fake_ec2.paginate_calls == 1
+
+
+def test_ec2_instance_types_db_stale_snapshot(context, fake_ec2):
+    EC2InstanceTypesDB(context=context)
+    context.config().put('scheduler.cache.instance_types_refresh_interval', -1)
+    fake_ec2.instance_types = fake_ec2.instance_types + ['c7i.large']
+
+    # stale snapshot is served while the catalog is refreshed in background
+    db = EC2InstanceTypesDB(context=context)
+    assert db._refresh_thread is not None
+    wait_for_refresh(db)
+    assert fake_ec2.paginate_calls == 2
+    assert 'c7i.large' in db.all_instance_type_names()
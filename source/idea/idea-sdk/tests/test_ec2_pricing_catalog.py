@@ -0,0 +1,174 @@
+#  Copyright Amazon.com, Inc. or its affiliates. All Rights Reserved.
+#
+#  Licensed under the Apache License, Version 2.0 (the "License"). You may not use this file except in compliance
+#  with the License. A copy of the License is located at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+#  or in the 'license' file accompanying this file. This file is distributed on an 'AS IS' BASIS, WITHOUT WARRANTIES
+#  OR CONDITIONS OF ANY KIND, express or implied. See the License for the specific language governing permissions
+#  and limitations under the License.
+
+"""
+Test Cases for EC2PricingCatalog
+"""
+
+from ideasdk.aws import EC2PricingCatalog
+from ideadatamodel import SocaAnyPayload
+
+from typing import Dict, List
+import json
+import os
+import time
+import pytest
+
+# simulated latency of a pricing:GetProducts request
+GET_PRODUCTS_LATENCY_SECONDS = 0.005
+
+
+def build_price_list_item(usage_type: str, instance_type: str, ondemand: float) -> str:
+    return json.dumps(
+        {
+            'product': {
+                'productFamily': 'Compute Instance',
+                'attributes': {
+                    'usagetype': usage_type,
+                    'instanceType': instance_type,
+                    'operatingSystem': 'Linux',
+                },
+            },
+            'terms': {
+                'OnDemand': {
+                    'SKU1.JRTCKXETXF': {
+                        'priceDimensions': {
+                            'SKU1.JRTCKXETXF.6YS6EN2CT7': {
+                                'description': f'${ondemand} per On Demand Linux {instance_type} Instance Hour',
+                                'pricePerUnit': {'USD': f'{ondemand:.10f}'},
+                            }
+                        }
+                    }
+                },
+                'Reserved': {
+                    'SKU1.4NA7Y494T4': {
+                        'termAttributes': {
+                            'OfferingClass': 'standard',
+                            'LeaseContractLength': '1yr',
+                            'PurchaseOption': 'No Upfront',
+                        },
+                        'priceDimensions': {
+                            'SKU1.4NA7Y494T4.6YS6EN2CT7': {
+                                'description': f'Linux/UNIX (Amazon VPC), {instance_type} reserved instance applied',
+                                'pricePerUnit': {'USD': f'{ondemand * 0.6:.10f}'},
+                            }
+                        },
+                    },
+                    'SKU1.7NE97W5U4E': {
+                        'termAttributes': {
+                            'OfferingClass': 'convertible',
+                            'LeaseContractLength': '3yr',
+                            'PurchaseOption': 'All Upfront',
+                        },
+                        'priceDimensions': {
+                            'SKU1.7NE97W5U4E.6YS6EN2CT7': {
+                                'description': f'Linux/UNIX (Amazon VPC), {instance_type} reserved instance applied',
+                                'pricePerUnit': {'USD': '0.0000000000'},
+                            }
+                        },
+                    },
+                },
+            },
+        }
+    )
+
+
+class FakePricing:
+    def __init__(self, instance_types: List[str], region_prefix: str = 'USE2-'):
+        self.products: Dict[str, str] = {}
+        for index, instance_type in enumerate(instance_types):
+            usage_type = f'{region_prefix}BoxUsage:{instance_type}'
+            self.products[usage_type] = build_price_list_item(
+                usage_type=usage_type, instance_type=instance_type, ondemand=0.1 + index
+            )
+        self.requests = 0
+        self.fail = False
+
+    def _request(self):
+        self.requests += 1
+        time.sleep(GET_PRODUCTS_LATENCY_SECONDS)
+        if self.fail:
+            raise Exception('AccessDeniedException')
+
+    def get_products(self, ServiceCode: str, Filters: List[Dict]):
+        self._request()
+        usage_type = Filters[0]['Value']
+        price_list = []
+        if usage_type in self.products:
+            price_list.append(self.products[usage_type])
+        return {'PriceList': price_list}
+
+    def _paginate(self, ServiceCode: str, Filters: List[Dict], MaxResults: int):
+        price_list = list(self.products.values())
+        for offset in range(0, len(price_list), MaxResults):
+            self._request()
+            yield {'PriceList': price_list[offset : offset + MaxResults]}
+
+    def get_paginator(self, operation_name: str):
+        return SocaAnyPayload(paginate=self._paginate)
+
+
+INSTANCE_TYPES = [f'c5.{index}xlarge' for index in range(500)]
+
+
+@pytest.fixture()
+def fake_pricing(context, tmp_path, monkeypatch) -> FakePricing:
+    monkeypatch.setenv('IDEA_APP_DEPLOY_DIR', str(tmp_path))
+    pricing = FakePricing(instance_types=INSTANCE_TYPES)
+    aws = SocaAnyPayload(pricing=lambda: pricing, aws_region=lambda: 'us-east-2')
+    context.aws = lambda: aws
+    return pricing
+
+
+def test_ec2_pricing_catalog_parse_price_list_item():
+    usage_type, unit_price = EC2PricingCatalog.parse_price_list_item(
+        build_price_list_item('USE2-BoxUsage:c5.large', 'c5.large', ondemand=0.085)
+    )
+    assert usage_type == 'USE2-BoxUsage:c5.large'
+    assert unit_price.ondemand == 0.085
+    assert unit_price.reserved == pytest.approx(0.051)
+
+
+def test_ec2_pricing_catalog_bulk_load_and_snapshot(context, fake_pricing):
+    catalog = EC2PricingCatalog(context=context)
+    assert catalog.get('c5.3xlarge').ondemand == pytest.approx(3.1)
+    # 500 instance types in pages of 100
+    assert fake_pricing.requests == 5
+    assert os.path.isfile(catalog.get_snapshot_file())
+
+    # restart: prices are loaded from the snapshot
+    fake_pricing.fail = True
+    catalog = EC2PricingCatalog(context=context)
+    unit_price = catalog.get('c5.3xlarge')
+    assert unit_price.ondemand == pytest.approx(3.1)
+    assert unit_price.reserved == pytest.approx(3.1 * 0.6)
+    assert fake_pricing.requests == 5
+
+
+def test_ec2_pricing_catalog_unknown_instance_type(context, fake_pricing):
+    catalog = EC2PricingCatalog(context=context)
+    catalog.get('c5.1xlarge')
+
+    # instance types not in the catalog are fetched individually, once
+    fake_pricing.products['USE2-BoxUsage:c7i.large'] = build_price_list_item(
+        'USE2-BoxUsage:c7i.large', 'c7i.large', ondemand=0.089
+    )
+    assert catalog.get('c7i.large').ondemand == 0.089
+    assert catalog.get('c7i.large').ondemand == 0.089
+    assert fake_pricing.requests == 6
+
+
+def test_ec2_pricing_catalog_pricing_api_unavailable(context, fake_pricing):
+    fake_pricing.fail = True
+    catalog = EC2PricingCatalog(context=context)
+    unit_price = catalog.get('c5.1xlarge')
+    assert unit_price.ondemand == 0.0
+    assert unit_price.reserved == 0.0
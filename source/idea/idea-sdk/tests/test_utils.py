@@ -10,7 +10,28 @@
 #  and limitations under the License.
 
 from ideasdk.utils import Utils
-from ideadatamodel import constants, exceptions, errorcodes
+from ideadatamodel import (
+    constants,
+    exceptions,
+    errorcodes,
+    Project,
+    SocaJob,
+    SocaJobExecutionHost,
+    SocaJobParams,
+    SocaJobState,
+    SocaMemory,
+    SocaMemoryUnit,
+    SocaComputeNode,
+    OpenPBSInfo,
+    VirtualDesktopBaseOS,
+    VirtualDesktopServer,
+    VirtualDesktopSession,
+    VirtualDesktopSessionState,
+)
+from ideadatamodel.model_utils import ModelUtils
+
+from datetime import datetime, timezone
+from decimal import Decimal
 import pytest
 
 
@@ -375,3 +396,81 @@ def test_utils_convert_custom_tags_to_key_value_pairs():
     assert tags['k1'] == 'v1'
     assert 'k 3' in tags
     assert tags['k 3'] == 'v 3'
+
+
+def build_job() -> SocaJob:
+    now = datetime.now(timezone.utc)
+    return SocaJob(
+        cluster_name='idea-mock',
+        job_id='1',
+        name='job-1',
+        queue='normal',
+        owner='user1',
+        state=SocaJobState.QUEUED,
+        queue_time=now,
+        params=SocaJobParams(
+            nodes=2,
+            cpus=8,
+            memory=SocaMemory(value=8, unit=SocaMemoryUnit.GiB),
+            instance_types=['c5.large', 'c5.xlarge'],
+            subnet_ids=['subnet-1', 'subnet-2'],
+            custom_params={'license': 'abaqus', 'empty': None},
+        ),
+        execution_hosts=[
+            SocaJobExecutionHost(host=f'ip-10-0-0-{index}', instance_id=f'i-{index}')
+            for index in range(16)
+        ],
+    )
+
+
+def build_session() -> VirtualDesktopSession:
+    now = datetime.now(timezone.utc)
+    return VirtualDesktopSession(
+        dcv_session_id='dcv-1',
+        idea_session_id='session-1',
+        base_os=VirtualDesktopBaseOS.AMAZON_LINUX2,
+        name='session',
+        owner='user1',
+        server=VirtualDesktopServer(
+            instance_id='i-1',
+            instance_type='m5.large',
+            root_volume_size=SocaMemory(value=40, unit=SocaMemoryUnit.GB),
+            security_groups=['sg-1'],
+        ),
+        created_on=now,
+        updated_on=now,
+        state=VirtualDesktopSessionState.READY,
+        project=Project(project_id='project-1', name='project', ldap_groups=['group1']),
+    )
+
+
+def test_utils_to_dict_same_as_json_round_trip():
+    job = build_job()
+    # values that are converted differently by a json mode model_dump or a structural copy
+    job.params.memory.value = float('inf')
+    job.state = 'queued'
+    node = SocaComputeNode(
+        host='ip-10-0-0-1', scheduler_info=OpenPBSInfo(name='openpbs', mom_port=15002)
+    )
+    payloads = [
+        job,
+        node,
+        build_session(),
+        {
+            'Images': [
+                {
+                    'ImageId': 'ami-1',
+                    'CreationDate': datetime.now(timezone.utc),
+                    'Size': Decimal('1.5'),
+                    'Tags': ({'Key': 'k', 'Value': 'v'},),
+                    'State': SocaJobState.RUNNING,
+                }
+            ]
+        },
+    ]
+    for payload in payloads:
+        expected = ModelUtils.from_json(ModelUtils.to_json(payload))
+        assert Utils.to_dict(payload) == expected
+        assert Utils.deep_copy(payload) == expected
+    assert Utils.to_dict(job)['params']['memory']['value'] is None
+    assert Utils.to_dict(node)['scheduler_info'] == {'name': 'openpbs'}
@@ -17,10 +17,12 @@ from ideasdk.shell import ShellInvoker, StreamInvocationProcess
 from ideasdk.utils import Utils
 from ideatestutils import IdeaTestProps
 
+import boto3
 import os
 import requests
 import shutil
 import pathlib
+import time
 from threading import Thread
 from typing import Optional
 
@@ -68,6 +70,61 @@ class DynamoDBLocal:
         self.process: Optional[StreamInvocationProcess] = None
         self.loop = Thread(target=self._run_ddb_local, name='ddb-local')
 
+    def get_endpoint_url(self) -> str:
+        return f'http://localhost:{self.port}'
+
+    def client(self):
+        """
+        boto3 dynamodb client connected to ddb local
+        """
+        return boto3.client(
+            'dynamodb',
+            endpoint_url=self.get_endpoint_url(),
+            region_name='us-east-1',
+            aws_access_key_id='dummy',
+            aws_secret_access_key='dummy',
+        )
+
+    def resource(self):
+        """
+        boto3 dynamodb resource connected to ddb local
+        """
+        return boto3.resource(
+            'dynamodb',
+            endpoint_url=self.get_endpoint_url(),
+            region_name='us-east-1',
+            aws_access_key_id='dummy',
+            aws_secret_access_key='dummy',
+        )
+
+    def wait_until_ready(self, timeout: int = 30) -> bool:
+        """
+        wait for ddb local to accept connections
+        :param timeout: seconds to wait for the server to start
+        :return: True if the server is ready, False if the server did not start within the timeout
+        """
+        endpoint_url = f'{self.get_endpoint_url()}/'
+        start_time = time.time()
+        while time.time() - start_time < timeout:
+            try:
+                # ddb local returns 400 for GET requests, but that means it's running
+                response = requests.get(endpoint_url, timeout=1)
+                if response.status_code == 400:
+                    print(f'DynamoDB Local is ready at {endpoint_url}')
+                    return True
+            except (
+                requests.exceptions.ConnectionError,
+                requests.exceptions.Timeout,
+            ):
+                # server not ready yet, continue waiting
+                pass
+
+            print(f'Waiting for DynamoDB Local at {endpoint_url}...')
+            time.sleep(1)
+
+        print(f'DynamoDB Local failed to start within {timeout} seconds')
+        return False
+
     def get_ddb_local_download_dir(self) -> str:
         idea_user_home_dir = self.props.get_idea_user_home_dir()
         downloads_dir = os.path.join(idea_user_home_dir, 'downloads')
@@ -182,8 +239,6 @@ class DynamoDBLocal:
 if __name__ == '__main__':
     db = DynamoDBLocal(db_name='cluster-manager', reset=True)
 
-    import time
-
     db.start()
     time.sleep(10)
     db.stop()
@@ -0,0 +1,53 @@
+#  Copyright Amazon.com, Inc. or its affiliates. All Rights Reserved.
+#
+#  Licensed under the Apache License, Version 2.0 (the "License"). You may not use this file except in compliance
+#  with the License. A copy of the License is located at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+#  or in the 'license' file accompanying this file. This file is distributed on an 'AS IS' BASIS, WITHOUT WARRANTIES
+#  OR CONDITIONS OF ANY KIND, express or implied. See the License for the specific language governing permissions
+#  and limitations under the License.
+
+"""
+DynamoDB Request Counter for Unit Tests
+"""
+
+from collections import Counter, defaultdict
+from typing import Dict, List, Optional
+
+
+class DynamoDBRequests:
+    """
+    Observe the requests of a boto3 dynamodb client (or of the tables of a dynamodb resource) using botocore events.
+    * counts the requests by operation name. eg. Scan, Query, BatchGetItem, BatchWriteItem
+    * optionally, scan and query results are returned in pages of page_size items, so that paging is exercised without a large table
+    * errors added to errors[operation_name] are raised by the next requests of the operation. None lets a request through
+    """
+
+    def __init__(self, client, page_size: Optional[int] = None):
+        """
+        :param client: boto3 dynamodb client. for a dynamodb resource, use resource.meta.client
+        :param page_size: the Limit of scan and query requests that do not specify a Limit
+        """
+        self.counts: Counter = Counter()
+        self.page_size = page_size
+        self.errors: Dict[str, List[Optional[Exception]]] = defaultdict(list)
+        client.meta.events.register(
+            'before-parameter-build.dynamodb', self._before_parameter_build
+        )
+        client.meta.events.register('before-call.dynamodb', self._before_call)
+
+    def _before_parameter_build(self, params: Dict, model, **_):
+        if self.page_size is None:
+            return
+        if model.name in ('Scan', 'Query'):
+            params.setdefault('Limit', self.page_size)
+
+    def _before_call(self, model, **_):
+        self.counts[model.name] += 1
+        errors = self.errors[model.name]
+        if len(errors) > 0:
+            error = errors.pop(0)
+            if error is not None:
+                raise error
@@ -81,6 +81,11 @@ class VirtualDesktopNotifiableDBProtocol(SocaBaseProtocol):
         self, hash_key: str, range_key: str, deleted_entry: dict
     ) -> dict: ...
 
+    @abstractmethod
+    def trigger_delete_events(
+        self, deleted_entries: List[dict], hash_key_name: str, range_key_name: str
+    ): ...
+
     @abstractmethod
     def trigger_create_event(
         self, hash_key: str, range_key: str, new_entry: dict
@@ -201,10 +201,17 @@ class DCVBrokerClient(DCVClientProtocol):
         if Utils.is_empty(session_ids):
             session_ids = None
 
-        response = self._describe_sessions(session_ids=session_ids)
         sessions = {}
-        for session in Utils.get_value_as_list('sessions', response, []):
-            sessions[session['id']] = session
+        next_token = None
+        while True:
+            response = self._describe_sessions(
+                session_ids=session_ids, next_token=next_token
+            )
+            for session in Utils.get_value_as_list('sessions', response, []):
+                sessions[session['id']] = session
+            next_token = Utils.get_value_as_string('next_token', response)
+            if Utils.is_empty(next_token):
+                break
         response['sessions'] = sessions
         return response
 
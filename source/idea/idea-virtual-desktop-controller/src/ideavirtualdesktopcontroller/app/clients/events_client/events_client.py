@@ -9,12 +9,15 @@
 #  OR CONDITIONS OF ANY KIND, express or implied. See the License for the specific language governing permissions
 #  and limitations under the License.
 from enum import Enum
-from typing import Optional, Dict
+from typing import Optional, Dict, List
 from pydantic import Field
 from ideadatamodel import SocaBaseModel
 from ideasdk.protocols import SocaContextProtocol
 from ideasdk.utils import Utils
 
+# max. no. of messages in a SendMessageBatch request
+SQS_MAX_BATCH_SIZE = 10
+
 
 class VirtualDesktopEventType(str, Enum):
     VALIDATE_SOFTWARE_STACK_CREATION_EVENT = 'VALIDATE_SOFTWARE_STACK_CREATION_EVENT'
@@ -34,6 +37,7 @@ class VirtualDesktopEventType(str, Enum):
     )
     IDEA_SESSION_SCHEDULED_RESUME_EVENT = 'IDEA_SESSION_SCHEDULED_RESUME_EVENT'
     IDEA_SESSION_SCHEDULED_STOP_EVENT = 'IDEA_SESSION_SCHEDULED_STOP_EVENT'
+    IDEA_SESSIONS_IDLE_CHECK_EVENT = 'IDEA_SESSIONS_IDLE_CHECK_EVENT'
     IDEA_SESSION_TERMINATE_EVENT = 'IDEA_SESSION_TERMINATE_EVENT'
     IDEA_SESSION_SOFTWARE_STACK_UPDATED_EVENT = (
         'IDEA_SESSION_SOFTWARE_STACK_UPDATED_EVENT'
@@ -94,3 +98,37 @@ class EventsClient:
             MessageBody=Utils.to_json(event_data),
             MessageGroupId=event.event_group_id.replace(' ', '_'),
         )
+
+    def publish_events(self, events: List[VirtualDesktopEvent]):
+        """
+        publish events in batches of up to 10 messages per SendMessageBatch request
+        """
+        if Utils.is_empty(events):
+            return
+
+        events_sqs_queue_url = self.context.config().get_string(
+            'virtual-desktop-controller.events_sqs_queue_url', default=None
+        )
+        if Utils.is_empty(events_sqs_queue_url):
+            return
+
+        for offset in range(0, len(events), SQS_MAX_BATCH_SIZE):
+            entries = []
+            for index, event in enumerate(events[offset : offset + SQS_MAX_BATCH_SIZE]):
+                entries.append(
+                    {
+                        'Id': str(index),
+                        'MessageBody': Utils.to_json(event.model_dump()),
+                        'MessageGroupId': event.event_group_id.replace(' ', '_'),
+                    }
+                )
+            result = (
+                self.context.aws()
+                .sqs()
+                .send_message_batch(QueueUrl=events_sqs_queue_url, Entries=entries)
+            )
+            for failed in Utils.get_value_as_list('Failed', result, []):
+                self._logger.error(
+                    f'failed to publish event: {entries[int(failed["Id"])]["MessageBody"]}, '
+                    f'error: {Utils.get_value_as_string("Code", failed)} - {Utils.get_value_as_string("Message", failed)}'
+                )
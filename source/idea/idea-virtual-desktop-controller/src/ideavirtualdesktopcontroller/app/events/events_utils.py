@@ -8,7 +8,7 @@
 #  or in the 'license' file accompanying this file. This file is distributed on an 'AS IS' BASIS, WITHOUT WARRANTIES
 #  OR CONDITIONS OF ANY KIND, express or implied. See the License for the specific language governing permissions
 #  and limitations under the License.
-from typing import Optional, Dict
+from typing import Optional, Dict, List
 
 import ideavirtualdesktopcontroller
 from ideadatamodel import VirtualDesktopBaseOS, VirtualDesktopSessionState
@@ -222,6 +222,35 @@ class EventsUtils:
             )
         )
 
+    def publish_idea_sessions_cpu_utilization_command_status_event(
+        self, sessions: List[Dict], status: str, command_id: str
+    ):
+        self.context.events_client.publish_event(
+            event=VirtualDesktopEvent(
+                event_group_id=command_id,
+                event_type=VirtualDesktopEventType.IDEA_SESSION_CPU_UTILIZATION_COMMAND_PROGRESS_EVENT,
+                detail={
+                    'sessions': sessions,
+                    'status': status,
+                    'command_id': command_id,
+                    'timestamp': Utils.current_time_ms(),
+                },
+            )
+        )
+
+    @staticmethod
+    def build_idea_sessions_idle_check_event(
+        sessions: List[Dict],
+    ) -> VirtualDesktopEvent:
+        """
+        :param sessions: list of dict with idea_session_id and idea_session_owner
+        """
+        return VirtualDesktopEvent(
+            event_group_id=f'idle-check-{Utils.short_uuid()}',
+            event_type=VirtualDesktopEventType.IDEA_SESSIONS_IDLE_CHECK_EVENT,
+            detail={'sessions': sessions},
+        )
+
     def publish_validate_software_stack_creation_event(
         self,
         software_stack_id: str,
@@ -274,31 +303,47 @@ class EventsUtils:
             )
         )
 
+    @staticmethod
+    def build_idea_session_scheduled_resume_event(
+        idea_session_id: str, idea_session_owner: str
+    ) -> VirtualDesktopEvent:
+        return VirtualDesktopEvent(
+            event_group_id=idea_session_id,
+            event_type=VirtualDesktopEventType.IDEA_SESSION_SCHEDULED_RESUME_EVENT,
+            detail={
+                'idea_session_id': idea_session_id,
+                'idea_session_owner': idea_session_owner,
+            },
+        )
+
     def publish_idea_session_scheduled_resume_event(
         self, idea_session_id: str, idea_session_owner: str
     ):
         self.context.events_client.publish_event(
-            event=VirtualDesktopEvent(
-                event_group_id=idea_session_id,
-                event_type=VirtualDesktopEventType.IDEA_SESSION_SCHEDULED_RESUME_EVENT,
-                detail={
-                    'idea_session_id': idea_session_id,
-                    'idea_session_owner': idea_session_owner,
-                },
+            event=self.build_idea_session_scheduled_resume_event(
+                idea_session_id=idea_session_id, idea_session_owner=idea_session_owner
             )
         )
 
+    @staticmethod
+    def build_idea_session_scheduled_stop_event(
+        idea_session_id: str, idea_session_owner: str
+    ) -> VirtualDesktopEvent:
+        return VirtualDesktopEvent(
+            event_group_id=idea_session_id,
+            event_type=VirtualDesktopEventType.IDEA_SESSION_SCHEDULED_STOP_EVENT,
+            detail={
+                'idea_session_id': idea_session_id,
+                'idea_session_owner': idea_session_owner,
+            },
+        )
+
     def publish_idea_session_scheduled_stop_event(
         self, idea_session_id: str, idea_session_owner: str
     ):
         self.context.events_client.publish_event(
-            event=VirtualDesktopEvent(
-                event_group_id=idea_session_id,
-                event_type=VirtualDesktopEventType.IDEA_SESSION_SCHEDULED_STOP_EVENT,
-                detail={
-                    'idea_session_id': idea_session_id,
-                    'idea_session_owner': idea_session_owner,
-                },
+            event=self.build_idea_session_scheduled_stop_event(
+                idea_session_id=idea_session_id, idea_session_owner=idea_session_owner
             )
         )
 
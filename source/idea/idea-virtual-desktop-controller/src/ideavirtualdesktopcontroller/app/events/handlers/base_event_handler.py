@@ -49,6 +49,9 @@ from ideavirtualdesktopcontroller.app.session_permissions.virtual_desktop_sessio
 from ideavirtualdesktopcontroller.app.sessions.virtual_desktop_session_counters_db import (
     VirtualDesktopSessionCounterDB,
 )
+from ideavirtualdesktopcontroller.app.sessions.virtual_desktop_idle_sampler import (
+    VirtualDesktopIdleSampler,
+)
 from ideavirtualdesktopcontroller.app.sessions.virtual_desktop_session_db import (
     VirtualDesktopSessionDB,
 )
@@ -142,6 +145,12 @@ class BaseVirtualDesktopControllerEventHandler(
             session_permission_db=self.session_permissions_db,
             permission_profile_db=self.permission_profile_db,
         )
+        self.idle_sampler: VirtualDesktopIdleSampler = VirtualDesktopIdleSampler(
+            context=self.context,
+            session_db=self.session_db,
+            session_utils=self.session_utils,
+            ssm_commands_utils=self.ssm_commands_utils,
+        )
         self.dcv_broker_client_utils: DCVBrokerClientUtils = DCVBrokerClientUtils(
             context=context,
             session_permission_utils=self.session_permission_utils,
@@ -0,0 +1,49 @@
+#  Copyright Amazon.com, Inc. or its affiliates. All Rights Reserved.
+#
+#  Licensed under the Apache License, Version 2.0 (the "License"). You may not use this file except in compliance
+#  with the License. A copy of the License is located at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+#  or in the 'license' file accompanying this file. This file is distributed on an 'AS IS' BASIS, WITHOUT WARRANTIES
+#  OR CONDITIONS OF ANY KIND, express or implied. See the License for the specific language governing permissions
+#  and limitations under the License.
+
+import ideavirtualdesktopcontroller
+from ideasdk.utils import Utils
+from ideavirtualdesktopcontroller.app.clients.events_client.events_client import (
+    VirtualDesktopEvent,
+)
+from ideavirtualdesktopcontroller.app.events.handlers.base_event_handler import (
+    BaseVirtualDesktopControllerEventHandler,
+)
+
+
+class IDEASessionsIdleCheckEventHandler(BaseVirtualDesktopControllerEventHandler):
+    def __init__(self, context: ideavirtualdesktopcontroller.AppContext):
+        super().__init__(context, 'idea-sessions-idle-check-handler')
+
+    def handle_event(self, message_id: str, sender_id: str, event: VirtualDesktopEvent):
+        if not self.is_sender_controller_role(sender_id):
+            raise self.message_source_validation_failed(
+                f'Corrupted sender_id: {sender_id}. Ignoring message'
+            )
+
+        session_keys = []
+        for session_info in Utils.get_value_as_list('sessions', event.detail, []):
+            session_keys.append(
+                (
+                    Utils.get_value_as_string('idea_session_owner', session_info),
+                    Utils.get_value_as_string('idea_session_id', session_info),
+                )
+            )
+
+        self.log_info(
+            message_id=message_id,
+            message=f'handle idle check for {len(session_keys)} sessions',
+        )
+        summary = self.idle_sampler.stop_idle_sessions(session_keys)
+        self.log_info(
+            message_id=message_id,
+            message=f'idle check complete. sampled: {summary["sampled"]}, active: {summary["active"]}, stopped: {summary["stopped"]}, sent to SSM: {summary["ssm"]}',
+        )
@@ -8,8 +8,6 @@
 #  or in the 'license' file accompanying this file. This file is distributed on an 'AS IS' BASIS, WITHOUT WARRANTIES
 #  OR CONDITIONS OF ANY KIND, express or implied. See the License for the specific language governing permissions
 #  and limitations under the License.
-from typing import Optional
-
 import ideavirtualdesktopcontroller
 from ideadatamodel import DayOfWeek
 
@@ -59,33 +57,28 @@ class ScheduledEventHandler(BaseVirtualDesktopControllerEventHandler):
             message=f'Handling scheduled event at time {event_time} in {self.context.cluster_timezone()}',
         )
         day_of_week = self.DAY_OF_WEEKS[event_time.weekday()]
-        schedule_db_entries = self.schedule_db.get_schedules_for_day_of_week(
-            day_of_week
+        events_published = self.schedule_utils.trigger_schedules_for_day_of_week(
+            day_of_week=day_of_week, event_time=event_time.time()
+        )
+        self.log_info(
+            message_id=message_id,
+            message=f'Published {events_published} scheduled events for {day_of_week}',
         )
-        for schedule_db_entry in schedule_db_entries:
+
+        expired_permissions = self.session_permissions_db.list_expired(event_time)
+        if Utils.is_empty(expired_permissions):
+            return
+
+        sessions_info = set()
+        for permission in expired_permissions:
             self.log_info(
                 message_id=message_id,
-                message=f'Triggering schedule {schedule_db_entry.schedule_id}',
+                message=f'Session Permission for session {permission.idea_session_id} has expired. Expiry Date {permission.expiry_date}. Deleting Permission',
             )
-            self.schedule_utils.trigger_schedule(event_time.time(), schedule_db_entry)
-
-        cursor: Optional[str] = None
-        loop_break = False
-        sessions_info = set()
-        while not loop_break:
-            permissions, cursor = self.session_permissions_db.list_all_from_db(cursor)
-            for permission in permissions:
-                if event_time >= permission.expiry_date:
-                    self.log_info(
-                        message_id=message_id,
-                        message=f'Session Permission for session {permission.idea_session_id} has expired. Expiry Date {permission.expiry_date}. Deleting Permission',
-                    )
-                    sessions_info.add(
-                        (permission.idea_session_id, permission.idea_session_owner)
-                    )
-                    self.session_permissions_db.delete(permission)
-
-            loop_break = Utils.is_empty(cursor)
+            sessions_info.add(
+                (permission.idea_session_id, permission.idea_session_owner)
+            )
+        self.session_permissions_db.delete_all(expired_permissions)
 
         for session_info in sessions_info:
             self.events_utils.publish_enforce_session_permissions_event(
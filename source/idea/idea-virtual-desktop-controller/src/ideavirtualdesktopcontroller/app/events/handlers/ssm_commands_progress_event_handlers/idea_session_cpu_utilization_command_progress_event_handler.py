@@ -44,6 +44,24 @@ class IDEASessionCPUUtilizationCommandProgressEventHandler(
         )
         command_id = Utils.get_value_as_string('command_id', event.detail, None)
 
+        sessions = Utils.get_value_as_list('sessions', event.detail, None)
+        if sessions is not None:
+            # command sent to multiple instances. status is the status of the command.
+            if status in {'Success', 'Failed', 'TimedOut', 'Cancelled'}:
+                stopped = self.idle_sampler.stop_idle_sessions_from_command_output(
+                    command_id=command_id, sessions=sessions
+                )
+                self.log_info(
+                    message_id=message_id,
+                    message=f'CPU Utilization command: {command_id} complete with status: {status}. Stopped {stopped} of {len(sessions)} sessions.',
+                )
+            else:
+                self.log_error(
+                    message_id=message_id,
+                    message=f'Ignoring message because state is {status} for command: {command_id}',
+                )
+            return
+
         if status in {'Success', 'Failed'}:
             session = self.session_db.get_from_db(
                 idea_session_owner=idea_session_owner, idea_session_id=idea_session_id
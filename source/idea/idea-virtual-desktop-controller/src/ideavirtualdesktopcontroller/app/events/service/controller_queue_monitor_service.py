@@ -263,6 +263,17 @@ class ControllerQueueMonitorService(SocaService):
                 ),
                 status=status,
             )
+        elif (
+            ssm_command.command_type
+            == VirtualDesktopSSMCommandType.CPU_UTILIZATION_CHECK_STOP_SCHEDULED_SESSIONS
+        ):
+            self._events_utils.publish_idea_sessions_cpu_utilization_command_status_event(
+                sessions=Utils.get_value_as_list(
+                    'sessions', ssm_command.additional_payload, []
+                ),
+                command_id=command_id,
+                status=status,
+            )
         else:
             self._logger.error(
                 f'[msg-id: {message_id}] Unsupported command type {ssm_command.command_type}. NO=OP'
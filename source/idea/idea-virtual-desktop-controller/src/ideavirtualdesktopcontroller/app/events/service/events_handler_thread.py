@@ -58,6 +58,9 @@ from ideavirtualdesktopcontroller.app.events.handlers.idea_session_state_event_h
 from ideavirtualdesktopcontroller.app.events.handlers.idea_session_state_event_handlers.idea_session_scheduled_stop_event_handler import (
     IDEASessionScheduledStopEventHandler,
 )
+from ideavirtualdesktopcontroller.app.events.handlers.idea_session_state_event_handlers.idea_sessions_idle_check_event_handler import (
+    IDEASessionsIdleCheckEventHandler,
+)
 from ideavirtualdesktopcontroller.app.events.handlers.idea_session_state_event_handlers.idea_session_terminate_event_handler import (
     IDEASessionTerminateEventHandler,
 )
@@ -123,6 +126,9 @@ class EventsHandlerThread(IdeaThread):
             VirtualDesktopEventType.IDEA_SESSION_SCHEDULED_STOP_EVENT: IDEASessionScheduledStopEventHandler(
                 context=self.context
             ),
+            VirtualDesktopEventType.IDEA_SESSIONS_IDLE_CHECK_EVENT: IDEASessionsIdleCheckEventHandler(
+                context=self.context
+            ),
             VirtualDesktopEventType.IDEA_SESSION_TERMINATE_EVENT: IDEASessionTerminateEventHandler(
                 context=self.context
             ),
@@ -6,3 +6,14 @@ SCHEDULE_DB_START_UP_TIME_KEY = 'shut_down_time'
 SCHEDULE_DB_SHUT_DOWN_TIME_KEY = 'start_up_time'
 SCHEDULE_DB_HASH_KEY = 'day_of_week'
 SCHEDULE_DB_RANGE_KEY = SCHEDULE_DB_SCHEDULE_ID_KEY
+
+# time of the day (HH:MM) from which a schedule needs to be evaluated on each scheduled event.
+# no action is taken for a schedule before its start up time, so scheduled events query only the
+# schedules with active_from <= time of the event.
+SCHEDULE_DB_ACTIVE_FROM_KEY = 'active_from'
+# start up time of working hours schedules is read from cluster settings and not saved with the schedule.
+# sorts after all HH:MM values.
+SCHEDULE_DB_ACTIVE_FROM_WORKING_HOURS = 'working_hours'
+SCHEDULE_DB_ACTIVE_FROM_INDEX_NAME = 'active-from-index'
+# backfill of active_from for schedules created before the active from index was added
+SCHEDULE_DB_ACTIVE_FROM_BACKFILL = 'schedules-active-from'
@@ -9,6 +9,9 @@
 #  OR CONDITIONS OF ANY KIND, express or implied. See the License for the specific language governing permissions
 #  and limitations under the License.
 from typing import List, Dict, Optional
+from datetime import time
+from boto3.dynamodb.conditions import Key, Attr
+import botocore.exceptions
 
 import ideavirtualdesktopcontroller
 from ideadatamodel import VirtualDesktopSchedule, DayOfWeek, VirtualDesktopScheduleType
@@ -25,6 +28,8 @@ class VirtualDesktopScheduleDB(VirtualDesktopNotifiableDB):
         self._table_obj = None
         self._logger = self.context.logger('virtual-desktop-schedule-db')
         self._ddb_client = self.context.aws().dynamodb_table()
+        self._active_from_index_active = False
+        self._active_from_backfill_complete = False
         super().__init__(context, self.table_name, self._logger)
 
     @property
@@ -54,6 +59,10 @@ class VirtualDesktopScheduleDB(VirtualDesktopNotifiableDB):
                             'AttributeName': schedules_constants.SCHEDULE_DB_RANGE_KEY,
                             'AttributeType': 'S',
                         },
+                        {
+                            'AttributeName': schedules_constants.SCHEDULE_DB_ACTIVE_FROM_KEY,
+                            'AttributeType': 'S',
+                        },
                     ],
                     'KeySchema': [
                         {
@@ -65,10 +74,138 @@ class VirtualDesktopScheduleDB(VirtualDesktopNotifiableDB):
                             'KeyType': 'RANGE',
                         },
                     ],
+                    'GlobalSecondaryIndexes': [
+                        self._build_active_from_index_definition()
+                    ],
                     'BillingMode': 'PAY_PER_REQUEST',
                 },
                 wait=True,
             )
+            self.context.aws_util().dynamodb_set_backfill_complete(
+                self.table_name, schedules_constants.SCHEDULE_DB_ACTIVE_FROM_BACKFILL
+            )
+        else:
+            self._create_active_from_index()
+        self._active_from_backfill_complete = True
+
+    @staticmethod
+    def _build_active_from_index_definition() -> Dict:
+        return {
+            'IndexName': schedules_constants.SCHEDULE_DB_ACTIVE_FROM_INDEX_NAME,
+            'KeySchema': [
+                {
+                    'AttributeName': schedules_constants.SCHEDULE_DB_HASH_KEY,
+                    'KeyType': 'HASH',
+                },
+                {
+                    'AttributeName': schedules_constants.SCHEDULE_DB_ACTIVE_FROM_KEY,
+                    'KeyType': 'RANGE',
+                },
+            ],
+            'Projection': {'ProjectionType': 'ALL'},
+        }
+
+    def _create_active_from_index(self):
+        """
+        add the active from index to schedule tables created by earlier releases and backfill active_from for existing schedules.
+        the backfill is re-run on initialize until its completion is recorded.
+        """
+        self.context.aws_util().dynamodb_create_global_secondary_index(
+            table_name=self.table_name,
+            index=self._build_active_from_index_definition(),
+            attribute_definitions=[
+                {
+                    'AttributeName': schedules_constants.SCHEDULE_DB_HASH_KEY,
+                    'AttributeType': 'S',
+                },
+                {
+                    'AttributeName': schedules_constants.SCHEDULE_DB_ACTIVE_FROM_KEY,
+                    'AttributeType': 'S',
+                },
+            ],
+        )
+        if self.context.aws_util().dynamodb_is_backfill_complete(
+            self.table_name, schedules_constants.SCHEDULE_DB_ACTIVE_FROM_BACKFILL
+        ):
+            return
+
+        backfill_count = 0
+        scan_request = {}
+        while True:
+            result = self._table.scan(**scan_request)
+            for db_entry in Utils.get_value_as_list('Items', result, []):
+                if self._backfill_active_from(db_entry):
+                    backfill_count += 1
+            last_evaluated_key = Utils.get_value_as_dict('LastEvaluatedKey', result)
+            if Utils.is_empty(last_evaluated_key):
+                break
+            scan_request = {'ExclusiveStartKey': last_evaluated_key}
+
+        self.context.aws_util().dynamodb_set_backfill_complete(
+            self.table_name, schedules_constants.SCHEDULE_DB_ACTIVE_FROM_BACKFILL
+        )
+        self._logger.info(
+            f'active from index backfilled for {backfill_count} schedules'
+        )
+
+    def _backfill_active_from(self, db_entry: Dict) -> bool:
+        """
+        :return: False if the schedule was deleted since it was scanned
+        """
+        schedule = self.convert_db_dict_to_schedule_object(db_entry)
+        try:
+            self._table.update_item(
+                Key={
+                    schedules_constants.SCHEDULE_DB_HASH_KEY: db_entry[
+                        schedules_constants.SCHEDULE_DB_HASH_KEY
+                    ],
+                    schedules_constants.SCHEDULE_DB_RANGE_KEY: db_entry[
+                        schedules_constants.SCHEDULE_DB_RANGE_KEY
+                    ],
+                },
+                UpdateExpression='SET #active_from = :active_from',
+                ConditionExpression=Attr(
+                    schedules_constants.SCHEDULE_DB_RANGE_KEY
+                ).exists(),
+                ExpressionAttributeNames={
+                    '#active_from': schedules_constants.SCHEDULE_DB_ACTIVE_FROM_KEY
+                },
+                ExpressionAttributeValues={
+                    ':active_from': self.get_active_from(schedule)
+                },
+            )
+            return True
+        except botocore.exceptions.ClientError as e:
+            if e.response['Error']['Code'] == 'ConditionalCheckFailedException':
+                return False
+            raise e
+
+    def _is_active_from_index_active(self) -> bool:
+        if not self._active_from_backfill_complete:
+            return False
+        if not self._active_from_index_active:
+            status = self.context.aws_util().dynamodb_get_global_secondary_index_status(
+                self.table_name, schedules_constants.SCHEDULE_DB_ACTIVE_FROM_INDEX_NAME
+            )
+            self._active_from_index_active = status == 'ACTIVE'
+        return self._active_from_index_active
+
+    @staticmethod
+    def get_active_from(schedule: VirtualDesktopSchedule) -> str:
+        """
+        :return: time of the day (HH:MM) from which the schedule needs to be evaluated
+        """
+        schedule_type = VirtualDesktopScheduleType(schedule.schedule_type)
+        if schedule_type == VirtualDesktopScheduleType.WORKING_HOURS:
+            return schedules_constants.SCHEDULE_DB_ACTIVE_FROM_WORKING_HOURS
+        if (
+            schedule_type == VirtualDesktopScheduleType.CUSTOM_SCHEDULE
+            and Utils.is_not_empty(schedule.start_up_time)
+        ):
+            hours, minutes = schedule.start_up_time.split(':')
+            return f'{int(hours):02d}:{int(minutes):02d}'
+        # STOP_ON_IDLE and START_ALL_DAY are evaluated throughout the day
+        return '00:00'
 
     @staticmethod
     def get_empty_schedule(
@@ -92,6 +229,11 @@ class VirtualDesktopScheduleDB(VirtualDesktopNotifiableDB):
             schedules_constants.SCHEDULE_DB_SCHEDULE_TYPE_KEY: schedule.schedule_type,
         }
 
+        if schedule.schedule_type != VirtualDesktopScheduleType.NO_SCHEDULE:
+            schedule_dict[schedules_constants.SCHEDULE_DB_ACTIVE_FROM_KEY] = (
+                VirtualDesktopScheduleDB.get_active_from(schedule)
+            )
+
         if schedule.schedule_type == VirtualDesktopScheduleType.CUSTOM_SCHEDULE:
             schedule_dict[schedules_constants.SCHEDULE_DB_START_UP_TIME_KEY] = (
                 schedule.start_up_time
@@ -232,24 +374,69 @@ class VirtualDesktopScheduleDB(VirtualDesktopNotifiableDB):
         )
         return self.convert_db_dict_to_schedule_object(db_entry)
 
+    def _query_all(self, query_request: Dict) -> List[VirtualDesktopSchedule]:
+        result: List[VirtualDesktopSchedule] = []
+        while True:
+            query_result = self._table.query(**query_request)
+            for schedule in Utils.get_value_as_list('Items', query_result, []):
+                result.append(self.convert_db_dict_to_schedule_object(schedule))
+            last_evaluated_key = Utils.get_value_as_dict(
+                'LastEvaluatedKey', query_result
+            )
+            if Utils.is_empty(last_evaluated_key):
+                break
+            query_request['ExclusiveStartKey'] = last_evaluated_key
+        return result
+
     def get_schedules_for_day_of_week(
         self, day_of_week: DayOfWeek
     ) -> List[VirtualDesktopSchedule]:
-        query_request = {
-            'KeyConditions': {
-                schedules_constants.SCHEDULE_DB_HASH_KEY: {
-                    'AttributeValueList': [day_of_week],
-                    'ComparisonOperator': 'EQ',
-                },
+        return self._query_all(
+            {
+                'KeyConditionExpression': Key(
+                    schedules_constants.SCHEDULE_DB_HASH_KEY
+                ).eq(day_of_week)
             }
-        }
-        query_result = self._table.query(**query_request)
-        schedule_entries = Utils.get_value_as_list('Items', query_result, [])
-        result: List[VirtualDesktopSchedule] = []
-        for schedule in schedule_entries:
-            result.append(self.convert_db_dict_to_schedule_object(schedule))
+        )
 
-        return result
+    def get_active_schedules_for_day_of_week(
+        self,
+        day_of_week: DayOfWeek,
+        event_time: time,
+        working_hours_start_up_time: time,
+    ) -> List[VirtualDesktopSchedule]:
+        """
+        list the schedules for day_of_week that need to be evaluated at event_time.
+        schedules before their start up time are not read.
+        falls back to all schedules for the day while the active from index is being created or backfilled.
+        """
+        if not self._is_active_from_index_active():
+            return self.get_schedules_for_day_of_week(day_of_week)
+
+        schedules = self._query_all(
+            {
+                'IndexName': schedules_constants.SCHEDULE_DB_ACTIVE_FROM_INDEX_NAME,
+                'KeyConditionExpression': Key(
+                    schedules_constants.SCHEDULE_DB_HASH_KEY
+                ).eq(day_of_week)
+                & Key(schedules_constants.SCHEDULE_DB_ACTIVE_FROM_KEY).lte(
+                    event_time.strftime('%H:%M')
+                ),
+            }
+        )
+        if event_time >= working_hours_start_up_time:
+            schedules += self._query_all(
+                {
+                    'IndexName': schedules_constants.SCHEDULE_DB_ACTIVE_FROM_INDEX_NAME,
+                    'KeyConditionExpression': Key(
+                        schedules_constants.SCHEDULE_DB_HASH_KEY
+                    ).eq(day_of_week)
+                    & Key(schedules_constants.SCHEDULE_DB_ACTIVE_FROM_KEY).eq(
+                        schedules_constants.SCHEDULE_DB_ACTIVE_FROM_WORKING_HOURS
+                    ),
+                }
+            )
+        return schedules
 
     def delete(self, schedule: VirtualDesktopSchedule):
         if Utils.is_empty(schedule):
@@ -10,6 +10,7 @@
 #  and limitations under the License.
 
 from datetime import time
+from typing import List, Optional, Tuple
 
 import ideavirtualdesktopcontroller
 from ideadatamodel import (
@@ -20,11 +21,18 @@ from ideadatamodel import (
     VirtualDesktopWeekSchedule,
 )
 from ideasdk.utils import Utils, DateTimeUtils
+from ideavirtualdesktopcontroller.app.clients.events_client.events_client import (
+    VirtualDesktopEvent,
+    VirtualDesktopEventType,
+)
 from ideavirtualdesktopcontroller.app.events.events_utils import EventsUtils
 from ideavirtualdesktopcontroller.app.schedules.virtual_desktop_schedule_db import (
     VirtualDesktopScheduleDB,
 )
 
+# max. no. of sessions in an idle check event
+IDLE_CHECK_BATCH_SIZE = 100
+
 
 class VirtualDesktopScheduleUtils:
     def __init__(
@@ -312,18 +320,46 @@ class VirtualDesktopScheduleUtils:
         self._delete_schedule(schedule=session.schedule.saturday)
         self._delete_schedule(schedule=session.schedule.sunday)
 
-    def trigger_schedule(self, event_time: time, schedule: VirtualDesktopSchedule):
-        should_resume = False
-        should_stop = False
-        working_hours_start_up_time = self.context.config().get_string(
-            'virtual-desktop-controller.dcv_session.working_hours.start_up_time',
-            required=True,
+    def get_working_hours(self) -> Tuple[time, time]:
+        """
+        :return: start up and shut down time of working hours schedules
+        """
+        working_hours_start_up_time = (
+            self.context.config()
+            .get_string(
+                'virtual-desktop-controller.dcv_session.working_hours.start_up_time',
+                required=True,
+            )
+            .split(':')
         )
-        working_hours_shut_down_time = self.context.config().get_string(
-            'virtual-desktop-controller.dcv_session.working_hours.shut_down_time',
-            required=True,
+        working_hours_shut_down_time = (
+            self.context.config()
+            .get_string(
+                'virtual-desktop-controller.dcv_session.working_hours.shut_down_time',
+                required=True,
+            )
+            .split(':')
+        )
+        return (
+            DateTimeUtils.to_time_object(
+                hours=int(working_hours_start_up_time[0]),
+                minutes=int(working_hours_start_up_time[1]),
+            ),
+            DateTimeUtils.to_time_object(
+                hours=int(working_hours_shut_down_time[0]),
+                minutes=int(working_hours_shut_down_time[1]),
+            ),
         )
 
+    def _build_schedule_event(
+        self,
+        event_time: time,
+        schedule: VirtualDesktopSchedule,
+        working_hours: Tuple[time, time],
+    ) -> Optional[VirtualDesktopEvent]:
+        should_resume = False
+        should_stop = False
+
         if (
             VirtualDesktopScheduleType[schedule.schedule_type]
             == VirtualDesktopScheduleType.STOP_ON_IDLE
@@ -340,19 +376,18 @@ class VirtualDesktopScheduleUtils:
                 VirtualDesktopScheduleType[schedule.schedule_type]
                 == VirtualDesktopScheduleType.WORKING_HOURS
             ):
-                start_up_time = working_hours_start_up_time.split(':')
-                shut_down_time = working_hours_shut_down_time.split(':')
+                start_up_time, shut_down_time = working_hours
             else:
                 # CUSTOM
                 start_up_time = schedule.start_up_time.split(':')
                 shut_down_time = schedule.shut_down_time.split(':')
+                start_up_time = DateTimeUtils.to_time_object(
+                    hours=int(start_up_time[0]), minutes=int(start_up_time[1])
+                )
+                shut_down_time = DateTimeUtils.to_time_object(
+                    hours=int(shut_down_time[0]), minutes=int(shut_down_time[1])
+                )
 
-            start_up_time = DateTimeUtils.to_time_object(
-                hours=int(start_up_time[0]), minutes=int(start_up_time[1])
-            )
-            shut_down_time = DateTimeUtils.to_time_object(
-                hours=int(shut_down_time[0]), minutes=int(shut_down_time[1])
-            )
             if event_time < start_up_time:
                 # should we shut down a running session ?? or leave as is.
                 pass
@@ -364,17 +399,66 @@ class VirtualDesktopScheduleUtils:
                 # STOP SESSION
                 should_stop = True
 
-        if not should_resume and not should_stop:
-            # No Action to take.
-            return
-
         if should_stop:
-            self._events_utils.publish_idea_session_scheduled_stop_event(
+            return self._events_utils.build_idea_session_scheduled_stop_event(
                 idea_session_id=schedule.idea_session_id,
                 idea_session_owner=schedule.idea_session_owner,
             )
         elif should_resume:
-            self._events_utils.publish_idea_session_scheduled_resume_event(
+            return self._events_utils.build_idea_session_scheduled_resume_event(
                 idea_session_id=schedule.idea_session_id,
                 idea_session_owner=schedule.idea_session_owner,
             )
+
+        # No Action to take.
+        return None
+
+    def trigger_schedules(
+        self, event_time: time, schedules: List[VirtualDesktopSchedule]
+    ) -> int:
+        """
+        evaluate schedules at event_time and publish the resulting events in batches.
+        sessions to resume are published as scheduled resume events. sessions to stop are published as idle check events.
+        :return: no. of events published
+        """
+        working_hours = self.get_working_hours()
+        events = []
+        sessions_to_stop = []
+        for schedule in schedules:
+            event = self._build_schedule_event(event_time, schedule, working_hours)
+            if event is None:
+                continue
+            if (
+                event.event_type
+                == VirtualDesktopEventType.IDEA_SESSION_SCHEDULED_STOP_EVENT
+            ):
+                # sessions to stop are checked for idle in batches
+                sessions_to_stop.append(event.detail)
+            else:
+                events.append(event)
+
+        for offset in range(0, len(sessions_to_stop), IDLE_CHECK_BATCH_SIZE):
+            events.append(
+                self._events_utils.build_idea_sessions_idle_check_event(
+                    sessions_to_stop[offset : offset + IDLE_CHECK_BATCH_SIZE]
+                )
+            )
+        self.context.events_client.publish_events(events)
+        return len(events)
+
+    def trigger_schedules_for_day_of_week(
+        self, day_of_week: DayOfWeek, event_time: time
+    ) -> int:
+        """
+        evaluate the schedules for day_of_week that are active at event_time
+        :return: no. of events published
+        """
+        schedules = self._schedule_db.get_active_schedules_for_day_of_week(
+            day_of_week=day_of_week,
+            event_time=event_time,
+            working_hours_start_up_time=self.get_working_hours()[0],
+        )
+        self._logger.info(
+            f'evaluating {len(schedules)} schedules for {day_of_week} at {event_time}'
+        )
+        return self.trigger_schedules(event_time, schedules)
@@ -13,6 +13,13 @@ SESSION_PERMISSIONS_DB_ACTOR_TYPE_KEY = 'actor_type'
 SESSION_PERMISSIONS_DB_EXPIRY_DATE_KEY = 'expiry_date'
 SESSION_PERMISSIONS_DB_CREATED_ON_KEY = 'created_on'
 SESSION_PERMISSIONS_DB_UPDATED_ON_KEY = 'updated_on'
+SESSION_PERMISSIONS_DB_EXPIRY_SHARD_KEY = 'expiry_shard'
+
+# permissions are indexed by expiry date across a fixed no. of shards (partitions of the expiry index)
+SESSION_PERMISSIONS_DB_EXPIRY_INDEX_NAME = 'expiry-date-index'
+SESSION_PERMISSIONS_DB_EXPIRY_INDEX_SHARDS = 4
+# backfill of the expiry shard for permissions created before the expiry index was added
+SESSION_PERMISSIONS_DB_EXPIRY_BACKFILL = 'session-permissions-expiry-shard'
 
 SESSION_PERMISSIONS_FILTER_ACTOR_KEY = SESSION_PERMISSIONS_DB_RANGE_KEY
 SESSION_PERMISSIONS_FILTER_SESSION_ID_KEY = SESSION_PERMISSIONS_DB_HASH_KEY
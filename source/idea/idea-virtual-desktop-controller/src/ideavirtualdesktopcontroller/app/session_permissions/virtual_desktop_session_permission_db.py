@@ -10,7 +10,10 @@
 #  and limitations under the License.
 
 from typing import Dict, List, Optional
-from boto3.dynamodb.conditions import Key
+from boto3.dynamodb.conditions import Attr, Key
+from datetime import datetime
+import botocore.exceptions
+import zlib
 
 import ideavirtualdesktopcontroller
 from ideadatamodel import (
@@ -46,6 +49,8 @@ class VirtualDesktopSessionPermissionDB(VirtualDesktopNotifiableDB, OpenSearchab
         self._logger = self.context.logger('virtual-desktop-session-permissions-db')
         self._table_obj = None
         self._ddb_client = self.context.aws().dynamodb_table()
+        self._expiry_index_active = False
+        self._expiry_backfill_complete = False
         VirtualDesktopNotifiableDB.__init__(
             self, context=context, table_name=self.table_name, logger=self._logger
         )
@@ -79,6 +84,36 @@ class VirtualDesktopSessionPermissionDB(VirtualDesktopNotifiableDB, OpenSearchab
     def table_name(self) -> str:
         return f'{self.context.cluster_name()}.{self.context.module_id()}.controller.session-permissions'
 
+    @staticmethod
+    def _build_expiry_index_definition() -> Dict:
+        return {
+            'IndexName': session_permissions_constants.SESSION_PERMISSIONS_DB_EXPIRY_INDEX_NAME,
+            'KeySchema': [
+                {
+                    'AttributeName': session_permissions_constants.SESSION_PERMISSIONS_DB_EXPIRY_SHARD_KEY,
+                    'KeyType': 'HASH',
+                },
+                {
+                    'AttributeName': session_permissions_constants.SESSION_PERMISSIONS_DB_EXPIRY_DATE_KEY,
+                    'KeyType': 'RANGE',
+                },
+            ],
+            'Projection': {'ProjectionType': 'ALL'},
+        }
+
+    @staticmethod
+    def _build_expiry_index_attribute_definitions() -> List[Dict]:
+        return [
+            {
+                'AttributeName': session_permissions_constants.SESSION_PERMISSIONS_DB_EXPIRY_SHARD_KEY,
+                'AttributeType': 'S',
+            },
+            {
+                'AttributeName': session_permissions_constants.SESSION_PERMISSIONS_DB_EXPIRY_DATE_KEY,
+                'AttributeType': 'N',
+            },
+        ]
+
     def initialize(self):
         exists = self.context.aws_util().dynamodb_check_table_exists(
             self.table_name, True
@@ -96,7 +131,8 @@ class VirtualDesktopSessionPermissionDB(VirtualDesktopNotifiableDB, OpenSearchab
                             'AttributeName': session_permissions_constants.SESSION_PERMISSIONS_DB_RANGE_KEY,
                             'AttributeType': 'S',
                         },
-                    ],
+                    ]
+                    + self._build_expiry_index_attribute_definitions(),
                     'KeySchema': [
                         {
                             'AttributeName': session_permissions_constants.SESSION_PERMISSIONS_DB_HASH_KEY,
@@ -107,10 +143,106 @@ class VirtualDesktopSessionPermissionDB(VirtualDesktopNotifiableDB, OpenSearchab
                             'KeyType': 'RANGE',
                         },
                     ],
+                    'GlobalSecondaryIndexes': [self._build_expiry_index_definition()],
                     'BillingMode': 'PAY_PER_REQUEST',
                 },
                 wait=True,
             )
+            self.context.aws_util().dynamodb_set_backfill_complete(
+                self.table_name,
+                session_permissions_constants.SESSION_PERMISSIONS_DB_EXPIRY_BACKFILL,
+            )
+        else:
+            self._create_expiry_index()
+        self._expiry_backfill_complete = True
+
+    def _create_expiry_index(self):
+        """
+        add the expiry index to session permission tables created by earlier releases and
+        backfill the expiry shard for existing permissions.
+        the backfill is re-run on initialize until its completion is recorded.
+        """
+        self.context.aws_util().dynamodb_create_global_secondary_index(
+            table_name=self.table_name,
+            index=self._build_expiry_index_definition(),
+            attribute_definitions=self._build_expiry_index_attribute_definitions(),
+        )
+        if self.context.aws_util().dynamodb_is_backfill_complete(
+            self.table_name,
+            session_permissions_constants.SESSION_PERMISSIONS_DB_EXPIRY_BACKFILL,
+        ):
+            return
+
+        backfill_count = 0
+        scan_request = {}
+        while True:
+            result = self._table.scan(**scan_request)
+            for db_entry in Utils.get_value_as_list('Items', result, []):
+                if self._backfill_expiry_shard(db_entry):
+                    backfill_count += 1
+            last_evaluated_key = Utils.get_value_as_dict('LastEvaluatedKey', result)
+            if Utils.is_empty(last_evaluated_key):
+                break
+            scan_request = {'ExclusiveStartKey': last_evaluated_key}
+
+        self.context.aws_util().dynamodb_set_backfill_complete(
+            self.table_name,
+            session_permissions_constants.SESSION_PERMISSIONS_DB_EXPIRY_BACKFILL,
+        )
+        self._logger.info(
+            f'expiry index backfilled for {backfill_count} session permissions'
+        )
+
+    def _backfill_expiry_shard(self, db_entry: Dict) -> bool:
+        """
+        :return: False if the permission was deleted since it was scanned
+        """
+        idea_session_id = db_entry[
+            session_permissions_constants.SESSION_PERMISSIONS_DB_HASH_KEY
+        ]
+        actor_name = db_entry[
+            session_permissions_constants.SESSION_PERMISSIONS_DB_RANGE_KEY
+        ]
+        try:
+            self._table.update_item(
+                Key={
+                    session_permissions_constants.SESSION_PERMISSIONS_DB_HASH_KEY: idea_session_id,
+                    session_permissions_constants.SESSION_PERMISSIONS_DB_RANGE_KEY: actor_name,
+                },
+                UpdateExpression='SET #expiry_shard = :expiry_shard',
+                ConditionExpression=Attr(
+                    session_permissions_constants.SESSION_PERMISSIONS_DB_RANGE_KEY
+                ).exists(),
+                ExpressionAttributeNames={
+                    '#expiry_shard': session_permissions_constants.SESSION_PERMISSIONS_DB_EXPIRY_SHARD_KEY
+                },
+                ExpressionAttributeValues={
+                    ':expiry_shard': self.get_expiry_shard(idea_session_id, actor_name)
+                },
+            )
+            return True
+        except botocore.exceptions.ClientError as e:
+            if e.response['Error']['Code'] == 'ConditionalCheckFailedException':
+                return False
+            raise e
+
+    def _is_expiry_index_active(self) -> bool:
+        if not self._expiry_backfill_complete:
+            return False
+        if not self._expiry_index_active:
+            status = self.context.aws_util().dynamodb_get_global_secondary_index_status(
+                self.table_name,
+                session_permissions_constants.SESSION_PERMISSIONS_DB_EXPIRY_INDEX_NAME,
+            )
+            self._expiry_index_active = status == 'ACTIVE'
+        return self._expiry_index_active
+
+    @staticmethod
+    def get_expiry_shard(idea_session_id: str, actor_name: str) -> str:
+        return str(
+            zlib.crc32(f'{idea_session_id}/{actor_name}'.encode('utf-8'))
+            % session_permissions_constants.SESSION_PERMISSIONS_DB_EXPIRY_INDEX_SHARDS
+        )
 
     def get_index_name(self) -> str:
         return f'{self.context.config().get_string("virtual-desktop-controller.opensearch.session_permission.alias", required=True)}-{self.context.session_permission_template_version}'
@@ -255,6 +387,11 @@ class VirtualDesktopSessionPermissionDB(VirtualDesktopNotifiableDB, OpenSearchab
         self, session_permission: VirtualDesktopSessionPermission
     ) -> VirtualDesktopSessionPermission:
         db_entry = self.convert_session_permission_object_to_db_dict(session_permission)
+        db_entry[
+            session_permissions_constants.SESSION_PERMISSIONS_DB_EXPIRY_SHARD_KEY
+        ] = self.get_expiry_shard(
+            session_permission.idea_session_id, session_permission.actor_name
+        )
         db_entry[
             session_permissions_constants.SESSION_PERMISSIONS_DB_CREATED_ON_KEY
         ] = Utils.current_time_ms()
@@ -273,6 +410,11 @@ class VirtualDesktopSessionPermissionDB(VirtualDesktopNotifiableDB, OpenSearchab
         self, session_permission: VirtualDesktopSessionPermission
     ) -> VirtualDesktopSessionPermission:
         db_entry = self.convert_session_permission_object_to_db_dict(session_permission)
+        db_entry[
+            session_permissions_constants.SESSION_PERMISSIONS_DB_EXPIRY_SHARD_KEY
+        ] = self.get_expiry_shard(
+            session_permission.idea_session_id, session_permission.actor_name
+        )
         db_entry[
             session_permissions_constants.SESSION_PERMISSIONS_DB_UPDATED_ON_KEY
         ] = Utils.current_time_ms()
@@ -389,6 +531,87 @@ class VirtualDesktopSessionPermissionDB(VirtualDesktopNotifiableDB, OpenSearchab
 
         return self.convert_db_dict_to_session_permission_object(db_entry)
 
+    def list_expired(
+        self, expiry_date: datetime
+    ) -> List[VirtualDesktopSessionPermission]:
+        """
+        list session permissions expiring on or before expiry_date.
+        queries the expiry index, which reads only the permissions that are due for expiry.
+        falls back to a filtered scan of the table while the expiry index is being created or backfilled.
+        """
+        expiry_date_ms = Utils.to_milliseconds(expiry_date)
+        if self._is_expiry_index_active():
+            requests = []
+            for shard in range(
+                session_permissions_constants.SESSION_PERMISSIONS_DB_EXPIRY_INDEX_SHARDS
+            ):
+                requests.append(
+                    {
+                        'IndexName': session_permissions_constants.SESSION_PERMISSIONS_DB_EXPIRY_INDEX_NAME,
+                        'KeyConditionExpression': Key(
+                            session_permissions_constants.SESSION_PERMISSIONS_DB_EXPIRY_SHARD_KEY
+                        ).eq(str(shard))
+                        & Key(
+                            session_permissions_constants.SESSION_PERMISSIONS_DB_EXPIRY_DATE_KEY
+                        ).lte(expiry_date_ms),
+                    }
+                )
+            operation = self._table.query
+        else:
+            requests = [
+                {
+                    'FilterExpression': Attr(
+                        session_permissions_constants.SESSION_PERMISSIONS_DB_EXPIRY_DATE_KEY
+                    ).lte(expiry_date_ms)
+                }
+            ]
+            operation = self._table.scan
+
+        permissions: List[VirtualDesktopSessionPermission] = []
+        for request in requests:
+            while True:
+                result = operation(**request)
+                for db_entry in Utils.get_value_as_list('Items', result, []):
+                    permissions.append(
+                        self.convert_db_dict_to_session_permission_object(db_entry)
+                    )
+                last_evaluated_key = Utils.get_value_as_dict('LastEvaluatedKey', result)
+                if Utils.is_empty(last_evaluated_key):
+                    break
+                request['ExclusiveStartKey'] = last_evaluated_key
+        return permissions
+
+    def delete_all(self, session_permissions: List[VirtualDesktopSessionPermission]):
+        """
+        delete session permissions using batched writes.
+        a DB entry deleted event is published for each deleted permission.
+        """
+        if Utils.is_empty(session_permissions):
+            return
+
+        with self._table.batch_writer(
+            overwrite_by_pkeys=[
+                session_permissions_constants.SESSION_PERMISSIONS_DB_HASH_KEY,
+                session_permissions_constants.SESSION_PERMISSIONS_DB_RANGE_KEY,
+            ]
+        ) as batch:
+            for session_permission in session_permissions:
+                batch.delete_item(
+                    Key={
+                        session_permissions_constants.SESSION_PERMISSIONS_DB_HASH_KEY: session_permission.idea_session_id,
+                        session_permissions_constants.SESSION_PERMISSIONS_DB_RANGE_KEY: session_permission.actor_name,
+                    }
+                )
+
+        self.trigger_delete_events(
+            [
+                self.convert_session_permission_object_to_db_dict(session_permission)
+                for session_permission in session_permissions
+            ],
+            hash_key_name=session_permissions_constants.SESSION_PERMISSIONS_DB_HASH_KEY,
+            range_key_name=session_permissions_constants.SESSION_PERMISSIONS_DB_RANGE_KEY,
+        )
+
     def list_all_from_db(
         self, cursor: str
     ) -> tuple[List[VirtualDesktopSessionPermission], Optional[str]]:
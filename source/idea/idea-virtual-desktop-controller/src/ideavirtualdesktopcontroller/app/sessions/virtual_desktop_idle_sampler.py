@@ -0,0 +1,307 @@
+#  Copyright Amazon.com, Inc. or its affiliates. All Rights Reserved.
+#
+#  Licensed under the Apache License, Version 2.0 (the "License"). You may not use this file except in compliance
+#  with the License. A copy of the License is located at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+#  or in the 'license' file accompanying this file. This file is distributed on an 'AS IS' BASIS, WITHOUT WARRANTIES
+#  OR CONDITIONS OF ANY KIND, express or implied. See the License for the specific language governing permissions
+#  and limitations under the License.
+from typing import Dict, List, Optional, Tuple
+from datetime import datetime, timedelta, timezone
+from dateutil.parser import parse
+
+import ideavirtualdesktopcontroller
+from ideadatamodel import (
+    VirtualDesktopSession,
+    VirtualDesktopSessionState,
+)
+from ideasdk.utils import Utils
+from ideavirtualdesktopcontroller.app.sessions.virtual_desktop_session_db import (
+    VirtualDesktopSessionDB,
+)
+from ideavirtualdesktopcontroller.app.sessions.virtual_desktop_session_utils import (
+    VirtualDesktopSessionUtils,
+)
+from ideavirtualdesktopcontroller.app.ssm_commands.virtual_desktop_ssm_commands_utils import (
+    VirtualDesktopSSMCommandsUtils,
+)
+
+# max. no. of metric queries in a GetMetricData request
+CLOUDWATCH_GET_METRIC_DATA_MAX_QUERIES = 500
+
+
+class VirtualDesktopIdleSample:
+    def __init__(self, session: VirtualDesktopSession):
+        self.session = session
+        self.connections: Optional[int] = None
+        self.last_disconnection_time: Optional[datetime] = None
+        self.cpu_utilization: Optional[float] = None
+
+
+class VirtualDesktopIdleSampler:
+    """
+    Fleet-wide idle detection for virtual desktop sessions scheduled to stop.
+
+    Sessions are sampled in bulk, cheapest source first:
+    * DCV connection count and last disconnection time from the DCV broker (DescribeSessions)
+    * average CPU utilization over the sample period from CloudWatch (GetMetricData, 500 instances per request)
+
+    Sessions without broker or CloudWatch data, and Linux sessions that look idle when SSH connections must be
+    checked, are sampled on the instances using SSM commands targeting up to 50 instances per command.
+    Results of the SSM commands are collected in bulk after the command is complete.
+    """
+
+    def __init__(
+        self,
+        context: ideavirtualdesktopcontroller.AppContext,
+        session_db: VirtualDesktopSessionDB,
+        session_utils: VirtualDesktopSessionUtils,
+        ssm_commands_utils: VirtualDesktopSSMCommandsUtils,
+    ):
+        self.context = context
+        self._logger = self.context.logger('virtual-desktop-idle-sampler')
+        self._session_db = session_db
+        self._session_utils = session_utils
+        self._ssm_commands_utils = ssm_commands_utils
+        self._cloudwatch_client = self.context.aws().cloudwatch()
+
+    def _get_idle_settings(self) -> Tuple[float, float]:
+        cpu_utilization_threshold = self.context.config().get_float(
+            'virtual-desktop-controller.dcv_session.cpu_utilization_threshold',
+            required=True,
+        )
+        idle_autostop_delay = self.context.config().get_float(
+            'virtual-desktop-controller.dcv_session.idle_autostop_delay',
+            required=True,
+        )
+        return cpu_utilization_threshold, idle_autostop_delay
+
+    @staticmethod
+    def _is_disconnected_since(
+        sample: VirtualDesktopIdleSample, idle_autostop_delay: float
+    ) -> bool:
+        if sample.connections is None or sample.connections > 0:
+            return False
+        if sample.last_disconnection_time is None:
+            return False
+        current_time = datetime.now(timezone.utc).replace(microsecond=0)
+        return (
+            sample.last_disconnection_time + timedelta(minutes=idle_autostop_delay)
+            < current_time
+        )
+
+    def _sample_dcv_connections(self, samples: Dict[str, VirtualDesktopIdleSample]):
+        sessions = [sample.session for sample in samples.values()]
+        response = self.context.dcv_broker_client.describe_sessions(sessions)
+        dcv_sessions = Utils.get_value_as_dict('sessions', response, {})
+        for sample in samples.values():
+            dcv_session = dcv_sessions.get(sample.session.dcv_session_id)
+            if dcv_session is None:
+                continue
+            sample.connections = Utils.get_value_as_int(
+                'num_of_connections', dcv_session, 0
+            )
+            last_disconnection_time = dcv_session.get('last_disconnection_time')
+            if last_disconnection_time is None:
+                # session was never connected
+                last_disconnection_time = dcv_session.get('creation_time')
+            if isinstance(last_disconnection_time, str):
+                last_disconnection_time = parse(last_disconnection_time)
+            if (
+                last_disconnection_time is not None
+                and last_disconnection_time.tzinfo is None
+            ):
+                last_disconnection_time = last_disconnection_time.replace(
+                    tzinfo=timezone.utc
+                )
+            sample.last_disconnection_time = last_disconnection_time
+
+    def _sample_cpu_utilization(self, samples: List[VirtualDesktopIdleSample]):
+        sample_minutes = self.context.config().get_int(
+            'virtual-desktop-controller.dcv_session.idle_detection.cpu_sample_minutes',
+            default=10,
+        )
+        end_time = datetime.now(timezone.utc).replace(second=0, microsecond=0)
+        start_time = end_time - timedelta(minutes=sample_minutes)
+
+        for offset in range(0, len(samples), CLOUDWATCH_GET_METRIC_DATA_MAX_QUERIES):
+            batch = samples[offset : offset + CLOUDWATCH_GET_METRIC_DATA_MAX_QUERIES]
+            queries = []
+            for index, sample in enumerate(batch):
+                queries.append(
+                    {
+                        'Id': f'cpu{index}',
+                        'MetricStat': {
+                            'Metric': {
+                                'Namespace': 'AWS/EC2',
+                                'MetricName': 'CPUUtilization',
+                                'Dimensions': [
+                                    {
+                                        'Name': 'InstanceId',
+                                        'Value': sample.session.server.instance_id,
+                                    }
+                                ],
+                            },
+                            'Period': sample_minutes * 60,
+                            'Stat': 'Average',
+                        },
+                        'ReturnData': True,
+                    }
+                )
+
+            request = {
+                'MetricDataQueries': queries,
+                'StartTime': start_time,
+                'EndTime': end_time,
+            }
+            while True:
+                result = self._cloudwatch_client.get_metric_data(**request)
+                for metric_data in Utils.get_value_as_list(
+                    'MetricDataResults', result, []
+                ):
+                    values = Utils.get_value_as_list('Values', metric_data, [])
+                    if Utils.is_empty(values):
+                        continue
+                    index = int(metric_data['Id'][len('cpu') :])
+                    batch[index].cpu_utilization = sum(values) / len(values)
+                next_token = Utils.get_value_as_string('NextToken', result)
+                if Utils.is_empty(next_token):
+                    break
+                request['NextToken'] = next_token
+
+    def _stop_sessions(self, sessions: List[VirtualDesktopSession]) -> int:
+        if Utils.is_empty(sessions):
+            return 0
+        success_list, fail_list = self._session_utils.stop_sessions(sessions)
+        for session in fail_list:
+            self._logger.error(
+                f'Error in stopping idle session {session.idea_session_id}:{session.name}. Error: {session.failure_reason}'
+            )
+        return len(success_list)
+
+    def stop_idle_sessions(self, session_keys: List[Tuple[str, str]]) -> Dict:
+        """
+        sample the sessions and stop the sessions that are idle.
+        idle sessions have no connections, were disconnected for longer than idle_autostop_delay and
+        have CPU utilization below cpu_utilization_threshold.
+
+        :param session_keys: list of (idea_session_owner, idea_session_id)
+        :return: no. of sessions sampled, active, stopped and sent to SSM for sampling
+        """
+        cpu_utilization_threshold, idle_autostop_delay = self._get_idle_settings()
+        check_ssh_connections = self.context.config().get_bool(
+            'virtual-desktop-controller.dcv_session.idle_detection.check_ssh_connections',
+            default=True,
+        )
+
+        samples: Dict[str, VirtualDesktopIdleSample] = {}
+        for session in self._session_db.batch_get_from_db(session_keys):
+            if session.state not in {
+                VirtualDesktopSessionState.READY,
+                VirtualDesktopSessionState.RESUMING,
+            }:
+                continue
+            if Utils.is_empty(session.server) or Utils.is_empty(
+                session.server.instance_id
+            ):
+                continue
+            samples[session.idea_session_id] = VirtualDesktopIdleSample(session)
+
+        summary = {'sampled': len(samples), 'active': 0, 'stopped': 0, 'ssm': 0}
+        if Utils.is_empty(samples):
+            return summary
+
+        self._sample_dcv_connections(samples)
+
+        # sessions with connections or recent disconnections are active. no need to sample CPU utilization.
+        cpu_samples = []
+        ssm_samples = []
+        for sample in samples.values():
+            if sample.connections is None:
+                ssm_samples.append(sample)
+            elif self._is_disconnected_since(sample, idle_autostop_delay):
+                cpu_samples.append(sample)
+            else:
+                summary['active'] += 1
+
+        if Utils.is_not_empty(cpu_samples):
+            self._sample_cpu_utilization(cpu_samples)
+
+        idle_sessions = []
+        for sample in cpu_samples:
+            if sample.cpu_utilization is None:
+                ssm_samples.append(sample)
+            elif sample.cpu_utilization >= cpu_utilization_threshold:
+                summary['active'] += 1
+            elif (
+                check_ssh_connections
+                and 'windows' not in str(sample.session.base_os).lower()
+            ):
+                # SSH connections are not tracked by the DCV broker
+                ssm_samples.append(sample)
+            else:
+                idle_sessions.append(sample.session)
+
+        if Utils.is_not_empty(ssm_samples):
+            self._ssm_commands_utils.submit_ssm_command_to_get_cpu_utilization_for_sessions(
+                [sample.session for sample in ssm_samples]
+            )
+            summary['ssm'] = len(ssm_samples)
+
+        summary['stopped'] = self._stop_sessions(idle_sessions)
+        self._logger.info(f'idle check: {summary}')
+        return summary
+
+    def stop_idle_sessions_from_command_output(
+        self, command_id: str, sessions: List[Dict]
+    ) -> int:
+        """
+        evaluate the output of a CPU utilization command sent to multiple instances and stop the sessions that are idle
+        :param command_id: SSM command id
+        :param sessions: list of dict with idea_session_id, idea_session_owner and instance_id
+        :return: no. of sessions stopped
+        """
+        cpu_utilization_threshold, idle_autostop_delay = self._get_idle_settings()
+        outputs = self._ssm_commands_utils.get_command_outputs(command_id)
+
+        idle_sessions = []
+        for session_info in sessions:
+            idea_session_id = Utils.get_value_as_string('idea_session_id', session_info)
+            output = outputs.get(Utils.get_value_as_string('instance_id', session_info))
+            if output is None:
+                self._logger.error(
+                    f'CPU Utilization command: {command_id} failed for session {idea_session_id}. Will try to stop session later.'
+                )
+                continue
+
+            dcv = Utils.get_value_as_dict('DCV', output, {})
+            sample = VirtualDesktopIdleSample(
+                VirtualDesktopSession(
+                    idea_session_id=idea_session_id,
+                    owner=Utils.get_value_as_string('idea_session_owner', session_info),
+                )
+            )
+            sample.connections = Utils.get_value_as_int('num-of-connections', dcv, 0)
+            last_disconnection_time = Utils.get_value_as_string(
+                'last-disconnection-time', dcv, ''
+            )
+            if last_disconnection_time == '':
+                # handle case where user launched DCV but never accessed it
+                last_disconnection_time = Utils.get_value_as_string(
+                    'creation-time', dcv, ''
+                )
+            if Utils.is_not_empty(last_disconnection_time):
+                sample.last_disconnection_time = parse(last_disconnection_time)
+            sample.cpu_utilization = Utils.get_value_as_float(
+                'CPUAveragePerformanceLast10Secs', output, 0
+            )
+
+            if sample.cpu_utilization >= cpu_utilization_threshold:
+                continue
+            if not self._is_disconnected_since(sample, idle_autostop_delay):
+                continue
+            idle_sessions.append(sample.session)
+
+        return self._stop_sessions(idle_sessions)
@@ -8,7 +8,7 @@
 #  or in the 'license' file accompanying this file. This file is distributed on an 'AS IS' BASIS, WITHOUT WARRANTIES
 #  OR CONDITIONS OF ANY KIND, express or implied. See the License for the specific language governing permissions
 #  and limitations under the License.
-from typing import Union, Dict, List, Optional
+from typing import Union, Dict, List, Optional, Tuple
 
 import ideavirtualdesktopcontroller
 from botocore.exceptions import ClientError
@@ -52,6 +52,8 @@ from ideavirtualdesktopcontroller.app.sessions import constants as sessions_cons
 
 class VirtualDesktopSessionDB(VirtualDesktopNotifiableDB, OpenSearchableDB):
     DEFAULT_PAGE_SIZE = 10
+    # max. no. of keys in a BatchGetItem request
+    BATCH_GET_MAX_KEYS = 100
 
     def __init__(
         self,
@@ -583,6 +585,36 @@ class VirtualDesktopSessionDB(VirtualDesktopNotifiableDB, OpenSearchableDB):
                 raise e
         return self.convert_db_dict_to_session_object(session_db_entry)
 
+    def batch_get_from_db(
+        self, session_keys: List[Tuple[str, str]]
+    ) -> List[VirtualDesktopSession]:
+        """
+        get sessions using BatchGetItem, up to 100 sessions per request
+        :param session_keys: list of (idea_session_owner, idea_session_id)
+        """
+        sessions: List[VirtualDesktopSession] = []
+        keys = [
+            {
+                sessions_constants.USER_SESSION_DB_HASH_KEY: idea_session_owner,
+                sessions_constants.USER_SESSION_DB_RANGE_KEY: idea_session_id,
+            }
+            for idea_session_owner, idea_session_id in dict.fromkeys(session_keys)
+            if not Utils.is_any_empty(idea_session_owner, idea_session_id)
+        ]
+        for offset in range(0, len(keys), self.BATCH_GET_MAX_KEYS):
+            request_items = {
+                self.table_name: {
+                    'Keys': keys[offset : offset + self.BATCH_GET_MAX_KEYS]
+                }
+            }
+            while Utils.is_not_empty(request_items):
+                result = self._ddb_client.batch_get_item(RequestItems=request_items)
+                responses = Utils.get_value_as_dict('Responses', result, {})
+                for db_entry in Utils.get_value_as_list(self.table_name, responses, []):
+                    sessions.append(self.convert_db_dict_to_session_object(db_entry))
+                request_items = Utils.get_value_as_dict('UnprocessedKeys', result, {})
+        return sessions
+
     def get_from_index(
         self, idea_session_id: str
     ) -> Union[VirtualDesktopSession, None]:
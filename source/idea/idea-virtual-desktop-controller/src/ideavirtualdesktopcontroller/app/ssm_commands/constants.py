@@ -1,3 +1,6 @@
 SSM_COMMANDS_DB_HASH_KEY = 'command_id'
 SSM_COMMANDS_DB_COMMAND_TYPE_KEY = 'command_type'
 SSM_COMMANDS_DB_COMMAND_ADDITIONAL_PAYLOAD_KEY = 'additional_payload'
+
+# max. no. of instance ids in a SendCommand request
+SSM_SEND_COMMAND_MAX_INSTANCES = 50
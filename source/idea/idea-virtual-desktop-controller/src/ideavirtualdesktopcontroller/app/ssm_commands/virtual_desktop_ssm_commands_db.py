@@ -25,6 +25,9 @@ class VirtualDesktopSSMCommandType(str, Enum):
     CPU_UTILIZATION_CHECK_STOP_SCHEDULED_SESSION = (
         'CPU_UTILIZATION_CHECK_STOP_SCHEDULED_SESSION'
     )
+    CPU_UTILIZATION_CHECK_STOP_SCHEDULED_SESSIONS = (
+        'CPU_UTILIZATION_CHECK_STOP_SCHEDULED_SESSIONS'
+    )
     WINDOWS_ENABLE_USERDATA_EXECUTION = 'WINDOWS_ENABLE_USERDATA_EXECUTION'
     WINDOWS_DISABLE_USERDATA_EXECUTION = 'WINDOWS_DISABLE_USERDATA_EXECUTION'
 
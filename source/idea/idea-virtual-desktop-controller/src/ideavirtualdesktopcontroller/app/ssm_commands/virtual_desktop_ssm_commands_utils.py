@@ -8,11 +8,14 @@
 #  or in the 'license' file accompanying this file. This file is distributed on an 'AS IS' BASIS, WITHOUT WARRANTIES
 #  OR CONDITIONS OF ANY KIND, express or implied. See the License for the specific language governing permissions
 #  and limitations under the License.
-from typing import List
+from typing import Dict, List, Optional, Tuple
 
 import ideavirtualdesktopcontroller
-from ideadatamodel import VirtualDesktopBaseOS
+from ideadatamodel import VirtualDesktopBaseOS, VirtualDesktopSession
 from ideasdk.utils import Utils
+from ideavirtualdesktopcontroller.app.ssm_commands import (
+    constants as ssm_commands_constants,
+)
 from ideavirtualdesktopcontroller.app.ssm_commands.virtual_desktop_ssm_commands_db import (
     VirtualDesktopSSMCommandsDB,
     VirtualDesktopSSMCommand,
@@ -207,13 +210,13 @@ class VirtualDesktopSSMCommandsUtils:
         )
         return command_id
 
-    def submit_ssm_command_to_get_cpu_utilization(
-        self,
-        instance_id: str,
-        idea_session_id: str,
-        idea_session_owner: str,
+    @staticmethod
+    def _get_cpu_utilization_commands(
         base_os: VirtualDesktopBaseOS,
-    ):
+    ) -> Tuple[str, List[str]]:
+        """
+        :return: SSM document name and commands to get CPU utilization and DCV connections of a session
+        """
         # Simplified Windows detection to match all Windows variations
         is_windows = 'windows' in str(base_os).lower()
 
@@ -245,6 +248,16 @@ class VirtualDesktopSSMCommandsUtils:
                 'Final_JSON=$(jq -c -n --argjson dcv "$DCV_Describe_Session" --argjson cpuAvg "$CPUAveragePerformanceLast10Secs" --arg sshTime "$SSH_Last_Disconnect_ISO" --argjson sshCount "$SSH_Connection_Count" \'{"DCV": ($dcv | .["num-of-connections"] = ($sshCount | if . > $dcv["num-of-connections"] then . else $dcv["num-of-connections"] end) | .["last-disconnection-time"] = (if $dcv["last-disconnection-time"] == "" and $sshTime > $dcv["creation-time"] then $sshTime elif $dcv["last-disconnection-time"] != "" and $sshTime > $dcv["last-disconnection-time"] then $sshTime else $dcv["last-disconnection-time"] end)), "CPUAveragePerformanceLast10Secs": $cpuAvg, "SSH_Connection_Count": $sshCount, "SSH_Last_Disconnect_ISO": $sshTime}\')',
                 'echo "$Final_JSON"',
             ]
+        return document_name, commands
+
+    def submit_ssm_command_to_get_cpu_utilization(
+        self,
+        instance_id: str,
+        idea_session_id: str,
+        idea_session_owner: str,
+        base_os: VirtualDesktopBaseOS,
+    ):
+        document_name, commands = self._get_cpu_utilization_commands(base_os)
 
         response = self._ssm_client.send_command(
             InstanceIds=[instance_id],
@@ -290,3 +303,113 @@ class VirtualDesktopSSMCommandsUtils:
             f'SSM command to check CPU Utilization sent to {instance_id}.'
         )
         return command_id
+
+    def submit_ssm_command_to_get_cpu_utilization_for_sessions(
+        self, sessions: List[VirtualDesktopSession]
+    ) -> List[str]:
+        """
+        send CPU utilization commands targeting up to 50 instances per command.
+        sessions are grouped by SSM document (base os).
+        a command level notification is sent after all invocations of a command are complete.
+        """
+        sessions_by_document: Dict[str, List[VirtualDesktopSession]] = {}
+        commands_by_document: Dict[str, List[str]] = {}
+        for session in sessions:
+            document_name, commands = self._get_cpu_utilization_commands(
+                session.base_os
+            )
+            sessions_by_document.setdefault(document_name, []).append(session)
+            commands_by_document[document_name] = commands
+
+        command_ids = []
+        for document_name, document_sessions in sessions_by_document.items():
+            for offset in range(
+                0,
+                len(document_sessions),
+                ssm_commands_constants.SSM_SEND_COMMAND_MAX_INSTANCES,
+            ):
+                batch = document_sessions[
+                    offset : offset
+                    + ssm_commands_constants.SSM_SEND_COMMAND_MAX_INSTANCES
+                ]
+                response = self._ssm_client.send_command(
+                    InstanceIds=[session.server.instance_id for session in batch],
+                    DocumentName=document_name,
+                    Comment=f'Checking CPU Utilization for {len(batch)} sessions',
+                    Parameters={'commands': commands_by_document[document_name]},
+                    ServiceRoleArn=self.context.config().get_string(
+                        'virtual-desktop-controller.ssm_commands_pass_role_arn',
+                        required=True,
+                    ),
+                    NotificationConfig={
+                        'NotificationArn': self.context.config().get_string(
+                            'virtual-desktop-controller.ssm_commands_sns_topic_arn',
+                            required=True,
+                        ),
+                        'NotificationEvents': [
+                            'Success',
+                            'TimedOut',
+                            'Cancelled',
+                            'Failed',
+                        ],
+                        'NotificationType': 'Command',
+                    },
+                    CloudWatchOutputConfig={
+                        'CloudWatchOutputEnabled': True,
+                        'CloudWatchLogGroupName': f'/{self.context.cluster_name()}/{self.context.module_id()}/dcv-session/cpu-utilization',
+                    },
+                    OutputS3BucketName=self.context.config().get_string(
+                        'cluster.cluster_s3_bucket', required=True
+                    ),
+                    OutputS3KeyPrefix=f'/{self.context.cluster_name()}/{self.context.module_id()}/dcv-session/cpu-utilization',
+                )
+                command_id = Utils.get_value_as_string(
+                    'CommandId', Utils.get_value_as_dict('Command', response, {}), ''
+                )
+                _ = self._ssm_commands_db.create(
+                    VirtualDesktopSSMCommand(
+                        command_id=command_id,
+                        command_type=VirtualDesktopSSMCommandType.CPU_UTILIZATION_CHECK_STOP_SCHEDULED_SESSIONS,
+                        additional_payload={
+                            'sessions': [
+                                {
+                                    'idea_session_id': session.idea_session_id,
+                                    'idea_session_owner': session.owner,
+                                    'instance_id': session.server.instance_id,
+                                }
+                                for session in batch
+                            ]
+                        },
+                    )
+                )
+                command_ids.append(command_id)
+                self._logger.info(
+                    f'SSM command to check CPU Utilization sent to {len(batch)} instances.'
+                )
+        return command_ids
+
+    def get_command_outputs(self, command_id: str) -> Dict[str, Optional[Dict]]:
+        """
+        collect the output of all invocations of a command using ListCommandInvocations
+        :return: instance id -> json output of the command. None if the invocation was not successful.
+        """
+        outputs: Dict[str, Optional[Dict]] = {}
+        paginator = self._ssm_client.get_paginator('list_command_invocations')
+        for page in paginator.paginate(CommandId=command_id, Details=True):
+            for invocation in Utils.get_value_as_list('CommandInvocations', page, []):
+                instance_id = Utils.get_value_as_string('InstanceId', invocation)
+                output = None
+                if Utils.get_value_as_string('Status', invocation) == 'Success':
+                    for plugin in Utils.get_value_as_list(
+                        'CommandPlugins', invocation, []
+                    ):
+                        plugin_output = Utils.get_value_as_string('Output', plugin)
+                        if Utils.is_not_empty(plugin_output):
+                            try:
+                                output = Utils.from_json(plugin_output)
+                            except Exception as e:
+                                self._logger.error(
+                                    f'invalid output for command: {command_id}, instance: {instance_id} - {e}'
+                                )
+                outputs[instance_id] = output
+        return outputs
@@ -8,7 +8,6 @@
 #  or in the 'license' file accompanying this file. This file is distributed on an 'AS IS' BASIS, WITHOUT WARRANTIES
 #  OR CONDITIONS OF ANY KIND, express or implied. See the License for the specific language governing permissions
 #  and limitations under the License.
-import os
 import logging
 import random
 from threading import RLock
@@ -209,39 +208,32 @@ class VirtualDesktopControllerUtils:
         if is_windows:
             component = 'virtual-desktop-host-windows'
 
-        bootstrap_package_archive_file = BootstrapPackageBuilder(
+        # the package is rendered in memory and uploaded directly, without staging it on shared storage
+        package_basename = f'dcv-host-{session.idea_session_id}'
+        bootstrap_package_archive = BootstrapPackageBuilder(
             bootstrap_context=bootstrap_context,
             source_directory=self.context.get_bootstrap_dir(),
-            target_package_basename=f'dcv-host-{session.idea_session_id}',
+            target_package_basename=package_basename,
             components=[component],
-            tmp_dir=os.path.join(
-                f'{self.context.config().get_string("shared-storage.apps.mount_dir", required=True)}',
-                self.context.cluster_name(),
-                self.context.module_id(),
-                'dcv-host-bootstrap',
-                session.owner,
-                f'{Utils.to_secure_filename(session.name)}-{session.idea_session_id}',
-            ),
-            force_build=True,
             base_os=str(session.software_stack.base_os.value),
             logger=self._logger,
-        ).build()
+        ).build_archive()
 
         self._logger.debug(
-            f'{session.idea_session_id} built bootstrap package: {bootstrap_package_archive_file}'
+            f'{session.idea_session_id} built bootstrap package: {package_basename}.tar.gz ({len(bootstrap_package_archive)} bytes)'
         )
         cluster_s3_bucket = self.context.config().get_string(
             'cluster.cluster_s3_bucket', required=True
         )
-        upload_key = f'idea/{self.context.module_id()}/dcv-host-bootstrap/{Utils.to_secure_filename(session.name)}-{session.idea_session_id}/{os.path.basename(bootstrap_package_archive_file)}'
+        upload_key = f'idea/{self.context.module_id()}/dcv-host-bootstrap/{Utils.to_secure_filename(session.name)}-{session.idea_session_id}/{package_basename}.tar.gz'
         self._logger.debug(
             f'{session.idea_session_id} uploading bootstrap package: {upload_key}'
         )
         try:
-            self.s3_client.upload_file(
+            self.s3_client.put_object(
                 Bucket=cluster_s3_bucket,
-                Filename=bootstrap_package_archive_file,
                 Key=upload_key,
+                Body=bootstrap_package_archive,
             )
             self._logger.debug(
                 f'{session.idea_session_id} successfully uploaded bootstrap package to S3'
@@ -258,9 +250,7 @@ class VirtualDesktopControllerUtils:
                 else str(err)
             )
             self._logger.error(f'S3 upload failed: {error_code} - {error_message}')
-            self._logger.error(
-                f'S3 bucket: {cluster_s3_bucket}, key: {upload_key}, file exists: {os.path.exists(bootstrap_package_archive_file)}'
-            )
+            self._logger.error(f'S3 bucket: {cluster_s3_bucket}, key: {upload_key}')
             raise
         return f's3://{cluster_s3_bucket}/{upload_key}'
 
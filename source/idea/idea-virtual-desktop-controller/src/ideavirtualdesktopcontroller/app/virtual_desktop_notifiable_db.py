@@ -9,6 +9,7 @@
 #  OR CONDITIONS OF ANY KIND, express or implied. See the License for the specific language governing permissions
 #  and limitations under the License.
 from logging import Logger
+from typing import List
 
 import ideavirtualdesktopcontroller
 from ideavirtualdesktopcontroller.app.app_protocols import (
@@ -32,18 +33,37 @@ class VirtualDesktopNotifiableDB(VirtualDesktopNotifiableDBProtocol):
         self._table_name = table_name
         self.sqs_client = self.context.aws().sqs()
 
+    def _build_delete_event(
+        self, hash_key: str, range_key: str, deleted_entry: dict
+    ) -> VirtualDesktopEvent:
+        return VirtualDesktopEvent(
+            event_group_id=f'{hash_key}-{range_key}',
+            event_type=VirtualDesktopEventType.DB_ENTRY_DELETED_EVENT,
+            detail={
+                'hash_key': hash_key,
+                'range_key': range_key,
+                'deleted_value': deleted_entry,
+                'table_name': self._table_name,
+            },
+        )
+
     def trigger_delete_event(self, hash_key: str, range_key: str, deleted_entry: dict):
         self.context.events_client.publish_event(
-            event=VirtualDesktopEvent(
-                event_group_id=f'{hash_key}-{range_key}',
-                event_type=VirtualDesktopEventType.DB_ENTRY_DELETED_EVENT,
-                detail={
-                    'hash_key': hash_key,
-                    'range_key': range_key,
-                    'deleted_value': deleted_entry,
-                    'table_name': self._table_name,
-                },
-            )
+            event=self._build_delete_event(hash_key, range_key, deleted_entry)
+        )
+
+    def trigger_delete_events(
+        self, deleted_entries: List[dict], hash_key_name: str, range_key_name: str
+    ):
+        self.context.events_client.publish_events(
+            events=[
+                self._build_delete_event(
+                    deleted_entry[hash_key_name],
+                    deleted_entry[range_key_name],
+                    deleted_entry,
+                )
+                for deleted_entry in deleted_entries
+            ]
         )
 
     def trigger_create_event(self, hash_key: str, range_key: str, new_entry: dict):
@@ -8,3 +8,67 @@
 #  or in the 'license' file accompanying this file. This file is distributed on an 'AS IS' BASIS, WITHOUT WARRANTIES
 #  OR CONDITIONS OF ANY KIND, express or implied. See the License for the specific language governing permissions
 #  and limitations under the License.
+
+from ideadatamodel import SocaAnyPayload
+from ideasdk.aws import AWSUtil, EC2InstanceTypesDB
+from ideasdk.config.soca_config import SocaConfig
+
+from ideatestutils import MockConfig
+from ideatestutils.dynamodb.dynamodb_local import DynamoDBLocal
+
+import logging
+import pytest
+
+
+@pytest.fixture(scope='session')
+def ddb_local():
+    ddb_local = DynamoDBLocal(db_name='virtual-desktop-controller', reset=True)
+
+    # Check and install DynamoDB Local if not already installed
+    install_success = ddb_local.check_and_install()
+    if not install_success:
+        pytest.skip('DynamoDB Local installation failed')
+
+    ddb_local.start()
+
+    # Wait for DynamoDB Local to actually be ready
+    if not ddb_local.wait_until_ready(timeout=30):
+        ddb_local.stop()
+        pytest.skip('DynamoDB Local failed to start')
+
+    yield ddb_local
+
+    ddb_local.stop()
+
+
+@pytest.fixture()
+def dynamodb(ddb_local, monkeypatch):
+    """
+    dynamodb local client, table resource and AWSUtil for the controller db tests.
+    the tables created by a test are deleted after the test.
+    """
+    client = ddb_local.client()
+    resource = ddb_local.resource()
+    aws = SocaAnyPayload(dynamodb=lambda: client, dynamodb_table=lambda: resource)
+
+    # the instance types catalog is not used by the dynamodb utils
+    monkeypatch.setattr(EC2InstanceTypesDB, '__init__', lambda *_, **__: None)
+    config = SocaConfig(config=MockConfig().get_config())
+    aws_util = AWSUtil(
+        context=SocaAnyPayload(
+            cluster_name=lambda: 'idea-mock',
+            module_id=lambda: 'vdc',
+            module_name=lambda: 'virtual-desktop-controller',
+            config=lambda: config,
+            logger=lambda name=None: logging.getLogger('test-dynamodb'),
+        ),
+        aws=aws,
+    )
+
+    existing_table_names = set(client.list_tables()['TableNames'])
+
+    yield SocaAnyPayload(client=client, resource=resource, aws=aws, aws_util=aws_util)
+
+    for table_name in client.list_tables()['TableNames']:
+        if table_name not in existing_table_names:
+            client.delete_table(TableName=table_name)
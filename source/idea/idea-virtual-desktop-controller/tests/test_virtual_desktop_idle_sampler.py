@@ -0,0 +1,226 @@
+#  Copyright Amazon.com, Inc. or its affiliates. All Rights Reserved.
+#
+#  Licensed under the Apache License, Version 2.0 (the "License"). You may not use this file except in compliance
+#  with the License. A copy of the License is located at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+#  or in the 'license' file accompanying this file. This file is distributed on an 'AS IS' BASIS, WITHOUT WARRANTIES
+#  OR CONDITIONS OF ANY KIND, express or implied. See the License for the specific language governing permissions
+#  and limitations under the License.
+
+"""
+Test Cases for VirtualDesktopIdleSampler
+"""
+
+from ideadatamodel import (
+    SocaAnyPayload,
+    VirtualDesktopBaseOS,
+    VirtualDesktopServer,
+    VirtualDesktopSession,
+    VirtualDesktopSessionState,
+)
+from ideasdk.utils import Utils
+from ideavirtualdesktopcontroller.app.sessions.virtual_desktop_idle_sampler import (
+    VirtualDesktopIdleSampler,
+)
+from ideavirtualdesktopcontroller.app.sessions.virtual_desktop_session_db import (
+    VirtualDesktopSessionDB,
+)
+from ideavirtualdesktopcontroller.app.ssm_commands.virtual_desktop_ssm_commands_utils import (
+    VirtualDesktopSSMCommandsUtils,
+)
+
+from collections import Counter
+from datetime import datetime, timedelta, timezone
+from typing import Dict, List
+import logging
+
+TABLE_NAME = 'idea-mock.vdc.controller.user-sessions'
+
+CONFIG = {
+    'virtual-desktop-controller.dcv_session.cpu_utilization_threshold': 30.0,
+    'virtual-desktop-controller.dcv_session.idle_autostop_delay': 15.0,
+    'virtual-desktop-controller.dcv_session.idle_detection.cpu_sample_minutes': 10,
+    'virtual-desktop-controller.dcv_session.idle_detection.check_ssh_connections': True,
+    'virtual-desktop-controller.ssm_commands_pass_role_arn': 'arn:aws:iam::123456789012:role/ssm',
+    'virtual-desktop-controller.ssm_commands_sns_topic_arn': 'arn:aws:sns:us-east-1:123456789012:ssm',
+    'cluster.cluster_s3_bucket': 'idea-mock-bucket',
+}
+
+# session profiles in the fleet. windows sessions are stopped without an SSM command.
+PROFILES = ['connected', 'busy', 'idle-windows', 'idle-linux', 'no-metrics']
+
+
+class FakeFleet:
+    """
+    in-memory DynamoDB, DCV broker, CloudWatch and SSM. counts the api calls made by each service.
+    """
+
+    def __init__(self, size: int):
+        self.calls = Counter()
+        self.sessions: Dict[str, VirtualDesktopSession] = {}
+        self.profiles: Dict[str, str] = {}
+        for index in range(size):
+            profile = PROFILES[index % len(PROFILES)]
+            base_os = (
+                VirtualDesktopBaseOS.WINDOWS
+                if profile == 'idle-windows'
+                else VirtualDesktopBaseOS.AMAZON_LINUX2
+            )
+            session = VirtualDesktopSession(
+                idea_session_id=f'session-{index}',
+                owner=f'user{index}',
+                base_os=base_os,
+                state=VirtualDesktopSessionState.READY,
+                dcv_session_id=f'dcv-{index}',
+                server=VirtualDesktopServer(instance_id=f'i-{index:017d}'),
+            )
+            self.sessions[session.idea_session_id] = session
+            self.profiles[session.server.instance_id] = profile
+        self.stopped: List[str] = []
+
+    # dynamodb
+    def batch_get_item(self, RequestItems: Dict):
+        self.calls['dynamodb'] += 1
+        keys = RequestItems[TABLE_NAME]['Keys']
+        assert len(keys) <= 100
+        return {
+            'Responses': {
+                TABLE_NAME: [
+                    {'idea_session_id': key['idea_session_id']} for key in keys
+                ]
+            }
+        }
+
+    def get_item(self):
+        self.calls['dynamodb'] += 1
+
+    def put_item(self, *_):
+        self.calls['dynamodb'] += 1
+
+    # dcv broker
+    def describe_sessions(self, sessions: List[VirtualDesktopSession]) -> Dict:
+        self.calls['dcv-broker'] += 1
+        disconnected = datetime.now(timezone.utc) - timedelta(hours=1)
+        return {
+            'sessions': {
+                session.dcv_session_id: {
+                    'num_of_connections': 1
+                    if self.profiles[session.server.instance_id] == 'connected'
+                    else 0,
+                    'last_disconnection_time': disconnected.isoformat(),
+                }
+                for session in sessions
+            }
+        }
+
+    # cloudwatch
+    def get_metric_data(self, MetricDataQueries: List[Dict], **_):
+        self.calls['cloudwatch'] += 1
+        assert len(MetricDataQueries) <= 500
+        results = []
+        for query in MetricDataQueries:
+            instance_id = query['MetricStat']['Metric']['Dimensions'][0]['Value']
+            profile = self.profiles[instance_id]
+            values = []
+            if profile == 'busy':
+                values = [80.0, 95.0]
+            elif profile != 'no-metrics':
+                values = [2.0, 4.0]
+            results.append({'Id': query['Id'], 'Values': values})
+        return {'MetricDataResults': results}
+
+    # ssm
+    def send_command(self, InstanceIds: List[str], **_):
+        self.calls['ssm'] += 1
+        assert len(InstanceIds) <= 50
+        return {'Command': {'CommandId': Utils.uuid()}}
+
+    def get_command_invocation(self):
+        self.calls['ssm'] += 1
+
+    def stop_sessions(self, sessions: List[VirtualDesktopSession]):
+        self.calls['ec2'] += 1
+        self.stopped.extend(session.idea_session_id for session in sessions)
+        return sessions, []
+
+
+def build_sampler(fleet: FakeFleet) -> VirtualDesktopIdleSampler:
+    logger = logging.getLogger('test-idle-sampler')
+    aws = SocaAnyPayload(cloudwatch=lambda: fleet, ssm=lambda: fleet)
+    config = SocaAnyPayload(
+        get_string=lambda key, default=None, required=False: CONFIG.get(key, default),
+        get_int=lambda key, default=None, required=False: CONFIG.get(key, default),
+        get_float=lambda key, default=None, required=False: CONFIG.get(key, default),
+        get_bool=lambda key, default=None, required=False: CONFIG.get(key, default),
+    )
+    context = SocaAnyPayload(
+        aws=lambda: aws,
+        config=lambda: config,
+        logger=lambda name=None: logger,
+        dcv_broker_client=fleet,
+        cluster_name=lambda: 'idea-mock',
+        module_id=lambda: 'vdc',
+    )
+
+    session_db = VirtualDesktopSessionDB.__new__(VirtualDesktopSessionDB)
+    session_db.context = context
+    session_db._ddb_client = fleet
+    session_db.convert_db_dict_to_session_object = lambda db_entry: fleet.sessions[
+        db_entry['idea_session_id']
+    ]
+
+    ssm_commands_utils = VirtualDesktopSSMCommandsUtils.__new__(
+        VirtualDesktopSSMCommandsUtils
+    )
+    ssm_commands_utils.context = context
+    ssm_commands_utils._logger = logger
+    ssm_commands_utils._ssm_client = fleet
+    ssm_commands_utils._ssm_commands_db = SocaAnyPayload(create=fleet.put_item)
+
+    return VirtualDesktopIdleSampler(
+        context=context,
+        session_db=session_db,
+        session_utils=SocaAnyPayload(stop_sessions=fleet.stop_sessions),
+        ssm_commands_utils=ssm_commands_utils,
+    )
+
+
+def test_virtual_desktop_idle_sampler_stop_idle_sessions():
+    fleet = FakeFleet(size=10)
+    sampler = build_sampler(fleet)
+    session_keys = [
+        (session.owner, session.idea_session_id) for session in fleet.sessions.values()
+    ]
+
+    summary = sampler.stop_idle_sessions(session_keys)
+
+    assert summary == {'sampled': 10, 'active': 4, 'stopped': 2, 'ssm': 4}
+    # only idle windows sessions are stopped. idle linux sessions are confirmed using SSM (SSH connections).
+    assert sorted(fleet.stopped) == ['session-2', 'session-7']
+
+
+def test_virtual_desktop_idle_sampler_batched_api_calls():
+    """
+    api calls per idle check cycle for a fleet of 1000 sessions scheduled to stop are made in bulk
+    """
+    fleet = FakeFleet(size=1000)
+    sampler = build_sampler(fleet)
+    session_keys = [
+        (session.owner, session.idea_session_id) for session in fleet.sessions.values()
+    ]
+
+    summary = sampler.stop_idle_sessions(session_keys)
+
+    assert summary == {'sampled': 1000, 'active': 400, 'stopped': 200, 'ssm': 400}
+    assert dict(fleet.calls) == {
+        # sessions in batches of 100, and a command record per SSM command
+        'dynamodb': 10 + 8,
+        'dcv-broker': 1,
+        # metric queries in batches of 500
+        'cloudwatch': 2,
+        # instances in batches of 50
+        'ssm': 8,
+        'ec2': 1,
+    }
@@ -0,0 +1,206 @@
+#  Copyright Amazon.com, Inc. or its affiliates. All Rights Reserved.
+#
+#  Licensed under the Apache License, Version 2.0 (the "License"). You may not use this file except in compliance
+#  with the License. A copy of the License is located at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+#  or in the 'license' file accompanying this file. This file is distributed on an 'AS IS' BASIS, WITHOUT WARRANTIES
+#  OR CONDITIONS OF ANY KIND, express or implied. See the License for the specific language governing permissions
+#  and limitations under the License.
+
+"""
+Test Cases for VirtualDesktopScheduleDB
+"""
+
+from ideadatamodel import SocaAnyPayload, VirtualDesktopScheduleType
+from ideavirtualdesktopcontroller.app.schedules import constants as schedules_constants
+from ideavirtualdesktopcontroller.app.schedules.virtual_desktop_schedule_db import (
+    VirtualDesktopScheduleDB,
+)
+
+from ideatestutils.dynamodb.dynamodb_requests import DynamoDBRequests
+
+from botocore.exceptions import ClientError
+from typing import Dict, List
+import logging
+import pytest
+
+TABLE_NAME = 'idea-mock.vdc.controller.schedules'
+
+# items returned in a single scan page (Limit)
+PAGE_SIZE = 2
+
+
+def build_schedule_db(dynamodb: SocaAnyPayload) -> VirtualDesktopScheduleDB:
+    logger = logging.getLogger('test-schedule-db')
+    config = SocaAnyPayload(
+        get_string=lambda key, default=None, required=False: '09:00'
+        if key.endswith('start_up_time')
+        else '17:00'
+    )
+    schedule_db = VirtualDesktopScheduleDB.__new__(VirtualDesktopScheduleDB)
+    schedule_db.context = SocaAnyPayload(
+        cluster_name=lambda: 'idea-mock',
+        module_id=lambda: 'vdc',
+        config=lambda: config,
+        aws_util=lambda: dynamodb.aws_util,
+    )
+    schedule_db._table_obj = None
+    schedule_db._ddb_client = dynamodb.resource
+    schedule_db._logger = logger
+    schedule_db._active_from_index_active = False
+    schedule_db._active_from_backfill_complete = False
+    return schedule_db
+
+
+def put_schedule(
+    dynamodb: SocaAnyPayload,
+    day_of_week: str,
+    schedule_id: str,
+    schedule_type: str,
+    **kwargs,
+):
+    dynamodb.resource.Table(TABLE_NAME).put_item(
+        Item={
+            'day_of_week': day_of_week,
+            'schedule_id': schedule_id,
+            'schedule_type': schedule_type,
+            **kwargs,
+        }
+    )
+
+
+def create_table(dynamodb: SocaAnyPayload):
+    """
+    schedules table created by a release before the active from index was added
+    """
+    dynamodb.client.create_table(
+        TableName=TABLE_NAME,
+        AttributeDefinitions=[
+            {
+                'AttributeName': schedules_constants.SCHEDULE_DB_HASH_KEY,
+                'AttributeType': 'S',
+            },
+            {
+                'AttributeName': schedules_constants.SCHEDULE_DB_RANGE_KEY,
+                'AttributeType': 'S',
+            },
+        ],
+        KeySchema=[
+            {
+                'AttributeName': schedules_constants.SCHEDULE_DB_HASH_KEY,
+                'KeyType': 'HASH',
+            },
+            {
+                'AttributeName': schedules_constants.SCHEDULE_DB_RANGE_KEY,
+                'KeyType': 'RANGE',
+            },
+        ],
+        BillingMode='PAY_PER_REQUEST',
+    )
+    dynamodb.aws_util.dynamodb_check_table_exists(TABLE_NAME, wait=True)
+    put_schedule(
+        dynamodb,
+        'monday',
+        's1',
+        VirtualDesktopScheduleType.CUSTOM_SCHEDULE,
+        **{
+            schedules_constants.SCHEDULE_DB_START_UP_TIME_KEY: '7:30',
+            schedules_constants.SCHEDULE_DB_SHUT_DOWN_TIME_KEY: '18:00',
+        },
+    )
+    put_schedule(dynamodb, 'monday', 's2', VirtualDesktopScheduleType.WORKING_HOURS)
+    put_schedule(dynamodb, 'tuesday', 's3', VirtualDesktopScheduleType.STOP_ON_IDLE)
+    put_schedule(dynamodb, 'wednesday', 's4', VirtualDesktopScheduleType.START_ALL_DAY)
+
+
+def scan_all(dynamodb: SocaAnyPayload) -> List[Dict]:
+    table = dynamodb.resource.Table(TABLE_NAME)
+    scan_request = {}
+    items = []
+    while True:
+        result = table.scan(**scan_request)
+        items += result['Items']
+        if 'LastEvaluatedKey' not in result:
+            return items
+        scan_request['ExclusiveStartKey'] = result['LastEvaluatedKey']
+
+
+def is_backfill_complete(dynamodb: SocaAnyPayload) -> bool:
+    return dynamodb.aws_util.dynamodb_is_backfill_complete(
+        TABLE_NAME, schedules_constants.SCHEDULE_DB_ACTIVE_FROM_BACKFILL
+    )
+
+
+def test_virtual_desktop_schedule_db_active_from_backfill_resumes(dynamodb):
+    """
+    an interrupted backfill is re-run on the next initialize, until its completion is recorded
+    """
+    create_table(dynamodb)
+    schedule_db = build_schedule_db(dynamodb)
+    requests = DynamoDBRequests(dynamodb.resource.meta.client, page_size=PAGE_SIZE)
+
+    # the second scan page fails
+    requests.errors['Scan'] += [
+        None,
+        ClientError(
+            {'Error': {'Code': 'ProvisionedThroughputExceededException'}}, 'Scan'
+        ),
+    ]
+    with pytest.raises(ClientError):
+        schedule_db._create_active_from_index()
+    assert (
+        dynamodb.aws_util.dynamodb_get_global_secondary_index_status(
+            TABLE_NAME, schedules_constants.SCHEDULE_DB_ACTIVE_FROM_INDEX_NAME
+        )
+        is not None
+    )
+    assert not is_backfill_complete(dynamodb)
+    assert not schedule_db._is_active_from_index_active()
+
+    # index exists. backfill is not complete and is re-run.
+    schedule_db._create_active_from_index()
+    assert is_backfill_complete(dynamodb)
+    active_from = {
+        item['schedule_id']: item[schedules_constants.SCHEDULE_DB_ACTIVE_FROM_KEY]
+        for item in scan_all(dynamodb)
+    }
+    assert active_from == {
+        's1': '07:30',
+        's2': schedules_constants.SCHEDULE_DB_ACTIVE_FROM_WORKING_HOURS,
+        's3': '00:00',
+        's4': '00:00',
+    }
+
+    # completed backfills are not re-run
+    scans = requests.counts['Scan']
+    schedule_db._create_active_from_index()
+    assert requests.counts['Scan'] == scans
+
+
+def test_virtual_desktop_schedule_db_active_from_backfill_deleted_schedule(dynamodb):
+    """
+    schedules deleted after the scan are not re-created by the backfill
+    """
+    create_table(dynamodb)
+    schedule_db = build_schedule_db(dynamodb)
+    # the schedules are scanned in pages of PAGE_SIZE
+    DynamoDBRequests(dynamodb.resource.meta.client, page_size=PAGE_SIZE)
+
+    table = schedule_db._table
+    scan = table.scan
+
+    def scan_then_delete(**kwargs):
+        result = scan(**kwargs)
+        # deleted after the schedule was read, before the schedule is updated
+        for item in result['Items']:
+            if item['schedule_id'] == 's2':
+                table.delete_item(Key={'day_of_week': 'monday', 'schedule_id': 's2'})
+        return result
+
+    table.scan = scan_then_delete
+    schedule_db._create_active_from_index()
+
+    schedule_ids = sorted(item['schedule_id'] for item in scan_all(dynamodb))
+    assert schedule_ids == ['s1', 's3', 's4']
@@ -0,0 +1,405 @@
+#  Copyright Amazon.com, Inc. or its affiliates. All Rights Reserved.
+#
+#  Licensed under the Apache License, Version 2.0 (the "License"). You may not use this file except in compliance
+#  with the License. A copy of the License is located at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+#  or in the 'license' file accompanying this file. This file is distributed on an 'AS IS' BASIS, WITHOUT WARRANTIES
+#  OR CONDITIONS OF ANY KIND, express or implied. See the License for the specific language governing permissions
+#  and limitations under the License.
+
+"""
+Test Cases for VirtualDesktopSessionPermissionDB
+"""
+
+from ideadatamodel import (
+    SocaAnyPayload,
+    VirtualDesktopBaseOS,
+    VirtualDesktopPermissionProfile,
+    VirtualDesktopSessionPermission,
+    VirtualDesktopSessionPermissionActorType,
+    VirtualDesktopSessionState,
+    VirtualDesktopSessionType,
+)
+from ideasdk.utils import Utils
+from ideavirtualdesktopcontroller.app.clients.events_client.events_client import (
+    EventsClient,
+    VirtualDesktopEvent,
+    VirtualDesktopEventType,
+)
+from ideavirtualdesktopcontroller.app.session_permissions import (
+    constants as session_permissions_constants,
+)
+from ideavirtualdesktopcontroller.app.session_permissions.virtual_desktop_session_permission_db import (
+    VirtualDesktopSessionPermissionDB,
+)
+
+from ideatestutils.dynamodb.dynamodb_requests import DynamoDBRequests
+
+from botocore.exceptions import ClientError
+from datetime import datetime, timedelta, timezone
+from typing import Dict, List, Optional, Set, Tuple
+import logging
+import pytest
+import time
+
+TABLE_NAME = 'idea-mock.vdc.controller.session-permissions'
+EVENTS_QUEUE_URL = (
+    'https://sqs.us-east-1.amazonaws.com/123456789012/idea-mock-vdc-events.fifo'
+)
+
+NOW = datetime(2026, 1, 1, tzinfo=timezone.utc)
+
+# items returned in a single scan or query page (Limit)
+PAGE_SIZE = 2
+
+
+class FakeSQS:
+    def __init__(self, failed_ids: Optional[List[str]] = None):
+        self.batches: List[List[Dict]] = []
+        self.failed_ids = failed_ids or []
+
+    def send_message_batch(self, QueueUrl: str, Entries: List[Dict]):
+        assert QueueUrl == EVENTS_QUEUE_URL
+        assert len(Entries) <= 10
+        self.batches.append(Entries)
+        return {
+            'Successful': [
+                {'Id': entry['Id']}
+                for entry in Entries
+                if entry['Id'] not in self.failed_ids
+            ],
+            'Failed': [
+                {'Id': entry['Id'], 'Code': 'InternalError', 'Message': 'failed'}
+                for entry in Entries
+                if entry['Id'] in self.failed_ids
+            ],
+        }
+
+
+def build_context(
+    sqs: FakeSQS, dynamodb: Optional[SocaAnyPayload] = None
+) -> SocaAnyPayload:
+    logger = logging.getLogger('test-session-permission-db')
+    config = SocaAnyPayload(
+        get_string=lambda key, default=None, required=False: EVENTS_QUEUE_URL
+        if key == 'virtual-desktop-controller.events_sqs_queue_url'
+        else default
+    )
+    context = SocaAnyPayload(
+        cluster_name=lambda: 'idea-mock',
+        module_id=lambda: 'vdc',
+        config=lambda: config,
+        logger=lambda name=None: logger,
+        aws=lambda: SocaAnyPayload(
+            sqs=lambda: sqs,
+            dynamodb_table=lambda: None if dynamodb is None else dynamodb.resource,
+        ),
+        aws_util=lambda: None if dynamodb is None else dynamodb.aws_util,
+    )
+    context.events_client = EventsClient(context=context)
+    return context
+
+
+def build_permission_db(context: SocaAnyPayload) -> VirtualDesktopSessionPermissionDB:
+    permission_db = VirtualDesktopSessionPermissionDB.__new__(
+        VirtualDesktopSessionPermissionDB
+    )
+    permission_db.context = context
+    permission_db._logger = context.logger()
+    permission_db._ddb_client = context.aws().dynamodb_table()
+    permission_db._table_obj = None
+    permission_db._table_name = permission_db.table_name
+    permission_db._expiry_index_active = False
+    permission_db._expiry_backfill_complete = False
+    return permission_db
+
+
+def build_permission(
+    idea_session_id: str, actor_name: str, expiry_date: datetime
+) -> VirtualDesktopSessionPermission:
+    return VirtualDesktopSessionPermission(
+        idea_session_id=idea_session_id,
+        idea_session_owner='owner',
+        idea_session_name=idea_session_id,
+        idea_session_instance_type='t3.large',
+        idea_session_state=VirtualDesktopSessionState.READY,
+        idea_session_base_os=VirtualDesktopBaseOS.AMAZON_LINUX2,
+        idea_session_created_on=NOW,
+        idea_session_type=VirtualDesktopSessionType.VIRTUAL,
+        permission_profile=VirtualDesktopPermissionProfile(profile_id='observer'),
+        actor_type=VirtualDesktopSessionPermissionActorType.USER,
+        actor_name=actor_name,
+        created_on=NOW,
+        updated_on=NOW,
+        expiry_date=expiry_date,
+    )
+
+
+def build_permissions(count: int) -> List[VirtualDesktopSessionPermission]:
+    # every third permission has expired
+    return [
+        build_permission(
+            idea_session_id=f'session-{index // 3}',
+            actor_name=f'user{index}',
+            expiry_date=NOW + timedelta(days=-1 if index % 3 == 0 else 1),
+        )
+        for index in range(count)
+    ]
+
+
+def create_table_without_expiry_index(dynamodb: SocaAnyPayload):
+    """
+    session permissions table created by a release before the expiry index was added
+    """
+    dynamodb.client.create_table(
+        TableName=TABLE_NAME,
+        AttributeDefinitions=[
+            {
+                'AttributeName': session_permissions_constants.SESSION_PERMISSIONS_DB_HASH_KEY,
+                'AttributeType': 'S',
+            },
+            {
+                'AttributeName': session_permissions_constants.SESSION_PERMISSIONS_DB_RANGE_KEY,
+                'AttributeType': 'S',
+            },
+        ],
+        KeySchema=[
+            {
+                'AttributeName': session_permissions_constants.SESSION_PERMISSIONS_DB_HASH_KEY,
+                'KeyType': 'HASH',
+            },
+            {
+                'AttributeName': session_permissions_constants.SESSION_PERMISSIONS_DB_RANGE_KEY,
+                'KeyType': 'RANGE',
+            },
+        ],
+        BillingMode='PAY_PER_REQUEST',
+    )
+    dynamodb.aws_util.dynamodb_check_table_exists(TABLE_NAME, wait=True)
+
+
+def put_permissions(
+    dynamodb: SocaAnyPayload,
+    permissions: List[VirtualDesktopSessionPermission],
+    with_expiry_shard: bool,
+):
+    with dynamodb.resource.Table(TABLE_NAME).batch_writer() as batch:
+        for permission in permissions:
+            db_entry = VirtualDesktopSessionPermissionDB.convert_session_permission_object_to_db_dict(
+                permission
+            )
+            # enums are saved as strings
+            for key, value in db_entry.items():
+                if isinstance(value, VirtualDesktopSessionType):
+                    db_entry[key] = value.name
+                elif hasattr(value, 'value'):
+                    db_entry[key] = value.value
+            if with_expiry_shard:
+                db_entry[
+                    session_permissions_constants.SESSION_PERMISSIONS_DB_EXPIRY_SHARD_KEY
+                ] = VirtualDesktopSessionPermissionDB.get_expiry_shard(
+                    permission.idea_session_id, permission.actor_name
+                )
+            batch.put_item(Item=db_entry)
+
+
+def scan_all(dynamodb: SocaAnyPayload) -> List[Dict]:
+    table = dynamodb.resource.Table(TABLE_NAME)
+    scan_request = {}
+    items = []
+    while True:
+        result = table.scan(**scan_request)
+        items += result['Items']
+        if 'LastEvaluatedKey' not in result:
+            return items
+        scan_request['ExclusiveStartKey'] = result['LastEvaluatedKey']
+
+
+def get_keys(dynamodb: SocaAnyPayload) -> Set[Tuple[str, str]]:
+    return {
+        (item['idea_session_id'], item['actor_name']) for item in scan_all(dynamodb)
+    }
+
+
+def wait_for_expiry_index(dynamodb: SocaAnyPayload, timeout: int = 30):
+    start_time = time.time()
+    while time.time() - start_time < timeout:
+        status = dynamodb.aws_util.dynamodb_get_global_secondary_index_status(
+            TABLE_NAME,
+            session_permissions_constants.SESSION_PERMISSIONS_DB_EXPIRY_INDEX_NAME,
+        )
+        if status == 'ACTIVE':
+            return
+        time.sleep(1)
+    raise TimeoutError('expiry index is not active')
+
+
+def test_virtual_desktop_session_permission_db_expiry_backfill_resumes(dynamodb):
+    """
+    an interrupted backfill is re-run on the next initialize, until its completion is recorded.
+    expired permissions are read using a scan until the backfill is complete.
+    """
+    create_table_without_expiry_index(dynamodb)
+    put_permissions(dynamodb, build_permissions(9), with_expiry_shard=False)
+    permission_db = build_permission_db(build_context(FakeSQS(), dynamodb))
+    requests = DynamoDBRequests(dynamodb.resource.meta.client, page_size=PAGE_SIZE)
+
+    def is_backfill_complete() -> bool:
+        return dynamodb.aws_util.dynamodb_is_backfill_complete(
+            TABLE_NAME,
+            session_permissions_constants.SESSION_PERMISSIONS_DB_EXPIRY_BACKFILL,
+        )
+
+    # the second scan page fails
+    requests.errors['Scan'] += [
+        None,
+        ClientError(
+            {'Error': {'Code': 'ProvisionedThroughputExceededException'}}, 'Scan'
+        ),
+    ]
+    with pytest.raises(ClientError):
+        permission_db._create_expiry_index()
+    assert not is_backfill_complete()
+
+    # fallback to scan while the backfill is incomplete
+    expired = permission_db.list_expired(NOW)
+    assert sorted(p.actor_name for p in expired) == ['user0', 'user3', 'user6']
+    assert requests.counts['Query'] == 0
+
+    permission_db._create_expiry_index()
+    permission_db._expiry_backfill_complete = True
+    assert is_backfill_complete()
+    for item in scan_all(dynamodb):
+        assert (
+            session_permissions_constants.SESSION_PERMISSIONS_DB_EXPIRY_SHARD_KEY
+            in item
+        )
+
+    # completed backfills are not re-run
+    scans = requests.counts['Scan']
+    permission_db._create_expiry_index()
+    assert requests.counts['Scan'] == scans
+
+    wait_for_expiry_index(dynamodb)
+    expired = permission_db.list_expired(NOW)
+    assert sorted(p.actor_name for p in expired) == ['user0', 'user3', 'user6']
+    assert requests.counts['Scan'] == scans
+    assert requests.counts['Query'] > 0
+
+
+def test_virtual_desktop_session_permission_db_expiry_backfill_deleted_permission(
+    dynamodb,
+):
+    """
+    permissions deleted after the scan are not re-created by the backfill
+    """
+    create_table_without_expiry_index(dynamodb)
+    put_permissions(dynamodb, build_permissions(3), with_expiry_shard=False)
+    permission_db = build_permission_db(build_context(FakeSQS(), dynamodb))
+    # the permissions are scanned in pages of PAGE_SIZE
+    DynamoDBRequests(dynamodb.resource.meta.client, page_size=PAGE_SIZE)
+
+    table = permission_db._table
+    scan = table.scan
+
+    def scan_then_delete(**kwargs):
+        result = scan(**kwargs)
+        # deleted after the permission was read, before the permission is updated
+        for item in result['Items']:
+            if item['actor_name'] == 'user1':
+                table.delete_item(
+                    Key={'idea_session_id': 'session-0', 'actor_name': 'user1'}
+                )
+        return result
+
+    table.scan = scan_then_delete
+    permission_db._create_expiry_index()
+
+    assert get_keys(dynamodb) == {('session-0', 'user0'), ('session-0', 'user2')}
+
+
+def test_virtual_desktop_session_permission_db_list_expired(dynamodb):
+    """
+    expired permissions are queried from each shard of the expiry index without scanning the table
+    """
+    permission_db = build_permission_db(build_context(FakeSQS(), dynamodb))
+    permission_db.initialize()
+    put_permissions(dynamodb, build_permissions(30), with_expiry_shard=True)
+    wait_for_expiry_index(dynamodb)
+    requests = DynamoDBRequests(dynamodb.resource.meta.client, page_size=PAGE_SIZE)
+
+    expired = permission_db.list_expired(NOW)
+
+    assert sorted(p.actor_name for p in expired) == sorted(
+        f'user{index}' for index in range(0, 30, 3)
+    )
+    assert expired[0].idea_session_type == VirtualDesktopSessionType.VIRTUAL
+    assert requests.counts['Scan'] == 0
+    assert (
+        requests.counts['Query']
+        >= session_permissions_constants.SESSION_PERMISSIONS_DB_EXPIRY_INDEX_SHARDS
+    )
+
+
+def test_virtual_desktop_session_permission_db_delete_all(dynamodb):
+    """
+    permissions are deleted in a batch and a deleted event is published for each permission
+    """
+    permissions = build_permissions(12)
+    sqs = FakeSQS()
+    permission_db = build_permission_db(build_context(sqs, dynamodb))
+    permission_db.initialize()
+    put_permissions(dynamodb, permissions, with_expiry_shard=True)
+    requests = DynamoDBRequests(dynamodb.resource.meta.client)
+
+    permission_db.delete_all(permissions[:11])
+    permission_db.delete_all([])
+
+    assert get_keys(dynamodb) == {('session-3', 'user11')}
+    assert requests.counts['BatchWriteItem'] == 1
+
+    # 11 events in 2 SendMessageBatch requests
+    assert [len(batch) for batch in sqs.batches] == [10, 1]
+    events = [Utils.from_json(entry['MessageBody']) for entry in sqs.batches[0]]
+    # same message as a single published delete event
+    assert (
+        events[0]['event_type']
+        == (
+            VirtualDesktopEvent(
+                event_type=VirtualDesktopEventType.DB_ENTRY_DELETED_EVENT
+            ).model_dump()['event_type']
+        )
+    )
+    assert events[0]['event_group_id'] == 'session-0-user0'
+    assert events[0]['detail']['table_name'] == TABLE_NAME
+    assert events[0]['detail']['deleted_value']['actor_name'] == 'user0'
+    assert sqs.batches[0][0]['MessageGroupId'] == 'session-0-user0'
+
+
+def test_virtual_desktop_events_client_publish_events(caplog):
+    """
+    events are published in batches of up to 10 messages. failed entries are logged.
+    """
+    sqs = FakeSQS(failed_ids=['3'])
+    context = build_context(sqs)
+    permission_db = build_permission_db(context)
+    events = [
+        permission_db._build_delete_event(f'session {index}', 'user', {})
+        for index in range(25)
+    ]
+
+    context.events_client.publish_events([])
+    assert sqs.batches == []
+
+    with caplog.at_level(logging.ERROR):
+        context.events_client.publish_events(events)
+
+    assert [len(batch) for batch in sqs.batches] == [10, 10, 5]
+    assert [entry['Id'] for entry in sqs.batches[1]] == [str(i) for i in range(10)]
+    # spaces are not allowed in message group ids
+    assert sqs.batches[2][0]['MessageGroupId'] == 'session_20-user'
+    assert (
+        len([r for r in caplog.records if 'failed to publish event' in r.message]) == 3
+    )
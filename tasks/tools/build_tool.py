@@ -13,6 +13,7 @@ import tasks.idea as idea
 
 from invoke import Context
 from typing import Optional
+import gzip
 import shutil
 import os
 from abc import abstractmethod, ABC
@@ -401,6 +402,7 @@ class BuildTool:
         # webapp
         if self.has_webapp():
             shutil.copytree(self.webapp_build_dir, os.path.join(output_dir, 'webapp'))
+            self.precompress_webapp(os.path.join(output_dir, 'webapp'))
 
         # config
         if self.has_config():
@@ -413,6 +415,33 @@ class BuildTool:
                 self.bootstrap_dir, os.path.join(output_dir, 'resources', 'bootstrap')
             )
 
+    @staticmethod
+    def precompress_webapp(webapp_dir: str):
+        """
+        create gzip (and brotli, if the brotli module is installed) variants of text resources, served by the web
+        portal based on the Accept-Encoding request header.
+        """
+        try:
+            import brotli
+        except ImportError:
+            brotli = None
+
+        extensions = ('.js', '.css', '.html', '.json', '.map', '.svg', '.txt', '.ico')
+        for root, _, files in os.walk(webapp_dir):
+            for file_name in files:
+                if not file_name.endswith(extensions):
+                    continue
+                file = os.path.join(root, file_name)
+                with open(file, 'rb') as f:
+                    content = f.read()
+                if len(content) < 1024:
+                    continue
+                with open(f'{file}.gz', 'wb') as f:
+                    f.write(gzip.compress(content, compresslevel=9, mtime=0))
+                if brotli is not None:
+                    with open(f'{file}.br', 'wb') as f:
+                        f.write(brotli.compress(content))
+
     def build(self):
         idea.console.print_header_block(f'build {self.app_name}')
 